@@ -53,9 +53,24 @@ export type DeployParams = {
   upperQuorumCap: BigNumber
   lowerQuorumCap: BigNumber
 
+  // The maximum number of polls which may be underway at once.
+  maxActivePolls: BigNumber
+
+  // The number of blocks of token checkpoint history which compaction always keeps.
+  minCheckpointRetentionBlocks: BigNumber
+
   // The maximum drip size from the faucet.
   maxFaucetDripSize: BigNumber
 
+  // The maximum number of tokens an address may receive from the faucet in an epoch.
+  maxFaucetTokensPerEpoch: BigNumber
+
+  // The maximum number of tokens the faucet may drip in a block.
+  maxFaucetTokensPerBlock: BigNumber
+
+  // The number of blocks in a faucet epoch.
+  faucetBlocksPerEpoch: BigNumber
+
   // The governor address
   governorAddress: string
 }
@@ -67,6 +82,9 @@ export type VestingContract = {
   // The block vesting starts on.
   vestingStartBlock: BigNumber
 
+  // The block before which no tokens are available. Defaults to `vestingStartBlock`.
+  cliffBlock?: BigNumber
+
   // The amount that becomes available each block.
   amountPerBlock: BigNumber
 
@@ -117,7 +135,20 @@ export const deploy = async (params: DeployParams): Promise<void> => {
   console.log(
     `Quorum Caps: [${params.lowerQuorumCap.toFixed()}, ${params.upperQuorumCap.toFixed()}]`,
   )
+  console.log(`Max Active Polls: ${params.maxActivePolls.toFixed()}`)
+  console.log(
+    `Min Checkpoint Retention Blocks: ${params.minCheckpointRetentionBlocks.toFixed()}`,
+  )
   console.log(`Faucet Max Drip Size: ${params.maxFaucetDripSize.toFixed()}`)
+  console.log(
+    `Faucet Max Tokens Per Epoch: ${params.maxFaucetTokensPerEpoch.toFixed()}`,
+  )
+  console.log(
+    `Faucet Max Tokens Per Block: ${params.maxFaucetTokensPerBlock.toFixed()}`,
+  )
+  console.log(
+    `Faucet Blocks Per Epoch: ${params.faucetBlocksPerEpoch.toFixed()}`,
+  )
   console.log(``)
 
   console.log(`Vesting Contracts:`)
@@ -182,7 +213,7 @@ export const deploy = async (params: DeployParams): Promise<void> => {
 
   console.log('>>> [1/4] Deploying Token Contract')
   counter++
-  const tokenContractStorage = `(Pair (Pair (Pair (Some "${keystore.publicKeyHash}") {}) (Pair {} {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20226b44414f20546f6b656e222c20226465736372697074696f6e223a2022546865204641312e3220476f7665726e616e636520546f6b656e20466f72204b6f6c69627269222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e6365222c2022696e7465726661636573223a205b2022545a49502d3030372d323032312d30312d3239225d207d})) (Pair (Pair False {}) (Pair False (Pair {Elt 0 (Pair 0 {Elt "decimals" 0x3138; Elt "icon" 0x2068747470733a2f2f6b6f6c696272692d646174612e73332e616d617a6f6e6177732e636f6d2f6c6f676f2e706e67; Elt "name" 0x4b6f6c696272692044414f20546f6b656e; Elt "symbol" 0x6b44414f})} 0))))`
+  const tokenContractStorage = `(Pair (Pair (Pair (Pair (Some "${keystore.publicKeyHash}") {}) (Pair {} {})) (Pair (Pair 2 {}) (Pair {} (Pair "${keystore.publicKeyHash}" {})))) (Pair (Pair (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20226b44414f20546f6b656e222c20226465736372697074696f6e223a2022546865204641312e3220476f7665726e616e636520546f6b656e20466f72204b6f6c69627269222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e6365222c2022696e7465726661636573223a205b2022545a49502d3030372d323032312d30312d3239225d207d} ${params.minCheckpointRetentionBlocks.toFixed()}) (Pair False (Pair {} False))) (Pair (Pair {} 86400) (Pair {} (Pair {Elt 0 (Pair 0 {Elt "decimals" 0x3138; Elt "icon" 0x2068747470733a2f2f6b6f6c696272692d646174612e73332e616d617a6f6e6177732e636f6d2f6c6f676f2e706e67; Elt "name" 0x4b6f6c696272692044414f20546f6b656e; Elt "symbol" 0x6b44414f})} 0)))))`
   const tokenDeployResult = await deployContract(
     tokenContract,
     tokenContractStorage,
@@ -194,7 +225,7 @@ export const deploy = async (params: DeployParams): Promise<void> => {
 
   console.log('>>> [2/4] Deploying Community Fund')
   counter++
-  const communityFundStorage = `(Pair "${keystore.publicKeyHash}" (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20224b6f6c696272692044414f20436f6d6d756e6974792046756e64222c20226465736372697074696f6e223a2022476f7665726e616e636520546f6b656e2046756e6420666f72204b6f6c696272692044414f222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d} "${tokenDeployResult.contractAddress}"))`
+  const communityFundStorage = `(Pair (Pair "${keystore.publicKeyHash}" {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20224b6f6c696272692044414f20436f6d6d756e6974792046756e64222c20226465736372697074696f6e223a2022476f7665726e616e636520546f6b656e2046756e6420666f72204b6f6c696272692044414f222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d}) (Pair 0 {}))`
   const communityFundDeployResult = await deployContract(
     communityFundContract,
     communityFundStorage,
@@ -206,7 +237,7 @@ export const deploy = async (params: DeployParams): Promise<void> => {
 
   console.log('>>> [3/4] Deploying DAO')
   counter++
-  const daoStorage = `(Pair (Pair (Pair "${communityFundDeployResult.contractAddress}" (Pair ${params.escrowAmount.toFixed()} (Pair ${params.voteDelayBlocks.toFixed()} (Pair ${params.voteLengthBlocks.toFixed()} (Pair ${params.minYayVotesPercentForEscrowReturn.toFixed()} (Pair ${params.blocksInTimelockForExecution.toFixed()} (Pair ${params.blocksInTimelockForCancellation.toFixed()} (Pair ${params.percentageForSuperMajority.toFixed()} (Pair ${params.lowerQuorumCap.toFixed()} ${params.upperQuorumCap.toFixed()}))))))))) (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20224b6f6c6962726920476f7665726e616e63652044414f222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d}                                                                                   (Pair 0 {}))) (Pair (Pair None (Pair ${params.quorum.toFixed()} 0)) (Pair None (Pair "${tokenDeployResult.contractAddress}" None))))`
+  const daoStorage = `(Pair (Pair (Pair {} (Pair "${communityFundDeployResult.contractAddress}" "${tokenDeployResult.contractAddress}")) (Pair (Pair (Pair ${params.escrowAmount.toFixed()} (Pair ${params.voteDelayBlocks.toFixed()} (Pair ${params.voteLengthBlocks.toFixed()} (Pair ${params.minYayVotesPercentForEscrowReturn.toFixed()} (Pair ${params.blocksInTimelockForExecution.toFixed()} (Pair ${params.blocksInTimelockForCancellation.toFixed()} (Pair ${params.percentageForSuperMajority.toFixed()} (Pair (Pair ${params.lowerQuorumCap.toFixed()} ${params.upperQuorumCap.toFixed()}) ${params.maxActivePolls.toFixed()})))))))) {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20224b6f6c6962726920476f7665726e616e63652044414f222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d}) (Pair 0 {}))) (Pair (Pair {} (Pair ${params.quorum.toFixed()} {})) (Pair (Pair "${tokenDeployResult.contractAddress}" {}) (Pair {} {}))))`
   const daoDeployResult = await deployContract(
     daoContract,
     daoStorage,
@@ -218,7 +249,7 @@ export const deploy = async (params: DeployParams): Promise<void> => {
 
   console.log('>>> [4/4] Deploying Faucet')
   counter++
-  const faucetStorage = `(Pair ${params.maxFaucetDripSize.toFixed()} (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20226b44414f20546f6b656e20466175636574222c20226465736372697074696f6e223a2022476f7665726e616e636520546f6b656e2046617563657420666f72204b6f6c696272692044414f222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d} "${tokenDeployResult.contractAddress}"))`
+  const faucetStorage = `(Pair (Pair (Pair ${params.faucetBlocksPerEpoch.toFixed()} {}) (Pair 0 ${params.maxFaucetTokensPerBlock.toFixed()})) (Pair (Pair ${params.maxFaucetDripSize.toFixed()} ${params.maxFaucetTokensPerEpoch.toFixed()}) (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b20226e616d65223a20226b44414f20546f6b656e20466175636574222c20226465736372697074696f6e223a2022476f7665726e616e636520546f6b656e2046617563657420666f72204b6f6c696272692044414f222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d} (Pair "${tokenDeployResult.contractAddress}" 0))))`
   const faucetDeployResult = await deployContract(
     faucetContract,
     faucetStorage,
@@ -230,18 +261,57 @@ export const deploy = async (params: DeployParams): Promise<void> => {
 
   console.log('------------------------------------------------------')
   console.log('>> Deploy Complete')
+  console.log('>> Deploying Vesting Vault')
+  console.log('------------------------------------------------------')
+  console.log('')
+
+  console.log('>>> [1/1] Deploying Vesting Vault')
+  counter++
+  const vestingVaultStorage = `(Pair (Pair (Pair {} {}) (Pair "${daoDeployResult.contractAddress}" (Pair {} "${keystore.publicKeyHash}"))) (Pair (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b226e616d65223a20226b44414f2056657374696e6720436f6e7472616374222c20226465736372697074696f6e223a20226b44414f2056657374696e6720436f6e7472616374222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d} {}) (Pair {} (Pair "${tokenDeployResult.contractAddress}" 0))))`
+  const vestingVaultDeployResult = await deployContract(
+    vestingVaultContract,
+    vestingVaultStorage,
+    keystore,
+    counter,
+    params.nodeAddress,
+  )
+  console.log('')
+
+  console.log('------------------------------------------------------')
+  console.log('>> Vesting Vault Deployed')
   console.log('>> Minting...')
   console.log('------------------------------------------------------')
   console.log('')
 
+  const totalInVaults = params.vestingContracts.reduce(
+    (accumulated: BigNumber, next: VestingContract) => {
+      return accumulated.plus(next.amount)
+    },
+    new BigNumber(0),
+  )
+  const remainder = CONFIG.TOKENS_TO_MINT.minus(totalInVaults)
+    .minus(params.faucetAmount)
+    .minus(params.airdropAmount)
+  console.log(`Total In Vesting Vaults: ${totalInVaults.toFixed()}`)
+  console.log(`Faucet: ${params.faucetAmount.toFixed()}`)
+  console.log(`Airdrop: ${params.airdropAmount.toFixed()}`)
+  console.log(`Community Fund: ${remainder.toFixed()}`)
+  console.log('')
+
+  // Mint the genesis distribution directly to each recipient in a single operation.
+  const genesisMints = [
+    `Pair "${vestingVaultDeployResult.contractAddress}" ${totalInVaults.toFixed()}`,
+    `Pair "${faucetDeployResult.contractAddress}" ${params.faucetAmount.toFixed()}`,
+    `Pair "${params.airdropAddress}" ${params.airdropAmount.toFixed()}`,
+    `Pair "${communityFundDeployResult.contractAddress}" ${remainder.toFixed()}`,
+  ]
+
   console.log('>>> [1/2] Minting Tokens')
   counter++
-  const mintParam = `Pair "${keystore.publicKeyHash
-    }" ${CONFIG.TOKENS_TO_MINT.toFixed()}`
   await sendOperation(
     tokenDeployResult.contractAddress,
-    'mint',
-    mintParam,
+    'mintBatch',
+    `{ ${genesisMints.join('; ')} }`,
     keystore,
     counter,
     params.nodeAddress,
@@ -266,132 +336,64 @@ export const deploy = async (params: DeployParams): Promise<void> => {
   console.log('------------------------------------------------------')
   console.log('')
 
-  console.log('>>> [1/2] Setting Governor for Community Fund')
-  counter++
-  await sendOperation(
-    communityFundDeployResult.contractAddress,
-    'setGovernorContract',
-    `"${keystore.publicKeyHash}"`,
-    keystore,
-    counter,
-    params.nodeAddress,
-  )
-  console.log('')
+  // Add every beneficiary to the vault in a single operation, once the vault holds their tokens.
+  // Each beneficiary vests linearly from their start block until their whole amount is available.
+  const beneficiaries = params.vestingContracts.map((vestingContract) => {
+    const cliffBlock =
+      vestingContract.cliffBlock ?? vestingContract.vestingStartBlock
+    const endBlock = vestingContract.vestingStartBlock.plus(
+      vestingContract.amount
+        .dividedBy(vestingContract.amountPerBlock)
+        .integerValue(BigNumber.ROUND_CEIL),
+    )
+    const segments = `{ Pair ${vestingContract.vestingStartBlock.toFixed()} ${vestingContract.amountPerBlock.toFixed()} }`
+    return `Pair "${vestingContract.owner}" (Pair ${vestingContract.amount.toFixed()} (Pair ${cliffBlock.toFixed()} (Pair ${endBlock.toFixed()} ${segments})))`
+  })
 
-  console.log('>>> [2/2] Setting Governor for DAO')
+  console.log(`>>> [1/4] Adding ${beneficiaries.length} Beneficiaries to Vesting Vault`)
   counter++
   await sendOperation(
-    tokenDeployResult.contractAddress,
-    'setAdministrator',
-    `Some "${params.governorAddress}"`,
+    vestingVaultDeployResult.contractAddress,
+    'addBeneficiaries',
+    `{ ${beneficiaries.join('; ')} }`,
     keystore,
     counter,
     params.nodeAddress,
   )
   console.log('')
 
-  console.log('------------------------------------------------------')
-  console.log('>> Wiring Complete')
-  console.log('>> Deploying Vesting Contracts')
-  console.log('------------------------------------------------------')
-  console.log('')
-
-  const vestingVaultDeployResults = []
-  const steps = params.vestingContracts.length * 2
-  let step = 0
-  for (let i = 0; i < params.vestingContracts.length; i++) {
-    const vestingContract = params.vestingContracts[i]
-    counter++
-    console.log(
-      `>>> [${++step}/${steps}] Deploying Vesting Contract for ${vestingContract.owner
-      }`,
-    )
-    const vestingVaultStorage =  `(Pair (Pair (Pair ${vestingContract.amountPerBlock.toFixed()}      0) (Pair "${daoDeployResult.contractAddress}"               "${keystore.publicKeyHash}")) (Pair (Pair {Elt "" 0x74657a6f732d73746f726167653a64617461; Elt "data" 0x7b226e616d65223a20226b44414f2056657374696e6720436f6e7472616374222c20226465736372697074696f6e223a20226b44414f2056657374696e6720436f6e7472616374222c2022617574686f7273223a205b22486f766572204c616273203c68656c6c6f40686f7665722e656e67696e656572696e673e225d2c2022686f6d6570616765223a20202268747470733a2f2f6b6f6c696272692e66696e616e636522207d} "${vestingContract.owner}") (Pair ${vestingContract.vestingStartBlock.toFixed()} "${tokenDeployResult.contractAddress}")))`                                 
-    const vestingVaultDeployResult = await deployContract(
-      vestingVaultContract,
-      vestingVaultStorage,
-      keystore,
-      counter,
-      params.nodeAddress,
-    )
-    vestingVaultDeployResults.push(vestingVaultDeployResult)
-    console.log('')
-
-    counter++
-    console.log(
-      `>>> [${++step}/${steps}] Transferring Vesting Contract for ${vestingContract.owner
-      }`,
-    )
-    const transferParam = `Pair "${keystore.publicKeyHash}" (Pair "${vestingVaultDeployResult.contractAddress
-      }" ${vestingContract.amount.toFixed()})`
-    await sendOperation(
-      tokenDeployResult.contractAddress,
-      'transfer',
-      transferParam,
-      keystore,
-      counter,
-      params.nodeAddress,
-    )
-    console.log(``)
-  }
-
-  console.log('------------------------------------------------------')
-  console.log('>> Vesting Contracts Deployed and Configured')
-  console.log('>> Distributing Tokens')
-  console.log('------------------------------------------------------')
-  console.log('')
-
-  const totalInVaults = params.vestingContracts.reduce(
-    (accumulated: BigNumber, next: VestingContract) => {
-      return accumulated.plus(next.amount)
-    },
-    new BigNumber(0),
-  )
-  console.log(`Total In Vesting Vaults: ${totalInVaults.toFixed()}`)
-  console.log('')
-
-  console.log(`Moving ${params.faucetAmount.toFixed()} Tokens to Faucet`)
+  console.log('>>> [2/4] Setting Governor for Community Fund')
   counter++
-  const faucetTransferParam = `Pair "${keystore.publicKeyHash}" (Pair "${faucetDeployResult.contractAddress
-    }" ${params.faucetAmount.toFixed()})`
   await sendOperation(
-    tokenDeployResult.contractAddress,
-    'transfer',
-    faucetTransferParam,
+    communityFundDeployResult.contractAddress,
+    'setGovernorContract',
+    `"${keystore.publicKeyHash}"`,
     keystore,
     counter,
     params.nodeAddress,
   )
   console.log('')
 
-  console.log(
-    `Moving ${params.airdropAmount.toFixed()} Tokens to ${params.airdropAddress
-    }`,
-  )
+  // The token reads the DAO to bound checkpoint compaction. The DAO was deployed after the token, so the
+  // deployer is used until it is known.
+  console.log('>>> [3/4] Setting DAO for Token')
   counter++
-  const airdropTransferParam = `Pair "${keystore.publicKeyHash}" (Pair "${params.airdropAddress
-    }" ${params.airdropAmount.toFixed()})`
   await sendOperation(
     tokenDeployResult.contractAddress,
-    'transfer',
-    airdropTransferParam,
+    'setDaoContractAddress',
+    `"${daoDeployResult.contractAddress}"`,
     keystore,
     counter,
     params.nodeAddress,
   )
   console.log('')
 
-  const remainder = CONFIG.TOKENS_TO_MINT.minus(totalInVaults)
-    .minus(params.faucetAmount)
-    .minus(params.airdropAmount)
-  console.log(`Moving remaining ${remainder.toFixed()} to Community Fund`)
+  console.log('>>> [4/4] Setting Governor for DAO')
   counter++
-  const communityFundTransferParam = `Pair "${keystore.publicKeyHash}" (Pair "${communityFundDeployResult.contractAddress
-    }" ${remainder.toFixed()})`
   await sendOperation(
     tokenDeployResult.contractAddress,
-    'transfer',
-    communityFundTransferParam,
+    'setAdministrator',
+    `Some "${params.governorAddress}"`,
     keystore,
     counter,
     params.nodeAddress,
@@ -399,7 +401,7 @@ export const deploy = async (params: DeployParams): Promise<void> => {
   console.log('')
 
   console.log('------------------------------------------------------')
-  console.log('>> Tokens Distributed')
+  console.log('>> Wiring Complete')
   console.log('>> Murmuration Deploy Complete')
   console.log('> All Done!')
   console.log('------------------------------------------------------')
@@ -419,12 +421,16 @@ export const deploy = async (params: DeployParams): Promise<void> => {
     `Faucet Contract:         ${faucetDeployResult.contractAddress} (${faucetDeployResult.operationHash})`,
   )
 
+  console.log(
+    `Vesting Vault Contract:  ${vestingVaultDeployResult.contractAddress} (${vestingVaultDeployResult.operationHash})`,
+  )
+
   console.log('')
-  console.log('---------------- Vesting Contracts ---------------------')
+  console.log('---------------- Vesting Beneficiaries -----------------')
 
-  for (let i = 0; i < vestingVaultDeployResults.length; i++) {
+  for (let i = 0; i < params.vestingContracts.length; i++) {
     console.log(
-      `${params.vestingContracts[i].owner}: ${vestingVaultDeployResults[i].contractAddress} (${vestingVaultDeployResults[i].operationHash})`,
+      `${params.vestingContracts[i].owner}: ${params.vestingContracts[i].amount.toFixed()}`,
     )
   }
 }
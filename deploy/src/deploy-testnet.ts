@@ -28,6 +28,9 @@ const params: DeployParams = {
 
   faucetAmount: scaleTokenAmount(new BigNumber('100000')),
   maxFaucetDripSize: scaleTokenAmount(new BigNumber('100')),
+  maxFaucetTokensPerEpoch: scaleTokenAmount(new BigNumber('100')),
+  maxFaucetTokensPerBlock: scaleTokenAmount(new BigNumber('1000')),
+  faucetBlocksPerEpoch: new BigNumber('2880'),
 
   airdropAmount: scaleTokenAmount(new BigNumber('200000')),
   airdropAddress: 'tz1KoLibimdjUSfhrSpXwx4FhhhCq1JM5Etk',
@@ -46,6 +49,9 @@ const params: DeployParams = {
   quorum: scaleTokenAmount(new BigNumber('2000')),
   upperQuorumCap: scaleTokenAmount(new BigNumber('900000')),
   lowerQuorumCap: scaleTokenAmount(new BigNumber('10000')),
+  maxActivePolls: new BigNumber('5'),
+
+  minCheckpointRetentionBlocks: new BigNumber('20160'),
 
   governorAddress: 'tz1hoverof3f2F8NAavUyTjbFBstZXTqnUMS',
 }
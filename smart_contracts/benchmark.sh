@@ -0,0 +1,303 @@
+#!/usr/bin/env bash
+
+set -e -o pipefail
+
+echo "----------------------------------------"
+echo "Benchmarking Dao Contracts"
+echo "----------------------------------------"
+
+# Usage: ./benchmark.sh [--update-baseline]
+#
+# Compiles the contracts in benchmarks.py, originates them into a mockup chain and calls their hot entry
+# points. Consumed gas, storage size, paid storage size diff and parameter size are recorded for every call.
+#
+# With --update-baseline, results are written to $BASELINE. Otherwise results are compared to $BASELINE and
+# the script fails if any call regresses by more than $TOLERANCE percent, or if the baseline has no entry for a
+# call. While no baseline is committed, results are printed with a warning instead. The baseline should be
+# committed, and updated whenever benchmarks are added.
+
+# Expected location of SmartPy CLI.
+SMART_PY_CLI=~/smartpy-cli/SmartPy.sh
+
+# Expected location of Tezos client.
+TEZOS_CLIENT=${TEZOS_CLIENT:-tezos-client}
+
+# Output directory
+OUT_DIR=./.smartpy_out
+
+# Mockup chain directory
+MOCKUP_DIR=./.mockup
+
+# Results of this run.
+RESULTS=./.benchmark_results.json
+
+# Machine readable baseline.
+BASELINE=./benchmark-baseline.json
+
+# Allowed regression, in percent.
+TOLERANCE=${TOLERANCE:-2}
+
+UPDATE_BASELINE=false
+if [ "$1" == "--update-baseline" ]; then
+    UPDATE_BASELINE=true
+fi
+
+# Ensure we have a SmartPy binary.
+if [ ! -f "$SMART_PY_CLI" ]; then
+    echo "Fatal: Please install SmartPy CLI at $SMART_PY_CLI" && exit 1
+fi
+
+# Ensure we have a Tezos client and jq.
+for BINARY in $TEZOS_CLIENT jq; do
+    if ! command -v $BINARY > /dev/null; then
+        echo "Fatal: Please install $BINARY" && exit 1
+    fi
+done
+
+function client {
+    $TEZOS_CLIENT --base-dir $MOCKUP_DIR --mode mockup "$@"
+}
+
+# Read a placeholder address from test-helpers/addresses.py.
+# Args <name, ex: VOTER_ADDRESS>
+function placeholder {
+    grep "^$1 " test-helpers/addresses.py | sed -E 's/.*"(.*)".*/\1/'
+}
+
+# Read the address of a mockup account or originated contract.
+# Args <alias>
+function addressOf {
+    client show address $1 2> /dev/null | grep Hash | awk '{ print $2 }' || client show known contract $1
+}
+
+# Substitutions applied to compiled storage, as "placeholder=address" pairs.
+SUBSTITUTIONS=()
+
+# Originate a compiled contract, substituting placeholder addresses in its storage.
+# Args <alias> <compilation target>
+function originate {
+    ALIAS=$1
+    TARGET=$2
+    STORAGE=$(cat $OUT_DIR/$TARGET/step_000_cont_0_storage.tz)
+    for SUBSTITUTION in "${SUBSTITUTIONS[@]}"; do
+        STORAGE=${STORAGE//${SUBSTITUTION%%=*}/${SUBSTITUTION#*=}}
+    done
+
+    echo ">> Originating $ALIAS"
+    client originate contract $ALIAS transferring 0 from bootstrap1 \
+        running $OUT_DIR/$TARGET/step_000_cont_0_contract.tz \
+        --init "$STORAGE" --burn-cap 100 --force > /dev/null
+}
+
+# Call an entry point and record its cost.
+# Args <benchmark name> <alias> <entry point> <michelson parameter> <sender>
+function bench {
+    NAME=$1
+    RECEIPT=$(client transfer 0 from $5 to $2 --entrypoint $3 --arg "$4" --burn-cap 100)
+
+    GAS=$(echo "$RECEIPT" | grep "Consumed gas:" | awk '{ sum += $3 } END { print sum }')
+    STORAGE_SIZE=$(echo "$RECEIPT" | grep "Storage size:" | head -n 1 | awk '{ print $3 }')
+    # Storage freed by a call is not refunded, but is reused by later writes to the contract before they are
+    # charged. Freed storage shows up as a smaller storage size, rather than as a storage diff.
+    STORAGE_DIFF=$(echo "$RECEIPT" | grep "Paid storage size diff:" | awk '{ sum += $5 } END { print sum + 0 }')
+    PARAMETER_HEX=$(client convert data "$4" from michelson to binary)
+    PARAMETER_SIZE=$(( (${#PARAMETER_HEX} - 2) / 2 ))
+
+    echo ">> $NAME: gas $GAS, storage $STORAGE_SIZE, storage diff $STORAGE_DIFF, parameter $PARAMETER_SIZE"
+    jq --arg name "$NAME" \
+        --argjson gas "$GAS" \
+        --argjson storageSize "$STORAGE_SIZE" \
+        --argjson storageDiff "$STORAGE_DIFF" \
+        --argjson parameterSize "$PARAMETER_SIZE" \
+        '. + { ($name): { gas: $gas, storageSize: $storageSize, storageDiff: $storageDiff, parameterSize: $parameterSize } }' \
+        $RESULTS > $RESULTS.tmp
+    mv $RESULTS.tmp $RESULTS
+}
+
+echo "> [1 / 4] Compiling Benchmark Contracts."
+$SMART_PY_CLI compile benchmarks.py $OUT_DIR > /dev/null
+echo "> Done."
+echo ""
+
+echo "> [2 / 4] Originating Contracts."
+rm -rf $MOCKUP_DIR
+client create mockup > /dev/null
+echo "{}" > $RESULTS
+
+VOTER=$(addressOf bootstrap1)
+ALICE=$(addressOf bootstrap2)
+BOB=$(addressOf bootstrap3)
+SUBSTITUTIONS+=(
+    "$(placeholder TOKEN_ADMIN_ADDRESS)=$VOTER"
+    "$(placeholder VOTER_ADDRESS)=$VOTER"
+    "$(placeholder ALICE_ADDRESS)=$ALICE"
+)
+
+# Escrow contracts must be originated first, as the DAO and viewers read from them.
+for COUNT in 1 10 100 500; do
+    originate escrow_checkpoints_$COUNT escrow_checkpoints_$COUNT
+    SUBSTITUTIONS+=("$(placeholder ESCROW_CONTRACT_ADDRESS)=$(addressOf escrow_checkpoints_$COUNT)")
+    originate escrow_viewer_$COUNT escrow_viewer
+    unset 'SUBSTITUTIONS[${#SUBSTITUTIONS[@]}-1]'
+done
+
+# The benchmarked poll reads voting power from the escrow contract with 100 checkpoints.
+SUBSTITUTIONS+=("$(placeholder ESCROW_CONTRACT_ADDRESS)=$(addressOf escrow_checkpoints_100)")
+for COUNT in 1 100 500; do
+    originate dao_voters_$COUNT dao_voters_$COUNT
+done
+
+# The DAO escrows proposals in, and the escrow contract locks, the FA2 governance token.
+originate governance_token governance_token
+SUBSTITUTIONS+=("$(placeholder TOKEN_CONTRACT_ADDRESS)=$(addressOf governance_token)")
+for ALIAS in escrow_governance dao_propose dao_end_voting dao_timelock; do
+    originate $ALIAS $ALIAS
+done
+unset 'SUBSTITUTIONS[${#SUBSTITUTIONS[@]}-1]'
+
+# Checkpoints are compacted up to the oldest block the DAO may query.
+originate dao_compaction dao_compaction
+SUBSTITUTIONS+=("$(placeholder DAO_ADDRESS)=$(addressOf dao_compaction)")
+for COUNT in 1 10 100 500; do
+    originate token_checkpoints_$COUNT token_checkpoints_$COUNT
+    originate token_compaction_$COUNT token_compaction_$COUNT
+done
+originate token_checkpoints_disabled token_checkpoints_disabled
+for COUNT in 1 100 500; do
+    originate token_approvals_$COUNT token_approvals_$COUNT
+done
+
+originate token token
+SUBSTITUTIONS+=("$(placeholder TOKEN_CONTRACT_ADDRESS)=$(addressOf token)")
+originate vesting_vault vesting_vault
+originate community_fund community_fund
+originate faucet faucet
+
+# Fund the contracts which hold tokens.
+for ALIAS in vesting_vault community_fund faucet; do
+    client transfer 0 from bootstrap1 to token --entrypoint mint \
+        --arg "Pair \"$(addressOf $ALIAS)\" 1000000" --burn-cap 100 > /dev/null
+done
+
+# Fund the benchmarked address and the contracts which release governance tokens, and allow the contracts
+# which take governance tokens from the benchmarked address to do so.
+for ALIAS in bootstrap1 escrow_governance dao_end_voting; do
+    client transfer 0 from bootstrap1 to governance_token --entrypoint mint \
+        --arg "Pair (Pair \"$(addressOf $ALIAS)\" 1000000) (Pair {} 0)" --burn-cap 100 > /dev/null
+done
+for ALIAS in escrow_governance dao_propose; do
+    client transfer 0 from bootstrap1 to governance_token --entrypoint update_operators \
+        --arg "{ Left (Pair \"$VOTER\" (Pair \"$(addressOf $ALIAS)\" 0)) }" --burn-cap 100 > /dev/null
+done
+echo "> Done."
+echo ""
+
+echo "> [3 / 4] Running Benchmarks."
+for COUNT in 1 10 100 500; do
+    bench "escrow.getPriorBalance.checkpoints_$COUNT" escrow_viewer_$COUNT target "Pair \"$VOTER\" 0" bootstrap1
+    bench "escrow.delegate.checkpoints_$COUNT" escrow_checkpoints_$COUNT delegate "\"$ALICE\"" bootstrap1
+done
+
+for COUNT in 1 100 500; do
+    bench "dao.vote.voters_$COUNT" dao_voters_$COUNT vote "Pair 0 0" bootstrap1
+done
+
+# Relay a yay vote signed by Alice, who has not voted yet.
+CHAIN_ID=$(client rpc get /chains/main/chain_id | jq -r .)
+ALICE_KEY=$(client show address bootstrap2 | grep "Public Key" | awk '{ print $3 }')
+for COUNT in 1 100 500; do
+    PAYLOAD=$(client hash data "Pair \"$CHAIN_ID\" (Pair \"$(addressOf dao_voters_$COUNT)\" (Pair 0 (Pair 0 0)))" \
+        of type "pair chain_id (pair address (pair nat (pair nat nat)))" | grep "Raw packed data" | awk '{ print $4 }')
+    SIGNATURE=$(client sign bytes $PAYLOAD for bootstrap2 | awk '{ print $2 }')
+    bench "dao.voteBySig.voters_$COUNT" dao_voters_$COUNT voteBySig "{ Pair \"$ALICE_KEY\" (Pair 0 (Pair 0 (Pair 0 \"$SIGNATURE\"))) }" bootstrap3
+done
+
+# The proposal lambda matches the one in benchmarks.py.
+LAMBDA="{ DROP; NIL operation }"
+LAMBDA_HASH=$(client hash data "$LAMBDA" of type "lambda unit (list operation)" | grep "Raw Script-expression-ID-Hash" | awk '{ print $3 }')
+bench "dao.propose" dao_propose propose "Pair \"benchmark\" (Pair \"ipfs://xyz\" (Pair \"xyz123\" $LAMBDA_HASH))" bootstrap1
+bench "dao.endVoting" dao_end_voting endVoting "0" bootstrap1
+bench "dao.executeTimelock" dao_timelock executeTimelock "Pair 0 $LAMBDA" bootstrap1
+
+bench "escrow.escrow" escrow_governance escrow "1" bootstrap1
+bench "escrow.release" escrow_governance release "1" bootstrap1
+
+for COUNT in 1 10 100 500; do
+    bench "token.compactCheckpoints.checkpoints_$COUNT" token_compaction_$COUNT compactCheckpoints "Pair \"$VOTER\" 100" bootstrap1
+    bench "token.transfer.checkpoints_$COUNT" token_checkpoints_$COUNT transfer "Pair \"$VOTER\" (Pair \"$ALICE\" 1)" bootstrap1
+done
+
+bench "token.transfer.checkpoints_disabled" token_checkpoints_disabled transfer "Pair \"$VOTER\" (Pair \"$ALICE\" 1)" bootstrap1
+
+for COUNT in 1 100 500; do
+    bench "token.approve.approvals_$COUNT" token_approvals_$COUNT approve "Pair \"$BOB\" 1" bootstrap1
+    bench "token.transferFrom.approvals_$COUNT" token_approvals_$COUNT transfer "Pair \"$ALICE\" (Pair \"$BOB\" 1)" bootstrap1
+done
+
+# Transfer to distinct recipients in one batch.
+for COUNT in 1 10 100; do
+    TRANSFERS=""
+    for i in $(seq 1 $COUNT); do
+        client gen keys recipient_$i --force > /dev/null 2>&1
+        TRANSFERS="$TRANSFERS; Pair \"$VOTER\" (Pair \"$(addressOf recipient_$i)\" 1)"
+    done
+    bench "token.transferBatch.recipients_$COUNT" token_checkpoints_1 transferBatch "{ ${TRANSFERS#; } }" bootstrap1
+done
+
+bench "token.mint" token mint "Pair \"$ALICE\" 1" bootstrap1
+bench "vestingVault.withdraw" vesting_vault withdraw "1" bootstrap1
+bench "communityFund.rescueFA12" community_fund rescueFA12 "Pair \"$(addressOf token)\" (Pair 1 \"$ALICE\")" bootstrap1
+
+# Disburse to the recipients generated above.
+for COUNT in 1 10 100; do
+    DISBURSEMENTS=""
+    for i in $(seq 1 $COUNT); do
+        DISBURSEMENTS="$DISBURSEMENTS; Pair \"$(addressOf token)\" (Pair None (Pair \"$(addressOf recipient_$i)\" 1))"
+    done
+    bench "communityFund.disburse.recipients_$COUNT" community_fund disburse "{ ${DISBURSEMENTS#; } }" bootstrap1
+done
+
+bench "faucet.drip" faucet drip "1" bootstrap1
+echo "> Done."
+echo ""
+
+echo "> [4 / 4] Comparing Results."
+if [ "$UPDATE_BASELINE" = true ]; then
+    cp $RESULTS $BASELINE
+    echo ">> Baseline written to $BASELINE"
+elif [ ! -f "$BASELINE" ]; then
+    echo ">> Warning: No baseline at $BASELINE, so results were not compared. Run with --update-baseline and commit $BASELINE to check for regressions."
+    jq . $RESULTS
+else
+    REGRESSIONS=$(jq -r --slurpfile baseline $BASELINE --argjson tolerance $TOLERANCE '
+        to_entries[]
+        | .key as $name
+        | .value as $result
+        | $baseline[0][$name] as $previous
+        | if $previous == null then
+            "\($name): no baseline"
+          else
+            ["gas", "storageDiff", "parameterSize"][]
+            | select($result[.] > $previous[.] * (100 + $tolerance) / 100)
+            | "\($name) \(.): \($previous[.]) -> \($result[.])"
+          end
+    ' $RESULTS)
+
+    if [ -n "$REGRESSIONS" ]; then
+        echo ">> Regressions found:"
+        echo "$REGRESSIONS"
+        exit 1
+    fi
+    echo ">> No regressions found."
+fi
+echo ""
+
+# Remove other artifacts to reduce noise.
+echo "> Cleaning up"
+rm -rf $OUT_DIR $MOCKUP_DIR $RESULTS
+echo "> All tidied up."
+echo ""
+
+echo "----------------------------------------"
+echo "Task complete."
+echo "----------------------------------------"
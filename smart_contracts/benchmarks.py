@@ -0,0 +1,308 @@
+import smartpy as sp
+
+################################################################
+################################################################
+# Benchmarks
+#
+# Builds each contract with scaled state so that `benchmark.sh` can
+# originate it in a mockup chain and record the gas, storage and
+# operation size of its hot entry points.
+#
+# Addresses from test-helpers/addresses.py are used as placeholders
+# and are replaced by `benchmark.sh` with the addresses of the mockup
+# accounts and contracts before origination.
+#
+# State sizes are bounded by the maximum size of an origination
+# operation, since all state is provided in the initial storage.
+################################################################
+################################################################
+
+Addresses = sp.io.import_script_from_url("file:test-helpers/addresses.py")
+Checkpoints = sp.io.import_script_from_url("file:common/checkpoints.py")
+CommunityFund = sp.io.import_script_from_url("file:community-fund.py")
+Dao = sp.io.import_script_from_url("file:dao.py")
+Escrow = sp.io.import_script_from_url("file:escrow.py")
+FA2 = sp.io.import_script_from_url("file:test-helpers/fa2.py")
+Faucet = sp.io.import_script_from_url("file:faucet.py")
+HistoricalOutcomes = sp.io.import_script_from_url("file:common/historical-outcomes.py")
+Poll = sp.io.import_script_from_url("file:common/poll.py")
+PollOutcomes = sp.io.import_script_from_url("file:common/poll-outcomes.py")
+Proposal = sp.io.import_script_from_url("file:common/proposal.py")
+Token = sp.io.import_script_from_url("file:token.py")
+VestingVault = sp.io.import_script_from_url("file:vesting-vault.py")
+VoteRecord = sp.io.import_script_from_url("file:common/vote-record.py")
+VoteValue = sp.io.import_script_from_url("file:common/vote-value.py")
+
+# The number of checkpoints held by the benchmarked address.
+CHECKPOINT_COUNTS = [1, 10, 100, 500]
+
+# The number of addresses which have already voted in the benchmarked poll.
+VOTER_COUNTS = [1, 100, 500]
+
+# The number of approvals held by the benchmarked owner.
+APPROVAL_COUNTS = [1, 100, 500]
+
+# The balance held by benchmarked addresses.
+BALANCE = 1_000_000
+
+# The proposal of benchmarked polls and timelock items. Its lambda compiles to `{ DROP; NIL operation }`, which
+# `benchmark.sh` reveals when executing the timelock.
+PROPOSAL = sp.record(
+  title = 'benchmark',
+  descriptionLink = 'ipfs://xyz',
+  descriptionHash = "xyz123",
+  proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+)
+
+################################################################
+# Helpers
+################################################################
+
+# Generate a number of distinct addresses.
+def makeAddresses(count, prefix):
+  return [sp.test_account(prefix + str(i)).address for i in range(count)]
+
+# Generate checkpoints for an address which hold a balance from block 0 onwards, grouped into pages.
+#
+# The most recent checkpoint is always after block 0, so reading the balance at
+# block 0 performs a full search. With a `blockStep` of 0 every checkpoint is at
+# block 0, so that all but the last page may be compacted at any level of the
+# mockup chain.
+def makeCheckpointStorage(address, count, blockStep = 1):
+  pageSize = Checkpoints.CHECKPOINTS_PER_PAGE
+  pages = {}
+  for i in range(count):
+    checkpoint = sp.record(fromBlock = sp.nat(i * blockStep), balance = sp.nat(BALANCE - (count - 1) + i))
+    pages.setdefault(i // pageSize, {})[sp.nat(i % pageSize)] = checkpoint
+
+  return dict(
+    balances = sp.big_map(l = { address: sp.nat(BALANCE) }, tkey = sp.TAddress, tvalue = sp.TNat),
+    checkpoints = sp.big_map(
+      l = {
+        (address, sp.nat(page)): sp.map(l = checkpoints, tkey = sp.TNat, tvalue = Checkpoints.CHECKPOINT_TYPE)
+        for page, checkpoints in pages.items()
+      },
+      tkey = Checkpoints.CHECKPOINT_PAGE_KEY_TYPE,
+      tvalue = Checkpoints.CHECKPOINT_PAGE_TYPE
+    ),
+    checkpointDirectories = sp.big_map(
+      l = { address: sp.map(l = { sp.nat(page): sp.nat(page * pageSize * blockStep) for page in pages }, tkey = sp.TNat, tvalue = sp.TNat) },
+      tkey = sp.TAddress,
+      tvalue = Checkpoints.CHECKPOINT_DIRECTORY_TYPE
+    ),
+    numCheckpoints = sp.big_map(l = { address: sp.nat(count) }, tkey = sp.TAddress, tvalue = sp.TNat),
+  )
+
+# A poll which is underway, or which has ended if `votingEndBlock` is 0.
+def makePoll(votingEndBlock, votes):
+  return sp.record(
+    id = sp.nat(0),
+    proposal = PROPOSAL,
+    votingStartBlock = sp.nat(0),
+    votingEndBlock = sp.nat(votingEndBlock),
+    yayVotes = sp.nat(votes),
+    nayVotes = sp.nat(0),
+    abstainVotes = sp.nat(0),
+    totalVotes = sp.nat(votes),
+    author = Addresses.ALICE_ADDRESS,
+    escrowAmount = sp.nat(100),
+    quorum = sp.nat(100),
+    authorIsVestingVault = False
+  )
+
+################################################################
+# Governance token
+################################################################
+
+# The FA2 token the DAO escrows proposals in and the escrow contract locks. `benchmark.sh` mints it to the
+# contracts and accounts which transfer it.
+sp.add_compilation_target(
+  "governance_token",
+  FA2.FA2(
+    config = FA2.FA2_config(single_asset = True),
+    metadata = sp.utils.metadata_of_url("https://example.com"),
+    admin = Addresses.TOKEN_ADMIN_ADDRESS,
+  )
+)
+
+################################################################
+# EscrowSDAO
+################################################################
+
+for count in CHECKPOINT_COUNTS:
+  sp.add_compilation_target(
+    "escrow_checkpoints_" + str(count),
+    Escrow.EscrowSDAO(**makeCheckpointStorage(Addresses.VOTER_ADDRESS, count))
+  )
+
+# The benchmarked address has escrowed tokens in the governance token.
+sp.add_compilation_target(
+  "escrow_governance",
+  Escrow.EscrowSDAO(
+    tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+    **makeCheckpointStorage(Addresses.VOTER_ADDRESS, 100)
+  )
+)
+
+sp.add_compilation_target(
+  "escrow_viewer",
+  Escrow.Viewer(escrowContractAddress = Addresses.ESCROW_CONTRACT_ADDRESS)
+)
+
+################################################################
+# DaoContract
+################################################################
+
+for count in VOTER_COUNTS:
+  poll = makePoll(1_000_000_000, 0)
+  voters = {
+    (sp.nat(0), address): sp.record(voteValue = VoteValue.YAY, level = sp.nat(0), votes = sp.nat(1))
+    for address in makeAddresses(count, "voter")
+  }
+
+  sp.add_compilation_target(
+    "dao_voters_" + str(count),
+    Dao.DaoContract(
+      escrowContractAddress = Addresses.ESCROW_CONTRACT_ADDRESS,
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(0) }, tkey = sp.TNat, tvalue = sp.TNat),
+      voters = sp.big_map(l = voters, tkey = VoteRecord.VOTE_RECORD_KEY_TYPE, tvalue = VoteRecord.VOTE_RECORD_TYPE),
+    )
+  )
+
+# A DAO with no polls underway, which escrows proposals in the governance token.
+sp.add_compilation_target("dao_propose", Dao.DaoContract())
+
+# A DAO with a poll which has ended and passed, which releases escrow in the governance token.
+sp.add_compilation_target(
+  "dao_end_voting",
+  Dao.DaoContract(
+    polls = sp.big_map(l = { sp.nat(0): makePoll(0, 100) }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+    activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(0) }, tkey = sp.TNat, tvalue = sp.TNat),
+  )
+)
+
+# A DAO with an item in the timelock which the benchmarked address may execute.
+sp.add_compilation_target(
+  "dao_timelock",
+  Dao.DaoContract(
+    timelockItems = sp.big_map(
+      l = {
+        sp.nat(0): sp.record(
+          id = sp.nat(0),
+          proposal = PROPOSAL,
+          endBlock = sp.nat(0),
+          cancelBlock = sp.nat(1_000_000_000),
+          author = Addresses.VOTER_ADDRESS
+        )
+      },
+      tkey = sp.TNat,
+      tvalue = Dao.TIMELOCK_ITEM_TYPE
+    ),
+    outcomes = sp.big_map(
+      l = {
+        sp.nat(0): sp.record(
+          outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
+          id = sp.nat(0),
+          proposalHash = sp.blake2b(sp.pack(sp.set_type_expr(PROPOSAL, Proposal.PROPOSAL_TYPE))),
+          author = Addresses.VOTER_ADDRESS,
+          votingStartBlock = sp.nat(0),
+          votingEndBlock = sp.nat(0),
+          yayVotes = sp.nat(100),
+          nayVotes = sp.nat(0),
+          abstainVotes = sp.nat(0),
+          totalVotes = sp.nat(100),
+          quorum = sp.nat(100)
+        )
+      },
+      tkey = sp.TNat,
+      tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE
+    ),
+  )
+)
+
+################################################################
+# FA12
+################################################################
+
+# A DAO with no polls underway, which does not hold back compaction.
+sp.add_compilation_target("dao_compaction", Dao.DaoContract())
+
+for count in CHECKPOINT_COUNTS:
+  sp.add_compilation_target(
+    "token_checkpoints_" + str(count),
+    Token.FA12(**makeCheckpointStorage(Addresses.VOTER_ADDRESS, count))
+  )
+
+  # Compaction never passes the current block, so all checkpoints are at block 0 for all but the last page
+  # to be compacted.
+  sp.add_compilation_target(
+    "token_compaction_" + str(count),
+    Token.FA12(**makeCheckpointStorage(Addresses.VOTER_ADDRESS, count, blockStep = 0))
+  )
+
+# The benchmarked address holds tokens, but checkpoints are disabled.
+sp.add_compilation_target(
+  "token_checkpoints_disabled",
+  Token.FA12(
+    balances = sp.big_map(
+      l = { Addresses.VOTER_ADDRESS: sp.nat(BALANCE) },
+      tkey = sp.TAddress,
+      tvalue = sp.TNat
+    ),
+    checkpointMode = Checkpoints.CHECKPOINT_MODE_DISABLED,
+  )
+)
+
+# Both the benchmarked address and Alice approve a number of spenders. The benchmarked
+# address may spend Alice's tokens.
+for count in APPROVAL_COUNTS:
+  owners = [Addresses.VOTER_ADDRESS, Addresses.ALICE_ADDRESS]
+  spenders = makeAddresses(count - 1, "spender")
+  sp.add_compilation_target(
+    "token_approvals_" + str(count),
+    Token.FA12(
+      balances = sp.big_map(
+        l = {
+          Addresses.VOTER_ADDRESS: sp.nat(BALANCE),
+          Addresses.ALICE_ADDRESS: sp.nat(BALANCE),
+        },
+        tkey = sp.TAddress,
+        tvalue = sp.TNat
+      ),
+      approvals = sp.big_map(
+        l = dict(
+          { (owner, spender): sp.nat(1) for owner in owners for spender in spenders },
+          **{ (Addresses.ALICE_ADDRESS, Addresses.VOTER_ADDRESS): sp.nat(BALANCE) }
+        ),
+        tkey = sp.TPair(sp.TAddress, sp.TAddress),
+        tvalue = sp.TNat
+      ),
+    )
+  )
+
+sp.add_compilation_target("token", Token.FA12())
+
+################################################################
+# VestingVault, CommunityFund and Faucet
+################################################################
+
+sp.add_compilation_target(
+  "vesting_vault",
+  VestingVault.VestingVault(
+    amountPerBlock = sp.nat(BALANCE),
+    startBlock = sp.nat(0),
+    owner = Addresses.VOTER_ADDRESS,
+    tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+  )
+)
+
+sp.add_compilation_target(
+  "community_fund",
+  CommunityFund.CommunityFund(governorAddress = Addresses.VOTER_ADDRESS)
+)
+
+sp.add_compilation_target(
+  "faucet",
+  Faucet.Faucet(tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS)
+)
@@ -0,0 +1,174 @@
+import smartpy as sp
+
+Errors = sp.io.import_script_from_url("file:common/errors.py")
+
+# Checkpoints record the balance of an address over time.
+#
+# Checkpoints are grouped into fixed size pages so that a historical lookup reads one
+# page directory and one page from big maps, regardless of how many checkpoints an
+# address has. Checkpoint `i` of an address is stored at offset `i % CHECKPOINTS_PER_PAGE`
+# of page `i / CHECKPOINTS_PER_PAGE`.
+#
+# The helpers below read and write checkpoints in the storage of a contract, which holds:
+# - checkpoints (big_map(CHECKPOINT_PAGE_KEY_TYPE, CHECKPOINT_PAGE_TYPE)): The pages of checkpoints of each address.
+# - checkpointDirectories (big_map(address, CHECKPOINT_DIRECTORY_TYPE)): The directory of pages of each address.
+# - numCheckpoints (big_map(address, nat)): The number of checkpoints of each address.
+
+# Modes for which addresses are checkpointed.
+# - CHECKPOINT_MODE_DISABLED: No addresses are checkpointed.
+# - CHECKPOINT_MODE_OPT_IN: Only addresses which opted in are checkpointed.
+# - CHECKPOINT_MODE_ALL: All addresses are checkpointed.
+CHECKPOINT_MODE_DISABLED = 0
+CHECKPOINT_MODE_OPT_IN = 1
+CHECKPOINT_MODE_ALL = 2
+
+# The default number of checkpoints in a page.
+CHECKPOINTS_PER_PAGE = 64
+
+# A checkpoint.
+# Params:
+# - fromBlock (nat): The block the balance was recorded in.
+# - balance (nat): The balance from that block onwards.
+CHECKPOINT_TYPE = sp.TRecord(
+  fromBlock = sp.TNat,
+  balance = sp.TNat
+).layout(("fromBlock", "balance"))
+
+# A page of checkpoints, keyed by offset in the page.
+CHECKPOINT_PAGE_TYPE = sp.TMap(sp.TNat, CHECKPOINT_TYPE)
+
+# The key a page of checkpoints is stored under.
+# Params:
+# - (address): The address which is checkpointed.
+# - (nat): The index of the page.
+CHECKPOINT_PAGE_KEY_TYPE = sp.TPair(sp.TAddress, sp.TNat)
+
+# A directory of the pages of an address, mapping the index of each page to the `fromBlock`
+# of the first checkpoint in the page.
+CHECKPOINT_DIRECTORY_TYPE = sp.TMap(sp.TNat, sp.TNat)
+
+# Write a checkpoint of the balance of an address at the current level.
+#
+# A checkpoint written in the same block as the last checkpoint overwrites it, and a checkpoint is only appended
+# if the balance changed.
+# Params:
+# - data: The storage of the contract.
+# - checkpointsPerPage (int): The number of checkpoints in a page.
+# - address (address): The address to checkpoint.
+# - numCheckpoints (nat): The number of checkpoints of the address.
+# - newBalance (nat): The balance of the address.
+def writeCheckpoint(data, checkpointsPerPage, address, numCheckpoints, newBalance):
+  newCheckpoint = sp.record(fromBlock = sp.level, balance = newBalance)
+
+  # If there are no checkpoints, write data.
+  sp.if numCheckpoints == 0:
+    appendCheckpoint(data, checkpointsPerPage, address, numCheckpoints, newCheckpoint)
+  sp.else:
+    lastIndex = sp.local('lastIndex', sp.as_nat(numCheckpoints - 1))
+    lastPageKey = sp.local('lastPageKey', (address, lastIndex.value / checkpointsPerPage))
+    lastCheckpoint = sp.local('lastCheckpoint', data.checkpoints[lastPageKey.value][lastIndex.value % checkpointsPerPage])
+
+    # Otherwise, if this update occurred in the same block, overwrite
+    sp.if lastCheckpoint.value.fromBlock == sp.level:
+      data.checkpoints[lastPageKey.value][lastIndex.value % checkpointsPerPage] = newCheckpoint
+    sp.else:
+      # Only write an additional checkpoint if the balance has changed.
+      sp.if lastCheckpoint.value.balance != newBalance:
+        appendCheckpoint(data, checkpointsPerPage, address, numCheckpoints, newCheckpoint)
+
+# Append a checkpoint to the last page of an address, starting a new page if it is full.
+# Params:
+# - data: The storage of the contract.
+# - checkpointsPerPage (int): The number of checkpoints in a page.
+# - address (address): The address to checkpoint.
+# - index (nat): The index of the new checkpoint.
+# - checkpoint (CHECKPOINT_TYPE): The checkpoint.
+def appendCheckpoint(data, checkpointsPerPage, address, index, checkpoint):
+  page = index / checkpointsPerPage
+  offset = index % checkpointsPerPage
+  sp.if offset == 0:
+    data.checkpoints[(address, page)] = sp.map(l = { 0: checkpoint }, tkey = sp.TNat, tvalue = CHECKPOINT_TYPE)
+    sp.if page == 0:
+      data.checkpointDirectories[address] = sp.map(l = { 0: checkpoint.fromBlock }, tkey = sp.TNat, tvalue = sp.TNat)
+    sp.else:
+      data.checkpointDirectories[address][page] = checkpoint.fromBlock
+  sp.else:
+    data.checkpoints[(address, page)][offset] = checkpoint
+  data.numCheckpoints[address] = index + 1
+
+# Read a checkpoint from its page.
+# Params:
+# - data: The storage of the contract.
+# - checkpointsPerPage (int): The number of checkpoints in a page.
+# - address (address): The checkpointed address.
+# - index (nat): The index of the checkpoint.
+def getCheckpoint(data, checkpointsPerPage, address, index):
+  return data.checkpoints[(address, index / checkpointsPerPage)][index % checkpointsPerPage]
+
+# Find the balance of an address at a past level from its checkpoints.
+#
+# Each big map entry is read at most once: the latest checkpoint is checked first, then the directory is binary
+# searched for the page which holds the level, then that page is binary searched for the checkpoint.
+# Params:
+# - data: The storage of the contract.
+# - checkpointsPerPage (int): The number of checkpoints in a page.
+# - address (address): The checkpointed address.
+# - level (nat): The level, which must be in the past.
+# - firstPage (nat): The oldest page of the address which was not compacted, or None if the contract does not
+#   compact checkpoints.
+def findPriorBalance(data, checkpointsPerPage, address, level, firstPage = None):
+  sp.verify(level < sp.level, Errors.ERROR_BLOCK_LEVEL_TOO_SOON)
+
+  # The balance at the requested level. If there are no checkpoints, this is 0.
+  priorBalance = sp.local('priorBalance', sp.nat(0))
+
+  numCheckpoints = sp.local('numCheckpoints', data.numCheckpoints.get(address, 0))
+  sp.if numCheckpoints.value != 0:
+    # First check most recent balance.
+    latest = sp.local('latest', getCheckpoint(data, checkpointsPerPage, address, sp.as_nat(numCheckpoints.value - 1)))
+    sp.if latest.value.fromBlock <= level:
+      priorBalance.value = latest.value.balance
+    sp.else:
+      # Next, check for an implicit zero balance before the first checkpoint. The oldest page begins with the
+      # oldest checkpoint which was not compacted. If pages were compacted, balances before it are no longer known,
+      # so the request fails rather than reporting 0.
+      directory = sp.local('directory', data.checkpointDirectories[address])
+      oldestPage = sp.local('oldestPage', sp.nat(0))
+      if firstPage is not None:
+        oldestPage.value = firstPage
+        sp.verify((oldestPage.value == 0) | (directory.value[oldestPage.value] <= level), Errors.ERROR_CHECKPOINTS_COMPACTED)
+      sp.if directory.value[oldestPage.value] <= level:
+        # Otherwise binary search the directory for the last page which begins at or before the requested level.
+        lower = sp.local('lower', oldestPage.value)
+        upper = sp.local('upper', sp.as_nat(numCheckpoints.value - 1) / checkpointsPerPage)
+        center = sp.local('center', sp.nat(0))
+
+        sp.while upper.value > lower.value:
+          # A complicated way to get the ceiling.
+          center.value = sp.as_nat(upper.value - (sp.as_nat(upper.value - lower.value) / 2))
+
+          sp.if directory.value[center.value] <= level:
+            lower.value = center.value
+          sp.else:
+            upper.value = sp.as_nat(center.value - 1)
+
+        # Then binary search that page for the last checkpoint at or before the requested level.
+        page = sp.local('page', data.checkpoints[(address, lower.value)])
+        lower.value = 0
+        upper.value = sp.as_nat(sp.len(page.value) - 1)
+
+        sp.while upper.value > lower.value:
+          # A complicated way to get the ceiling.
+          center.value = sp.as_nat(upper.value - (sp.as_nat(upper.value - lower.value) / 2))
+
+          sp.if page.value[center.value].fromBlock <= level:
+            # Stop early if center is the exact block we are looking for.
+            sp.if page.value[center.value].fromBlock == level:
+              upper.value = center.value
+            lower.value = center.value
+          sp.else:
+            upper.value = sp.as_nat(center.value - 1)
+
+        priorBalance.value = page.value[lower.value].balance
+
+  return priorBalance.value
@@ -0,0 +1,36 @@
+import smartpy as sp
+
+# A payment of tokens from the community fund.
+# Params:
+# - tokenContractAddress (address): The contract of the token to pay.
+# - tokenId (option(nat)): The id of the token for FA2 tokens, or None for FA1.2 tokens.
+# - destination (address): The address to pay.
+# - amount (nat): The amount of tokens to pay.
+DISBURSEMENT_TYPE = sp.TRecord(
+  tokenContractAddress = sp.TAddress,
+  tokenId = sp.TOption(sp.TNat),
+  destination = sp.TAddress,
+  amount = sp.TNat,
+).layout(("tokenContractAddress", ("tokenId", ("destination", "amount"))))
+
+# A transfer in the `txs` list of an FA2 `transfer` call.
+# Params:
+# - to_ (address): The address to transfer to.
+# - token_id (nat): The id of the token.
+# - amount (nat): The amount of tokens to transfer.
+FA2_TX_TYPE = sp.TRecord(
+  amount = sp.TNat,
+  to_ = sp.TAddress, 
+  token_id = sp.TNat,
+).layout(("to_", ("token_id", "amount")))
+
+# A transfer in an FA1.2 `transferBatch` call.
+# Params:
+# - from_ (address): The address to transfer from.
+# - to_ (address): The address to transfer to.
+# - value (nat): The amount of tokens to transfer.
+FA12_TX_TYPE = sp.TRecord(
+  from_ = sp.TAddress,
+  to_ = sp.TAddress,
+  value = sp.TNat,
+).layout(("from_ as from", ("to_ as to", "value")))
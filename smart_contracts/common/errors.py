@@ -6,15 +6,12 @@ import smartpy as sp
 ################################################################
 ################################################################
 
-# There is already a poll underway.
-ERROR_POLL_UNDERWAY = "POLL_UNDERWAY"
+# The maximum number of polls are already underway.
+ERROR_TOO_MANY_POLLS = "TOO_MANY_POLLS"
 
 # There is not a poll available.
 ERROR_NO_POLL = "NO_POLL"
 
-# There is already a item in the timelock.
-ERROR_ITEM_IN_TIMELOCK = "ITEM_IN_TIMELOCK"
-
 # There is no item in the timelock.
 ERROR_NO_ITEM_IN_TIMELOCK = "NO_ITEM_IN_TIMELOCK"
 
@@ -27,6 +24,18 @@ ERROR_VOTING_NOT_FINISHED = "VOTING_NOT_FINISHED"
 # The address has already voted.
 ERROR_ALREADY_VOTED = "ALREADY_VOTED"
 
+# The signature did not match the signed data.
+ERROR_BAD_SIGNATURE = "BAD_SIGNATURE"
+
+# The nonce was not the next unused nonce.
+ERROR_BAD_NONCE = "BAD_NONCE"
+
+# A permit for the same parameters has been submitted and has not expired.
+ERROR_DUPLICATE_PERMIT = "DUP_PERMIT"
+
+# The permit has expired.
+ERROR_PERMIT_EXPIRED = "PERMIT_EXPIRED"
+
 # The given vote value was invalid.
 ERROR_BAD_VOTE_VALUE = "BAD_VOTE_VALUE"
 
@@ -36,17 +45,26 @@ ERROR_NOT_AUTHOR = "NOT_AUTHOR"
 # The timelock can not be executed at this time.
 ERROR_TOO_SOON = "TOO_SOON"
 
+# The revealed proposal lambda did not match the proposal's lambda hash.
+ERROR_BAD_LAMBDA = "BAD_LAMBDA"
+
 # This method may only be called by the dao.
 ERROR_NOT_DAO = "NOT_DAO"
 
-# The contract was not in the expected state.
-ERROR_BAD_STATE = "BAD_STATE"
+# The escrow contract did not provide the expected view.
+ERROR_BAD_ESCROW_VIEW = "BAD_ESCROW_VIEW"
 
-# An unknown error occurred.
-ERROR_UNKNOWN = "UNKNOWN"
+# The vesting vault did not provide the expected view.
+ERROR_BAD_VAULT_VIEW = "BAD_VAULT_VIEW"
 
-# The sender was not the token contract.
-ERROR_NOT_TOKEN_CONTRACT = "NOT_TOKEN_CONTRACT"
+# The sender was not a vesting vault known to the DAO.
+ERROR_NOT_VESTING_VAULT = "NOT_VESTING_VAULT"
+
+# The DAO contract did not provide the expected view.
+ERROR_BAD_DAO_VIEW = "BAD_DAO_VIEW"
+
+# The token contract did not provide the expected view.
+ERROR_BAD_TOKEN_VIEW = "BAD_TOKEN_VIEW"
 
 # The operation requested too many tokens from the faucet
 ERROR_TOO_MANY_TOKENS = "TOO_MANY_TOKENS"
@@ -54,6 +72,15 @@ ERROR_TOO_MANY_TOKENS = "TOO_MANY_TOKENS"
 # The requested block level hasn't occured.
 ERROR_BLOCK_LEVEL_TOO_SOON = "BLOCK_LEVEL_TOO_SOON"
 
+# The requested block level is before the oldest checkpoint which was not compacted.
+ERROR_CHECKPOINTS_COMPACTED = "CHECKPOINTS_COMPACTED"
+
+# The balance of the address was not checkpointed at the requested block level.
+ERROR_NOT_CHECKPOINTED = "NOT_CHECKPOINTED"
+
+# The checkpoint mode was not a known mode, or was higher than the current mode.
+ERROR_BAD_CHECKPOINT_MODE = "BAD_CHECKPOINT_MODE"
+
 # The transaction tried to spend more tokens than were available
 ERROR_LOW_BALANCE = "LOW_BALANCE"
 
@@ -78,5 +105,41 @@ ERROR_NOT_ADMINISTRATOR = "NOT_ADMINISTRATOR"
 # The sender must be the owner
 ERROR_NOT_OWNER = "NOT_OWNER"
 
+# The stream does not exist
+ERROR_NO_STREAM = "NO_STREAM"
+
+# The sender must be the recipient
+ERROR_NOT_RECIPIENT = "NOT_RECIPIENT"
+
+# The stream would never pay out any tokens
+ERROR_BAD_STREAM = "BAD_STREAM"
+
+# No tokens have accrued in the stream since the last withdrawal
+ERROR_NOTHING_ACCRUED = "NOTHING_ACCRUED"
+
+# The address already has a vesting schedule
+ERROR_ALREADY_BENEFICIARY = "ALREADY_BENEFICIARY"
+
+# The vesting schedule was malformed
+ERROR_BAD_SCHEDULE = "BAD_SCHEDULE"
+
+# The vesting schedule has escrow for a poll which has not ended
+ERROR_ESCROW_OUTSTANDING = "ESCROW_OUTSTANDING"
+
+# There is no outstanding escrow for the poll
+ERROR_NO_ESCROW = "NO_ESCROW"
+
 # The requested operation could not be completed because not enough value is vested
-ERROR_NOT_VESTED = "NOT_VESTED"
\ No newline at end of file
+ERROR_NOT_VESTED = "NOT_VESTED"
+
+# The entry in the distribution has already been claimed
+ERROR_ALREADY_CLAIMED = "ALREADY_CLAIMED"
+
+# The Merkle proof did not match the root of the distribution
+ERROR_BAD_PROOF = "BAD_PROOF"
+
+# The address has received the maximum number of tokens from the faucet in this epoch
+ERROR_EPOCH_LIMIT_REACHED = "EPOCH_LIMIT_REACHED"
+
+# The faucet has dripped the maximum number of tokens in this block
+ERROR_BLOCK_BUDGET_EXCEEDED = "BLOCK_BUDGET_EXCEEDED"
@@ -1,12 +1,31 @@
 import smartpy as sp
 
-Poll = sp.io.import_script_from_url("file:common/poll.py")
-
 # A historical result of a vote.
+#
+# This is a compact summary of a finished poll. The proposal is recorded by its hash
+# and the votes of individual addresses are kept in the DAO's `voters` big_map.
 # Params:
 # - outcome (nat): The outcome of the poll
-# - poll (Poll.POLL_TYPE): The poll and the results.
+# - id (nat): The identifier of the poll.
+# - proposalHash (bytes): The blake2b hash of the packed proposal.
+# - author (address): The author of the proposal.
+# - votingStartBlock (nat): The first block of voting.
+# - votingEndBlock (nat): The last block of voting.
+# - yayVotes (nat): The number of yay votes.
+# - nayVotes (nat): The number of nay votes.
+# - abstainVotes (nat): The number of abstain votes.
+# - totalVotes (nat): The total number of votes.
+# - quorum (nat): The quorum the poll needed to achieve.
 HISTORICAL_OUTCOME_TYPE = sp.TRecord(
   outcome = sp.TNat,
-  poll = Poll.POLL_TYPE
-).layout(("outcome", "poll"))
\ No newline at end of file
+  id = sp.TNat,
+  proposalHash = sp.TBytes,
+  author = sp.TAddress,
+  votingStartBlock = sp.TNat,
+  votingEndBlock = sp.TNat,
+  yayVotes = sp.TNat,
+  nayVotes = sp.TNat,
+  abstainVotes = sp.TNat,
+  totalVotes = sp.TNat,
+  quorum = sp.TNat
+).layout(("outcome", ("id", ("proposalHash", ("author", ("votingStartBlock", ("votingEndBlock", ("yayVotes", ("nayVotes", ("abstainVotes", ("totalVotes", "quorum")))))))))))
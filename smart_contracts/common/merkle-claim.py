@@ -0,0 +1,34 @@
+import smartpy as sp
+
+# Claims against a Merkle distributor.
+#
+# A distribution is a list of (index, account, amount) entries. Each entry is packed and hashed into a leaf, and
+# the leaves are hashed pairwise into a tree whose root is stored in the distributor. The position of a node at
+# each level of the tree is given by the bits of the entry's index, so a proof is only the list of sibling hashes.
+
+# The number of claims tracked in each word of the claimed bitmap.
+BITMAP_WORD_SIZE = 256
+
+# An entry in a distribution, which is packed and hashed to form a leaf of the tree.
+# Params:
+# - index (nat): The index of the entry in the distribution.
+# - account (address): The address which receives the tokens.
+# - amount (nat): The amount of tokens to pay.
+LEAF_TYPE = sp.TRecord(
+  index = sp.TNat,
+  account = sp.TAddress,
+  amount = sp.TNat,
+).layout(("index", ("account", "amount")))
+
+# A claim of an entry in a distribution.
+# Params:
+# - index (nat): The index of the entry in the distribution.
+# - account (address): The address which receives the tokens.
+# - amount (nat): The amount of tokens to pay.
+# - proof (list(bytes)): The sibling hashes on the path from the leaf to the root, leaf first.
+CLAIM_TYPE = sp.TRecord(
+  index = sp.TNat,
+  account = sp.TAddress,
+  amount = sp.TNat,
+  proof = sp.TList(sp.TBytes),
+).layout(("index", ("account", ("amount", "proof"))))
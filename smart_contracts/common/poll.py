@@ -1,8 +1,6 @@
 import smartpy as sp
 
 Proposal = sp.io.import_script_from_url("file:common/proposal.py")
-QuorumCap = sp.io.import_script_from_url("file:common/quorum-cap.py")
-VoteRecord = sp.io.import_script_from_url("file:common/vote-record.py")
 
 # A poll for a proposal.
 # Params:
@@ -14,11 +12,10 @@ VoteRecord = sp.io.import_script_from_url("file:common/vote-record.py")
 # - nayVotes (nat): The number of nay votes.
 # - abstainVotes (nat): The number of abstain votes.
 # - totalVotes (nat): The total number of votes.
-# - voters (set<nat>): The addresses which have voted.
 # - author (address): The author of the proposal.
 # - escrowAmount (nat): The amount of tokens escrowed for the proposal.
 # - quorum (nat): The quorum the poll needs to achieve. 
-# - quorumCap (nat): The quorum caps of the proposal.
+# - authorIsVestingVault (bool): Whether the author was a vesting vault known to the DAO when the poll was proposed.
 POLL_TYPE = sp.TRecord(
   id = sp.TNat,
   proposal = Proposal.PROPOSAL_TYPE,
@@ -28,9 +25,8 @@ POLL_TYPE = sp.TRecord(
   nayVotes = sp.TNat,
   abstainVotes = sp.TNat,
   totalVotes = sp.TNat,
-  voters = sp.TMap(sp.TAddress, VoteRecord.VOTE_RECORD_TYPE),
   author = sp.TAddress,
   escrowAmount = sp.TNat,
   quorum = sp.TNat,
-  quorumCap = QuorumCap.QUORUM_CAP_TYPE
-).layout(("id", ("proposal", ("votingStartBlock", ("votingEndBlock", ("yayVotes", ("nayVotes", ("abstainVotes", ("totalVotes", ("voters", ("author", ("escrowAmount", ("quorum", "quorumCap")))))))))))))
+  authorIsVestingVault = sp.TBool
+).layout(("id", ("proposal", ("votingStartBlock", ("votingEndBlock", ("yayVotes", ("nayVotes", ("abstainVotes", ("totalVotes", ("author", ("escrowAmount", ("quorum", "authorIsVestingVault"))))))))))))
@@ -10,10 +10,18 @@ PROPOSAL_LAMBDA_TYPE = sp.TLambda(sp.TUnit, sp.TList(sp.TOperation))
 # - title (string): The title of the proposal
 # - descriptionLink (string): A link to the proposals description.
 # - descriptionHash (string): A digest of the content at subscription link.
-# - proposal (PROPOSAL_LAMBDA_TYPE): The code to execute.
+# - proposalLambdaHash (bytes): A blake2b digest of the packed code to execute.
 PROPOSAL_TYPE = sp.TRecord(
   title = sp.TString,
   descriptionLink = sp.TString,
   descriptionHash = sp.TString,
-  proposalLambda = PROPOSAL_LAMBDA_TYPE
-).layout(("title", ("descriptionLink", ("descriptionHash", "proposalLambda"))))
+  proposalLambdaHash = sp.TBytes
+).layout(("title", ("descriptionLink", ("descriptionHash", "proposalLambdaHash"))))
+
+# Hash the code to execute for a proposal. 
+#
+# The code is revealed and checked against this hash when the proposal is executed.
+# Params:
+# - proposalLambda (PROPOSAL_LAMBDA_TYPE): The code to execute.
+def hashLambda(proposalLambda):
+  return sp.blake2b(sp.pack(sp.set_type_expr(proposalLambda, PROPOSAL_LAMBDA_TYPE)))
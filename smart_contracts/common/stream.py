@@ -0,0 +1,42 @@
+import smartpy as sp
+
+# A stream of tokens from the community fund to a recipient.
+#
+# A stream accrues a fixed amount of tokens per block from its start block, up to a cap. The recipient may
+# withdraw the accrued amount at any time.
+
+# A stream.
+# Params:
+# - recipient (address): The address which receives the tokens.
+# - tokenContractAddress (address): The contract of the token which is streamed.
+# - tokenId (option(nat)): The id of the token for FA2 tokens, or None for FA1.2 tokens.
+# - amountPerBlock (nat): The amount of tokens which accrue per block.
+# - startBlock (nat): The block the stream starts accruing on.
+# - cap (nat): The total amount of tokens the stream pays out.
+# - amountWithdrawn (nat): The amount of tokens paid out so far.
+STREAM_TYPE = sp.TRecord(
+  recipient = sp.TAddress,
+  tokenContractAddress = sp.TAddress,
+  tokenId = sp.TOption(sp.TNat),
+  amountPerBlock = sp.TNat,
+  startBlock = sp.TNat,
+  cap = sp.TNat,
+  amountWithdrawn = sp.TNat,
+).layout(("recipient", ("tokenContractAddress", ("tokenId", ("amountPerBlock", ("startBlock", ("cap", "amountWithdrawn")))))))
+
+# The parameters to create a stream.
+# Params:
+# - recipient (address): The address which receives the tokens.
+# - tokenContractAddress (address): The contract of the token which is streamed.
+# - tokenId (option(nat)): The id of the token for FA2 tokens, or None for FA1.2 tokens.
+# - amountPerBlock (nat): The amount of tokens which accrue per block.
+# - startBlock (nat): The block the stream starts accruing on.
+# - cap (nat): The total amount of tokens the stream pays out.
+STREAM_PARAMS_TYPE = sp.TRecord(
+  recipient = sp.TAddress,
+  tokenContractAddress = sp.TAddress,
+  tokenId = sp.TOption(sp.TNat),
+  amountPerBlock = sp.TNat,
+  startBlock = sp.TNat,
+  cap = sp.TNat,
+).layout(("recipient", ("tokenContractAddress", ("tokenId", ("amountPerBlock", ("startBlock", "cap"))))))
@@ -0,0 +1,77 @@
+import smartpy as sp
+
+# Vesting schedules are made of a small number of linear segments. Each segment vests a fixed amount per
+# block from its start block until the next segment starts.
+#
+# The amount vested at the start of each segment is computed once, when the schedule is added, so the vested
+# amount at any block is read from a single segment rather than summed over the history of the schedule.
+
+# The maximum number of segments in a schedule.
+MAX_SEGMENTS = 8
+
+# A segment of a vesting schedule, as provided when the schedule is added.
+# Params:
+# - startBlock (nat): The block the segment starts on.
+# - amountPerBlock (nat): The amount of tokens which vest per block during the segment.
+SEGMENT_TYPE = sp.TRecord(
+  startBlock = sp.TNat,
+  amountPerBlock = sp.TNat,
+).layout(("startBlock", "amountPerBlock"))
+
+# A segment of a vesting schedule, as stored.
+# Params:
+# - startBlock (nat): The block the segment starts on.
+# - amountPerBlock (nat): The amount of tokens which vest per block during the segment.
+# - vestedAtStart (nat): The amount of tokens vested by all previous segments.
+VESTING_SEGMENT_TYPE = sp.TRecord(
+  startBlock = sp.TNat,
+  amountPerBlock = sp.TNat,
+  vestedAtStart = sp.TNat,
+).layout(("startBlock", ("amountPerBlock", "vestedAtStart")))
+
+# The vesting schedule of a beneficiary of a vesting vault.
+# Params:
+# - totalAmount (nat): The total amount of tokens allocated to the beneficiary.
+# - cliffBlock (nat): The block before which no tokens are vested.
+# - endBlock (nat): The block from which all tokens are vested.
+# - segments (list(VESTING_SEGMENT_TYPE)): The segments of the schedule, latest first.
+# - amountWithdrawn (nat): The cumulative amount of tokens withdrawn by the beneficiary, or escrowed and not returned.
+# - escrowOutstanding (nat): The amount of tokens escrowed for proposals whose polls have not ended.
+SCHEDULE_TYPE = sp.TRecord(
+  totalAmount = sp.TNat,
+  cliffBlock = sp.TNat,
+  endBlock = sp.TNat,
+  segments = sp.TList(VESTING_SEGMENT_TYPE),
+  amountWithdrawn = sp.TNat,
+  escrowOutstanding = sp.TNat,
+).layout(("totalAmount", ("cliffBlock", ("endBlock", ("segments", ("amountWithdrawn", "escrowOutstanding"))))))
+
+# Escrow taken from a vesting vault for a proposal.
+# Params:
+# - owner (address): The owner who proposed.
+# - amount (nat): The amount of tokens escrowed.
+ESCROW_TYPE = sp.TRecord(
+  owner = sp.TAddress,
+  amount = sp.TNat,
+).layout(("owner", "amount"))
+
+# The key escrow is stored under.
+# Params:
+# - (address): The DAO the proposal was made to.
+# - (nat): The id of the poll.
+ESCROW_KEY_TYPE = sp.TPair(sp.TAddress, sp.TNat)
+
+# A beneficiary to add to a vesting vault.
+# Params:
+# - owner (address): The address which owns the schedule.
+# - totalAmount (nat): The total amount of tokens allocated to the beneficiary.
+# - cliffBlock (nat): The block before which no tokens are vested.
+# - endBlock (nat): The block from which all tokens are vested.
+# - segments (list(SEGMENT_TYPE)): The segments of the schedule, in order of increasing start block.
+BENEFICIARY_TYPE = sp.TRecord(
+  owner = sp.TAddress,
+  totalAmount = sp.TNat,
+  cliffBlock = sp.TNat,
+  endBlock = sp.TNat,
+  segments = sp.TList(SEGMENT_TYPE),
+).layout(("owner", ("totalAmount", ("cliffBlock", ("endBlock", "segments")))))
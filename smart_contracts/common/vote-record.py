@@ -9,4 +9,10 @@ VOTE_RECORD_TYPE = sp.TRecord(
   voteValue = sp.TNat,
   level = sp.TNat,
   votes = sp.TNat,
-).layout(("voteValue", ("level", "votes")))
\ No newline at end of file
+).layout(("voteValue", ("level", "votes")))
+
+# The key a vote record is stored under.
+# Params:
+# - (nat): The identifier of the poll that was voted on.
+# - (address): The address which voted.
+VOTE_RECORD_KEY_TYPE = sp.TPair(sp.TNat, sp.TAddress)
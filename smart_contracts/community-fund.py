@@ -7,9 +7,14 @@ import smartpy as sp
 ################################################################
 
 Addresses = sp.io.import_script_from_url("file:./test-helpers/addresses.py")
+Disbursement = sp.io.import_script_from_url("file:common/disbursement.py")
 Errors = sp.io.import_script_from_url("file:common/errors.py")
+Stream = sp.io.import_script_from_url("file:common/stream.py")
 
 # A community fund for KOL tokens managed by the DAO.
+#
+# Besides one-off transfers, the governor may create streams which pay a recipient a fixed amount of tokens
+# per block, so recurring spending needs a single governance decision.
 class CommunityFund(sp.Contract):
     def __init__(
       self, 
@@ -33,6 +38,10 @@ class CommunityFund(sp.Contract):
           
           # The governor address
           governorAddress = governorAddress,
+          # Streams which are paying out, keyed by stream id.
+          streams = sp.big_map(l = {}, tkey = sp.TNat, tvalue = Stream.STREAM_TYPE),
+          # The id of the next stream.
+          nextStreamId = sp.nat(0),
           # Contract metadata.
           metadata = metadata,
         )
@@ -91,17 +100,7 @@ class CommunityFund(sp.Contract):
       sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
 
       # Transfer the tokens
-      handle = sp.contract(
-        sp.TRecord(
-          from_ = sp.TAddress,
-          to_ = sp.TAddress, 
-          value = sp.TNat
-        ).layout(("from_ as from", ("to_ as to", "value"))),
-        params.tokenContractAddress,
-        "transfer"
-      ).open_some()
-      arg = sp.record(from_ = sp.self_address, to_ = params.destination, value = params.amount)
-      sp.transfer(arg, sp.mutez(0), handle)
+      self.transferFA12(params.tokenContractAddress, params.amount, params.destination)
 
     # Rescue FA2 tokens
     @sp.entry_point
@@ -117,46 +116,236 @@ class CommunityFund(sp.Contract):
       sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
 
       # Transfer the tokens
+      self.transferFA2(
+        params.tokenContractAddress,
+        [
+          sp.record(
+            amount = params.amount,
+            to_ = params.destination,
+            token_id = params.tokenId
+          )
+        ]
+      )
+
+    # Pay tokens to many destinations.
+    # Payments of FA2 tokens are grouped into a single `transfer` call per token contract. Payments of
+    # FA1.2 tokens are grouped into a single `transferBatch` call per token contract if the contract has a
+    # `transferBatch` entrypoint, and are otherwise paid with one `transfer` call per payment.
+    # Params:
+    # - (list(Disbursement.DISBURSEMENT_TYPE)): The payments to make.
+    @sp.entry_point
+    def disburse(self, disbursements):
+      sp.set_type(disbursements, sp.TList(Disbursement.DISBURSEMENT_TYPE))
+
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # The FA1.2 and FA2 transfers to make, keyed by token contract.
+      fa12Transfers = sp.local('fa12Transfers', sp.map(l = {}, tkey = sp.TAddress, tvalue = sp.TList(Disbursement.FA12_TX_TYPE)))
+      fa2Transfers = sp.local('fa2Transfers', sp.map(l = {}, tkey = sp.TAddress, tvalue = sp.TList(Disbursement.FA2_TX_TYPE)))
+
+      sp.for disbursement in disbursements:
+        sp.if disbursement.tokenId.is_some():
+          fa2Tx = sp.record(
+            amount = disbursement.amount,
+            to_ = disbursement.destination,
+            token_id = disbursement.tokenId.open_some()
+          )
+          sp.if fa2Transfers.value.contains(disbursement.tokenContractAddress):
+            fa2Transfers.value[disbursement.tokenContractAddress].push(fa2Tx)
+          sp.else:
+            fa2Transfers.value[disbursement.tokenContractAddress] = sp.list(l = [fa2Tx], t = Disbursement.FA2_TX_TYPE)
+        sp.else:
+          fa12Tx = sp.record(
+            from_ = sp.self_address,
+            to_ = disbursement.destination,
+            value = disbursement.amount
+          )
+          sp.if fa12Transfers.value.contains(disbursement.tokenContractAddress):
+            fa12Transfers.value[disbursement.tokenContractAddress].push(fa12Tx)
+          sp.else:
+            fa12Transfers.value[disbursement.tokenContractAddress] = sp.list(l = [fa12Tx], t = Disbursement.FA12_TX_TYPE)
+
+      # Batch FA1.2 transfers where the token supports it. Standard FA1.2 tokens only have `transfer`.
+      sp.for fa12Transfer in fa12Transfers.value.items():
+        batchHandle = sp.local('batchHandle', sp.contract(sp.TList(Disbursement.FA12_TX_TYPE), fa12Transfer.key, "transferBatch"))
+        sp.if batchHandle.value.is_some():
+          sp.transfer(fa12Transfer.value, sp.mutez(0), batchHandle.value.open_some())
+        sp.else:
+          sp.for tx in fa12Transfer.value:
+            self.transferFA12(fa12Transfer.key, tx.value, tx.to_)
+
+      sp.for fa2Transfer in fa2Transfers.value.items():
+        self.transferFA2(fa2Transfer.key, fa2Transfer.value)
+
+    @sp.entry_point
+    def setDelegate(self, newDelegate):
+      sp.set_type(newDelegate, sp.TOption(sp.TKeyHash))
+
+      # Verify the caller is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      sp.set_delegate(newDelegate)
+
+    ################################################################
+    # Streams
+    ################################################################
+
+    # Create a stream.
+    # Params:
+    # - (Stream.STREAM_PARAMS_TYPE): The stream to create.
+    @sp.entry_point
+    def createStream(self, params):
+      sp.set_type(params, Stream.STREAM_PARAMS_TYPE)
+
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # Verify the stream pays out tokens.
+      sp.verify(params.cap > 0, Errors.ERROR_BAD_STREAM)
+      sp.verify(params.amountPerBlock > 0, Errors.ERROR_BAD_STREAM)
+
+      self.data.streams[self.data.nextStreamId] = sp.record(
+        recipient = params.recipient,
+        tokenContractAddress = params.tokenContractAddress,
+        tokenId = params.tokenId,
+        amountPerBlock = params.amountPerBlock,
+        startBlock = params.startBlock,
+        cap = params.cap,
+        amountWithdrawn = sp.nat(0),
+      )
+      self.data.nextStreamId += 1
+
+    # Withdraw the tokens which have accrued in a stream to its recipient.
+    # Params:
+    # - streamId (nat): The id of the stream.
+    @sp.entry_point
+    def withdrawFromStream(self, streamId):
+      sp.set_type(streamId, sp.TNat)
+
+      # Verify the stream exists and the requester is the recipient.
+      sp.verify(self.data.streams.contains(streamId), Errors.ERROR_NO_STREAM)
+      stream = sp.local('stream', self.data.streams[streamId])
+      sp.verify(sp.sender == stream.value.recipient, Errors.ERROR_NOT_RECIPIENT)
+
+      # Verify some tokens have accrued.
+      accrued = sp.local('accrued', self.accruedAmount(stream.value))
+      sp.verify(accrued.value > 0, Errors.ERROR_NOTHING_ACCRUED)
+
+      self.payStream(streamId, stream.value, accrued.value)
+
+    # Cancel a stream, paying out the tokens which have accrued to its recipient.
+    # Params:
+    # - streamId (nat): The id of the stream.
+    @sp.entry_point
+    def cancelStream(self, streamId):
+      sp.set_type(streamId, sp.TNat)
+
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # Verify the stream exists.
+      sp.verify(self.data.streams.contains(streamId), Errors.ERROR_NO_STREAM)
+      stream = sp.local('stream', self.data.streams[streamId])
+
+      # Pay out the accrued tokens, if any.
+      accrued = sp.local('accrued', self.accruedAmount(stream.value))
+      sp.if accrued.value > 0:
+        self.transferTokens(stream.value.tokenContractAddress, stream.value.tokenId, accrued.value, stream.value.recipient)
+
+      del self.data.streams[streamId]
+
+    # Returns the amount of tokens which have accrued in a stream and have not been withdrawn.
+    # Params:
+    # - stream (Stream.STREAM_TYPE): The stream.
+    def accruedAmount(self, stream):
+      streamed = sp.local('streamed', sp.nat(0))
+      sp.if sp.level > stream.startBlock:
+        streamed.value = sp.as_nat(sp.level - stream.startBlock) * stream.amountPerBlock
+
+      # Cap the streamed amount at the total of the stream.
+      sp.if streamed.value > stream.cap:
+        streamed.value = stream.cap
+
+      return sp.as_nat(streamed.value - stream.amountWithdrawn)
+
+    # Pay out tokens from a stream, removing the stream once it has paid out its cap.
+    # Params:
+    # - streamId (nat): The id of the stream.
+    # - stream (Stream.STREAM_TYPE): The stream.
+    # - amount (nat): The amount of tokens to pay.
+    def payStream(self, streamId, stream, amount):
+      amountWithdrawn = stream.amountWithdrawn + amount
+      sp.if amountWithdrawn == stream.cap:
+        del self.data.streams[streamId]
+      sp.else:
+        self.data.streams[streamId].amountWithdrawn = amountWithdrawn
+
+      self.transferTokens(stream.tokenContractAddress, stream.tokenId, amount, stream.recipient)
+
+    # Transfer FA1.2 or FA2 tokens from the fund.
+    # Params:
+    # - tokenContractAddress (address): The contract of the token.
+    # - tokenId (option(nat)): The id of the token for FA2 tokens, or None for FA1.2 tokens.
+    # - amount (nat): The amount of tokens.
+    # - destination (address): The address to send the tokens to.
+    def transferTokens(self, tokenContractAddress, tokenId, amount, destination):
+      sp.if tokenId.is_some():
+        self.transferFA2(
+          tokenContractAddress,
+          [
+            sp.record(
+              amount = amount,
+              to_ = destination,
+              token_id = tokenId.open_some()
+            )
+          ]
+        )
+      sp.else:
+        self.transferFA12(tokenContractAddress, amount, destination)
+
+    # Transfer FA1.2 tokens from the fund.
+    # Params:
+    # - tokenContractAddress (address): The contract of the token.
+    # - amount (nat): The amount of tokens.
+    # - destination (address): The address to send the tokens to.
+    def transferFA12(self, tokenContractAddress, amount, destination):
+      handle = sp.contract(
+        sp.TRecord(
+          from_ = sp.TAddress,
+          to_ = sp.TAddress, 
+          value = sp.TNat
+        ).layout(("from_ as from", ("to_ as to", "value"))),
+        tokenContractAddress,
+        "transfer"
+      ).open_some()
+      arg = sp.record(from_ = sp.self_address, to_ = destination, value = amount)
+      sp.transfer(arg, sp.mutez(0), handle)
+
+    # Transfer FA2 tokens from the fund in a single call.
+    # Params:
+    # - tokenContractAddress (address): The contract of the token.
+    # - txs (list(Disbursement.FA2_TX_TYPE)): The transfers to make.
+    def transferFA2(self, tokenContractAddress, txs):
       handle = sp.contract(
         sp.TList(
           sp.TRecord(
             from_ = sp.TAddress,
-            txs = sp.TList(
-              sp.TRecord(
-                amount = sp.TNat,
-                to_ = sp.TAddress, 
-                token_id = sp.TNat,
-              ).layout(("to_", ("token_id", "amount")))
-            )
+            txs = sp.TList(Disbursement.FA2_TX_TYPE)
           ).layout(("from_", "txs"))
         ),
-        params.tokenContractAddress,
+        tokenContractAddress,
         "transfer"
       ).open_some()
 
       arg = [
         sp.record(
           from_ = sp.self_address,
-          txs = [
-            sp.record(
-              amount = params.amount,
-              to_ = params.destination,
-              token_id = params.tokenId
-            )
-          ]
+          txs = txs
         )
       ]
       sp.transfer(arg, sp.mutez(0), handle)
 
-    @sp.entry_point
-    def setDelegate(self, newDelegate):
-      sp.set_type(newDelegate, sp.TOption(sp.TKeyHash))
-
-      # Verify the caller is the governor.
-      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
-
-      sp.set_delegate(newDelegate)
-
 ################################################################
 ################################################################
 # Tests
@@ -169,7 +358,7 @@ if __name__ == "__main__":
   Dummy = sp.io.import_script_from_url("file:./test-helpers/dummy.py")
   FA12 = sp.io.import_script_from_url("file:./test-helpers/fa12.py")
   FA2 = sp.io.import_script_from_url("file:./test-helpers/fa2.py")
-  # Token = sp.import_script_from_url("file:./token.py")
+  Token = sp.io.import_script_from_url("file:./token.py")
 
   ################################################################
   # Set Delegate
@@ -553,6 +742,623 @@ if __name__ == "__main__":
   #     valid = False
   #   )
 
+  ################################################################
+  # disburse
+  ################################################################
+
+  @sp.add_test(name="disburse - pays FA1.2 and FA2 tokens to many destinations")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN an FA1.2 token contract which supports batched transfers
+    fa12Token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += fa12Token
+
+    # AND an FA2 token contract
+    config = FA2.FA2_config()
+    fa2Token = FA2.FA2(
+      config = config,
+      metadata = sp.utils.metadata_of_url("https://example.com"),      
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += fa2Token
+
+    # AND a community fund contract
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    # AND the fund holds FA1.2 tokens and two FA2 tokens.
+    scenario += fa12Token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    for tokenId in [0, 1]:
+      scenario += fa2Token.mint(    
+        address = fund.address,
+        amount = sp.nat(100),
+        metadata = FA2.FA2.make_metadata(
+          name = "SomeToken",
+          decimals = 18,
+          symbol= "ST"
+        ),
+        token_id = tokenId
+      ).run(
+        sender = Addresses.TOKEN_ADMIN_ADDRESS
+      )
+
+    # WHEN the governor disburses tokens to several destinations
+    scenario += fund.disburse([
+      sp.record(tokenContractAddress = fa12Token.address, tokenId = sp.none, destination = Addresses.ALICE_ADDRESS, amount = sp.nat(10)),
+      sp.record(tokenContractAddress = fa12Token.address, tokenId = sp.none, destination = Addresses.BOB_ADDRESS, amount = sp.nat(20)),
+      sp.record(tokenContractAddress = fa2Token.address, tokenId = sp.some(sp.nat(0)), destination = Addresses.ALICE_ADDRESS, amount = sp.nat(30)),
+      sp.record(tokenContractAddress = fa2Token.address, tokenId = sp.some(sp.nat(1)), destination = Addresses.BOB_ADDRESS, amount = sp.nat(40)),
+      sp.record(tokenContractAddress = fa2Token.address, tokenId = sp.some(sp.nat(0)), destination = Addresses.BOB_ADDRESS, amount = sp.nat(50)),
+      sp.record(tokenContractAddress = fa12Token.address, tokenId = sp.none, destination = Addresses.ALICE_ADDRESS, amount = sp.nat(5)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+    )
+
+    # THEN the FA1.2 tokens are paid.
+    scenario.verify(fa12Token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(15))
+    scenario.verify(fa12Token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(20))
+    scenario.verify(fa12Token.data.balances[fund.address] == sp.nat(65))
+
+    # AND the FA2 tokens are paid.
+    scenario.verify(fa2Token.data.ledger[(Addresses.ALICE_ADDRESS, 0)].balance == sp.nat(30))
+    scenario.verify(fa2Token.data.ledger[(Addresses.BOB_ADDRESS, 0)].balance == sp.nat(50))
+    scenario.verify(fa2Token.data.ledger[(Addresses.BOB_ADDRESS, 1)].balance == sp.nat(40))
+    scenario.verify(fa2Token.data.ledger[(fund.address, 0)].balance == sp.nat(20))
+    scenario.verify(fa2Token.data.ledger[(fund.address, 1)].balance == sp.nat(60))
+
+  @sp.add_test(name="disburse - pays FA1.2 tokens which do not support batched transfers")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN an FA1.2 token contract without a transferBatch entrypoint
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN the governor disburses tokens to several destinations
+    scenario += fund.disburse([
+      sp.record(tokenContractAddress = token.address, tokenId = sp.none, destination = Addresses.ALICE_ADDRESS, amount = sp.nat(10)),
+      sp.record(tokenContractAddress = token.address, tokenId = sp.none, destination = Addresses.BOB_ADDRESS, amount = sp.nat(20)),
+      sp.record(tokenContractAddress = token.address, tokenId = sp.none, destination = Addresses.ALICE_ADDRESS, amount = sp.nat(5)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+    )
+
+    # THEN each payment is made with a transfer.
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS].balance == sp.nat(15))
+    scenario.verify(token.data.balances[Addresses.BOB_ADDRESS].balance == sp.nat(20))
+    scenario.verify(token.data.balances[fund.address].balance == sp.nat(65))
+
+  @sp.add_test(name="disburse - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN disburse is called by someone other than the governor
+    # THEN the call fails.
+    notGovernor = Addresses.NULL_ADDRESS
+    scenario += fund.disburse([
+      sp.record(tokenContractAddress = token.address, tokenId = sp.none, destination = Addresses.ALICE_ADDRESS, amount = sp.nat(10)),
+    ]).run(
+      sender = notGovernor,
+      valid = False
+    )
+
+  ################################################################
+  # Streams
+  ################################################################
+
+  @sp.add_test(name="createStream - creates a stream")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a community fund contract
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    # WHEN the governor creates two streams
+    stream = sp.record(
+      recipient = Addresses.ALICE_ADDRESS,
+      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+      tokenId = sp.none,
+      amountPerBlock = sp.nat(2),
+      startBlock = sp.nat(10),
+      cap = sp.nat(20),
+    )
+    scenario += fund.createStream(stream).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund.createStream(stream).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+    )
+
+    # THEN the streams are stored under consecutive ids.
+    scenario.verify(fund.data.nextStreamId == sp.nat(2))
+    scenario.verify(fund.data.streams[sp.nat(0)].recipient == Addresses.ALICE_ADDRESS)
+    scenario.verify(fund.data.streams[sp.nat(0)].amountPerBlock == sp.nat(2))
+    scenario.verify(fund.data.streams[sp.nat(0)].cap == sp.nat(20))
+    scenario.verify(fund.data.streams[sp.nat(0)].amountWithdrawn == sp.nat(0))
+    scenario.verify(fund.data.streams.contains(sp.nat(1)))
+
+  @sp.add_test(name="createStream - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a community fund contract
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    # WHEN createStream is called by someone other than the governor
+    # THEN the call fails.
+    notGovernor = Addresses.NULL_ADDRESS
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = notGovernor,
+      valid = False
+    )
+
+  @sp.add_test(name="createStream - fails if the stream pays out no tokens")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a community fund contract
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    # WHEN createStream is called with a cap of zero
+    # THEN the call fails.
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(0),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
+    )
+
+    # WHEN createStream is called with an amount per block of zero
+    # THEN the call fails.
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(0),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="withdrawFromStream - withdraws accrued FA1.2 tokens up to the cap")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a stream which pays 2 tokens per block from block 10, up to 20 tokens
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = token.address,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(0)
+    )
+
+    # WHEN the recipient withdraws before the stream starts
+    # THEN the call fails.
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(10),
+      valid = False
+    )
+
+    # WHEN the recipient withdraws after 3 blocks
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(13)
+    )
+
+    # THEN the accrued tokens are paid out.
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS].balance == sp.nat(6))
+    scenario.verify(fund.data.streams[sp.nat(0)].amountWithdrawn == sp.nat(6))
+
+    # WHEN the recipient withdraws long after the stream reached its cap
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(100)
+    )
+
+    # THEN the stream pays out no more than its cap
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS].balance == sp.nat(20))
+    scenario.verify(token.data.balances[fund.address].balance == sp.nat(80))
+
+    # AND the finished stream is removed.
+    scenario.verify(~fund.data.streams.contains(sp.nat(0)))
+
+  @sp.add_test(name="withdrawFromStream - withdraws accrued FA2 tokens")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    config = FA2.FA2_config()
+    token = FA2.FA2(
+      config = config,
+      metadata = sp.utils.metadata_of_url("https://example.com"),      
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS
+    )
+    scenario += fund
+
+    tokenId = 0
+    scenario += token.mint(    
+      address = fund.address,
+      amount = sp.nat(100),
+      metadata = FA2.FA2.make_metadata(
+        name = "SomeToken",
+        decimals = 18,
+        symbol= "ST"
+      ),
+      token_id = tokenId
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a stream which pays 2 tokens per block from block 10, up to 20 tokens
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = token.address,
+        tokenId = sp.some(sp.nat(tokenId)),
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(0)
+    )
+
+    # WHEN the recipient withdraws after 3 blocks
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(13)
+    )
+
+    # THEN the accrued tokens are paid out.
+    scenario.verify(token.data.ledger[(Addresses.ALICE_ADDRESS, tokenId)].balance == sp.nat(6))
+    scenario.verify(token.data.ledger[(fund.address, tokenId)].balance == sp.nat(94))
+
+  @sp.add_test(name="withdrawFromStream - fails if not called by recipient")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a stream which pays 2 tokens per block from block 10, up to 20 tokens
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = token.address,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(0)
+    )
+
+    # WHEN someone other than the recipient withdraws
+    # THEN the call fails.
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.BOB_ADDRESS,
+      level = sp.nat(13),
+      valid = False
+    )
+
+  @sp.add_test(name="withdrawFromStream - fails if the stream does not exist")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a community fund contract without streams
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    # WHEN withdrawFromStream is called
+    # THEN the call fails.
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(13),
+      valid = False
+    )
+
+  @sp.add_test(name="withdrawFromStream - fails if no tokens have accrued")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a stream which pays 2 tokens per block from block 10, up to 20 tokens
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = token.address,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(0)
+    )
+
+    # WHEN the recipient withdraws before the stream starts
+    # THEN the call fails.
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(5),
+      valid = False
+    )
+
+    # WHEN the recipient withdraws twice in the same block
+    # THEN the second call fails.
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(13),
+    )
+    scenario += fund.withdrawFromStream(sp.nat(0)).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(13),
+      valid = False
+    )
+
+    # AND the recipient only received the first withdrawal.
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS].balance == sp.nat(6))
+
+  @sp.add_test(name="cancelStream - pays accrued tokens and removes the stream")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a stream which pays 2 tokens per block from block 10, up to 20 tokens
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = token.address,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(0)
+    )
+
+    # WHEN the governor cancels the stream after 3 blocks
+    scenario += fund.cancelStream(sp.nat(0)).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(13)
+    )
+
+    # THEN the accrued tokens are paid out
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS].balance == sp.nat(6))
+
+    # AND the stream is removed.
+    scenario.verify(~fund.data.streams.contains(sp.nat(0)))
+
+  @sp.add_test(name="cancelStream - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    # AND a community fund contract which holds tokens
+    fund = CommunityFund(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += fund
+
+    scenario += token.mint(
+      sp.record(
+        address = fund.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a stream which pays 2 tokens per block from block 10, up to 20 tokens
+    scenario += fund.createStream(
+      sp.record(
+        recipient = Addresses.ALICE_ADDRESS,
+        tokenContractAddress = token.address,
+        tokenId = sp.none,
+        amountPerBlock = sp.nat(2),
+        startBlock = sp.nat(10),
+        cap = sp.nat(20),
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(0)
+    )
+
+    # WHEN someone other than the governor cancels the stream
+    # THEN the call fails.
+    notGovernor = Addresses.NULL_ADDRESS
+    scenario += fund.cancelStream(sp.nat(0)).run(
+      sender = notGovernor,
+      level = sp.nat(13),
+      valid = False
+    )
+
   ################################################################
   # setGovernorContract
   ################################################################
@@ -23,15 +23,6 @@ VoteValue = sp.io.import_script_from_url("file:common/vote-value.py")
 # as 123.
 SCALE = 100 
 
-################################################################
-################################################################
-# State Machine
-################################################################
-################################################################
-
-STATE_MACHINE_IDLE = 0
-STATE_MACHINE_WAITING_FOR_BALANCE = 1
-
 ################################################################
 ################################################################
 # Types
@@ -53,6 +44,36 @@ TIMELOCK_ITEM_TYPE = sp.TRecord(
   author = sp.TAddress
 ).layout(("id", ("proposal", ("endBlock", ("cancelBlock", "author")))))
 
+# A vote signed off chain by the voter.
+# Params:
+# - publicKey (key): The public key of the voter. The vote is cast from the address of this key.
+# - pollId (nat): The id of the poll to vote on.
+# - voteValue (nat): The value of the vote.
+# - nonce (nat): The next unused nonce of the voter.
+# - signature (signature): The voter's signature of the packed SIGNED_VOTE_PAYLOAD_TYPE.
+SIGNED_VOTE_TYPE = sp.TRecord(
+  publicKey = sp.TKey,
+  pollId = sp.TNat,
+  voteValue = sp.TNat,
+  nonce = sp.TNat,
+  signature = sp.TSignature
+).layout(("publicKey", ("pollId", ("voteValue", ("nonce", "signature")))))
+
+# The data a voter signs to authorize a vote.
+# Params:
+# - chainId (chain_id): The chain the vote is valid on.
+# - daoAddress (address): The DAO the vote is valid for.
+# - pollId (nat): The id of the poll to vote on.
+# - voteValue (nat): The value of the vote.
+# - nonce (nat): The next unused nonce of the voter.
+SIGNED_VOTE_PAYLOAD_TYPE = sp.TRecord(
+  chainId = sp.TChainId,
+  daoAddress = sp.TAddress,
+  pollId = sp.TNat,
+  voteValue = sp.TNat,
+  nonce = sp.TNat
+).layout(("chainId", ("daoAddress", ("pollId", ("voteValue", "nonce")))))
+
 # Governance parameters.
 # Params:
 # - escrowAmount (nat): The number of tokens to escrow when a proposal is submitted.
@@ -63,6 +84,7 @@ TIMELOCK_ITEM_TYPE = sp.TRecord(
 # - blocksInTimelockForCancellation (nat): The number of blocks a proposal can be in a timelock before it becomes cancellable.
 # - percentageForSuperMajority (nat): The percentage of votes needed for a super majority. Represented with scale = 2. Ex. 80 = .80 = 80%.
 # - quorumCaps (Record<nat, nat>): The upper and lower bounds for quorum.
+# - maxActivePolls (nat): The maximum number of polls which may be under vote at once.
 GOVERNANCE_PARAMETERS_TYPE = sp.TRecord(
   escrowAmount = sp.TNat,
   voteDelayBlocks = sp.TNat,
@@ -71,7 +93,8 @@ GOVERNANCE_PARAMETERS_TYPE = sp.TRecord(
   blocksInTimelockForExecution = sp.TNat,
   blocksInTimelockForCancellation = sp.TNat,
   percentageForSuperMajority = sp.TNat,
-  quorumCap = QuorumCap.QUORUM_CAP_TYPE
+  quorumCap = QuorumCap.QUORUM_CAP_TYPE,
+  maxActivePolls = sp.TNat
 ).layout(
   (
     "escrowAmount", 
@@ -87,7 +110,10 @@ GOVERNANCE_PARAMETERS_TYPE = sp.TRecord(
               "blocksInTimelockForCancellation",
               (
                 "percentageForSuperMajority",
-                "quorumCap"
+                (
+                  "quorumCap",
+                  "maxActivePolls"
+                )
               )
             )
           )
@@ -97,17 +123,6 @@ GOVERNANCE_PARAMETERS_TYPE = sp.TRecord(
   )
 )
 
-# A voting state.
-# Params:
-# - voteValue (nat): The value of the vote.
-# - address (address): The address casting the vote.
-# - level (nat): The block level data was requested at.
-VOTING_STATE = sp.TRecord(
-  voteValue = sp.TNat,
-  address = sp.TAddress,
-  level = sp.TNat
-).layout(("voteValue", ("address", "level")))
-
 ################################################################
 # Contract
 ################################################################
@@ -128,16 +143,19 @@ class DaoContract(sp.Contract):
       # with scale = 2, ex. 80 = .80 = 80%
       percentageForSuperMajority = sp.nat(80),
       quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(2)),
+      maxActivePolls = sp.nat(5),
     ),
-    poll = sp.none,
-    timelockItem = sp.none,
+    polls = sp.big_map(l = {}, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+    activePollStartBlocks = sp.map(l = {}, tkey = sp.TNat, tvalue = sp.TNat),
+    timelockItems = sp.big_map(l = {}, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE),
     tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
     escrowContractAddress = Addresses.ESCROW_CONTRACT_ADDRESS,
     quorum = sp.nat(100),
     communityFundAddress = Addresses.COMMUNITY_FUND_ADDRESS,
-    state = STATE_MACHINE_IDLE,
-    votingState = sp.none,
     outcomes = sp.big_map(l = {}, tkey = sp.TNat, tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE),
+    voters = sp.big_map(l = {}, tkey = VoteRecord.VOTE_RECORD_KEY_TYPE, tvalue = VoteRecord.VOTE_RECORD_TYPE),
+    voteNonces = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+    vestingVaults = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TUnit),
   ):
     metadata_data = sp.utils.bytes_of_string('{ "name": "SalsaDAO Governance", "authors": ["Genius Contracts"], "homepage":  "https://salsadao.xyz" }')
 
@@ -157,13 +175,15 @@ class DaoContract(sp.Contract):
         communityFundAddress = sp.TAddress,
         governanceParameters = GOVERNANCE_PARAMETERS_TYPE,
         quorum = sp.TNat,
-        poll = sp.TOption(Poll.POLL_TYPE),
-        timelockItem = sp.TOption(TIMELOCK_ITEM_TYPE),
+        polls = sp.TBigMap(sp.TNat, Poll.POLL_TYPE),
+        activePollStartBlocks = sp.TMap(sp.TNat, sp.TNat),
+        timelockItems = sp.TBigMap(sp.TNat, TIMELOCK_ITEM_TYPE),
         nextProposalId = sp.TNat,
-        state = sp.TNat,
-        votingState = sp.TOption(VOTING_STATE),
         metadata = sp.TBigMap(sp.TString, sp.TBytes),
-        outcomes = sp.TBigMap(sp.TNat, HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE)
+        outcomes = sp.TBigMap(sp.TNat, HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE),
+        voters = sp.TBigMap(VoteRecord.VOTE_RECORD_KEY_TYPE, VoteRecord.VOTE_RECORD_TYPE),
+        voteNonces = sp.TBigMap(sp.TAddress, sp.TNat),
+        vestingVaults = sp.TBigMap(sp.TAddress, sp.TUnit),
       )
     )
 
@@ -180,18 +200,27 @@ class DaoContract(sp.Contract):
       governanceParameters = governanceParameters,
       # The quorum.
       quorum = quorum,
-      # The poll which is underway.
-      poll = poll,
-      # The item in the timelock.
-      timelockItem = timelockItem,
+      # The polls which are underway, keyed by poll id.
+      polls = polls,
+      # The first block of voting of each poll which is underway, keyed by poll id. Its size is the number of polls underway.
+      activePollStartBlocks = activePollStartBlocks,
+      # The items in the timelock, keyed by poll id.
+      timelockItems = timelockItems,
 
       # Internal state
       nextProposalId = sp.nat(0),
       outcomes = outcomes,
 
-      # State machine
-      state = state,
-      votingState = votingState,
+      # Records of how each address voted, keyed by (poll id, address).
+      # Kept outside of the poll so a vote does not need to read or write
+      # the records of every previous voter.
+      voters = voters,
+
+      # The next unused nonce for votes signed by each address.
+      voteNonces = voteNonces,
+
+      # Vesting vaults which may vote on behalf of their owners.
+      vestingVaults = vestingVaults,
 
       # Contract metadata.
       metadata = metadata,
@@ -207,8 +236,8 @@ class DaoContract(sp.Contract):
   def propose(self, proposal):
     sp.set_type(proposal, Proposal.PROPOSAL_TYPE)
     
-    # Verify a poll is not under vote.
-    sp.verify(~self.data.poll.is_some(), Errors.ERROR_POLL_UNDERWAY)
+    # Verify there is room for another poll.
+    sp.verify(sp.len(self.data.activePollStartBlocks) < self.data.governanceParameters.maxActivePolls, Errors.ERROR_TOO_MANY_POLLS)
 
     # Escrow tokens.
     # tokenContractHandle = sp.contract(
@@ -258,39 +287,36 @@ class DaoContract(sp.Contract):
     # Create a new contract under vote.
     startBlock = sp.level + self.data.governanceParameters.voteDelayBlocks
     endBlock = startBlock + self.data.governanceParameters.voteLengthBlocks
-    self.data.poll = sp.some(
-      sp.record(
-        id = self.data.nextProposalId,
-        proposal = proposal,
-        votingStartBlock = startBlock,
-        votingEndBlock = endBlock,
-        yayVotes = sp.nat(0),
-        nayVotes = sp.nat(0),
-        abstainVotes = sp.nat(0),
-        totalVotes = sp.nat(0),
-        voters = sp.map(l = {}, tkey = sp.TAddress, tvalue = VoteRecord.VOTE_RECORD_TYPE),
-        author = sp.sender,
-        escrowAmount = self.data.governanceParameters.escrowAmount,
-        quorum = self.data.quorum,
-        quorumCap = self.data.governanceParameters.quorumCap
-      )
+    self.data.polls[self.data.nextProposalId] = sp.record(
+      id = self.data.nextProposalId,
+      proposal = proposal,
+      votingStartBlock = startBlock,
+      votingEndBlock = endBlock,
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = sp.sender,
+      escrowAmount = self.data.governanceParameters.escrowAmount,
+      quorum = self.data.quorum,
+      authorIsVestingVault = self.data.vestingVaults.contains(sp.sender)
     )
 
+    self.data.activePollStartBlocks[self.data.nextProposalId] = startBlock
     self.data.nextProposalId = self.data.nextProposalId + 1
 
   # End voting for a poll.
+  # Params:
+  # - pollId (nat): The id of the poll to end.
   @sp.entry_point
-  def endVoting(self, unit):
-    sp.set_type(unit, sp.TUnit)
+  def endVoting(self, pollId):
+    sp.set_type(pollId, sp.TNat)
 
-    # Verify a poll is underway.
-    sp.verify(self.data.poll.is_some(), Errors.ERROR_NO_POLL)
-
-    # Verify the timelock is empty.
-    sp.verify(~self.data.timelockItem.is_some(), Errors.ERROR_ITEM_IN_TIMELOCK)
+    # Verify the poll is underway.
+    sp.verify(self.data.polls.contains(pollId), Errors.ERROR_NO_POLL)
 
     # Verify voting has ended.
-    poll = sp.local('poll', self.data.poll.open_some())
+    poll = sp.local('poll', self.data.polls[pollId])
     sp.verify(sp.level > poll.value.votingEndBlock, Errors.ERROR_VOTING_NOT_FINISHED)
 
     # Calculate whether voting thresholds were met.
@@ -340,7 +366,7 @@ class DaoContract(sp.Contract):
         from_ = sp.self_address,
         txs = [
           sp.record(
-            amount = self.data.governanceParameters.escrowAmount,
+            amount = poll.value.escrowAmount,
             to_ = escrowRecipient.value,
             token_id = sp.nat(0) # STATIC: set to sDAO token_id
           )
@@ -349,43 +375,61 @@ class DaoContract(sp.Contract):
     ]
     sp.transfer(arg, sp.mutez(0), handle)
 
-    # Transfer proposal to timelock and update outcome if it passed
+    # If a vesting vault proposed the poll, tell it whether the escrow was returned so it can account for the
+    # escrow of the owner who proposed. The vault is told even if it was removed while the poll was underway,
+    # so its escrow is never left outstanding.
+    sp.if poll.value.authorIsVestingVault:
+      resolveEscrowHandle = sp.contract(
+        sp.TRecord(pollId = sp.TNat, returned = sp.TBool).layout(("pollId", "returned")),
+        poll.value.author,
+        "resolveEscrow"
+      ).open_some()
+      resolveEscrowArg = sp.record(pollId = poll.value.id, returned = escrowRecipient.value == poll.value.author)
+      sp.transfer(resolveEscrowArg, sp.mutez(0), resolveEscrowHandle)
+
+    # Transfer proposal to timelock if it passed. Otherwise the poll failed.
+    outcome = sp.local('outcome', PollOutcomes.POLL_OUTCOME_FAILED)
     sp.if (poll.value.yayVotes >= yayVotesNeededForSuperMajority) & (poll.value.totalVotes >= self.data.quorum): 
-      self.data.timelockItem = sp.some(
-        sp.record(
-          id = poll.value.id,
-          proposal = poll.value.proposal,
-          endBlock = sp.level + self.data.governanceParameters.blocksInTimelockForExecution,
-          cancelBlock = sp.level + self.data.governanceParameters.blocksInTimelockForCancellation,
-          author = poll.value.author
-        )
-      )
-
-      self.data.outcomes[poll.value.id] = sp.record(
-        outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
-        poll = poll.value
-      )
-    # Otherwise update the outcomes to show a failure.  
-    sp.else:
-      self.data.outcomes[poll.value.id] = sp.record(
-        outcome = PollOutcomes.POLL_OUTCOME_FAILED,
-        poll = poll.value
+      self.data.timelockItems[poll.value.id] = sp.record(
+        id = poll.value.id,
+        proposal = poll.value.proposal,
+        endBlock = sp.level + self.data.governanceParameters.blocksInTimelockForExecution,
+        cancelBlock = sp.level + self.data.governanceParameters.blocksInTimelockForCancellation,
+        author = poll.value.author
       )
+      outcome.value = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK
+
+    # Record a summary of the poll in the historical outcomes.
+    self.data.outcomes[poll.value.id] = sp.record(
+      outcome = outcome.value,
+      id = poll.value.id,
+      proposalHash = sp.blake2b(sp.pack(poll.value.proposal)),
+      author = poll.value.author,
+      votingStartBlock = poll.value.votingStartBlock,
+      votingEndBlock = poll.value.votingEndBlock,
+      yayVotes = poll.value.yayVotes,
+      nayVotes = poll.value.nayVotes,
+      abstainVotes = poll.value.abstainVotes,
+      totalVotes = poll.value.totalVotes,
+      quorum = poll.value.quorum
+    )
 
     # Remove poll.
-    self.data.poll = sp.none
+    del self.data.polls[pollId]
+    del self.data.activePollStartBlocks[pollId]
 
-    # Calculate a new quorum
-    lastWeight = (poll.value.quorum * 80) // SCALE # 80% weight
+    # Calculate a new quorum from the current quorum, so that the updates of polls which end in between are kept.
+    lastWeight = (self.data.quorum * 80) // SCALE # 80% weight
     newParticipation = (poll.value.totalVotes * 20) // SCALE # 20% weight
     newQuorum = sp.local('newQuorum', newParticipation + lastWeight)
 
-    # Bound upper and lower quorum.
-    sp.if newQuorum.value < poll.value.quorumCap.lower:
-      newQuorum.value = poll.value.quorumCap.lower
+    # Bound upper and lower quorum by the current caps, which may have changed since the poll was proposed.
+    quorumCap = self.data.governanceParameters.quorumCap
+    sp.if newQuorum.value < quorumCap.lower:
+      newQuorum.value = quorumCap.lower
 
-    sp.if newQuorum.value > poll.value.quorumCap.upper:
-      newQuorum.value = poll.value.quorumCap.upper
+    sp.if newQuorum.value > quorumCap.upper:
+      newQuorum.value = quorumCap.upper
 
     # Update quorum.
     self.data.quorum = newQuorum.value
@@ -394,159 +438,185 @@ class DaoContract(sp.Contract):
   # Voting
   ################################################################
 
+  # Vote on a poll.
+  # Params:
+  # - pollId (nat): The id of the poll to vote on.
+  # - voteValue (nat): The value of the vote.
   @sp.entry_point
-  def vote(self, voteValue):
-    sp.set_type(voteValue, sp.TNat)
+  def vote(self, params):
+    sp.set_type(params, sp.TRecord(pollId = sp.TNat, voteValue = sp.TNat).layout(("pollId", "voteValue")))
+
+    self.castVote(params.pollId, sp.sender, params.voteValue)
 
-    # Verify contract is in the correct state.
-    sp.verify(self.data.state == STATE_MACHINE_IDLE, Errors.ERROR_BAD_STATE)
+  # Tally a batch of votes which were signed off chain by the voters.
+  # Params:
+  # - (list(SIGNED_VOTE_TYPE)): The signed votes to tally.
+  @sp.entry_point
+  def voteBySig(self, signedVotes):
+    sp.set_type(signedVotes, sp.TList(SIGNED_VOTE_TYPE))
 
-    # Verify a poll is underway.
-    sp.verify(self.data.poll.is_some(), Errors.ERROR_NO_POLL)
+    sp.for signedVote in signedVotes:
+      voter = sp.local('voter', sp.to_address(sp.implicit_account(sp.hash_key(signedVote.publicKey))))
 
-    # Save state.
-    self.data.state = STATE_MACHINE_WAITING_FOR_BALANCE
-    self.data.votingState = sp.some(
-      sp.record(
-        voteValue = voteValue,
-        address = sp.sender,
-        level = self.data.poll.open_some().votingStartBlock
-      )
-    )
+      # Verify the nonce is the next one for the voter.
+      nonce = sp.local('nonce', self.data.voteNonces.get(voter.value, sp.nat(0)))
+      sp.verify(signedVote.nonce == nonce.value, Errors.ERROR_BAD_NONCE)
 
-    # Call token contract.
-    tokenContractHandle = sp.contract(
-      sp.TPair(
-        sp.TRecord(
-          address = sp.TAddress,
-          level = sp.TNat,
+      # Verify the voter signed the vote.
+      payload = sp.set_type_expr(
+        sp.record(
+          chainId = sp.chain_id,
+          daoAddress = sp.self_address,
+          pollId = signedVote.pollId,
+          voteValue = signedVote.voteValue,
+          nonce = signedVote.nonce
         ),
-        sp.TContract(
-          sp.TRecord(
-            address = sp.TAddress,
-            level = sp.TNat,
-            result = sp.TNat
-          )
-        )
-      ),
-      self.data.escrowContractAddress,
-      "getPriorBalance"
-    ).open_some()
-    tokenContractArg = (
-      sp.record(
-        address = sp.sender,
-        level = self.data.poll.open_some().votingStartBlock,
-      ),
-      sp.self_entry_point(entry_point = "voteCallback")
-    )
-    sp.transfer(tokenContractArg, sp.mutez(0), tokenContractHandle)
-  
+        SIGNED_VOTE_PAYLOAD_TYPE
+      )
+      sp.verify(sp.check_signature(signedVote.publicKey, signedVote.signature, sp.pack(payload)), Errors.ERROR_BAD_SIGNATURE)
+
+      # Consume the nonce and tally the vote.
+      self.data.voteNonces[voter.value] = nonce.value + 1
+      self.castVote(signedVote.pollId, voter.value, signedVote.voteValue)
+
+  # Vote on a poll on behalf of an owner of a vesting vault.
+  # The vote counts the owner's escrowed voting power and their voting power in the vault.
+  # Params:
+  # - owner (address): The owner of a vesting schedule in the vault.
+  # - pollId (nat): The id of the poll to vote on.
+  # - voteValue (nat): The value of the vote.
   @sp.entry_point
-  def voteCallback(self, returnedData):
-    sp.set_type(returnedData, sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat))
+  def voteFromVault(self, params):
+    sp.set_type(params, sp.TRecord(owner = sp.TAddress, pollId = sp.TNat, voteValue = sp.TNat).layout(("owner", ("pollId", "voteValue"))))
+
+    # Verify the sender is a vesting vault.
+    sp.verify(self.data.vestingVaults.contains(sp.sender), Errors.ERROR_NOT_VESTING_VAULT)
 
-    # Verify contract is in the correct state.
-    sp.verify(self.data.state == STATE_MACHINE_WAITING_FOR_BALANCE, Errors.ERROR_BAD_STATE)
+    self.castVote(params.pollId, params.owner, params.voteValue, vestingVaultAddress = sp.sender)
 
-    # Verify sender is the token contract.
-    sp.verify(sp.sender == self.data.escrowContractAddress, Errors.ERROR_NOT_TOKEN_CONTRACT)
+  # Tally a vote from the given address in the given poll.
+  # If a vesting vault address is given, the voter's voting power in the vault is counted as well.
+  def castVote(self, pollId, voter, voteValue, vestingVaultAddress = None):
+    # Verify the poll is underway.
+    sp.verify(self.data.polls.contains(pollId), Errors.ERROR_NO_POLL)
 
-    # Verify returned data is the requested data.
-    savedState = self.data.votingState.open_some()
-    sp.verify(savedState.address == returnedData.address, Errors.ERROR_UNKNOWN)
-    sp.verify(savedState.level == returnedData.level, Errors.ERROR_UNKNOWN)
+    # Retrieve old poll for mutation. 
+    newPoll = sp.local('newPoll', self.data.polls[pollId])
 
     # Verify that the address has not already voted.
-    sp.verify(~self.data.poll.open_some().voters.contains(savedState.address), Errors.ERROR_ALREADY_VOTED)
+    voterKey = sp.local('voterKey', (newPoll.value.id, voter))
+    sp.verify(~self.data.voters.contains(voterKey.value), Errors.ERROR_ALREADY_VOTED)
     
     # Verify voting has not ended.
-    poll = sp.local('poll', self.data.poll.open_some())
-    sp.verify(sp.level <= self.data.poll.open_some().votingEndBlock, Errors.ERROR_VOTING_FINISHED)
+    sp.verify(sp.level <= newPoll.value.votingEndBlock, Errors.ERROR_VOTING_FINISHED)
+
+    # Read the voter's balance at the start of the poll from the escrow contract.
+    votes = sp.local(
+      'votes',
+      sp.view(
+        "getPriorBalance",
+        self.data.escrowContractAddress,
+        sp.record(
+          address = voter,
+          level = newPoll.value.votingStartBlock,
+        ),
+        t = sp.TNat
+      ).open_some(Errors.ERROR_BAD_ESCROW_VIEW)
+    )
 
-    # Retrieve old poll for mutation. 
-    newPoll = sp.local('newPoll', self.data.poll.open_some())
+    # Add the voter's voting power in the vesting vault at the start of the poll.
+    if vestingVaultAddress is not None:
+      votes.value += sp.view(
+        "getPriorBalance",
+        vestingVaultAddress,
+        sp.record(
+          address = voter,
+          level = newPoll.value.votingStartBlock,
+        ),
+        t = sp.TNat
+      ).open_some(Errors.ERROR_BAD_VAULT_VIEW)
 
-    # Add to voters and increment total.
-    newPoll.value.voters[savedState.address] = sp.record(
-      voteValue = savedState.voteValue,
+    # Record the vote and increment total.
+    self.data.voters[voterKey.value] = sp.record(
+      voteValue = voteValue,
       level = sp.level,
-      votes = returnedData.result
+      votes = votes.value
     )
-    newPoll.value.totalVotes += returnedData.result
+    newPoll.value.totalVotes += votes.value
 
     # Increment the given vote value. Fail if none matched.
-    sp.if savedState.voteValue == VoteValue.YAY:
-      newPoll.value.yayVotes += returnedData.result
+    sp.if voteValue == VoteValue.YAY:
+      newPoll.value.yayVotes += votes.value
     sp.else:
-      sp.if savedState.voteValue == VoteValue.NAY:
-        newPoll.value.nayVotes += returnedData.result
+      sp.if voteValue == VoteValue.NAY:
+        newPoll.value.nayVotes += votes.value
       sp.else:
-        sp.if savedState.voteValue == VoteValue.ABSTAIN:
-          newPoll.value.abstainVotes += returnedData.result
+        sp.if voteValue == VoteValue.ABSTAIN:
+          newPoll.value.abstainVotes += votes.value
         sp.else:
           sp.failwith(Errors.ERROR_BAD_VOTE_VALUE)
 
     # Update to new poll
-    self.data.poll = sp.some(newPoll.value)
-
-    # Clear state.
-    self.data.state = STATE_MACHINE_IDLE
-    self.data.votingState = sp.none
+    self.data.polls[pollId] = newPoll.value
 
   ################################################################
   # Timelock management
   ################################################################
 
   # Execute a timelock item.
+  # Params:
+  # - pollId (nat): The id of the poll which produced the timelock item.
+  # - proposalLambda (Proposal.PROPOSAL_LAMBDA_TYPE): The code to execute, which must match the proposal's lambda hash.
   @sp.entry_point
-  def executeTimelock(self, unit):
-    sp.set_type(unit, sp.TUnit)
+  def executeTimelock(self, params):
+    sp.set_type(params, sp.TRecord(
+      pollId = sp.TNat,
+      proposalLambda = Proposal.PROPOSAL_LAMBDA_TYPE
+    ).layout(("pollId", "proposalLambda")))
+    pollId = params.pollId
 
-    # Verify an item is in the timelock
-    sp.verify(self.data.timelockItem.is_some(), Errors.ERROR_NO_ITEM_IN_TIMELOCK)
+    # Verify the item is in the timelock
+    sp.verify(self.data.timelockItems.contains(pollId), Errors.ERROR_NO_ITEM_IN_TIMELOCK)
+    timelockItem = sp.local('timelockItem', self.data.timelockItems[pollId])
 
     # Verify the sender is the author.
-    sp.verify(sp.sender == self.data.timelockItem.open_some().author, Errors.ERROR_NOT_AUTHOR)
+    sp.verify(sp.sender == timelockItem.value.author, Errors.ERROR_NOT_AUTHOR)
 
     # Verify the length of blocks have passed.
-    sp.verify(sp.level > self.data.timelockItem.open_some().endBlock, Errors.ERROR_TOO_SOON)
+    sp.verify(sp.level > timelockItem.value.endBlock, Errors.ERROR_TOO_SOON)
+
+    # Verify the revealed code is the code that was voted on.
+    sp.verify(Proposal.hashLambda(params.proposalLambda) == timelockItem.value.proposal.proposalLambdaHash, Errors.ERROR_BAD_LAMBDA)
 
     # Execute the timelock
-    operations = self.data.timelockItem.open_some().proposal.proposalLambda(sp.unit)
+    operations = params.proposalLambda(sp.unit)
     sp.set_type(operations, sp.TList(sp.TOperation))
     sp.add_operations(operations)
 
     # Update the historical outcomes.
-    pollId = sp.local('pollId', self.data.timelockItem.open_some().id)
-    historicalOutcome = sp.local('historicalOutcome', self.data.outcomes[pollId.value])
-    self.data.outcomes[pollId.value] = sp.record(
-      poll = historicalOutcome.value.poll, 
-      outcome = PollOutcomes.POLL_OUTCOME_EXECUTED
-    )
+    self.data.outcomes[pollId].outcome = PollOutcomes.POLL_OUTCOME_EXECUTED
 
-    # Clear the timelock
-    self.data.timelockItem = sp.none
+    # Clear the item from the timelock
+    del self.data.timelockItems[pollId]
 
   # Cancel a timelock item.
+  # Params:
+  # - pollId (nat): The id of the poll which produced the timelock item.
   @sp.entry_point
-  def cancelTimelock(self, unit):
-    sp.set_type(unit, sp.TUnit)
+  def cancelTimelock(self, pollId):
+    sp.set_type(pollId, sp.TNat)
 
-    # Verify an item is in the timelock
-    sp.verify(self.data.timelockItem.is_some(), Errors.ERROR_NO_ITEM_IN_TIMELOCK)
+    # Verify the item is in the timelock
+    sp.verify(self.data.timelockItems.contains(pollId), Errors.ERROR_NO_ITEM_IN_TIMELOCK)
 
     # Verify the length of blocks have passed.
-    sp.verify(sp.level >= self.data.timelockItem.open_some().cancelBlock, Errors.ERROR_TOO_SOON)
+    sp.verify(sp.level >= self.data.timelockItems[pollId].cancelBlock, Errors.ERROR_TOO_SOON)
 
     # Update the historical outcomes.
-    pollId = sp.local('pollId', self.data.timelockItem.open_some().id)
-    historicalOutcome = sp.local('historicalOutcome', self.data.outcomes[pollId.value])
-    self.data.outcomes[pollId.value] = sp.record(
-      poll = historicalOutcome.value.poll, 
-      outcome = PollOutcomes.POLL_OUTCOME_CANCELLED
-    )
-    # Clear the timelock
-    self.data.timelockItem = sp.none
+    self.data.outcomes[pollId].outcome = PollOutcomes.POLL_OUTCOME_CANCELLED
+
+    # Clear the item from the timelock
+    del self.data.timelockItems[pollId]
 
   ################################################################
   # Governance
@@ -564,6 +634,71 @@ class DaoContract(sp.Contract):
     # Update parameters.
     self.data.governanceParameters = newGovernanceParameters
 
+  # A method to allow or disallow a vesting vault from voting on behalf of its owners. This method
+  # can only be called by this contract.
+  # Params:
+  # - vestingVaultAddress (address): The address of the vesting vault.
+  # - enabled (bool): Whether the vault may vote.
+  @sp.entry_point
+  def setVestingVault(self, params):
+    sp.set_type(params, sp.TRecord(vestingVaultAddress = sp.TAddress, enabled = sp.TBool).layout(("vestingVaultAddress", "enabled")))
+
+    # Only the DAO can change the vesting vaults.
+    sp.verify(sp.sender == sp.self_address, Errors.ERROR_NOT_DAO)
+
+    sp.if params.enabled:
+      self.data.vestingVaults[params.vestingVaultAddress] = sp.unit
+    sp.else:
+      del self.data.vestingVaults[params.vestingVaultAddress]
+
+  ################################################################
+  # Views
+  ################################################################
+
+  # The oldest block that an active or future poll may read voting power at.
+  #
+  # Polls read voting power from the escrow contract at their first block of voting, and future polls
+  # begin at least `voteDelayBlocks` after the current block. The bound follows the current parameters,
+  # so it moves earlier if `voteDelayBlocks` is lowered, but it is never earlier than the current block.
+  @sp.onchain_view()
+  def getOldestQueryableBlock(self, unit):
+    sp.set_type(unit, sp.TUnit)
+
+    oldestBlock = sp.local('oldestBlock', sp.level + self.data.governanceParameters.voteDelayBlocks)
+    sp.for startBlock in self.data.activePollStartBlocks.values():
+      sp.if startBlock < oldestBlock.value:
+        oldestBlock.value = startBlock
+
+    sp.result(oldestBlock.value)
+
+  # The id the next proposal will be given.
+  @sp.onchain_view()
+  def getNextProposalId(self, unit):
+    sp.set_type(unit, sp.TUnit)
+
+    sp.result(self.data.nextProposalId)
+
+  # The amount of tokens escrowed by a new proposal.
+  @sp.onchain_view()
+  def getEscrowAmount(self, unit):
+    sp.set_type(unit, sp.TUnit)
+
+    sp.result(self.data.governanceParameters.escrowAmount)
+
+  # Whether an address is a vesting vault which may vote on behalf of its owners.
+  @sp.onchain_view()
+  def isVestingVault(self, address):
+    sp.set_type(address, sp.TAddress)
+
+    sp.result(self.data.vestingVaults.contains(address))
+
+  # Whether a poll is under vote, that is it was proposed and voting has not been ended.
+  @sp.onchain_view()
+  def isPollUnderway(self, pollId):
+    sp.set_type(pollId, sp.TNat)
+
+    sp.result(self.data.polls.contains(pollId))
+
 ################################################################
 ################################################################
 # Tests
@@ -574,6 +709,7 @@ class DaoContract(sp.Contract):
 if __name__ == "__main__":
 
   FakeToken = sp.io.import_script_from_url("file:test-helpers/fake-token.py")
+  FakeVault = sp.io.import_script_from_url("file:test-helpers/fake-vault.py")
   Store = sp.io.import_script_from_url("file:test-helpers/store.py")
   Token = sp.io.import_script_from_url("file:token.py")
 
@@ -624,6 +760,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -632,7 +769,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a dao contract.
@@ -668,7 +806,7 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
     
     level = 1
@@ -679,8 +817,8 @@ if __name__ == "__main__":
     )
 
     # THEN a poll is loaded into the dao.
-    scenario.verify(dao.data.poll.is_some())
-    poll = dao.data.poll.open_some()
+    scenario.verify(dao.data.polls.contains(sp.nat(0)))
+    poll = dao.data.polls[sp.nat(0)]
 
     # AND the proposal matches the input data.
     scenario.verify(poll.proposal.title == title)
@@ -702,11 +840,17 @@ if __name__ == "__main__":
     # AND the identifier auto-incremented.
     scenario.verify(dao.data.nextProposalId == sp.nat(1))
 
+    # AND the poll is counted as active.
+    scenario.verify(sp.len(dao.data.activePollStartBlocks) == 1)
+
+    # AND the start of voting is recorded for the active poll.
+    scenario.verify(dao.data.activePollStartBlocks[sp.nat(0)] == poll.votingStartBlock)
+
     # AND the escrow amount is correct.
     scenario.verify(poll.escrowAmount == escrowAmount)
 
-    # AND no voters are listed
-    scenario.verify(sp.len(poll.voters) == 0)
+    # AND alice is not listed as a voter
+    scenario.verify(~dao.data.voters.contains((poll.id, alice.address)))
 
     # AND the start and end blocks are set correctly
     expectedStartBlock = level + governanceParameters.voteDelayBlocks
@@ -717,14 +861,159 @@ if __name__ == "__main__":
     # AND the quorum is set correctly. 
     scenario.verify(poll.quorum == dao.data.quorum)
 
-    # AND the quorum caps are set correctly. 
-    scenario.verify(poll.quorumCap.lower == governanceParameters.quorumCap.lower)
-    scenario.verify(poll.quorumCap.upper == governanceParameters.quorumCap.upper)
+    # AND the poll records that the author is not a vesting vault.
+    scenario.verify(poll.authorIsVestingVault == False)
 
     # AND the dao received the tokens in escrow.
     scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(dao.address, 0)].balance == escrowAmount)
 
-  @sp.add_test(name="propose - cannot propose if another poll is under vote")
+  @sp.add_test(name="propose - can propose while another poll is under vote")
+  def test():
+    scenario = sp.test_scenario()
+
+    escrowAmount = sp.nat(10)
+    # GIVEN a token contract
+    admin = sp.test_account("Administrator")
+    alice = sp.test_account("Alice")
+    bob   = sp.test_account("Robert")
+
+    # Let's display the accounts:
+    test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+          metadata = sp.utils.metadata_of_url("https://example.com"),
+          admin = admin.address)
+    scenario += test_sdao
+
+    scenario.h2("Initial Minting")
+
+    scenario.p("The administrator mints 100")
+
+    tok0_md = FA2_test.FA2.make_metadata(
+      name = "test sdao",
+      decimals = 0,
+      symbol= "TK0" )
+
+    scenario += test_sdao.mint(address = alice.address,
+                      amount = 690000,
+                      metadata = tok0_md,
+                      token_id = 0).run(sender = admin)
+
+    scenario += test_sdao.transfer(
+    [
+        test_sdao.batch_transfer.item(from_ = alice.address,
+        txs = [
+          sp.record(to_ = bob.address,
+                    amount = 10000,
+                    token_id = 0)
+        ])
+    ]).run(sender = alice)
+    
+    # AND some governance parameters
+    voteDelayBlocks = sp.nat(1)
+    voteLengthBlocks = sp.nat(10)
+    minYayVotesPercentForEscrowReturn = sp.nat(20)
+    blocksInTimelockForExecution = sp.nat(30)
+    blocksInTimelockForCancellation = sp.nat(40)
+    percentageForSuperMajority = sp.nat(80)
+    quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
+    governanceParameters = sp.record(
+      escrowAmount = escrowAmount,
+      voteDelayBlocks = voteDelayBlocks,
+      voteLengthBlocks = voteLengthBlocks,
+      minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+      blocksInTimelockForExecution = blocksInTimelockForExecution,
+      blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+      percentageForSuperMajority = percentageForSuperMajority,
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
+    )
+
+    # AND a dao contract.
+    dao = DaoContract(
+      tokenContractAddress = test_sdao.address,
+      governanceParameters = governanceParameters,
+    )
+    scenario += dao
+
+    scenario.p("Update Operators to DAO.")
+    scenario += test_sdao.update_operators([
+        sp.variant("add_operator", test_sdao.operator_param.make(
+            owner = alice.address,
+            operator = dao.address,
+            token_id = 0)),
+    ]).run(sender = alice)
+
+    scenario.p("Update Operators to DAO.")
+    scenario += test_sdao.update_operators([
+        sp.variant("add_operator", test_sdao.operator_param.make(
+            owner = bob.address,
+            operator = dao.address,
+            token_id = 0)),
+    ]).run(sender = bob)
+
+    # AND a store value contract with the dao as the admin.
+    storeContract = Store.StoreValueContract(value = sp.nat(0), admin = dao.address)
+    scenario += storeContract
+
+    # AND Alice has made a proposal
+    newValue = sp.nat(3)
+    def updateLambda(unitParam):
+      sp.set_type(unitParam, sp.TUnit)
+      storeContractHandle = sp.contract(sp.TNat, storeContract.address, 'replace').open_some()
+      sp.result([sp.transfer_operation(newValue, sp.mutez(0), storeContractHandle)])
+
+    title = "Prop 1"
+    descriptionLink = "ipfs://xyz"
+    descriptionHash = "xyz123"
+    proposal = sp.record(
+      title = title,
+      descriptionLink = descriptionLink,
+      descriptionHash = descriptionHash,
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
+    )
+    
+    level = 1
+
+    scenario += dao.propose(proposal).run(
+      sender = alice.address,
+      level = 1
+    )
+
+    # WHEN Bob makes a proposal
+    newValue = sp.nat(3)
+    def updateLambda(unitParam):
+      sp.set_type(unitParam, sp.TUnit)
+      storeContractHandle = sp.contract(sp.TNat, storeContract.address, 'replace').open_some()
+      sp.result([sp.transfer_operation(newValue, sp.mutez(0), storeContractHandle)])
+
+    title = "Prop 2"
+    descriptionLink = "ipfs://abc"
+    descriptionHash = "abc456"
+    proposal = sp.record(
+      title = title,
+      descriptionLink = descriptionLink,
+      descriptionHash = descriptionHash,
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
+    )
+    
+    level = 2
+
+    scenario += dao.propose(proposal).run(
+      sender = bob.address,
+      level = 2
+    )
+
+    # THEN both polls are under vote.
+    scenario.verify(dao.data.polls.contains(sp.nat(0)))
+    scenario.verify(dao.data.polls.contains(sp.nat(1)))
+    scenario.verify(sp.len(dao.data.activePollStartBlocks) == 2)
+
+    # AND each poll is attributed to its author.
+    scenario.verify(dao.data.polls[sp.nat(0)].author == alice.address)
+    scenario.verify(dao.data.polls[sp.nat(1)].author == bob.address)
+    scenario.verify(dao.data.polls[sp.nat(1)].proposal.title == title)
+
+  @sp.add_test(name="propose - cannot propose if the maximum number of polls are under vote")
   def test():
     scenario = sp.test_scenario()
 
@@ -772,6 +1061,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(1)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -780,7 +1070,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a dao contract.
@@ -824,7 +1115,7 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
     
     level = 1
@@ -848,7 +1139,7 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
     
     level = 2
@@ -899,6 +1190,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -907,7 +1199,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a dao contract.
@@ -943,7 +1236,7 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
     
     level = 1
@@ -973,6 +1266,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -981,7 +1275,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a dao contract.
@@ -992,11 +1287,11 @@ if __name__ == "__main__":
 
     # WHEN end voting is called before a poll is submitted
     # THEN the call fails.
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       valid = False
     )
 
-  @sp.add_test(name="endVoting - fails if timelock is occupied")
+  @sp.add_test(name="endVoting - fails if voting is not yet complete")
   def test():
     scenario = sp.test_scenario()
     
@@ -1010,6 +1305,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1018,10 +1314,11 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
-    # AND a poll under is unerway with an item in the timelock
+    # AND a poll is underway
     votingEndBlock = sp.nat(21)
     poll = sp.record(
       id = sp.nat(0),
@@ -1029,7 +1326,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1037,42 +1334,28 @@ if __name__ == "__main__":
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = alice.address,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
-    )
-
-    timelockItem = sp.record(
-      id = sp.nat(0),
-      proposal = sp.record(
-        title = 'timelocked prop',
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
-      endBlock = sp.nat(10),
-      cancelBlock = sp.nat(20),
-      author = alice.address
+      authorIsVestingVault = False
     )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
-      timelockItem = sp.some(timelockItem)
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
     )
     scenario += dao
 
-    # WHEN end voting is called after voting has ended
+    # WHEN end voting is called before voting has ended
     # THEN the call fails.
-    scenario += dao.endVoting(sp.unit).run(
-      level = votingEndBlock + 1,
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = sp.as_nat(votingEndBlock - 1),
       valid = False
     )
 
-  @sp.add_test(name="endVoting - fails if voting is not yet complete")
+  @sp.add_test(name="endVoting - adjusts quorum upwards")
   def test():
     scenario = sp.test_scenario()
     
@@ -1086,6 +1369,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1094,47 +1378,53 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a poll is underway
+    quorum = 45
     votingEndBlock = sp.nat(21)
+    totalVotes = 65
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
-      totalVotes = sp.nat(0),
-      voters = {},
+      totalVotes = totalVotes,
       author = alice.address,
       escrowAmount = escrowAmount,
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      quorum = quorum,
+      authorIsVestingVault = False
     )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      quorum = quorum
     )
     scenario += dao
 
-    # WHEN end voting is called before voting has ended
-    # THEN the call fails.
-    scenario += dao.endVoting(sp.unit).run(
-      level = sp.as_nat(votingEndBlock - 1),
-      valid = False
-    )
+    # WHEN end voting is called
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = votingEndBlock + 1,
+    )    
 
-  @sp.add_test(name="endVoting - adjusts quorum upwards")
+    # THEN quorum is adjusted upwards
+    expectedQuorum = 49 # (.8 * lastQuorum) + (.2 * participation) = (.8 * 45) + (.2 * 65) = 36 + 13 = 49
+    scenario.verify(dao.data.quorum == expectedQuorum)
+
+  @sp.add_test(name="endVoting - adjusts quorum from the quorum left by polls which ended in between")
   def test():
     scenario = sp.test_scenario()
     
@@ -1148,6 +1438,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1156,49 +1447,57 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
-    # AND a poll is underway
+    # AND two polls which were proposed with the same quorum are underway
     quorum = 45
     votingEndBlock = sp.nat(21)
     totalVotes = 65
-    poll = sp.record(
-      id = sp.nat(0),
-      proposal = sp.record(
-        title = 'timelocked prop',
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
-      votingStartBlock = sp.nat(11),
-      votingEndBlock = votingEndBlock,
-      yayVotes = sp.nat(0),
-      nayVotes = sp.nat(0),
-      abstainVotes = sp.nat(0),
-      totalVotes = totalVotes,
-      voters = {},
-      author = alice.address,
-      escrowAmount = escrowAmount,
-      quorum = quorum,
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
-    )
+    polls = {}
+    for pollId in [sp.nat(0), sp.nat(1)]:
+      polls[pollId] = sp.record(
+        id = pollId,
+        proposal = sp.record(
+          title = 'timelocked prop',
+          descriptionLink = 'ipfs://xyz',
+          descriptionHash = "xyz123",
+          proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+        ),
+        votingStartBlock = sp.nat(11),
+        votingEndBlock = votingEndBlock,
+        yayVotes = sp.nat(0),
+        nayVotes = sp.nat(0),
+        abstainVotes = sp.nat(0),
+        totalVotes = totalVotes,
+        author = alice.address,
+        escrowAmount = escrowAmount,
+        quorum = quorum,
+        authorIsVestingVault = False
+      )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = polls, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11), sp.nat(1): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum
     )
     scenario += dao
 
-    # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    # AND voting was ended for the first poll
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
-    # THEN quorum is adjusted upwards
-    expectedQuorum = 49 # (.8 * lastQuorum) + (.2 * participation) = (.8 * 45) + (.2 * 65) = 36 + 13 = 49
+    # WHEN end voting is called for the second poll
+    scenario += dao.endVoting(sp.nat(1)).run(
+      level = votingEndBlock + 1,
+    )    
+
+    # THEN quorum is adjusted from the quorum left by the first poll
+    expectedQuorum = 52 # (.8 * 49) + (.2 * 65) = 39 + 13 = 52
     scenario.verify(dao.data.quorum == expectedQuorum)
 
   @sp.add_test(name="endVoting - adjusts quorum downwards")
@@ -1215,6 +1514,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1223,7 +1523,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a poll is underway
@@ -1236,7 +1537,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1244,23 +1545,23 @@ if __name__ == "__main__":
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
       author = alice.address,
       escrowAmount = escrowAmount,
       quorum = quorum,
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum
     )
     scenario += dao
 
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
@@ -1283,6 +1584,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumUpperCap = sp.nat(48)
     quorumCap = sp.record(lower = 1, upper = quorumUpperCap)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1291,7 +1593,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a poll is under vote
@@ -1304,7 +1607,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1312,23 +1615,23 @@ if __name__ == "__main__":
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
       author = alice.address,
       escrowAmount = escrowAmount,
       quorum = quorum,
-      quorumCap = quorumCap,
+      authorIsVestingVault = False
     )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum
     )
     scenario += dao
 
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
@@ -1337,6 +1640,102 @@ if __name__ == "__main__":
     # Cap = 48
     scenario.verify(dao.data.quorum == quorumUpperCap)
 
+  @sp.add_test(name="endVoting - caps quorum with the caps in effect when voting ends")
+  def test():
+    scenario = sp.test_scenario()
+    
+    alice = sp.test_account("Alice")
+    # Given some governance parameters
+    escrowAmount = sp.nat(10)
+    voteDelayBlocks = sp.nat(1)
+    voteLengthBlocks = sp.nat(10)
+    minYayVotesPercentForEscrowReturn = sp.nat(20)
+    blocksInTimelockForExecution = sp.nat(30)
+    blocksInTimelockForCancellation = sp.nat(40)
+    percentageForSuperMajority = sp.nat(80)
+    quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
+    governanceParameters = sp.record(
+      escrowAmount = escrowAmount,
+      voteDelayBlocks = voteDelayBlocks,
+      voteLengthBlocks = voteLengthBlocks,
+      minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+      blocksInTimelockForExecution = blocksInTimelockForExecution,
+      blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+      percentageForSuperMajority = percentageForSuperMajority,
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
+    )
+
+    # AND two polls are underway
+    quorum = 45
+    votingEndBlock = sp.nat(21)
+    totalVotes = 65
+    polls = {}
+    for pollId in [sp.nat(0), sp.nat(1)]:
+      polls[pollId] = sp.record(
+        id = pollId,
+        proposal = sp.record(
+          title = 'timelocked prop',
+          descriptionLink = 'ipfs://xyz',
+          descriptionHash = "xyz123",
+          proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+        ),
+        votingStartBlock = sp.nat(11),
+        votingEndBlock = votingEndBlock,
+        yayVotes = sp.nat(0),
+        nayVotes = sp.nat(0),
+        abstainVotes = sp.nat(0),
+        totalVotes = totalVotes,
+        author = alice.address,
+        escrowAmount = escrowAmount,
+        quorum = quorum,
+        authorIsVestingVault = False
+      )
+
+    # AND a dao contract with the parameters above.
+    dao = DaoContract(
+      governanceParameters = governanceParameters,
+      polls = sp.big_map(l = polls, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11), sp.nat(1): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      quorum = quorum
+    )
+    scenario += dao
+
+    # AND voting was ended for the first poll
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = votingEndBlock + 1,
+    )    
+    scenario.verify(dao.data.quorum == 49) # (.8 * 45) + (.2 * 65) = 36 + 13 = 49
+
+    # AND the upper quorum cap was lowered while the second poll was underway
+    newQuorumUpperCap = sp.nat(50)
+    scenario += dao.setParameters(
+      sp.record(
+        escrowAmount = escrowAmount,
+        voteDelayBlocks = voteDelayBlocks,
+        voteLengthBlocks = voteLengthBlocks,
+        minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+        blocksInTimelockForExecution = blocksInTimelockForExecution,
+        blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+        percentageForSuperMajority = percentageForSuperMajority,
+        quorumCap = sp.record(lower = 1, upper = newQuorumUpperCap),
+        maxActivePolls = maxActivePolls
+      )
+    ).run(
+      sender = dao.address
+    )
+
+    # WHEN end voting is called for the second poll
+    scenario += dao.endVoting(sp.nat(1)).run(
+      level = votingEndBlock + 1,
+    )    
+
+    # THEN quorum is capped at the new upper bound
+    # Expected = (.8 * 49) + (.2 * 65) = 39 + 13 = 52
+    # Cap = 50
+    scenario.verify(dao.data.quorum == newQuorumUpperCap)
+
   @sp.add_test(name="endVoting - caps minimum quorum")
   def test():
     scenario = sp.test_scenario()
@@ -1352,6 +1751,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1360,7 +1760,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a poll is underway
@@ -1373,7 +1774,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1381,23 +1782,23 @@ if __name__ == "__main__":
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
       author = alice.address,
       escrowAmount = escrowAmount,
       quorum = quorum,
-      quorumCap = quorumCap
+      authorIsVestingVault = False
     )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum
     )
     scenario += dao
 
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
@@ -1423,6 +1824,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1431,7 +1833,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a poll by Alice which achieves the minimum for escrow return
@@ -1445,7 +1848,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1453,11 +1856,10 @@ if __name__ == "__main__":
       nayVotes = nayVotes,
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
       author = alice.address,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = quorumCap
+      authorIsVestingVault = False
     )
 
     # AND a token contract.
@@ -1479,7 +1881,8 @@ if __name__ == "__main__":
     quorum = 65
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum,
       tokenContractAddress = test_sdao.address,
     )
@@ -1491,7 +1894,7 @@ if __name__ == "__main__":
                       token_id = 0).run(sender = admin)
 
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
@@ -1499,7 +1902,7 @@ if __name__ == "__main__":
     scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(alice.address, 0)].balance == escrowAmount)
     scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(dao.address, 0)].balance == 0)
     
-  @sp.add_test(name="endVoting - gives escrow to community fund on failure")
+  @sp.add_test(name="endVoting - tells a vesting vault which proposed the poll that its escrow was returned")
   def test():
     scenario = sp.test_scenario()
     
@@ -1516,6 +1919,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1524,21 +1928,26 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
-    # AND a poll by Alice which fails to achieve the minimum for escrow return
+    # AND a vesting vault known to the DAO
+    vault = FakeVault.FakeVaultContract()
+    scenario += vault
+
+    # AND a poll by the vault which achieves the minimum for escrow return
     votingEndBlock = sp.nat(21)
     totalVotes = 100
-    yayVotes = 19
-    nayVotes = 81
+    yayVotes = 40
+    nayVotes = 60
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1546,11 +1955,10 @@ if __name__ == "__main__":
       nayVotes = nayVotes,
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
-      author = alice.address,
+      author = vault.address,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = quorumCap
+      authorIsVestingVault = True
     )
 
     # AND a token contract.
@@ -1571,11 +1979,12 @@ if __name__ == "__main__":
     # AND a dao contract with the parameters above.
     quorum = 65
     dao = DaoContract(
-      communityFundAddress = Addresses.COMMUNITY_FUND_ADDRESS,
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum,
       tokenContractAddress = test_sdao.address,
+      vestingVaults = sp.big_map(l = { vault.address: sp.unit }, tkey = sp.TAddress, tvalue = sp.TUnit),
     )
     scenario += dao
 
@@ -1585,20 +1994,25 @@ if __name__ == "__main__":
                       token_id = 0).run(sender = admin)
 
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
-    # THEN the community fund receives the escrow.
-    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(Addresses.COMMUNITY_FUND_ADDRESS, 0)].balance == escrowAmount)
-    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(dao.address, 0)].balance == 0)
+    # THEN the vault receives the escrow.
+    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(vault.address, 0)].balance == escrowAmount)
 
-  @sp.add_test(name="endVoting - removes poll if quorum and super majority not met")
+    # AND the vault is told whether the escrow was returned.
+    scenario.verify(vault.data.resolvedEscrow.open_some().pollId == sp.nat(0))
+    scenario.verify(vault.data.resolvedEscrow.open_some().returned == True)
+
+  @sp.add_test(name="endVoting - tells a vesting vault which proposed the poll that its escrow was not returned")
   def test():
     scenario = sp.test_scenario()
     
+    admin = sp.test_account("Administrator")
+    alice = sp.test_account("Alice")
+    bob   = sp.test_account("Robert")
     # Given some governance parameters 
-    quorum = 100
     escrowAmount = sp.nat(10)
     voteDelayBlocks = sp.nat(1)
     voteLengthBlocks = sp.nat(10)
@@ -1608,6 +2022,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1616,22 +2031,26 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
-    # AND a poll by Alice which fails to achieve quorum and fails to achieve a super majority
+    # AND a vesting vault known to the DAO
+    vault = FakeVault.FakeVaultContract()
+    scenario += vault
+
+    # AND a poll by the vault which fails to achieve the minimum for escrow return
     votingEndBlock = sp.nat(21)
-    totalVotes = quorum // 2
-    yayVotes = totalVotes // 2
-    nayVotes = totalVotes // 2
-    pollId = sp.nat(0)
+    totalVotes = 100
+    yayVotes = 10
+    nayVotes = 90
     poll = sp.record(
-      id = pollId,
+      id = sp.nat(0),
       proposal = sp.record(
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1639,41 +2058,64 @@ if __name__ == "__main__":
       nayVotes = nayVotes,
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
-      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      author = vault.address,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = quorumCap
+      authorIsVestingVault = True
     )
 
+    # AND a token contract.
+    test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+          metadata = sp.utils.metadata_of_url("https://example.com"),
+          admin = admin.address)
+    scenario += test_sdao
+
+    scenario.h2("Initial Minting")
+
+    scenario.p("The administrator mints 100")
+
+    tok0_md = FA2_test.FA2.make_metadata(
+      name = "test sdao",
+      decimals = 0,
+      symbol= "TK0" )
+
     # AND a dao contract with the parameters above.
+    quorum = 65
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum,
+      tokenContractAddress = test_sdao.address,
+      vestingVaults = sp.big_map(l = { vault.address: sp.unit }, tkey = sp.TAddress, tvalue = sp.TUnit),
     )
     scenario += dao
 
+    scenario += test_sdao.mint(address = dao.address,
+                      amount = escrowAmount,
+                      metadata = tok0_md,
+                      token_id = 0).run(sender = admin)
+
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
-    # THEN the poll is removed 
-    scenario.verify(~dao.data.poll.is_some())
-
-    # AND the outcome for the poll is FAILED
-    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_FAILED)
+    # THEN the vault does not receive the escrow.
+    scenario.verify(~test_sdao.data.ledger.contains(test_sdao.ledger_key.make(vault.address, 0)))
 
-    # AND it was not moved to the timelock
-    scenario.verify(~dao.data.timelockItem.is_some())
+    # AND the vault is told whether the escrow was returned.
+    scenario.verify(vault.data.resolvedEscrow.open_some().pollId == sp.nat(0))
+    scenario.verify(vault.data.resolvedEscrow.open_some().returned == False)
 
-  @sp.add_test(name="endVoting - removes poll if super majority achieved but quorum not met")
+  @sp.add_test(name="endVoting - tells a vesting vault which was removed while its poll was underway")
   def test():
     scenario = sp.test_scenario()
     
+    admin = sp.test_account("Administrator")
+    alice = sp.test_account("Alice")
+    bob   = sp.test_account("Robert")
     # Given some governance parameters 
-    quorum = 100
     escrowAmount = sp.nat(10)
     voteDelayBlocks = sp.nat(1)
     voteLengthBlocks = sp.nat(10)
@@ -1683,6 +2125,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1691,22 +2134,26 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
-    # AND a poll by Alice which fails to achieve quorum and but achieved a super majority
+    # AND a vesting vault known to the DAO
+    vault = FakeVault.FakeVaultContract()
+    scenario += vault
+
+    # AND a poll by the vault which achieves the minimum for escrow return
     votingEndBlock = sp.nat(21)
-    totalVotes = quorum // 2
-    yayVotes = totalVotes
-    nayVotes = 0
-    pollId = sp.nat(0)
+    totalVotes = 100
+    yayVotes = 40
+    nayVotes = 60
     poll = sp.record(
-      id = pollId,
+      id = sp.nat(0),
       proposal = sp.record(
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1714,42 +2161,76 @@ if __name__ == "__main__":
       nayVotes = nayVotes,
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
-      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      author = vault.address,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = quorumCap
+      authorIsVestingVault = True
     )
 
+    # AND a token contract.
+    test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+          metadata = sp.utils.metadata_of_url("https://example.com"),
+          admin = admin.address)
+    scenario += test_sdao
+
+    scenario.h2("Initial Minting")
+
+    scenario.p("The administrator mints 100")
+
+    tok0_md = FA2_test.FA2.make_metadata(
+      name = "test sdao",
+      decimals = 0,
+      symbol= "TK0" )
+
     # AND a dao contract with the parameters above.
+    quorum = 65
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum,
+      tokenContractAddress = test_sdao.address,
+      vestingVaults = sp.big_map(l = { vault.address: sp.unit }, tkey = sp.TAddress, tvalue = sp.TUnit),
     )
     scenario += dao
 
+    scenario += test_sdao.mint(address = dao.address,
+                      amount = escrowAmount,
+                      metadata = tok0_md,
+                      token_id = 0).run(sender = admin)
+
+    # AND the vault was removed while the poll was underway
+    scenario += dao.setVestingVault(
+      sp.record(
+        vestingVaultAddress = vault.address,
+        enabled = False
+      )
+    ).run(
+      sender = dao.address
+    )
+
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
-    # THEN the poll under vote is removed 
-    scenario.verify(~dao.data.poll.is_some())
-
-    # AND the outcome for the poll is FAILED
-    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_FAILED)
+    # THEN the vault receives the escrow.
+    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(vault.address, 0)].balance == escrowAmount)
 
-    # AND it was not moved to the timelock
-    scenario.verify(~dao.data.timelockItem.is_some())    
+    # AND the vault is still told whether the escrow was returned.
+    scenario.verify(vault.data.resolvedEscrow.open_some().pollId == sp.nat(0))
+    scenario.verify(vault.data.resolvedEscrow.open_some().returned == True)
 
-  @sp.add_test(name="endVoting - removes poll if quorum met and super majority not achieved")
+  @sp.add_test(name="endVoting - returns the escrow taken when the poll was proposed")
   def test():
     scenario = sp.test_scenario()
     
-    # Given some governance parameters 
-    quorum = 100
+    admin = sp.test_account("Administrator")
+    alice = sp.test_account("Alice")
+    bob   = sp.test_account("Robert")
+    # Given some governance parameters with an escrow amount which was raised after a poll was proposed
     escrowAmount = sp.nat(10)
+    newEscrowAmount = sp.nat(50)
     voteDelayBlocks = sp.nat(1)
     voteLengthBlocks = sp.nat(10)
     minYayVotesPercentForEscrowReturn = sp.nat(20)
@@ -1758,30 +2239,31 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
-      escrowAmount = escrowAmount,
+      escrowAmount = newEscrowAmount,
       voteDelayBlocks = voteDelayBlocks,
       voteLengthBlocks = voteLengthBlocks,
       minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
-    # AND a poll by Alice which achieves quorum and but failed to achieved a super majority
+    # AND a poll by Alice which escrowed the old amount and achieves the minimum for escrow return
     votingEndBlock = sp.nat(21)
-    totalVotes = quorum * 2
-    yayVotes = sp.nat(10)
-    nayVotes = sp.as_nat(totalVotes - yayVotes)
-    pollId = sp.nat(0)
+    totalVotes = 100
+    yayVotes = 40
+    nayVotes = 60
     poll = sp.record(
-      id = pollId,
+      id = sp.nat(0),
       proposal = sp.record(
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1789,34 +2271,382 @@ if __name__ == "__main__":
       nayVotes = nayVotes,
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
-      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      author = alice.address,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = quorumCap
+      authorIsVestingVault = False
     )
 
+    # AND a token contract.
+    test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+          metadata = sp.utils.metadata_of_url("https://example.com"),
+          admin = admin.address)
+    scenario += test_sdao
+
+    scenario.h2("Initial Minting")
+
+    scenario.p("The administrator mints 100")
+
+    tok0_md = FA2_test.FA2.make_metadata(
+      name = "test sdao",
+      decimals = 0,
+      symbol= "TK0" )
+
     # AND a dao contract with the parameters above.
+    quorum = 65
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
       quorum = quorum,
+      tokenContractAddress = test_sdao.address,
     )
     scenario += dao
 
+    scenario += test_sdao.mint(address = dao.address,
+                      amount = escrowAmount,
+                      metadata = tok0_md,
+                      token_id = 0).run(sender = admin)
+
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(sp.nat(0)).run(
       level = votingEndBlock + 1,
     )    
 
-    # THEN the poll under vote is removed 
-    scenario.verify(~dao.data.poll.is_some())
-
-    # AND the outcome for the poll is FAILED
-    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_FAILED)
+    # THEN alice receives the amount she escrowed.
+    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(alice.address, 0)].balance == escrowAmount)
+    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(dao.address, 0)].balance == 0)
+    
+  @sp.add_test(name="endVoting - gives escrow to community fund on failure")
+  def test():
+    scenario = sp.test_scenario()
+    
+    admin = sp.test_account("Administrator")
+    alice = sp.test_account("Alice")
+    bob   = sp.test_account("Robert")
+    # Given some governance parameters 
+    escrowAmount = sp.nat(10)
+    voteDelayBlocks = sp.nat(1)
+    voteLengthBlocks = sp.nat(10)
+    minYayVotesPercentForEscrowReturn = sp.nat(20)
+    blocksInTimelockForExecution = sp.nat(30)
+    blocksInTimelockForCancellation = sp.nat(40)
+    percentageForSuperMajority = sp.nat(80)
+    quorumLowerCap = 62
+    quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
+    governanceParameters = sp.record(
+      escrowAmount = escrowAmount,
+      voteDelayBlocks = voteDelayBlocks,
+      voteLengthBlocks = voteLengthBlocks,
+      minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+      blocksInTimelockForExecution = blocksInTimelockForExecution,
+      blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+      percentageForSuperMajority = percentageForSuperMajority,
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
+    )
+
+    # AND a poll by Alice which fails to achieve the minimum for escrow return
+    votingEndBlock = sp.nat(21)
+    totalVotes = 100
+    yayVotes = 19
+    nayVotes = 81
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = yayVotes,
+      nayVotes = nayVotes,
+      abstainVotes = sp.nat(0),
+      totalVotes = totalVotes,
+      author = alice.address,
+      escrowAmount = escrowAmount,
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a token contract.
+    test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+          metadata = sp.utils.metadata_of_url("https://example.com"),
+          admin = admin.address)
+    scenario += test_sdao
+
+    scenario.h2("Initial Minting")
+
+    scenario.p("The administrator mints 100")
+
+    tok0_md = FA2_test.FA2.make_metadata(
+      name = "test sdao",
+      decimals = 0,
+      symbol= "TK0" )
+
+    # AND a dao contract with the parameters above.
+    quorum = 65
+    dao = DaoContract(
+      communityFundAddress = Addresses.COMMUNITY_FUND_ADDRESS,
+      governanceParameters = governanceParameters,
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      quorum = quorum,
+      tokenContractAddress = test_sdao.address,
+    )
+    scenario += dao
+
+    scenario += test_sdao.mint(address = dao.address,
+                      amount = escrowAmount,
+                      metadata = tok0_md,
+                      token_id = 0).run(sender = admin)
+
+    # WHEN end voting is called
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = votingEndBlock + 1,
+    )    
+
+    # THEN the community fund receives the escrow.
+    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(Addresses.COMMUNITY_FUND_ADDRESS, 0)].balance == escrowAmount)
+    scenario.verify(test_sdao.data.ledger[test_sdao.ledger_key.make(dao.address, 0)].balance == 0)
+
+  @sp.add_test(name="endVoting - removes poll if quorum and super majority not met")
+  def test():
+    scenario = sp.test_scenario()
+    
+    # Given some governance parameters 
+    quorum = 100
+    escrowAmount = sp.nat(10)
+    voteDelayBlocks = sp.nat(1)
+    voteLengthBlocks = sp.nat(10)
+    minYayVotesPercentForEscrowReturn = sp.nat(20)
+    blocksInTimelockForExecution = sp.nat(30)
+    blocksInTimelockForCancellation = sp.nat(40)
+    percentageForSuperMajority = sp.nat(80)
+    quorumLowerCap = 62
+    quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
+    governanceParameters = sp.record(
+      escrowAmount = escrowAmount,
+      voteDelayBlocks = voteDelayBlocks,
+      voteLengthBlocks = voteLengthBlocks,
+      minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+      blocksInTimelockForExecution = blocksInTimelockForExecution,
+      blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+      percentageForSuperMajority = percentageForSuperMajority,
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
+    )
+
+    # AND a poll by Alice which fails to achieve quorum and fails to achieve a super majority
+    votingEndBlock = sp.nat(21)
+    totalVotes = quorum // 2
+    yayVotes = totalVotes // 2
+    nayVotes = totalVotes // 2
+    pollId = sp.nat(0)
+    poll = sp.record(
+      id = pollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = yayVotes,
+      nayVotes = nayVotes,
+      abstainVotes = sp.nat(0),
+      totalVotes = totalVotes,
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = escrowAmount,
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a dao contract with the parameters above.
+    dao = DaoContract(
+      governanceParameters = governanceParameters,
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: poll.votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      quorum = quorum,
+    )
+    scenario += dao
+
+    # WHEN end voting is called
+    scenario += dao.endVoting(pollId).run(
+      level = votingEndBlock + 1,
+    )    
+
+    # THEN the poll is removed 
+    scenario.verify(~dao.data.polls.contains(pollId))
+    scenario.verify(sp.len(dao.data.activePollStartBlocks) == 0)
+    scenario.verify(~dao.data.activePollStartBlocks.contains(pollId))
+
+    # AND the outcome for the poll is FAILED
+    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_FAILED)
 
     # AND it was not moved to the timelock
-    scenario.verify(~dao.data.timelockItem.is_some())    
+    scenario.verify(~dao.data.timelockItems.contains(pollId))
+
+  @sp.add_test(name="endVoting - removes poll if super majority achieved but quorum not met")
+  def test():
+    scenario = sp.test_scenario()
+    
+    # Given some governance parameters 
+    quorum = 100
+    escrowAmount = sp.nat(10)
+    voteDelayBlocks = sp.nat(1)
+    voteLengthBlocks = sp.nat(10)
+    minYayVotesPercentForEscrowReturn = sp.nat(20)
+    blocksInTimelockForExecution = sp.nat(30)
+    blocksInTimelockForCancellation = sp.nat(40)
+    percentageForSuperMajority = sp.nat(80)
+    quorumLowerCap = 62
+    quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
+    governanceParameters = sp.record(
+      escrowAmount = escrowAmount,
+      voteDelayBlocks = voteDelayBlocks,
+      voteLengthBlocks = voteLengthBlocks,
+      minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+      blocksInTimelockForExecution = blocksInTimelockForExecution,
+      blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+      percentageForSuperMajority = percentageForSuperMajority,
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
+    )
+
+    # AND a poll by Alice which fails to achieve quorum and but achieved a super majority
+    votingEndBlock = sp.nat(21)
+    totalVotes = quorum // 2
+    yayVotes = totalVotes
+    nayVotes = 0
+    pollId = sp.nat(0)
+    poll = sp.record(
+      id = pollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = yayVotes,
+      nayVotes = nayVotes,
+      abstainVotes = sp.nat(0),
+      totalVotes = totalVotes,
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = escrowAmount,
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a dao contract with the parameters above.
+    dao = DaoContract(
+      governanceParameters = governanceParameters,
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      quorum = quorum,
+    )
+    scenario += dao
+
+    # WHEN end voting is called
+    scenario += dao.endVoting(pollId).run(
+      level = votingEndBlock + 1,
+    )    
+
+    # THEN the poll under vote is removed 
+    scenario.verify(~dao.data.polls.contains(pollId))
+    scenario.verify(sp.len(dao.data.activePollStartBlocks) == 0)
+
+    # AND the outcome for the poll is FAILED
+    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_FAILED)
+
+    # AND it was not moved to the timelock
+    scenario.verify(~dao.data.timelockItems.contains(pollId))    
+
+  @sp.add_test(name="endVoting - removes poll if quorum met and super majority not achieved")
+  def test():
+    scenario = sp.test_scenario()
+    
+    # Given some governance parameters 
+    quorum = 100
+    escrowAmount = sp.nat(10)
+    voteDelayBlocks = sp.nat(1)
+    voteLengthBlocks = sp.nat(10)
+    minYayVotesPercentForEscrowReturn = sp.nat(20)
+    blocksInTimelockForExecution = sp.nat(30)
+    blocksInTimelockForCancellation = sp.nat(40)
+    percentageForSuperMajority = sp.nat(80)
+    quorumLowerCap = 62
+    quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
+    governanceParameters = sp.record(
+      escrowAmount = escrowAmount,
+      voteDelayBlocks = voteDelayBlocks,
+      voteLengthBlocks = voteLengthBlocks,
+      minYayVotesPercentForEscrowReturn = minYayVotesPercentForEscrowReturn,
+      blocksInTimelockForExecution = blocksInTimelockForExecution,
+      blocksInTimelockForCancellation = blocksInTimelockForCancellation,
+      percentageForSuperMajority = percentageForSuperMajority,
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
+    )
+
+    # AND a poll by Alice which achieves quorum and but failed to achieved a super majority
+    votingEndBlock = sp.nat(21)
+    totalVotes = quorum * 2
+    yayVotes = sp.nat(10)
+    nayVotes = sp.as_nat(totalVotes - yayVotes)
+    pollId = sp.nat(0)
+    poll = sp.record(
+      id = pollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = yayVotes,
+      nayVotes = nayVotes,
+      abstainVotes = sp.nat(0),
+      totalVotes = totalVotes,
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = escrowAmount,
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a dao contract with the parameters above.
+    dao = DaoContract(
+      governanceParameters = governanceParameters,
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      quorum = quorum,
+    )
+    scenario += dao
+
+    # WHEN end voting is called
+    scenario += dao.endVoting(pollId).run(
+      level = votingEndBlock + 1,
+    )    
+
+    # THEN the poll under vote is removed 
+    scenario.verify(~dao.data.polls.contains(pollId))
+    scenario.verify(sp.len(dao.data.activePollStartBlocks) == 0)
+
+    # AND the outcome for the poll is FAILED
+    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_FAILED)
+
+    # AND it was not moved to the timelock
+    scenario.verify(~dao.data.timelockItems.contains(pollId))    
 
   @sp.add_test(name="endVoting - moves proposal to timelock if super majority and quorum are achieved")
   def test():
@@ -1833,6 +2663,7 @@ if __name__ == "__main__":
     percentageForSuperMajority = sp.nat(80)
     quorumLowerCap = 62
     quorumCap = sp.record(lower = quorumLowerCap, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -1841,7 +2672,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a poll by Alice which achieves quorum and but failed to achieved a super majority
@@ -1857,7 +2689,7 @@ if __name__ == "__main__":
         title = proposalTitle,
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = sp.nat(11),
       votingEndBlock = votingEndBlock,
@@ -1865,53 +2697,207 @@ if __name__ == "__main__":
       nayVotes = nayVotes,
       abstainVotes = sp.nat(0),
       totalVotes = totalVotes,
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = escrowAmount,
       quorum = sp.nat(100),
-      quorumCap = quorumCap
+      authorIsVestingVault = False
+    )
+
+    # AND an item from an earlier poll is already in the timelock.
+    existingPollId = sp.nat(7)
+    existingTimelockItem = sp.record(
+      id = existingPollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      endBlock = sp.nat(10),
+      cancelBlock = sp.nat(20),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS
     )
 
     # AND a dao contract with the parameters above.
     dao = DaoContract(
       governanceParameters = governanceParameters,
-      poll = sp.some(poll),
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      timelockItems = sp.big_map(l = { existingPollId: existingTimelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE),
       quorum = quorum,
     )
     scenario += dao
 
     # WHEN end voting is called
-    scenario += dao.endVoting(sp.unit).run(
+    scenario += dao.endVoting(pollId).run(
       level = votingEndBlock + 1,
     )    
 
     # THEN the poll is removed 
-    scenario.verify(~dao.data.poll.is_some())
+    scenario.verify(~dao.data.polls.contains(pollId))
+    scenario.verify(sp.len(dao.data.activePollStartBlocks) == 0)
 
     # AND the outcome for the poll is IN_TIMELOCK
     scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_IN_TIMELOCK)
 
+    # AND the outcome summarizes the poll.
+    scenario.verify(dao.data.outcomes[pollId].id == pollId)
+    scenario.verify(dao.data.outcomes[pollId].proposalHash == sp.blake2b(sp.pack(poll.proposal)))
+    scenario.verify(dao.data.outcomes[pollId].author == Addresses.TOKEN_CONTRACT_ADDRESS)
+    scenario.verify(dao.data.outcomes[pollId].votingStartBlock == sp.nat(11))
+    scenario.verify(dao.data.outcomes[pollId].votingEndBlock == votingEndBlock)
+    scenario.verify(dao.data.outcomes[pollId].yayVotes == yayVotes)
+    scenario.verify(dao.data.outcomes[pollId].nayVotes == nayVotes)
+    scenario.verify(dao.data.outcomes[pollId].abstainVotes == sp.nat(0))
+    scenario.verify(dao.data.outcomes[pollId].totalVotes == totalVotes)
+    scenario.verify(dao.data.outcomes[pollId].quorum == sp.nat(100))
+
     # AND the proposal was moved to the timelock
-    scenario.verify(dao.data.timelockItem.is_some())    
-    scenario.verify(dao.data.timelockItem.open_some().proposal.title == proposalTitle)
+    scenario.verify(dao.data.timelockItems.contains(pollId))    
+    scenario.verify(dao.data.timelockItems[pollId].proposal.title == proposalTitle)
+
+    # AND the existing item is still in the timelock.
+    scenario.verify(dao.data.timelockItems.contains(existingPollId))
 
   ################################################################
   # vote
   ################################################################
 
-  @sp.add_test(name="vote - fails if in bad state")
+  @sp.add_test(name="vote - fails if no poll under vote")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a fake token contract
+    token = FakeToken.FakeTokenContract(result = sp.nat(50))
+    scenario += token
+  
+    # AND a dao contract with no poll.
+    dao = DaoContract(
+      escrowContractAddress = token.address
+    )
+    scenario += dao
+
+    # WHEN vote is called
+    # THEN the call fails.
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = VoteValue.YAY)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="vote - fails if escrow contract does not provide a balance")
+  def test():
+    scenario = sp.test_scenario()
+  
+    # GIVEN a poll.
+    votingStartBlock = sp.nat(11)
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'title',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = votingStartBlock,
+      votingEndBlock = sp.nat(20),
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = sp.nat(50),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a dao contract with an escrow address that has no getPriorBalance view.
+    dao = DaoContract(
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      escrowContractAddress = Addresses.NULL_ADDRESS,
+    )
+    scenario += dao
+
+    # WHEN vote is called
+    # THEN the call fails.
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = VoteValue.YAY)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = votingStartBlock + 1,
+      valid = False
+    )
+
+  @sp.add_test(name="vote - fails if already voted")
+  def test():
+    scenario = sp.test_scenario()
+    
+    # GIVEN a poll
+    votingStartBlock = sp.nat(11)
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'title',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = votingStartBlock,
+      votingEndBlock = sp.nat(20),
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = sp.nat(50),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )    
+
+    # AND a fake token contract
+    token = FakeToken.FakeTokenContract(result = sp.nat(50))
+    scenario += token
+
+    # AND a dao contract with a vote recorded for the VOTER_ADDRESS
+    dao = DaoContract(
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
+      voters = sp.big_map(
+        l = {
+          (sp.nat(0), Addresses.VOTER_ADDRESS): sp.record(
+            voteValue = VoteValue.YAY,
+            level = sp.nat(12),
+            votes = sp.nat(200),
+          )
+        },
+        tkey = VoteRecord.VOTE_RECORD_KEY_TYPE,
+        tvalue = VoteRecord.VOTE_RECORD_TYPE
+      )
+    )
+    scenario += dao
+
+    # WHEN vote is called by the VOTER_ADDRESS
+    # THEN the call fails.
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = VoteValue.YAY)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = votingStartBlock + 2,
+      valid = False
+    )
+
+  @sp.add_test(name="vote - allows voting when the address voted in a previous poll")
   def test():
     scenario = sp.test_scenario()
     
-    # GIVEN a poll.
+    # GIVEN a poll
+    pollId = sp.nat(1)
     votingStartBlock = sp.nat(11)
     poll = sp.record(
-      id = sp.nat(0),
+      id = pollId,
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
@@ -1919,63 +2905,105 @@ if __name__ == "__main__":
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract in the STATE_MACHINE_WAITING_FOR_BALANCE state
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = votingStartBlock,
-      voteValue = VoteValue.YAY
-    )
+    # AND a fake token contract
+    votingPower = sp.nat(50)
+    token = FakeToken.FakeTokenContract(result = votingPower)
+    scenario += token
+
+    # AND a dao contract where the VOTER_ADDRESS voted in the previous poll
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
+      voters = sp.big_map(
+        l = {
+          (sp.nat(0), Addresses.VOTER_ADDRESS): sp.record(
+            voteValue = VoteValue.NAY,
+            level = sp.nat(5),
+            votes = sp.nat(200),
+          )
+        },
+        tkey = VoteRecord.VOTE_RECORD_KEY_TYPE,
+        tvalue = VoteRecord.VOTE_RECORD_TYPE
+      )
     )
     scenario += dao
 
     # WHEN vote is called
-    # THEN the call fails.
-    scenario += dao.vote(VoteValue.YAY).run(
+    scenario += dao.vote(sp.record(pollId = pollId, voteValue = VoteValue.YAY)).run(
       sender = Addresses.VOTER_ADDRESS,
-      valid = False
+      level = votingStartBlock + 4,
     )
 
-  @sp.add_test(name="vote - fails if no poll under vote")
+    # THEN the vote is tallied in the current poll.
+    scenario.verify(dao.data.polls[pollId].yayVotes == votingPower)
+    scenario.verify(dao.data.polls[pollId].totalVotes == votingPower)
+
+    # AND the vote is recorded against the current poll.
+    scenario.verify(dao.data.voters[(pollId, Addresses.VOTER_ADDRESS)].votes == votingPower)
+
+    # AND the record for the previous poll is untouched.
+    scenario.verify(dao.data.voters[(sp.nat(0), Addresses.VOTER_ADDRESS)].voteValue == VoteValue.NAY)
+
+  @sp.add_test(name="vote - fails if voting finished")
   def test():
     scenario = sp.test_scenario()
-  
-    # GIVEN a dao contract with no poll.
+    
+    # GIVEN a poll
+    votingEndBlock = sp.nat(30)
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'title',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = sp.nat(50),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )    
+
+    # AND a fake token contract
+    token = FakeToken.FakeTokenContract(result = sp.nat(50))
+    scenario += token
+
+    # AND a dao contract
     dao = DaoContract(
-      poll = sp.none,
-      state = STATE_MACHINE_IDLE,
-      votingState = sp.none
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN vote is called
+    # WHEN vote is called after the voting has ended
     # THEN the call fails.
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = sp.nat(1),
-      result = sp.nat(50)
-    )
-    scenario += dao.vote(VoteValue.YAY).run(
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = VoteValue.YAY)).run(
       sender = Addresses.VOTER_ADDRESS,
+      level = votingEndBlock + 1,
       valid = False
-    )
+    )    
 
-  @sp.add_test(name="vote - succeeds at casting a vote")
+  @sp.add_test(name="vote - fails with a bad vote value")
   def test():
     scenario = sp.test_scenario()
-  
-    # GIVEN a poll.
+    
+    # GIVEN a poll
     votingStartBlock = sp.nat(11)
     poll = sp.record(
       id = sp.nat(0),
@@ -1983,7 +3011,7 @@ if __name__ == "__main__":
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
@@ -1991,595 +3019,692 @@ if __name__ == "__main__":
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
-    )
+      authorIsVestingVault = False
+    )    
 
     # AND a fake token contract
-    votingPower = sp.nat(50)
-    token = FakeToken.FakeTokenContract(result = votingPower)
+    token = FakeToken.FakeTokenContract(result = sp.nat(50))
     scenario += token
 
-    # AND and a dao contract holding the poll.
+    # AND a dao contract
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_IDLE,
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
       tokenContractAddress = token.address,
       escrowContractAddress = token.address,
-      votingState = sp.none
     )
     scenario += dao
 
-    # WHEN vote is called
-    scenario += dao.vote(VoteValue.YAY).run(
+    # WHEN vote is called with a value that is not yay, nay or abstain
+    # THEN the call fails.
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = sp.nat(3))).run(
       sender = Addresses.VOTER_ADDRESS,
       level = votingStartBlock + 1,
-    )
-
-    # THEN the vote tallies are incremented.
-    scenario.verify(dao.data.poll.open_some().yayVotes == votingPower)
-    scenario.verify(dao.data.poll.open_some().nayVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().abstainVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().totalVotes == votingPower)
-
-    # AND the VOTER_ADDRESS was recorded
-    scenario.verify(dao.data.poll.open_some().voters.contains(Addresses.VOTER_ADDRESS))
-
-    # AND the state machine is reset
-    scenario.verify(dao.data.state == STATE_MACHINE_IDLE)
-    scenario.verify(~dao.data.votingState.is_some())
-
-  ################################################################
-  # voteCallback
-  ################################################################
+      valid = False
+    )    
 
-  @sp.add_test(name="voteCallback - fails if in bad state")
+  @sp.add_test(name="vote - only tallies votes in the given poll")
   def test():
     scenario = sp.test_scenario()
     
-    # GIVEN a poll
-    poll = sp.record(
+    # GIVEN two polls
+    votingStartBlock = sp.nat(11)
+    firstPoll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
-    )    
+      authorIsVestingVault = False
+    )
+    secondPoll = sp.record(
+      id = sp.nat(1),
+      proposal = sp.record(
+        title = 'another title',
+        descriptionLink = 'ipfs://abc',
+        descriptionHash = "abc456",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = votingStartBlock,
+      votingEndBlock = sp.nat(20),
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = sp.nat(50),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a fake token contract
+    votingPower = sp.nat(50)
+    token = FakeToken.FakeTokenContract(result = votingPower)
+    scenario += token
 
-    # AND a dao contract in the STATE_MACHINE_IDLE state
+    # AND a dao contract with both polls under vote.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_IDLE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.none
+      polls = sp.big_map(
+        l = {
+          sp.nat(0): firstPoll,
+          sp.nat(1): secondPoll,
+        },
+        tkey = sp.TNat,
+        tvalue = Poll.POLL_TYPE
+      ),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock, sp.nat(1): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called
-    # THEN the call fails.
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = sp.nat(1),
-      result = sp.nat(50)
+    # WHEN the VOTER_ADDRESS votes yay on the second poll
+    scenario += dao.vote(sp.record(pollId = sp.nat(1), voteValue = VoteValue.YAY)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = votingStartBlock + 1,
     )
-    scenario += dao.voteCallback(result).run(
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
-      valid = False
+
+    # AND nay on the first poll
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = VoteValue.NAY)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = votingStartBlock + 2,
     )
 
-  @sp.add_test(name="voteCallback - fails if not called by token contract")
+    # THEN each poll only tallied its own vote.
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].nayVotes == votingPower)
+    scenario.verify(dao.data.polls[sp.nat(1)].yayVotes == votingPower)
+    scenario.verify(dao.data.polls[sp.nat(1)].nayVotes == sp.nat(0))
+
+    # AND a vote record exists for each poll.
+    scenario.verify(dao.data.voters[(sp.nat(0), Addresses.VOTER_ADDRESS)].voteValue == VoteValue.NAY)
+    scenario.verify(dao.data.voters[(sp.nat(1), Addresses.VOTER_ADDRESS)].voteValue == VoteValue.YAY)
+
+  @sp.add_test(name="vote - correctly tabulates yay votes")
   def test():
     scenario = sp.test_scenario()
     
     # GIVEN a poll
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = sp.nat(1),
-      voteValue = VoteValue.YAY
-    )
+    # AND a fake token contract
+    votingPower = sp.nat(50)
+    token = FakeToken.FakeTokenContract(result = votingPower)
+    scenario += token
+
+    # AND a dao contract holding the poll.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called by someone other than the token contract
-    # THEN the call fails.
-    notTokenContract = Addresses.NULL_ADDRESS
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = sp.nat(1),
-      result = sp.nat(50)
-    )
-    scenario += dao.voteCallback(result).run(
-      sender = notTokenContract,
-      valid = False
-    )  
+    # WHEN a yay vote is cast
+    voteValue = VoteValue.YAY
+    voteLevel = sp.nat(20)
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = voteLevel,
+    )
+
+    # THEN the vote tallies are incremented.
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == votingPower)
+    scenario.verify(dao.data.polls[sp.nat(0)].nayVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].abstainVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].totalVotes == votingPower)
+
+    # AND the VOTER_ADDRESS was recorded with the correct metadata.
+    voterKey = (sp.nat(0), Addresses.VOTER_ADDRESS)
+    scenario.verify(dao.data.voters.contains(voterKey))
+    scenario.verify(dao.data.voters[voterKey].voteValue == voteValue)
+    scenario.verify(dao.data.voters[voterKey].level == voteLevel)
+    scenario.verify(dao.data.voters[voterKey].votes == votingPower)
 
-  @sp.add_test(name="voteCallback - fails if callback contains bad address")
+  @sp.add_test(name="vote - correctly tabulates nay votes")
   def test():
     scenario = sp.test_scenario()
     
     # GIVEN a poll
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract
-    voteRequestLevel = sp.nat(1)
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = VoteValue.YAY
-    )
+    # AND a fake token contract
+    votingPower = sp.nat(50)
+    token = FakeToken.FakeTokenContract(result = votingPower)
+    scenario += token
+
+    # AND a dao contract holding the poll.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called by with an address other than the address requested
-    # THEN the call fails.
-    result = sp.record(
-      address = Addresses.NULL_ADDRESS,
-      level = voteRequestLevel,
-      result = sp.nat(50)
+    # WHEN a nay vote is cast
+    voteValue = VoteValue.NAY
+    voteLevel = sp.nat(20)
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = voteLevel,
     )
-    scenario += dao.voteCallback(result).run(
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
-      valid = False
-    )    
 
-  @sp.add_test(name="voteCallback - fails if callback contains bad level")
+    # THEN the vote tallies are incremented.
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].nayVotes == votingPower)
+    scenario.verify(dao.data.polls[sp.nat(0)].abstainVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].totalVotes == votingPower)
+
+    # AND the VOTER_ADDRESS was recorded with the correct metadata.
+    voterKey = (sp.nat(0), Addresses.VOTER_ADDRESS)
+    scenario.verify(dao.data.voters.contains(voterKey))
+    scenario.verify(dao.data.voters[voterKey].voteValue == voteValue)
+    scenario.verify(dao.data.voters[voterKey].level == voteLevel)
+    scenario.verify(dao.data.voters[voterKey].votes == votingPower)
+
+  @sp.add_test(name="vote - correctly tabulates abstain votes")
   def test():
     scenario = sp.test_scenario()
     
     # GIVEN a poll
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract
-    voteRequestLevel = sp.nat(1)
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = VoteValue.YAY
-    )
+    # AND a fake token contract
+    votingPower = sp.nat(50)
+    token = FakeToken.FakeTokenContract(result = votingPower)
+    scenario += token
+
+    # AND a dao contract holding the poll.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called by with a level other than the level requested
-    # THEN the call fails.
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel + 1,
-      result = sp.nat(50)
-    )
-    scenario += dao.voteCallback(result).run(
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
-      valid = False
+    # WHEN an abstain vote is cast
+    voteValue = VoteValue.ABSTAIN
+    voteLevel = sp.nat(20)
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = voteLevel,
     )
 
-  @sp.add_test(name="voteCallback - fails if already voted")
+    # THEN the vote tallies are incremented.
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].nayVotes == sp.nat(0))
+    scenario.verify(dao.data.polls[sp.nat(0)].abstainVotes == votingPower)
+    scenario.verify(dao.data.polls[sp.nat(0)].totalVotes == votingPower)
+
+    # AND the VOTER_ADDRESS was recorded with the correct metadata.
+    voterKey = (sp.nat(0), Addresses.VOTER_ADDRESS)
+    scenario.verify(dao.data.voters.contains(voterKey))
+    scenario.verify(dao.data.voters[voterKey].voteValue == voteValue)
+    scenario.verify(dao.data.voters[voterKey].level == voteLevel)
+    scenario.verify(dao.data.voters[voterKey].votes == votingPower)
+
+  ################################################################
+  # voteBySig
+  ################################################################
+
+  @sp.add_test(name="voteBySig - tallies a batch of signed votes")
   def test():
     scenario = sp.test_scenario()
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Robert")
+    chainId = sp.chain_id_cst("0x9caecab9")
     
-    # GIVEN a poll where the VOTER_ADDRESS has voted
+    # GIVEN a poll
+    pollId = sp.nat(0)
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
-      id = sp.nat(0),
+      id = pollId,
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = sp.map(
-        l = {
-          Addresses.VOTER_ADDRESS: sp.record(
-            voteValue = VoteValue.YAY,
-            level = sp.nat(12),
-            votes = sp.nat(200),
-          )
-        }
-      ),
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract
-    voteRequestLevel = sp.nat(1)
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = VoteValue.YAY
-    )
+    # AND a fake token contract
+    votingPower = sp.nat(50)
+    token = FakeToken.FakeTokenContract(result = votingPower)
+    scenario += token
+
+    # AND a dao contract holding the poll.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called by the VOTER_ADDRESS
-    # THEN the call fails.
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      result = sp.nat(50)
-    )
-    scenario += dao.voteCallback(result).run(
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
-      valid = False
+    # AND a yay vote signed by Alice and a nay vote signed by Bob.
+    alicePayload = sp.set_type_expr(
+      sp.record(chainId = chainId, daoAddress = dao.address, pollId = pollId, voteValue = VoteValue.YAY, nonce = sp.nat(0)),
+      SIGNED_VOTE_PAYLOAD_TYPE
+    )
+    aliceVote = sp.record(
+      publicKey = alice.public_key,
+      pollId = pollId,
+      voteValue = VoteValue.YAY,
+      nonce = sp.nat(0),
+      signature = sp.make_signature(alice.secret_key, sp.pack(alicePayload), message_format = "Raw")
+    )
+    bobPayload = sp.set_type_expr(
+      sp.record(chainId = chainId, daoAddress = dao.address, pollId = pollId, voteValue = VoteValue.NAY, nonce = sp.nat(0)),
+      SIGNED_VOTE_PAYLOAD_TYPE
+    )
+    bobVote = sp.record(
+      publicKey = bob.public_key,
+      pollId = pollId,
+      voteValue = VoteValue.NAY,
+      nonce = sp.nat(0),
+      signature = sp.make_signature(bob.secret_key, sp.pack(bobPayload), message_format = "Raw")
+    )
+
+    # WHEN a relayer submits both votes
+    scenario += dao.voteBySig([aliceVote, bobVote]).run(
+      sender = Addresses.NULL_ADDRESS,
+      level = votingStartBlock + 1,
+      chain_id = chainId
     )
 
-  @sp.add_test(name="voteCallback - fails if voting finished")
+    # THEN both votes are tallied.
+    scenario.verify(dao.data.polls[pollId].yayVotes == votingPower)
+    scenario.verify(dao.data.polls[pollId].nayVotes == votingPower)
+    scenario.verify(dao.data.polls[pollId].totalVotes == votingPower + votingPower)
+
+    # AND the votes are recorded against the signers rather than the relayer.
+    scenario.verify(dao.data.voters[(pollId, alice.address)].voteValue == VoteValue.YAY)
+    scenario.verify(dao.data.voters[(pollId, bob.address)].voteValue == VoteValue.NAY)
+    scenario.verify(~dao.data.voters.contains((pollId, Addresses.NULL_ADDRESS)))
+
+    # AND the nonces of the signers are consumed.
+    scenario.verify(dao.data.voteNonces[alice.address] == sp.nat(1))
+    scenario.verify(dao.data.voteNonces[bob.address] == sp.nat(1))
+
+  @sp.add_test(name="voteBySig - fails if the vote was not signed by the voter")
   def test():
     scenario = sp.test_scenario()
+
+    alice = sp.test_account("Alice")
+    bob = sp.test_account("Robert")
+    chainId = sp.chain_id_cst("0x9caecab9")
     
     # GIVEN a poll
-    votingEndBlock = sp.nat(30)
+    pollId = sp.nat(0)
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
-      id = sp.nat(0),
+      id = pollId,
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
-      votingEndBlock = votingEndBlock,
+      votingStartBlock = votingStartBlock,
+      votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract
-    voteRequestLevel = sp.nat(1)
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = VoteValue.YAY
-    )
+    # AND a fake token contract
+    token = FakeToken.FakeTokenContract(result = sp.nat(50))
+    scenario += token
+
+    # AND a dao contract holding the poll.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { pollId: poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { pollId: votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called after the voting has ended
-    # THEN the call fails.
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      result = sp.nat(50)
+    # AND a vote for Alice which was signed by Bob.
+    payload = sp.set_type_expr(
+      sp.record(chainId = chainId, daoAddress = dao.address, pollId = pollId, voteValue = VoteValue.YAY, nonce = sp.nat(0)),
+      SIGNED_VOTE_PAYLOAD_TYPE
     )
-    scenario += dao.voteCallback(result).run(
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
-      level = votingEndBlock + 1,
+    forgedVote = sp.record(
+      publicKey = alice.public_key,
+      pollId = pollId,
+      voteValue = VoteValue.YAY,
+      nonce = sp.nat(0),
+      signature = sp.make_signature(bob.secret_key, sp.pack(payload), message_format = "Raw")
+    )
+
+    # WHEN the vote is submitted
+    # THEN the call fails.
+    scenario += dao.voteBySig([forgedVote]).run(
+      sender = bob.address,
+      level = votingStartBlock + 1,
+      chain_id = chainId,
       valid = False
-    )    
+    )
 
-  @sp.add_test(name="voteCallback - correctly tabulates yay votes")
+  @sp.add_test(name="voteBySig - fails if a signed vote is replayed")
   def test():
     scenario = sp.test_scenario()
+
+    alice = sp.test_account("Alice")
+    chainId = sp.chain_id_cst("0x9caecab9")
     
-    # GIVEN a poll where the VOTER_ADDRESS has voted
-    poll = sp.record(
+    # GIVEN two polls
+    votingStartBlock = sp.nat(11)
+    firstPoll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
-    )    
-
-    # AND a dao contract with a yay vote
-    voteRequestLevel = sp.nat(1)
-    voteValue = VoteValue.YAY
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = voteValue
+      authorIsVestingVault = False
+    )
+    secondPoll = sp.record(
+      id = sp.nat(1),
+      proposal = sp.record(
+        title = 'another title',
+        descriptionLink = 'ipfs://abc',
+        descriptionHash = "abc456",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = votingStartBlock,
+      votingEndBlock = sp.nat(20),
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      escrowAmount = sp.nat(50),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
     )
+
+    # AND a fake token contract
+    token = FakeToken.FakeTokenContract(result = sp.nat(50))
+    scenario += token
+
+    # AND a dao contract with both polls under vote.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(
+        l = {
+          sp.nat(0): firstPoll,
+          sp.nat(1): secondPoll,
+        },
+        tkey = sp.TNat,
+        tvalue = Poll.POLL_TYPE
+      ),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock, sp.nat(1): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = token.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called
-    votingPower = sp.nat(50)
-    voteLevel = sp.nat(20)
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      result = votingPower
+    # AND Alice's signed vote on the first poll has been submitted.
+    payload = sp.set_type_expr(
+      sp.record(chainId = chainId, daoAddress = dao.address, pollId = sp.nat(0), voteValue = VoteValue.YAY, nonce = sp.nat(0)),
+      SIGNED_VOTE_PAYLOAD_TYPE
     )
-    scenario += dao.voteCallback(result).run(
-      level = voteLevel,
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
+    signature = sp.make_signature(alice.secret_key, sp.pack(payload), message_format = "Raw")
+    scenario += dao.voteBySig([
+      sp.record(
+        publicKey = alice.public_key,
+        pollId = sp.nat(0),
+        voteValue = VoteValue.YAY,
+        nonce = sp.nat(0),
+        signature = signature
+      )
+    ]).run(
+      level = votingStartBlock + 1,
+      chain_id = chainId
     )
 
-    # THEN the vote tallies are incremented.
-    scenario.verify(dao.data.poll.open_some().yayVotes == votingPower)
-    scenario.verify(dao.data.poll.open_some().nayVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().abstainVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().totalVotes == votingPower)
+    # WHEN the signature is replayed against the second poll
+    # THEN the call fails.
+    scenario += dao.voteBySig([
+      sp.record(
+        publicKey = alice.public_key,
+        pollId = sp.nat(1),
+        voteValue = VoteValue.YAY,
+        nonce = sp.nat(0),
+        signature = signature
+      )
+    ]).run(
+      level = votingStartBlock + 2,
+      chain_id = chainId,
+      valid = False
+    )
 
-    # AND the VOTER_ADDRESS was recorded with the correct metadata.
-    scenario.verify(dao.data.poll.open_some().voters.contains(Addresses.VOTER_ADDRESS))
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].voteValue == voteValue)
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].level == voteLevel)
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].votes == votingPower)
+    # AND the second poll is untouched.
+    scenario.verify(dao.data.polls[sp.nat(1)].totalVotes == sp.nat(0))
 
-    # AND the state machine is reset
-    scenario.verify(dao.data.state == STATE_MACHINE_IDLE)
-    scenario.verify(~dao.data.votingState.is_some())
+  ###############################################################
+  # voteFromVault
+  ###############################################################
 
-  @sp.add_test(name="voteCallback - correctly tabulates nay votes")
+  @sp.add_test(name="voteFromVault - tallies escrowed and vested voting power of the owner")
   def test():
     scenario = sp.test_scenario()
     
-    # GIVEN a poll where the VOTER_ADDRESS has voted
+    # GIVEN a poll
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract with a nay vote
-    voteRequestLevel = sp.nat(1)
-    voteValue = VoteValue.NAY
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = voteValue
-    )
+    # AND a fake escrow contract
+    escrowedVotingPower = sp.nat(50)
+    escrow = FakeToken.FakeTokenContract(result = escrowedVotingPower)
+    scenario += escrow
+
+    # AND a fake vesting vault
+    vestedVotingPower = sp.nat(30)
+    vault = FakeToken.FakeTokenContract(result = vestedVotingPower)
+    scenario += vault
+
+    # AND a dao contract holding the poll, which allows the vault to vote.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      escrowContractAddress = escrow.address,
+      vestingVaults = sp.big_map(l = { vault.address: sp.unit }, tkey = sp.TAddress, tvalue = sp.TUnit),
     )
     scenario += dao
 
-    # WHEN voteCallback is called
-    votingPower = sp.nat(50)
-    voteLevel = sp.nat(20)
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      result = votingPower
-    )
-    scenario += dao.voteCallback(result).run(
-      level = voteLevel,
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
+    # WHEN the vault votes on behalf of an owner
+    voteValue = VoteValue.YAY
+    scenario += dao.voteFromVault(sp.record(owner = Addresses.VOTER_ADDRESS, pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = vault.address,
+      level = sp.nat(20),
     )
 
-    # THEN the vote tallies are incremented.
-    scenario.verify(dao.data.poll.open_some().yayVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().nayVotes == votingPower)
-    scenario.verify(dao.data.poll.open_some().abstainVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().totalVotes == votingPower)
+    # THEN the owner's escrowed and vested voting power are tallied together.
+    expectedVotes = escrowedVotingPower + vestedVotingPower
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == expectedVotes)
+    scenario.verify(dao.data.polls[sp.nat(0)].totalVotes == expectedVotes)
 
-    # AND the VOTER_ADDRESS was recorded with the correct metadata.
-    scenario.verify(dao.data.poll.open_some().voters.contains(Addresses.VOTER_ADDRESS))
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].voteValue == voteValue)
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].level == voteLevel)
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].votes == votingPower)
+    # AND the vote is recorded for the owner.
+    voterKey = (sp.nat(0), Addresses.VOTER_ADDRESS)
+    scenario.verify(dao.data.voters[voterKey].votes == expectedVotes)
 
-    # AND the state machine is reset
-    scenario.verify(dao.data.state == STATE_MACHINE_IDLE)
-    scenario.verify(~dao.data.votingState.is_some())
+    # AND the owner can not vote again directly.
+    scenario += dao.vote(sp.record(pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = Addresses.VOTER_ADDRESS,
+      level = sp.nat(20),
+      valid = False
+    )
 
-  @sp.add_test(name="voteCallback - correctly tabulates abstain votes")
+  @sp.add_test(name="voteFromVault - fails if not called by a vesting vault")
   def test():
     scenario = sp.test_scenario()
     
-    # GIVEN a poll where the VOTER_ADDRESS has voted
+    # GIVEN a poll
+    votingStartBlock = sp.nat(11)
     poll = sp.record(
       id = sp.nat(0),
       proposal = sp.record(
         title = 'title',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
-      votingStartBlock = sp.nat(11),
+      votingStartBlock = votingStartBlock,
       votingEndBlock = sp.nat(20),
       yayVotes = sp.nat(0),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(0),
-      voters = {},
       author = Addresses.TOKEN_CONTRACT_ADDRESS,
       escrowAmount = sp.nat(50),
       quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+      authorIsVestingVault = False
     )    
 
-    # AND a dao contract with an abstain vote
-    voteRequestLevel = sp.nat(1)
-    voteValue = VoteValue.ABSTAIN
-    votingState = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      voteValue = voteValue
-    )
+    # AND a fake escrow contract
+    escrow = FakeToken.FakeTokenContract(result = sp.nat(50))
+    scenario += escrow
+
+    # AND a contract which is not a vesting vault of the dao
+    notVault = FakeToken.FakeTokenContract(result = sp.nat(1000))
+    scenario += notVault
+
+    # AND a dao contract holding the poll.
     dao = DaoContract(
-      poll = sp.some(poll),
-      state = STATE_MACHINE_WAITING_FOR_BALANCE,
-      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      votingState = sp.some(votingState)
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): votingStartBlock }, tkey = sp.TNat, tvalue = sp.TNat),
+      escrowContractAddress = escrow.address,
     )
     scenario += dao
 
-    # WHEN voteCallback is called
-    votingPower = sp.nat(50)
-    voteLevel = sp.nat(20)
-    result = sp.record(
-      address = Addresses.VOTER_ADDRESS,
-      level = voteRequestLevel,
-      result = votingPower
-    )
-    scenario += dao.voteCallback(result).run(
-      level = voteLevel,
-      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
+    # WHEN voteFromVault is called by a contract which is not a vesting vault
+    # THEN the call fails.
+    scenario += dao.voteFromVault(sp.record(owner = Addresses.VOTER_ADDRESS, pollId = sp.nat(0), voteValue = VoteValue.YAY)).run(
+      sender = notVault.address,
+      level = sp.nat(20),
+      valid = False
     )
 
-    # THEN the vote tallies are incremented.
-    scenario.verify(dao.data.poll.open_some().yayVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().nayVotes == sp.nat(0))
-    scenario.verify(dao.data.poll.open_some().abstainVotes == votingPower)
-    scenario.verify(dao.data.poll.open_some().totalVotes == votingPower)
-
-    # AND the VOTER_ADDRESS was recorded with the correct metadata.
-    scenario.verify(dao.data.poll.open_some().voters.contains(Addresses.VOTER_ADDRESS))
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].voteValue == voteValue)
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].level == voteLevel)
-    scenario.verify(dao.data.poll.open_some().voters[Addresses.VOTER_ADDRESS].votes == votingPower)
-
-    # AND the state machine is reset
-    scenario.verify(dao.data.state == STATE_MACHINE_IDLE)
-    scenario.verify(~dao.data.votingState.is_some())
-
   ###############################################################
   # executeTimelock
   ###############################################################
@@ -2590,16 +3715,49 @@ if __name__ == "__main__":
     
     # GIVEN a dao contract without an item in the timelock
     dao = DaoContract(
-      timelockItem = sp.none
     )
     scenario += dao
 
     # WHEN executeTimelock is called
     # THEN the call fails.
-    scenario += dao.executeTimelock(sp.unit).run(
+    scenario += dao.executeTimelock(sp.record(pollId = sp.nat(0), proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))).run(
       valid = False
     )
   
+  @sp.add_test(name="executeTimelock - fails if the poll has no item in the timelock")
+  def test():
+    scenario = sp.test_scenario()
+  
+    # GIVEN an item in the timelock for poll 0
+    endBlock = sp.nat(10)
+    cancelBlock = sp.nat(20)
+    timelockItem = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      endBlock = endBlock,
+      cancelBlock = cancelBlock,
+      author = Addresses.TOKEN_CONTRACT_ADDRESS
+    )
+
+    # AND a dao contract with the item.
+    dao = DaoContract(
+      timelockItems = sp.big_map(l = { sp.nat(0): timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE)
+    )
+    scenario += dao
+
+    # WHEN executeTimelock is called for poll 1, which has no item
+    # THEN the call fails.
+    scenario += dao.executeTimelock(sp.record(pollId = sp.nat(1), proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))).run(
+      level = endBlock + 1,
+      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
+      valid = False
+    )
+
   @sp.add_test(name="executeTimelock - fails if before endBlock")
   def test():
     scenario = sp.test_scenario()
@@ -2613,7 +3771,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       endBlock = endBlock,
       cancelBlock = cancelBlock,
@@ -2622,13 +3780,13 @@ if __name__ == "__main__":
 
     # AND a dao contract with the item.
     dao = DaoContract(
-      timelockItem = sp.some(timelockItem)
+      timelockItems = sp.big_map(l = { sp.nat(0): timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE)
     )
     scenario += dao
 
     # WHEN executeTimelock is called before the endblock
     # THEN the call fails.
-    scenario += dao.executeTimelock(sp.unit).run(
+    scenario += dao.executeTimelock(sp.record(pollId = sp.nat(0), proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))).run(
       level = sp.as_nat(endBlock - 1),
       sender = Addresses.TOKEN_CONTRACT_ADDRESS,
       valid = False
@@ -2647,7 +3805,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       endBlock = endBlock,
       cancelBlock = cancelBlock,
@@ -2656,19 +3814,70 @@ if __name__ == "__main__":
 
     # AND a dao contract with the item.
     dao = DaoContract(
-      timelockItem = sp.some(timelockItem)
+      timelockItems = sp.big_map(l = { sp.nat(0): timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE)
     )
     scenario += dao
 
     # WHEN executeTimelock is called by someone other than the author
     # THEN the call fails.
     notAuthor = Addresses.NULL_ADDRESS
-    scenario += dao.executeTimelock(sp.unit).run(
+    scenario += dao.executeTimelock(sp.record(pollId = sp.nat(0), proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))).run(
       level = endBlock + 1,
       sender = notAuthor,
       valid = False
     )
 
+  @sp.add_test(name="executeTimelock - fails if lambda does not match the proposal's lambda hash")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a store value contract with the dao as the admin.
+    storeContract = Store.StoreValueContract(value = 0, admin = Addresses.TOKEN_ADMIN_ADDRESS)
+    scenario += storeContract
+
+    # AND an item in the timelock with a lambda that does nothing
+    pollId = sp.nat(0)
+    endBlock = sp.nat(10)
+    cancelBlock = sp.nat(20)
+    timelockItem = sp.record(
+      id = pollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      endBlock = endBlock,
+      cancelBlock = cancelBlock,
+      author = Addresses.TOKEN_CONTRACT_ADDRESS
+    )
+
+    # AND a dao contract with the item.
+    dao = DaoContract(
+      timelockItems = sp.big_map(l = { pollId: timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE)
+    )
+    scenario += dao
+
+    # AND the store contract has the dao as the admin.
+    scenario += storeContract.setAdmin(dao.address)
+
+    # WHEN executeTimelock is called with a different lambda
+    newValue = sp.nat(3)
+    def updateLambda(unitParam):
+      sp.set_type(unitParam, sp.TUnit)
+      storeContractHandle = sp.contract(sp.TNat, storeContract.address, 'replace').open_some()
+      sp.result([sp.transfer_operation(newValue, sp.mutez(0), storeContractHandle)])
+
+    # THEN the call fails.
+    scenario += dao.executeTimelock(sp.record(pollId = pollId, proposalLambda = updateLambda)).run(
+      level = endBlock + 1,
+      sender = Addresses.TOKEN_CONTRACT_ADDRESS,
+      valid = False
+    )
+
+    # AND the item is still in the timelock.
+    scenario.verify(dao.data.timelockItems.contains(pollId))
+
   @sp.add_test(name="executeTimelock - can execute proposal")
   def test():
     scenario = sp.test_scenario()
@@ -2693,43 +3902,33 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = updateLambda
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
       ),
       endBlock = endBlock,
       cancelBlock = cancelBlock,
       author = Addresses.TOKEN_CONTRACT_ADDRESS
     )
 
-    poll = sp.record(
+    historicalOutcome = sp.record(
+      outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
       id = pollId,
-      proposal = sp.record(
-        title = "timelocked prop",
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
+      proposalHash = sp.bytes("0x"),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
       votingStartBlock = sp.nat(1),
       votingEndBlock = sp.nat(5),
       yayVotes = sp.nat(100),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(100),
-      voters = {},
-      author = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowAmount = sp.nat(2),
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(0), upper = sp.nat(1000))
+      quorum = sp.nat(100)
     )
 
     # AND a dao contract with the item.
     dao = DaoContract(
-      timelockItem = sp.some(timelockItem),
+      timelockItems = sp.big_map(l = { pollId: timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE),
       outcomes = sp.big_map(
         l = {
-            pollId: sp.record(
-              outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
-              poll = poll
-            )
+            pollId: historicalOutcome
         },
         tkey = sp.TNat,
         tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE,
@@ -2742,7 +3941,7 @@ if __name__ == "__main__":
 
     # WHEN executeTimelock is called by the author after the endBlock
     notAuthor = Addresses.NULL_ADDRESS
-    scenario += dao.executeTimelock(sp.unit).run(
+    scenario += dao.executeTimelock(sp.record(pollId = pollId, proposalLambda = updateLambda)).run(
       level = endBlock + 1,
       sender = Addresses.TOKEN_CONTRACT_ADDRESS,
     )
@@ -2753,8 +3952,12 @@ if __name__ == "__main__":
     # AND the historical outcome is updated.
     scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_EXECUTED)
 
+    # AND the rest of the historical outcome is unchanged.
+    scenario.verify(dao.data.outcomes[pollId].totalVotes == historicalOutcome.totalVotes)
+    scenario.verify(dao.data.outcomes[pollId].author == historicalOutcome.author)
+
     # AND the timelock is empty.
-    scenario.verify(~dao.data.timelockItem.is_some())
+    scenario.verify(~dao.data.timelockItems.contains(pollId))
 
   ################################################################
   # cancelTimelock
@@ -2766,13 +3969,12 @@ if __name__ == "__main__":
     
     # GIVEN a dao contract without an item in the timelock
     dao = DaoContract(
-      timelockItem = sp.none
     )
     scenario += dao
 
     # WHEN cancelTimelock is called
     # THEN the call fails.
-    scenario += dao.cancelTimelock(sp.unit).run(
+    scenario += dao.cancelTimelock(sp.nat(0)).run(
       valid = False
     )
   
@@ -2789,7 +3991,7 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       endBlock = endBlock,
       cancelBlock = cancelBlock,
@@ -2798,13 +4000,13 @@ if __name__ == "__main__":
 
     # AND a dao contract with the item.
     dao = DaoContract(
-      timelockItem = sp.some(timelockItem)
+      timelockItems = sp.big_map(l = { sp.nat(0): timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE)
     )
     scenario += dao
 
     # WHEN cancelTimelock is called before the cancelBlock
     # THEN the call fails.
-    scenario += dao.cancelTimelock(sp.unit).run(
+    scenario += dao.cancelTimelock(sp.nat(0)).run(
       level = sp.as_nat(cancelBlock - 1),
       valid = False
     )
@@ -2823,43 +4025,33 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
       ),
       endBlock = endBlock,
       cancelBlock = cancelBlock,
       author = Addresses.TOKEN_CONTRACT_ADDRESS
     )
 
-    poll = sp.record(
+    historicalOutcome = sp.record(
+      outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
       id = pollId,
-      proposal = sp.record(
-        title = "timelocked prop",
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
+      proposalHash = sp.bytes("0x"),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
       votingStartBlock = sp.nat(1),
       votingEndBlock = sp.nat(5),
       yayVotes = sp.nat(100),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(100),
-      voters = {},
-      author = Addresses.TOKEN_CONTRACT_ADDRESS,
-      escrowAmount = sp.nat(2),
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(0), upper = sp.nat(1000))
+      quorum = sp.nat(100)
     )
 
     # AND a dao contract with the item.
     dao = DaoContract(
-      timelockItem = sp.some(timelockItem),
+      timelockItems = sp.big_map(l = { pollId: timelockItem }, tkey = sp.TNat, tvalue = TIMELOCK_ITEM_TYPE),
       outcomes = sp.big_map(
         l = {
-            pollId: sp.record(
-              outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
-              poll = poll
-            )
+            pollId: historicalOutcome
         },
         tkey = sp.TNat,
         tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE,
@@ -2868,7 +4060,7 @@ if __name__ == "__main__":
     scenario += dao
 
     # WHEN cancelTimelock is called at the cancelBlock
-    scenario += dao.cancelTimelock(sp.unit).run(
+    scenario += dao.cancelTimelock(pollId).run(
       level = cancelBlock
     )    
 
@@ -2876,7 +4068,93 @@ if __name__ == "__main__":
     scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_CANCELLED)
 
     # THEN the item is removed.
-    scenario.verify(~dao.data.timelockItem.is_some())
+    scenario.verify(~dao.data.timelockItems.contains(pollId))
+
+  @sp.add_test(name="cancelTimelock - only cancels the item for the given poll")
+  def test():
+    scenario = sp.test_scenario()
+  
+    # GIVEN an item in the timelock which is cancellable
+    pollId = sp.nat(0)
+    cancelBlock = sp.nat(20)
+    timelockItem = sp.record(
+      id = pollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      endBlock = sp.nat(10),
+      cancelBlock = cancelBlock,
+      author = Addresses.TOKEN_CONTRACT_ADDRESS
+    )
+
+    # AND a later item in the timelock which is not yet cancellable
+    laterPollId = sp.nat(1)
+    laterTimelockItem = sp.record(
+      id = laterPollId,
+      proposal = sp.record(
+        title = 'another timelocked prop',
+        descriptionLink = 'ipfs://abc',
+        descriptionHash = "abc456",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      endBlock = sp.nat(30),
+      cancelBlock = sp.nat(40),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS
+    )
+
+    historicalOutcome = sp.record(
+      outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
+      id = pollId,
+      proposalHash = sp.bytes("0x"),
+      author = Addresses.TOKEN_CONTRACT_ADDRESS,
+      votingStartBlock = sp.nat(1),
+      votingEndBlock = sp.nat(5),
+      yayVotes = sp.nat(100),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(100),
+      quorum = sp.nat(100)
+    )
+
+    # AND a dao contract with both items.
+    dao = DaoContract(
+      timelockItems = sp.big_map(
+        l = {
+          pollId: timelockItem,
+          laterPollId: laterTimelockItem,
+        },
+        tkey = sp.TNat,
+        tvalue = TIMELOCK_ITEM_TYPE
+      ),
+      outcomes = sp.big_map(
+        l = {
+            pollId: historicalOutcome
+        },
+        tkey = sp.TNat,
+        tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE,
+      )
+    )
+    scenario += dao
+
+    # WHEN cancelTimelock is called for the first poll at its cancelBlock
+    scenario += dao.cancelTimelock(pollId).run(
+      level = cancelBlock
+    )    
+
+    # THEN the first item is removed.
+    scenario.verify(~dao.data.timelockItems.contains(pollId))
+
+    # AND the later item is untouched.
+    scenario.verify(dao.data.timelockItems.contains(laterPollId))
+
+    # AND the later item cannot be cancelled yet.
+    scenario += dao.cancelTimelock(laterPollId).run(
+      level = cancelBlock,
+      valid = False
+    )
 
   ################################################################
   # setParameters
@@ -2895,6 +4173,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -2903,7 +4182,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a dao contract.
@@ -2921,6 +4201,7 @@ if __name__ == "__main__":
     newblocksInTimelockForCancellation = sp.nat(41)
     newPercentageForSuperMajority = sp.nat(81)
     newQuorumCap = sp.record(lower = 2, upper = 98)
+    newMaxActivePolls = sp.nat(6)
     newGovernanceParameters = sp.record(
       escrowAmount = newEscrowAmount,
       voteDelayBlocks = newVoteDelayBlocks,
@@ -2929,7 +4210,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = newblocksInTimelockForExecution,
       blocksInTimelockForCancellation = newblocksInTimelockForCancellation,
       percentageForSuperMajority = newPercentageForSuperMajority,
-      quorumCap = newQuorumCap
+      quorumCap = newQuorumCap,
+      maxActivePolls = newMaxActivePolls
     )
 
     scenario += dao.setParameters(newGovernanceParameters).run(
@@ -2946,6 +4228,7 @@ if __name__ == "__main__":
     scenario.verify(dao.data.governanceParameters.percentageForSuperMajority == newPercentageForSuperMajority)
     scenario.verify(dao.data.governanceParameters.quorumCap.lower == newQuorumCap.lower)
     scenario.verify(dao.data.governanceParameters.quorumCap.upper == newQuorumCap.upper)
+    scenario.verify(dao.data.governanceParameters.maxActivePolls == newMaxActivePolls)
 
   @sp.add_test(name="setParameters - fails if not called by dao")
   def test():
@@ -2960,6 +4243,7 @@ if __name__ == "__main__":
     blocksInTimelockForCancellation = sp.nat(40)
     percentageForSuperMajority = sp.nat(80)
     quorumCap = sp.record(lower = 1, upper = 99)
+    maxActivePolls = sp.nat(5)
     governanceParameters = sp.record(
       escrowAmount = escrowAmount,
       voteDelayBlocks = voteDelayBlocks,
@@ -2968,7 +4252,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = blocksInTimelockForExecution,
       blocksInTimelockForCancellation = blocksInTimelockForCancellation,
       percentageForSuperMajority = percentageForSuperMajority,
-      quorumCap = quorumCap
+      quorumCap = quorumCap,
+      maxActivePolls = maxActivePolls
     )
 
     # AND a dao contract.
@@ -2987,6 +4272,7 @@ if __name__ == "__main__":
     newblocksInTimelockForCancellation = sp.nat(41)
     newPercentageForSuperMajority = sp.nat(81)
     newQuorumCap = sp.record(lower = 2, upper = 98)
+    newMaxActivePolls = sp.nat(6)
     newGovernanceParameters = sp.record(
       escrowAmount = newEscrowAmount,
       voteDelayBlocks = newVoteDelayBlocks,
@@ -2995,7 +4281,8 @@ if __name__ == "__main__":
       blocksInTimelockForExecution = newblocksInTimelockForExecution,
       blocksInTimelockForCancellation = newblocksInTimelockForCancellation,
       percentageForSuperMajority = newPercentageForSuperMajority,
-      quorumCap = newQuorumCap
+      quorumCap = newQuorumCap,
+      maxActivePolls = newMaxActivePolls
     )
 
     notDao = Addresses.NULL_ADDRESS
@@ -3004,4 +4291,48 @@ if __name__ == "__main__":
       valid = False
     )
 
+  ################################################################
+  # setVestingVault
+  ################################################################
+
+  @sp.add_test(name="setVestingVault - can allow and disallow a vesting vault")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a dao contract
+    dao = DaoContract()
+    scenario += dao
+
+    # WHEN the dao allows a vesting vault
+    scenario += dao.setVestingVault(sp.record(vestingVaultAddress = Addresses.ALICE_ADDRESS, enabled = True)).run(
+      sender = dao.address,
+    )
+
+    # THEN the vault is allowed.
+    scenario.verify(dao.data.vestingVaults.contains(Addresses.ALICE_ADDRESS))
+
+    # WHEN the dao disallows the vesting vault
+    scenario += dao.setVestingVault(sp.record(vestingVaultAddress = Addresses.ALICE_ADDRESS, enabled = False)).run(
+      sender = dao.address,
+    )
+
+    # THEN the vault is no longer allowed.
+    scenario.verify(~dao.data.vestingVaults.contains(Addresses.ALICE_ADDRESS))
+
+  @sp.add_test(name="setVestingVault - fails if not called by dao")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a dao contract
+    dao = DaoContract()
+    scenario += dao
+
+    # WHEN setVestingVault is called by someone other than the dao
+    # THEN the call fails.
+    notDao = Addresses.NULL_ADDRESS
+    scenario += dao.setVestingVault(sp.record(vestingVaultAddress = Addresses.ALICE_ADDRESS, enabled = True)).run(
+      sender = notDao,
+      valid = False
+    )
+
   sp.add_compilation_target("dao", DaoContract())
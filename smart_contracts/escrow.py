@@ -11,6 +11,7 @@ import smartpy as sp
 
 FA2_test = sp.io.import_script_from_url("file:test-helpers/fa2.py")
 Addresses = sp.io.import_script_from_url("file:test-helpers/addresses.py")
+Checkpoints = sp.io.import_script_from_url("file:common/checkpoints.py")
 Errors = sp.io.import_script_from_url("file:common/errors.py")
 
 # CHANGED: Compress the contract into a single entity, rather than using inheritance.
@@ -19,8 +20,17 @@ class EscrowSDAO(sp.Contract):
         self, 
         # CHANGED: Give admin a default value
         tokenContractAddress = Addresses.TOKEN_ADMIN_ADDRESS,
-        tokenID = sp.nat(0)
+        tokenID = sp.nat(0),
+        # CHANGED: Allow initial balances and checkpoints to be provided, for tests and benchmarks.
+        balances = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+        checkpoints = sp.big_map(l = {}, tkey = Checkpoints.CHECKPOINT_PAGE_KEY_TYPE, tvalue = Checkpoints.CHECKPOINT_PAGE_TYPE),
+        checkpointDirectories = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = Checkpoints.CHECKPOINT_DIRECTORY_TYPE),
+        numCheckpoints = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+        # CHANGED: Allow the number of checkpoints in a page to be set when the contract is compiled.
+        checkpointsPerPage = Checkpoints.CHECKPOINTS_PER_PAGE,
     ):
+        self.checkpointsPerPage = checkpointsPerPage
+
         # CHANGED: Construct token metadata.
         metadata_data = sp.utils.bytes_of_string('{ "name": "SalsaDAO Escrow", "description": "Locking contract for governance", "authors": ["Genius Contracts"], "homepage":  "https://salsadao.xyz" }')
 
@@ -37,114 +47,115 @@ class EscrowSDAO(sp.Contract):
         self.init(
             tokenContractAddress = tokenContractAddress,
             tokenID = tokenID,
-            balances = sp.big_map(
-                tkey = sp.TAddress,
-                tvalue = sp.TNat,
-            ),
+            balances = balances,
 
-            # CHANGED: Add Checkpoints
-            checkpoints = sp.big_map(
-                l = {},
-                tkey = sp.TPair(sp.TAddress, sp.TNat),
-                tvalue = sp.TRecord(fromBlock = sp.TNat, balance = sp.TNat).layout(("fromBlock", "balance"))
-            ),
+            # CHANGED: Add Checkpoints, grouped in pages.
+            checkpoints = checkpoints,
+            # CHANGED: Add a directory of the checkpoint pages of each address.
+            checkpointDirectories = checkpointDirectories,
             # CHANGED: Add numCheckpoints
-            numCheckpoints = sp.big_map(
+            numCheckpoints = numCheckpoints,
+            # CHANGED: Add delegates. Addresses without an entry delegate to themselves.
+            delegates = sp.big_map(
                 l = {},
                 tkey = sp.TAddress,
-                tvalue = sp.TNat
+                tvalue = sp.TAddress
             ),
 
             # CHANGED: Include metadata and token_metadata bigmap in storage.
             metadata = metadata,
         )
+
+        # CHANGED: Generate TZIP-16 metadata which includes off chain views.
+        self.init_metadata("escrow_metadata", {
+            "name": "SalsaDAO Escrow",
+            "description": "Locking contract for governance",
+            "authors": ["Genius Contracts"],
+            "homepage": "https://salsadao.xyz",
+            "views": [
+                self.getBalanceOffchainView,
+                self.getPriorBalanceOffchainView,
+                self.getNumCheckpointsOffchainView,
+            ],
+        })
         
     # CHANGED: Add method to write checkpoints.
     @sp.sub_entry_point
     def writeCheckpoint(self, params):
         sp.set_type(params, sp.TRecord(checkpointedAddress = sp.TAddress, numCheckpoints = sp.TNat, newBalance = sp.TNat).layout(("checkpointedAddress", ("numCheckpoints", "newBalance"))))
 
-        # If there are no checkpoints, write data.
-        sp.if params.numCheckpoints == 0:
-            self.data.checkpoints[(params.checkpointedAddress, 0)] = sp.record(fromBlock = sp.level, balance = params.newBalance)
-            self.data.numCheckpoints[params.checkpointedAddress] = params.numCheckpoints + 1
+        Checkpoints.writeCheckpoint(self.data, self.checkpointsPerPage, params.checkpointedAddress, params.numCheckpoints, params.newBalance)
+
+    # CHANGED: Add method to read a checkpoint from its page.
+    def getCheckpoint(self, address, index):
+        return Checkpoints.getCheckpoint(self.data, self.checkpointsPerPage, address, index)
+      
+    # CHANGED: Add methods to move voting power between delegates.
+    # Checkpoints record the voting power delegated to an address, rather than the address's own balance.
+    def increaseVotingPower(self, delegate, amount):
+        numCheckpoints = self.data.numCheckpoints.get(delegate, 0)
+        sp.if numCheckpoints == 0:
+            self.writeCheckpoint(
+                sp.record(
+                    checkpointedAddress = delegate,
+                    numCheckpoints = numCheckpoints,
+                    newBalance = amount
+                )
+            )
         sp.else:
-            # Otherwise, if this update occurred in the same block, overwrite
-            sp.if self.data.checkpoints[(params.checkpointedAddress, sp.as_nat(params.numCheckpoints - 1))].fromBlock == sp.level: 
-                self.data.checkpoints[(params.checkpointedAddress, sp.as_nat(params.numCheckpoints - 1))] = sp.record(fromBlock = sp.level, balance = params.newBalance)
+            self.writeCheckpoint(
+                sp.record(
+                    checkpointedAddress = delegate,
+                    numCheckpoints = numCheckpoints,
+                    newBalance = self.getCheckpoint(delegate, sp.as_nat(numCheckpoints - 1)).balance + amount
+                )
+            )
+
+    def decreaseVotingPower(self, delegate, amount):
+        sp.if amount > 0:
+            numCheckpoints = self.data.numCheckpoints.get(delegate, 0)
+            self.writeCheckpoint(
+                sp.record(
+                    checkpointedAddress = delegate,
+                    numCheckpoints = numCheckpoints,
+                    newBalance = sp.as_nat(self.getCheckpoint(delegate, sp.as_nat(numCheckpoints - 1)).balance - amount)
+                )
+            )
+
+    # CHANGED: Add entrypoint to delegate voting power.
+    # Params:
+    # - delegatee (address): The address to delegate the sender's escrowed voting power to.
+    @sp.entry_point
+    def delegate(self, delegatee):
+        sp.set_type(delegatee, sp.TAddress)
+
+        currentDelegate = sp.local('currentDelegate', self.data.delegates.get(sp.sender, sp.sender))
+        sp.if currentDelegate.value != delegatee:
+            # Move the sender's escrowed balance to the new delegate.
+            balance = sp.local('balance', self.data.balances.get(sp.sender, 0))
+            self.decreaseVotingPower(currentDelegate.value, balance.value)
+            self.increaseVotingPower(delegatee, balance.value)
+
+            # Only store delegations to other addresses.
+            sp.if delegatee == sp.sender:
+                del self.data.delegates[sp.sender]
             sp.else:
-                # Only write an additional checkpoint if the balance has changed.
-                sp.if self.data.checkpoints[(params.checkpointedAddress, sp.as_nat(params.numCheckpoints - 1))].balance != params.newBalance:
-                    self.data.checkpoints[(params.checkpointedAddress, params.numCheckpoints)] = sp.record(fromBlock = sp.level, balance = params.newBalance)
-                    self.data.numCheckpoints[params.checkpointedAddress] = params.numCheckpoints + 1
-      
-    # CHANGED: Add view to get balance from checkpoints
-    @sp.utils.view(sp.TRecord(address = sp.TAddress, level = sp.TNat, result = sp.TNat))
+                self.data.delegates[sp.sender] = delegatee
+
+    # CHANGED: Add method to find the balance of an address at a level from its checkpoints.
+    def findPriorBalance(self, address, level):
+        return Checkpoints.findPriorBalance(self.data, self.checkpointsPerPage, address, level)
+
+    # CHANGED: Add view to get voting power from checkpoints
+    # This is an on chain view so that the DAO can read voting power synchronously.
+    @sp.onchain_view()
     def getPriorBalance(self, params):
         sp.set_type(params, sp.TRecord(
             address = sp.TAddress,
             level = sp.TNat,
         ).layout(("address", "level")))
 
-        sp.verify(params.level < sp.level, Errors.ERROR_BLOCK_LEVEL_TOO_SOON)
-
-        # If there are no checkpoints, return 0.
-        sp.if self.data.numCheckpoints.get(params.address, 0) == 0:
-            sp.result(sp.record(result = 0, address = params.address, level = params.level))
-        sp.else:
-            # First check most recent balance.
-            sp.if self.data.checkpoints[(params.address, sp.as_nat(self.data.numCheckpoints[params.address] - 1))].fromBlock <= params.level:
-                sp.result(sp.record(
-                    result = self.data.checkpoints[(params.address, sp.as_nat(self.data.numCheckpoints[params.address] - 1))].balance,
-                    address = params.address,
-                    level = params.level
-                ))
-            sp.else:
-                # Next, check for an implicit zero balance.
-                sp.if self.data.checkpoints[(params.address, sp.nat(0))].fromBlock > params.level:
-                    sp.result(sp.record(result = 0, address = params.address, level = params.level))
-                sp.else:
-                    # A boolean that indicates that the current center is the level we are looking for.
-                    # This extra variable is required because SmartPy does not have a way to break from
-                    # a while loop. 
-                    centerIsNeedle = sp.local('centerIsNeedle', False)
-
-                    # Otherwise perform a binary search.
-                    center = sp.local('center', 0)
-                    lower = sp.local('lower', 0)
-                    upper = sp.local('upper', sp.as_nat(self.data.numCheckpoints[params.address] - 1))   
-                                        
-                    sp.while (upper.value > lower.value) & (centerIsNeedle.value == False):
-                        # A complicated way to get the ceiling.
-                        center.value = sp.as_nat(upper.value - (sp.as_nat(upper.value - lower.value) / 2))
-                        
-                        # Check that center is the exact block we are looking for.
-                        sp.if self.data.checkpoints[(params.address, center.value)].fromBlock == params.level:
-                            centerIsNeedle.value = True
-                        sp.else:
-                            sp.if self.data.checkpoints[(params.address, center.value)].fromBlock < params.level:
-                                lower.value = center.value
-                            sp.else:
-                                upper.value = sp.as_nat(center.value - 1)
-
-                    # If the center is the needle, return the value at center.
-                    sp.if centerIsNeedle.value == True:
-                        sp.result(
-                            sp.record(
-                                result = self.data.checkpoints[(params.address, center.value)].balance,
-                                address = params.address, 
-                                level = params.level
-                            )
-                        )
-                    # Otherwise return the result.
-                    sp.else:
-                        sp.result(
-                            sp.record(
-                                result = self.data.checkpoints[(params.address, lower.value)].balance, 
-                                address = params.address, 
-                                level = params.level
-                            )
-                        )
+        sp.result(self.findPriorBalance(params.address, params.level))
 
     def addAddressIfNecessary(self, address):
         sp.if ~ self.data.balances.contains(address):
@@ -152,10 +163,44 @@ class EscrowSDAO(sp.Contract):
 
     @sp.utils.view(sp.TNat)
     def getBalance(self, params):
-        # CHANGED: Add address if needed.
-        self.addAddressIfNecessary(params)
+        # CHANGED: Read the balance without adding the address to storage.
+        sp.result(self.data.balances.get(params, 0))
+
+    ################################################################
+    # Views
+    #
+    # CHANGED: Add views which do not modify storage. On chain views may be read synchronously by other
+    # contracts, and off chain views may be read for free via RPC.
+    ################################################################
+
+    @sp.onchain_view(name = "getBalance")
+    def getBalanceView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.balances.get(address, 0))
+
+    @sp.onchain_view()
+    def getNumCheckpoints(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.numCheckpoints.get(address, 0))
+
+    @sp.offchain_view(pure = True, name = "getBalance")
+    def getBalanceOffchainView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.balances.get(address, 0))
 
-        sp.result(self.data.balances[params])
+    @sp.offchain_view(pure = True, name = "getPriorBalance")
+    def getPriorBalanceOffchainView(self, params):
+        sp.set_type(params, sp.TRecord(
+            address = sp.TAddress,
+            level = sp.TNat,
+        ).layout(("address", "level")))
+
+        sp.result(self.findPriorBalance(params.address, params.level))
+
+    @sp.offchain_view(pure = True, name = "getNumCheckpoints")
+    def getNumCheckpointsOffchainView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.numCheckpoints.get(address, 0))
 
     @sp.entry_point
     def escrow(self, params):
@@ -203,14 +248,8 @@ class EscrowSDAO(sp.Contract):
         self.data.balances[sp.sender] += params.value
         
         # CHANGED
-        # Write a checkpoint for the receiver
-        self.writeCheckpoint(
-            sp.record(
-                checkpointedAddress = sp.sender,
-                numCheckpoints = self.data.numCheckpoints.get(sp.sender, 0),
-                newBalance = self.data.balances[sp.sender]
-            )
-        )
+        # Write a checkpoint for the sender's delegate
+        self.increaseVotingPower(self.data.delegates.get(sp.sender, sp.sender), params.value)
 
     @sp.entry_point
     def release(self, params):
@@ -260,23 +299,29 @@ class EscrowSDAO(sp.Contract):
 
         
         # CHANGED
-        # Write a checkpoint for the receiver
-        self.writeCheckpoint(
-            sp.record(
-                checkpointedAddress = sp.sender,
-                numCheckpoints = self.data.numCheckpoints.get(sp.sender, 0),
-                newBalance = self.data.balances[sp.sender]
-            )
-        )
+        # Write a checkpoint for the sender's delegate
+        self.decreaseVotingPower(self.data.delegates.get(sp.sender, sp.sender), params.value)
 
 
+# A contract which reads prior balances from an escrow contract's on chain view.
+#
+# This contract can be used in tests to capture the results of the view.
 class Viewer(sp.Contract):
-    def __init__(self, t):
-        self.init(last = sp.none)
-        self.init_type(sp.TRecord(last = sp.TOption(t)))
+    def __init__(self, escrowContractAddress):
+        self.init(escrowContractAddress = escrowContractAddress, last = sp.none)
+        self.init_type(
+            sp.TRecord(
+                escrowContractAddress = sp.TAddress,
+                last = sp.TOption(sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat))
+            )
+        )
+
     @sp.entry_point
     def target(self, params):
-        self.data.last = sp.some(params)
+        sp.set_type(params, sp.TRecord(address = sp.TAddress, level = sp.TNat).layout(("address", "level")))
+
+        result = sp.view("getPriorBalance", self.data.escrowContractAddress, params, t = sp.TNat).open_some()
+        self.data.last = sp.some(sp.record(result = result, address = params.address, level = params.level))
 
 # Only run tests if this file is main.
 if __name__ == "__main__":
@@ -341,7 +386,7 @@ if __name__ == "__main__":
 
         # AND a viewer contract.
         viewer = Viewer(
-            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+            escrowContractAddress = escrow.address
         )
         scenario += viewer
 
@@ -358,13 +403,10 @@ if __name__ == "__main__":
         # WHEN a balance is requested for Alice for the current block
         # THEN the call fails
         level = sp.nat(1)
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = level
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = level
             )
         ).run(
             level = level,
@@ -423,20 +465,17 @@ if __name__ == "__main__":
 
         # AND a viewer contract.
         viewer = Viewer(
-            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+            escrowContractAddress = escrow.address
         )
         scenario += viewer
 
         # WHEN a balance is requested for Alice, who has no checkpoints
         requestLevel = 2
         currentLevel = sp.nat(14)
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = requestLevel
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = requestLevel
             )
         ).run(
             level = currentLevel
@@ -498,7 +537,7 @@ if __name__ == "__main__":
 
         # AND a viewer contract.
         viewer = Viewer(
-            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+            escrowContractAddress = escrow.address
         )
         scenario += viewer
 
@@ -517,13 +556,10 @@ if __name__ == "__main__":
         # WHEN a balance is requested for Alice before her first checkpiont
         requestLevel = sp.as_nat(firstCheckpointLevel - 2)
         currentLevel = firstCheckpointLevel + 2
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = requestLevel
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = requestLevel
             )
         ).run(
             level = currentLevel
@@ -585,7 +621,7 @@ if __name__ == "__main__":
 
         # AND a viewer contract.
         viewer = Viewer(
-            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+            escrowContractAddress = escrow.address
         )
         scenario += viewer
 
@@ -605,13 +641,10 @@ if __name__ == "__main__":
         # WHEN a balance is requested for Alice before her first checkpiont
         requestLevel = firstCheckpointLevel + 2
         currentLevel = firstCheckpointLevel + 4
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = requestLevel
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = requestLevel
             )
         ).run(
             level = currentLevel
@@ -677,7 +710,7 @@ if __name__ == "__main__":
 
         # AND a viewer contract.
         viewer = Viewer(
-            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+            escrowContractAddress = escrow.address
         )
         scenario += viewer
 
@@ -772,13 +805,10 @@ if __name__ == "__main__":
 
         # level = 1
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = sp.nat(1)
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = sp.nat(1)
             )
         ).run(
             level = level,
@@ -790,13 +820,10 @@ if __name__ == "__main__":
 
         # level = 2
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 2
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 2
             )
         ).run(
             level = level,
@@ -807,13 +834,10 @@ if __name__ == "__main__":
 
         # level = 3
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 3
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 3
             )
         ).run(
             level = level,
@@ -824,13 +848,10 @@ if __name__ == "__main__":
 
         # level = 4
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 4
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 4
             )
         ).run(
             level = level,
@@ -841,13 +862,10 @@ if __name__ == "__main__":
 
         # level = 5
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 5
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 5
             )
         ).run(
             level = level,
@@ -858,13 +876,10 @@ if __name__ == "__main__":
 
         # level = 6
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 6
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 6
             )
         ).run(
             level = level,
@@ -875,13 +890,10 @@ if __name__ == "__main__":
 
         # level = 7
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 7
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 7
             )
         ).run(
             level = level,
@@ -892,13 +904,10 @@ if __name__ == "__main__":
 
         # level = 8
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 8
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 8
             )
         ).run(
             level = level,
@@ -909,13 +918,10 @@ if __name__ == "__main__":
 
         # level = 9
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 9
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 9
             )
         ).run(
             level = level,
@@ -926,13 +932,10 @@ if __name__ == "__main__":
 
         # level = 10
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 10
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 10
             )
         ).run(
             level = level,
@@ -943,13 +946,10 @@ if __name__ == "__main__":
 
         # level = 11
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 11
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 11
             )
         ).run(
             level = level,
@@ -960,13 +960,10 @@ if __name__ == "__main__":
 
         # level = 12
         level = 14
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 12
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 12
             )
         ).run(
             level = level,
@@ -1029,7 +1026,7 @@ if __name__ == "__main__":
 
         # AND a viewer contract.
         viewer = Viewer(
-            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+            escrowContractAddress = escrow.address
         )
         scenario += viewer
 
@@ -1113,13 +1110,10 @@ if __name__ == "__main__":
 
         # level = 1
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = sp.nat(1)
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = sp.nat(1)
             )
         ).run(
             level = level,
@@ -1131,13 +1125,10 @@ if __name__ == "__main__":
 
         # level = 2
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 2
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 2
             )
         ).run(
             level = level,
@@ -1148,13 +1139,10 @@ if __name__ == "__main__":
 
         # level = 3
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 3
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 3
             )
         ).run(
             level = level,
@@ -1165,13 +1153,10 @@ if __name__ == "__main__":
 
         # level = 4
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 4
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 4
             )
         ).run(
             level = level,
@@ -1182,13 +1167,10 @@ if __name__ == "__main__":
 
         # level = 5
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 5
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 5
             )
         ).run(
             level = level,
@@ -1199,13 +1181,10 @@ if __name__ == "__main__":
 
         # level = 6
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 6
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 6
             )
         ).run(
             level = level,
@@ -1216,13 +1195,10 @@ if __name__ == "__main__":
 
         # level = 7
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 7
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 7
             )
         ).run(
             level = level,
@@ -1233,13 +1209,10 @@ if __name__ == "__main__":
 
         # level = 8
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 8
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 8
             )
         ).run(
             level = level,
@@ -1250,13 +1223,10 @@ if __name__ == "__main__":
 
         # level = 9
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 9
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 9
             )
         ).run(
             level = level,
@@ -1267,13 +1237,10 @@ if __name__ == "__main__":
 
         # level = 10
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 10
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 10
             )
         ).run(
             level = level,
@@ -1284,13 +1251,10 @@ if __name__ == "__main__":
 
         # level = 11
         level = 12
-        scenario += escrow.getPriorBalance(
-            (
-                sp.record(
-                    address = alice.address,
-                    level = 11
-                ),
-                viewer.typed.target
+        scenario += viewer.target(
+            sp.record(
+                address = alice.address,
+                level = 11
             )
         ).run(
             level = level,
@@ -1478,28 +1442,28 @@ if __name__ == "__main__":
         scenario.verify(escrow.data.numCheckpoints.get(chorly.address, sp.nat(0)) == sp.nat(2))
 
         # AND history is recorded correctly for Alice.
-        scenario.verify(escrow.data.checkpoints[(alice.address, 0)].fromBlock == 0)
-        scenario.verify(escrow.data.checkpoints[(alice.address, 0)].balance == 100)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][0].fromBlock == 0)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][0].balance == 100)
 
-        scenario.verify(escrow.data.checkpoints[(alice.address, 1)].fromBlock == 1)
-        scenario.verify(escrow.data.checkpoints[(alice.address, 1)].balance == 90)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][1].fromBlock == 1)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][1].balance == 90)
 
-        scenario.verify(escrow.data.checkpoints[(alice.address, 2)].fromBlock == 2)
-        scenario.verify(escrow.data.checkpoints[(alice.address, 2)].balance == 80)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][2].fromBlock == 2)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][2].balance == 80)
 
         # AND history is recorded correctly for Bob.
-        scenario.verify(escrow.data.checkpoints[(bob.address, 0)].fromBlock == 1)
-        scenario.verify(escrow.data.checkpoints[(bob.address, 0)].balance == 10)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][0].fromBlock == 1)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][0].balance == 10)
 
-        scenario.verify(escrow.data.checkpoints[(bob.address, 1)].fromBlock == 3)
-        scenario.verify(escrow.data.checkpoints[(bob.address, 1)].balance == 5)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][1].fromBlock == 3)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][1].balance == 5)
 
         # AND history is recorded correctly for Charlie.
-        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)].fromBlock == 2)
-        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)].balance == 10)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][0].fromBlock == 2)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][0].balance == 10)
 
-        scenario.verify(escrow.data.checkpoints[(chorly.address, 1)].fromBlock == 3)
-        scenario.verify(escrow.data.checkpoints[(chorly.address, 1)].balance == 15)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][1].fromBlock == 3)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][1].balance == 15)
 
     @sp.add_test(name="transfer - does not write two checkpoints for one block")
     def test():
@@ -1640,15 +1604,260 @@ if __name__ == "__main__":
 
         # THEN Alice only records the transfer for the block once.
         scenario.verify(escrow.data.numCheckpoints.get(alice.address, sp.nat(0)) == sp.nat(2))
-        scenario.verify(escrow.data.checkpoints[(alice.address, 0)].fromBlock == 0)
-        scenario.verify(escrow.data.checkpoints[(alice.address, 0)].balance == totalTokens)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][0].fromBlock == 0)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][0].balance == totalTokens)
 
-        scenario.verify(escrow.data.checkpoints[(alice.address, 1)].fromBlock == level)
-        scenario.verify(escrow.data.checkpoints[(alice.address, 1)].balance == sp.as_nat(totalTokens - (transferValue * 2)))
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][1].fromBlock == level)
+        scenario.verify(escrow.data.checkpoints[(alice.address, 0)][1].balance == sp.as_nat(totalTokens - (transferValue * 2)))
 
         # AND Bob only records one checkpoint        
         scenario.verify(escrow.data.numCheckpoints.get(bob.address, sp.nat(0)) == sp.nat(1))
-        scenario.verify(escrow.data.checkpoints[(bob.address, 0)].fromBlock == level)
-        scenario.verify(escrow.data.checkpoints[(bob.address, 0)].balance == (transferValue * 2))
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][0].fromBlock == level)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][0].balance == (transferValue * 2))
+
+    ################################################################
+    # delegate
+    #
+    # These tests are largely based off of Compound's delegation tests:
+    # https://github.com/compound-finance/compound-protocol/blob/master/tests/Governance/CompTest.js
+    ################################################################
+
+    @sp.add_test(name="delegate - moves escrowed voting power to the delegatee")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        admin = sp.test_account("Administrator")
+        alice = sp.test_account("Alice")
+        bob   = sp.test_account("Robert")
+
+        test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+              metadata = sp.utils.metadata_of_url("https://example.com"),
+              admin = admin.address)
+        scenario += test_sdao
+
+        tok0_md = FA2_test.FA2.make_metadata(
+          name = "test sdao",
+          decimals = 0,
+          symbol= "TK0" )
+
+        scenario += test_sdao.mint(address = alice.address,
+                          amount = 690000,
+                          metadata = tok0_md,
+                          token_id = 0).run(sender = admin)
+
+        # AND an escrow contract
+        escrow = EscrowSDAO(
+            tokenContractAddress = test_sdao.address,
+            tokenID = sp.nat(0),
+        )
+        scenario += escrow
+
+        scenario += test_sdao.update_operators([
+            sp.variant("add_operator", test_sdao.operator_param.make(
+                owner = alice.address,
+                operator = escrow.address,
+                token_id = 0)),
+        ]).run(sender = alice)
+
+        # AND a viewer contract.
+        viewer = Viewer(
+            escrowContractAddress = escrow.address
+        )
+        scenario += viewer
+
+        # AND Alice has escrowed 100 tokens
+        scenario += escrow.escrow(
+            sp.record(
+                value = 100,
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = alice.address,
+        )
+
+        # WHEN Alice delegates to Bob
+        scenario += escrow.delegate(bob.address).run(
+            level = sp.nat(2),
+            sender = alice.address,
+        )
+
+        # THEN Alice's delegate is recorded.
+        scenario.verify(escrow.data.delegates[alice.address] == bob.address)
+
+        # AND Alice keeps her balance.
+        scenario.verify(escrow.data.balances[alice.address] == 100)
+
+        # AND Bob has Alice's voting power from the delegation onwards.
+        scenario += viewer.target(sp.record(address = bob.address, level = 1)).run(level = 3)
+        scenario.verify(viewer.data.last.open_some().result == 0)
+        scenario += viewer.target(sp.record(address = bob.address, level = 2)).run(level = 3)
+        scenario.verify(viewer.data.last.open_some().result == 100)
+
+        # AND Alice has no voting power from the delegation onwards.
+        scenario += viewer.target(sp.record(address = alice.address, level = 1)).run(level = 3)
+        scenario.verify(viewer.data.last.open_some().result == 100)
+        scenario += viewer.target(sp.record(address = alice.address, level = 2)).run(level = 3)
+        scenario.verify(viewer.data.last.open_some().result == 0)
+
+    @sp.add_test(name="delegate - tracks delegated totals across escrows, releases and re-delegation")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        admin = sp.test_account("Administrator")
+        alice = sp.test_account("Alice")
+        bob   = sp.test_account("Robert")
+        chorly   = sp.test_account("Chortle")
+
+        test_sdao = FA2_test.FA2(config = FA2_test.FA2_config(single_asset = True),
+              metadata = sp.utils.metadata_of_url("https://example.com"),
+              admin = admin.address)
+        scenario += test_sdao
+
+        tok0_md = FA2_test.FA2.make_metadata(
+          name = "test sdao",
+          decimals = 0,
+          symbol= "TK0" )
+
+        scenario += test_sdao.mint(address = alice.address,
+                          amount = 690000,
+                          metadata = tok0_md,
+                          token_id = 0).run(sender = admin)
+
+        scenario += test_sdao.transfer(
+        [
+            test_sdao.batch_transfer.item(from_ = alice.address,
+            txs = [
+              sp.record(to_ = bob.address,
+                        amount = 10000,
+                        token_id = 0)
+            ])
+        ]).run(sender = alice)
+
+        # AND an escrow contract
+        escrow = EscrowSDAO(
+            tokenContractAddress = test_sdao.address,
+            tokenID = sp.nat(0),
+        )
+        scenario += escrow
+
+        scenario += test_sdao.update_operators([
+            sp.variant("add_operator", test_sdao.operator_param.make(
+                owner = alice.address,
+                operator = escrow.address,
+                token_id = 0)),
+        ]).run(sender = alice)
+        scenario += test_sdao.update_operators([
+            sp.variant("add_operator", test_sdao.operator_param.make(
+                owner = bob.address,
+                operator = escrow.address,
+                token_id = 0)),
+        ]).run(sender = bob)
+
+        # AND Alice and Bob both delegate to Chorly
+        scenario += escrow.delegate(chorly.address).run(
+            level = sp.nat(0),
+            sender = alice.address,
+        )
+        scenario += escrow.delegate(chorly.address).run(
+            level = sp.nat(0),
+            sender = bob.address,
+        )
+
+        # WHEN Alice and Bob escrow tokens
+        scenario += escrow.escrow(sp.record(value = 100)).run(
+            level = sp.nat(1),
+            sender = alice.address,
+        )
+        scenario += escrow.escrow(sp.record(value = 50)).run(
+            level = sp.nat(2),
+            sender = bob.address,
+        )
+
+        # THEN Chorly holds their combined voting power.
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][0].fromBlock == 1)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][0].balance == 100)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][1].fromBlock == 2)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][1].balance == 150)
+
+        # AND Alice and Bob have no voting power.
+        scenario.verify(escrow.data.numCheckpoints.get(alice.address, sp.nat(0)) == sp.nat(0))
+        scenario.verify(escrow.data.numCheckpoints.get(bob.address, sp.nat(0)) == sp.nat(0))
+
+        # WHEN Alice releases some tokens
+        scenario += escrow.release(sp.record(value = 30)).run(
+            level = sp.nat(3),
+            sender = alice.address,
+        )
+
+        # THEN Chorly's voting power decreases.
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][2].fromBlock == 3)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][2].balance == 120)
+
+        # WHEN Bob takes his delegation back
+        scenario += escrow.delegate(bob.address).run(
+            level = sp.nat(4),
+            sender = bob.address,
+        )
+
+        # THEN Bob's voting power moves back to Bob.
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][3].fromBlock == 4)
+        scenario.verify(escrow.data.checkpoints[(chorly.address, 0)][3].balance == 70)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][0].fromBlock == 4)
+        scenario.verify(escrow.data.checkpoints[(bob.address, 0)][0].balance == 50)
+
+        # AND no delegation is stored for Bob.
+        scenario.verify(~escrow.data.delegates.contains(bob.address))
+
+    ################################################################
+    # views
+    ################################################################
+
+    @sp.add_test(name="views - read balances and checkpoints without modifying storage")
+    def test():
+        scenario = sp.test_scenario()
+
+        # GIVEN an escrow contract where Alice has escrowed 100 tokens at block 1
+        escrow = EscrowSDAO(
+            balances = sp.big_map(
+                l = { Addresses.ALICE_ADDRESS: sp.nat(100) },
+                tkey = sp.TAddress,
+                tvalue = sp.TNat
+            ),
+            checkpoints = sp.big_map(
+                l = {
+                    (Addresses.ALICE_ADDRESS, 0): { 0: sp.record(fromBlock = 1, balance = 100) },
+                },
+                tkey = Checkpoints.CHECKPOINT_PAGE_KEY_TYPE,
+                tvalue = Checkpoints.CHECKPOINT_PAGE_TYPE
+            ),
+            checkpointDirectories = sp.big_map(
+                l = { Addresses.ALICE_ADDRESS: { 0: 1 } },
+                tkey = sp.TAddress,
+                tvalue = Checkpoints.CHECKPOINT_DIRECTORY_TYPE
+            ),
+            numCheckpoints = sp.big_map(
+                l = { Addresses.ALICE_ADDRESS: sp.nat(1) },
+                tkey = sp.TAddress,
+                tvalue = sp.TNat
+            ),
+        )
+        scenario += escrow
+
+        # WHEN the on chain views are read
+        # THEN they return the balance and number of checkpoints of each address.
+        scenario.verify(escrow.getBalanceView(Addresses.ALICE_ADDRESS) == 100)
+        scenario.verify(escrow.getBalanceView(Addresses.BOB_ADDRESS) == 0)
+        scenario.verify(escrow.getNumCheckpoints(Addresses.ALICE_ADDRESS) == 1)
+        scenario.verify(escrow.getNumCheckpoints(Addresses.BOB_ADDRESS) == 0)
+
+        # WHEN the off chain views are read
+        # THEN they return the same values.
+        scenario.verify(escrow.getBalanceOffchainView(Addresses.ALICE_ADDRESS) == 100)
+        scenario.verify(escrow.getNumCheckpointsOffchainView(Addresses.ALICE_ADDRESS) == 1)
+
+        # AND addresses which were read are not added to storage.
+        scenario.verify(~escrow.data.balances.contains(Addresses.BOB_ADDRESS))
 
     sp.add_compilation_target("escrow", EscrowSDAO())
@@ -10,11 +10,20 @@ Addresses = sp.import_script_from_url("file:test-helpers/addresses.py")
 Errors = sp.import_script_from_url("file:common/errors.py")
 
 # A faucet contract for KOL Governance Tokens
+#
+# Drips are limited per address in each epoch of blocks, and globally in each block, so a single requester can not
+# drain the faucet.
 class Faucet(sp.Contract):
     def __init__(
       self, 
       tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
-      maxTokensPerDrip = 10_000_000_000_000_000_000  
+      maxTokensPerDrip = 10_000_000_000_000_000_000,
+      # The maximum number of tokens an address may receive in an epoch.
+      maxTokensPerEpoch = 10_000_000_000_000_000_000,
+      # The maximum number of tokens the faucet may drip in a block, across all addresses.
+      maxTokensPerBlock = 100_000_000_000_000_000_000,
+      # The number of blocks in an epoch.
+      blocksPerEpoch = 2880
     ):
         metadata_data = sp.bytes_of_string('{ "name": "kDAO Token Faucet", "description": "Governance Token Faucet for Kolibri DAO", "authors": ["Hover Labs <hello@hover.engineering>"], "homepage":  "https://kolibri.finance" }')
 
@@ -32,6 +41,18 @@ class Faucet(sp.Contract):
           tokenContractAddress = tokenContractAddress,
           # The maximum value that can be requested in a single drip.
           maxTokensPerDrip = maxTokensPerDrip,
+          # The maximum value an address can receive in an epoch.
+          maxTokensPerEpoch = maxTokensPerEpoch,
+          # The maximum value the faucet can drip in a block.
+          maxTokensPerBlock = maxTokensPerBlock,
+          # The number of blocks in an epoch.
+          blocksPerEpoch = blocksPerEpoch,
+          # The number of tokens dripped to each address, keyed by (epoch, address).
+          drips = sp.big_map(l = {}, tkey = sp.TPair(sp.TNat, sp.TAddress), tvalue = sp.TNat),
+          # The last block tokens were dripped on.
+          lastDripBlock = sp.nat(0),
+          # The number of tokens dripped in the last block tokens were dripped on.
+          tokensDrippedInBlock = sp.nat(0),
           # Contract metadata.
           metadata = metadata,
         )
@@ -49,6 +70,23 @@ class Faucet(sp.Contract):
       # Verify the requester is not asking for too many tokens.
       sp.verify(params.numberOfTokens <= self.data.maxTokensPerDrip, Errors.ERROR_TOO_MANY_TOKENS)
 
+      # Verify the faucet has not dripped too many tokens in this block.
+      sp.if self.data.lastDripBlock != sp.level:
+        self.data.lastDripBlock = sp.level
+        self.data.tokensDrippedInBlock = sp.nat(0)
+      self.data.tokensDrippedInBlock += params.numberOfTokens
+      sp.verify(self.data.tokensDrippedInBlock <= self.data.maxTokensPerBlock, Errors.ERROR_BLOCK_BUDGET_EXCEEDED)
+
+      # Verify the requester has not received too many tokens in this epoch.
+      epoch = sp.local('epoch', sp.level // self.data.blocksPerEpoch)
+      dripped = sp.local('dripped', self.data.drips.get((epoch.value, sp.sender), sp.nat(0)) + params.numberOfTokens)
+      sp.verify(dripped.value <= self.data.maxTokensPerEpoch, Errors.ERROR_EPOCH_LIMIT_REACHED)
+      self.data.drips[(epoch.value, sp.sender)] = dripped.value
+
+      # Remove the requester's record for the previous epoch, which is no longer needed.
+      sp.if epoch.value > 0:
+        del self.data.drips[(sp.as_nat(epoch.value - 1), sp.sender)]
+
       # Request tokens transferred to recipient.
       handle = sp.contract(
         sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value"))),
@@ -58,6 +96,19 @@ class Faucet(sp.Contract):
       arg = sp.record(from_ = sp.self_address, to_ = sp.sender, value = params.numberOfTokens)
       sp.transfer(arg, sp.mutez(0), handle)
 
+    # Remove records of drips from epochs which have ended. Records from the current epoch are left in place.
+    # May be called by anyone.
+    # Params:
+    # - (list(pair(nat, address))): The (epoch, address) keys of the records to remove.
+    @sp.entry_point
+    def removeExpiredDrips(self, keys):
+      sp.set_type(keys, sp.TList(sp.TPair(sp.TNat, sp.TAddress)))
+
+      epoch = sp.local('epoch', sp.level // self.data.blocksPerEpoch)
+      sp.for key in keys:
+        sp.if sp.fst(key) < epoch.value:
+          del self.data.drips[key]
+
 ################################################################
 ################################################################
 # Tests
@@ -153,4 +204,268 @@ if __name__ == "__main__":
       valid = False
     )
 
+  @sp.add_test(name="Drip - fails when the epoch limit is reached")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a faucet contract with an epoch limit.
+    faucet = Faucet(
+      tokenContractAddress = token.address,
+      maxTokensPerDrip = sp.nat(10),
+      maxTokensPerEpoch = sp.nat(15),
+      maxTokensPerBlock = sp.nat(100),
+      blocksPerEpoch = sp.nat(100)
+    )
+    scenario += faucet
+
+    # AND the faucet is funded.
+    scenario += token.mint(
+      sp.record(
+        address = faucet.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND the recipient has received tokens in this epoch
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.nat(110)
+    )
+
+    # WHEN the recipient requests more tokens than remain in their limit later in the epoch
+    # THEN the call fails.
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.nat(150),
+      valid = False
+    )
+
+    # AND the recipient can still request the rest of their limit.
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(5)
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.nat(150)
+    )
+    scenario.verify(faucet.data.drips[(sp.nat(1), Addresses.TOKEN_RECIPIENT)] == sp.nat(15))
+
+  @sp.add_test(name="Drip - resets the limit in a new epoch and removes the previous record")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a faucet contract with an epoch limit.
+    faucet = Faucet(
+      tokenContractAddress = token.address,
+      maxTokensPerDrip = sp.nat(10),
+      maxTokensPerEpoch = sp.nat(15),
+      maxTokensPerBlock = sp.nat(100),
+      blocksPerEpoch = sp.nat(100)
+    )
+    scenario += faucet
+
+    # AND the faucet is funded.
+    scenario += token.mint(
+      sp.record(
+        address = faucet.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND the recipient has received their limit in an epoch
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.nat(110)
+    )
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(5)
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.nat(111)
+    )
+
+    # WHEN the recipient requests tokens in the next epoch
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.nat(200)
+    )
+
+    # THEN the recipient received the tokens
+    scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == sp.nat(25))
+
+    # AND only the record for the current epoch is stored.
+    scenario.verify(faucet.data.drips[(sp.nat(2), Addresses.TOKEN_RECIPIENT)] == sp.nat(10))
+    scenario.verify(~faucet.data.drips.contains((sp.nat(1), Addresses.TOKEN_RECIPIENT)))
+
+  @sp.add_test(name="Drip - fails when the block budget is reached")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a faucet contract with a block budget.
+    faucet = Faucet(
+      tokenContractAddress = token.address,
+      maxTokensPerDrip = sp.nat(10),
+      maxTokensPerEpoch = sp.nat(100),
+      maxTokensPerBlock = sp.nat(15),
+      blocksPerEpoch = sp.nat(100)
+    )
+    scenario += faucet
+
+    # AND the faucet is funded.
+    scenario += token.mint(
+      sp.record(
+        address = faucet.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND Alice has received tokens in a block
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(110)
+    )
+
+    # WHEN Bob requests more tokens than remain in the budget in the same block
+    # THEN the call fails.
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS,
+      level = sp.nat(110),
+      valid = False
+    )
+
+    # AND Bob can request the tokens in the next block.
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS,
+      level = sp.nat(111)
+    )
+    scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(10))
+    scenario.verify(faucet.data.lastDripBlock == sp.nat(111))
+    scenario.verify(faucet.data.tokensDrippedInBlock == sp.nat(10))
+
+  ################################################################
+  # removeExpiredDrips
+  ################################################################
+
+  @sp.add_test(name="removeExpiredDrips - removes records from ended epochs")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a faucet contract with an epoch limit.
+    faucet = Faucet(
+      tokenContractAddress = token.address,
+      maxTokensPerDrip = sp.nat(10),
+      maxTokensPerEpoch = sp.nat(15),
+      maxTokensPerBlock = sp.nat(100),
+      blocksPerEpoch = sp.nat(100)
+    )
+    scenario += faucet
+
+    # AND the faucet is funded.
+    scenario += token.mint(
+      sp.record(
+        address = faucet.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND Alice received tokens in an epoch
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(110)
+    )
+
+    # AND Bob received tokens in the next epoch
+    scenario += faucet.drip(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS,
+      level = sp.nat(210)
+    )
+
+    # WHEN removeExpiredDrips is called with both records during Bob's epoch
+    scenario += faucet.removeExpiredDrips(
+      [
+        (sp.nat(1), Addresses.ALICE_ADDRESS),
+        (sp.nat(2), Addresses.BOB_ADDRESS),
+      ]
+    ).run(
+      sender = Addresses.NULL_ADDRESS,
+      level = sp.nat(250)
+    )
+
+    # THEN Alice's record is removed
+    scenario.verify(~faucet.data.drips.contains((sp.nat(1), Addresses.ALICE_ADDRESS)))
+
+    # AND Bob's record is kept.
+    scenario.verify(faucet.data.drips[(sp.nat(2), Addresses.BOB_ADDRESS)] == sp.nat(10))
+
   sp.add_compilation_target("faucet", Faucet())
@@ -0,0 +1,502 @@
+import smartpy as sp
+
+################################################################
+################################################################
+# Contract
+################################################################
+################################################################
+
+Addresses = sp.import_script_from_url("file:./test-helpers/addresses.py")
+Claim = sp.import_script_from_url("file:common/merkle-claim.py")
+Errors = sp.import_script_from_url("file:common/errors.py")
+
+# A distributor which pays out tokens to the entries of a Merkle tree.
+#
+# Only the root of the tree and a bitmap of claimed entries are stored, so the cost of storage does not depend on
+# the number of recipients. The distributor is funded by transferring tokens to it, generally from the community
+# fund.
+class MerkleDistributor(sp.Contract):
+    def __init__(
+      self,
+      # The root of the Merkle tree of the distribution.
+      merkleRoot = sp.bytes("0x"),
+      # The token contract.
+      tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
+      # The governor.
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    ):
+        metadata_data = sp.bytes_of_string('{ "name": "Merkle Distributor", "description": "Merkle Distributor for Governance Tokens", "authors": ["Hover Labs <hello@hover.engineering>"], "homepage":  "https://kolibri.finance" }')
+
+        metadata = sp.big_map(
+            l = {
+                "": sp.bytes('0x74657a6f732d73746f726167653a64617461'), # "tezos-storage:data"
+                "data": metadata_data
+            },
+            tkey = sp.TString,
+            tvalue = sp.TBytes
+        )
+
+        self.init(
+          # The root of the Merkle tree of the distribution.
+          merkleRoot = merkleRoot,
+          # The address of the token contract.
+          tokenContractAddress = tokenContractAddress,
+          # Words of the bitmap of claimed entries, keyed by word index.
+          claimedBitmap = sp.big_map(l = {}, tkey = sp.TNat, tvalue = sp.TNat),
+          # The governor address.
+          governorAddress = governorAddress,
+          # Contract metadata.
+          metadata = metadata,
+        )
+
+    @sp.entry_point
+    def default(self, unit):
+      sp.set_type(unit, sp.TUnit)
+      pass
+
+    # Claim an entry in the distribution, paying its tokens to the entry's account.
+    # Anyone may submit a claim, since the tokens are always paid to the account in the entry.
+    # Params:
+    # - (Claim.CLAIM_TYPE): The claim.
+    @sp.entry_point
+    def claim(self, params):
+      sp.set_type(params, Claim.CLAIM_TYPE)
+
+      # Verify the entry has not been claimed.
+      wordIndex = sp.local('wordIndex', params.index // Claim.BITMAP_WORD_SIZE)
+      mask = sp.local('mask', sp.nat(1) << (params.index % Claim.BITMAP_WORD_SIZE))
+      word = sp.local('word', self.data.claimedBitmap.get(wordIndex.value, sp.nat(0)))
+      sp.verify((word.value & mask.value) == 0, Errors.ERROR_ALREADY_CLAIMED)
+
+      # Verify the entry is in the tree.
+      leaf = sp.set_type_expr(
+        sp.record(
+          index = params.index,
+          account = params.account,
+          amount = params.amount,
+        ),
+        Claim.LEAF_TYPE
+      )
+      node = sp.local('node', sp.blake2b(sp.pack(leaf)))
+      position = sp.local('position', params.index)
+      sp.for sibling in params.proof:
+        sp.if position.value % 2 == 0:
+          node.value = sp.blake2b(node.value + sibling)
+        sp.else:
+          node.value = sp.blake2b(sibling + node.value)
+        position.value = position.value // 2
+      sp.verify(node.value == self.data.merkleRoot, Errors.ERROR_BAD_PROOF)
+
+      # Mark the entry as claimed.
+      self.data.claimedBitmap[wordIndex.value] = word.value | mask.value
+
+      self.transferFA12(self.data.tokenContractAddress, params.amount, params.account)
+
+    # Returns whether an entry in the distribution has been claimed.
+    # Params:
+    # - index (nat): The index of the entry.
+    @sp.onchain_view()
+    def isClaimed(self, index):
+      sp.set_type(index, sp.TNat)
+
+      word = self.data.claimedBitmap.get(index // Claim.BITMAP_WORD_SIZE, sp.nat(0))
+      mask = sp.nat(1) << (index % Claim.BITMAP_WORD_SIZE)
+      sp.result((word & mask) != 0)
+
+    ################################################################
+    # Governance
+    ################################################################
+
+    # Rotate the governor.
+    @sp.entry_point
+    def setGovernorContract(self, newGovernorAddress):
+      sp.set_type(newGovernorAddress, sp.TAddress)
+
+      # Verify command came from governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # Rotate addresses
+      self.data.governorAddress = newGovernorAddress
+
+    # Rescue FA1.2 Tokens, including tokens of the distribution which were not claimed.
+    @sp.entry_point
+    def rescueFA12(self, params):
+      sp.set_type(params, sp.TRecord(
+        tokenContractAddress = sp.TAddress,
+        amount = sp.TNat,
+        destination = sp.TAddress,
+      ).layout(("tokenContractAddress", ("amount", "destination"))))
+
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # Transfer the tokens
+      self.transferFA12(params.tokenContractAddress, params.amount, params.destination)
+
+    # Transfer FA1.2 tokens from the distributor.
+    # Params:
+    # - tokenContractAddress (address): The contract of the token.
+    # - amount (nat): The amount of tokens.
+    # - destination (address): The address to send the tokens to.
+    def transferFA12(self, tokenContractAddress, amount, destination):
+      handle = sp.contract(
+        sp.TRecord(
+          from_ = sp.TAddress,
+          to_ = sp.TAddress,
+          value = sp.TNat
+        ).layout(("from_ as from", ("to_ as to", "value"))),
+        tokenContractAddress,
+        "transfer"
+      ).open_some()
+      arg = sp.record(from_ = sp.self_address, to_ = destination, value = amount)
+      sp.transfer(arg, sp.mutez(0), handle)
+
+################################################################
+################################################################
+# Tests
+################################################################
+################################################################
+
+# Only run tests if this file is main.
+if __name__ == "__main__":
+
+  FA12 = sp.import_script_from_url("file:./test-helpers/fa12.py")
+
+  # The entries of the distribution used in tests, as (index, account, amount).
+  ENTRIES = [
+    (sp.nat(0), Addresses.ALICE_ADDRESS, sp.nat(100)),
+    (sp.nat(1), Addresses.BOB_ADDRESS, sp.nat(200)),
+    (sp.nat(2), Addresses.CHARLIE_ADDRESS, sp.nat(300)),
+    (sp.nat(3), Addresses.TOKEN_RECIPIENT, sp.nat(400)),
+  ]
+
+  # Returns the hash of a leaf.
+  def leafHash(index, account, amount):
+    leaf = sp.set_type_expr(sp.record(index = index, account = account, amount = amount), Claim.LEAF_TYPE)
+    return sp.blake2b(sp.pack(leaf))
+
+  # Builds a tree of four entries.
+  # Returns the root, and a function which returns the proof of the entry at a position in the tree.
+  def buildTree(scenario, entries):
+    leaves = [scenario.compute(leafHash(index, account, amount)) for (index, account, amount) in entries]
+    nodes = [
+      scenario.compute(sp.blake2b(leaves[0] + leaves[1])),
+      scenario.compute(sp.blake2b(leaves[2] + leaves[3])),
+    ]
+    root = scenario.compute(sp.blake2b(nodes[0] + nodes[1]))
+
+    def proof(position):
+      return sp.list([leaves[position ^ 1], nodes[1 - position // 2]], t = sp.TBytes)
+
+    return root, proof
+
+  # Originates a token and a distributor for a tree of entries, and funds the distributor.
+  # Returns the token, the distributor and a function which returns the proof of the entry at a position in the tree.
+  def setUp(scenario, entries):
+    token = FA12.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+    scenario += token
+
+    root, proof = buildTree(scenario, entries)
+    distributor = MerkleDistributor(
+      merkleRoot = root,
+      tokenContractAddress = token.address,
+    )
+    scenario += distributor
+
+    scenario += token.mint(
+      sp.record(
+        address = distributor.address,
+        value = sp.nat(1000)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    return token, distributor, proof
+
+  ################################################################
+  # claim
+  ################################################################
+
+  @sp.add_test(name="claim - pays every entry in the tree")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN each entry is claimed
+    for (position, (index, account, amount)) in enumerate(ENTRIES):
+      scenario += distributor.claim(
+        sp.record(
+          index = index,
+          account = account,
+          amount = amount,
+          proof = proof(position),
+        )
+      ).run(
+        sender = account
+      )
+
+    # THEN each account receives its tokens
+    for (index, account, amount) in ENTRIES:
+      scenario.verify(token.data.balances[account].balance == amount)
+    scenario.verify(token.data.balances[distributor.address].balance == sp.nat(0))
+
+    # AND each entry is marked as claimed in the first word of the bitmap.
+    scenario.verify(distributor.data.claimedBitmap[0] == sp.nat(15))
+
+  @sp.add_test(name="claim - pays the account when submitted by another address")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN Bob submits Alice's claim
+    scenario += distributor.claim(
+      sp.record(
+        index = sp.nat(0),
+        account = Addresses.ALICE_ADDRESS,
+        amount = sp.nat(100),
+        proof = proof(0),
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS
+    )
+
+    # THEN Alice receives the tokens.
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS].balance == sp.nat(100))
+    scenario.verify(~token.data.balances.contains(Addresses.BOB_ADDRESS))
+
+  @sp.add_test(name="claim - sets bits in later words of the bitmap")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor for entries with indices in the second word of the bitmap
+    entries = [
+      (sp.nat(256), Addresses.ALICE_ADDRESS, sp.nat(100)),
+      (sp.nat(257), Addresses.BOB_ADDRESS, sp.nat(200)),
+      (sp.nat(258), Addresses.CHARLIE_ADDRESS, sp.nat(300)),
+      (sp.nat(259), Addresses.TOKEN_RECIPIENT, sp.nat(400)),
+    ]
+    token, distributor, proof = setUp(scenario, entries)
+
+    # WHEN the entry with index 257 is claimed
+    scenario += distributor.claim(
+      sp.record(
+        index = sp.nat(257),
+        account = Addresses.BOB_ADDRESS,
+        amount = sp.nat(200),
+        proof = proof(1),
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS
+    )
+
+    # THEN the second bit of the second word is set
+    scenario.verify(distributor.data.claimedBitmap[1] == sp.nat(2))
+    scenario.verify(~distributor.data.claimedBitmap.contains(0))
+
+    # AND the view reports only that entry as claimed.
+    scenario.verify(distributor.isClaimed(sp.nat(257)))
+    scenario.verify(~distributor.isClaimed(sp.nat(256)))
+    scenario.verify(~distributor.isClaimed(sp.nat(1)))
+
+  @sp.add_test(name="claim - fails if the entry was already claimed")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # AND Alice has claimed her entry
+    claim = sp.record(
+      index = sp.nat(0),
+      account = Addresses.ALICE_ADDRESS,
+      amount = sp.nat(100),
+      proof = proof(0),
+    )
+    scenario += distributor.claim(claim).run(
+      sender = Addresses.ALICE_ADDRESS
+    )
+
+    # WHEN Alice claims her entry again
+    # THEN the call fails.
+    scenario += distributor.claim(claim).run(
+      sender = Addresses.ALICE_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="claim - fails with a wrong amount")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN Alice claims more tokens than her entry
+    # THEN the call fails.
+    scenario += distributor.claim(
+      sp.record(
+        index = sp.nat(0),
+        account = Addresses.ALICE_ADDRESS,
+        amount = sp.nat(101),
+        proof = proof(0),
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="claim - fails with a wrong account")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN Bob claims Alice's entry to himself
+    # THEN the call fails.
+    scenario += distributor.claim(
+      sp.record(
+        index = sp.nat(0),
+        account = Addresses.BOB_ADDRESS,
+        amount = sp.nat(100),
+        proof = proof(0),
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="claim - fails with a wrong index")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN Bob claims his entry under another index with the proof of his entry
+    # THEN the call fails.
+    scenario += distributor.claim(
+      sp.record(
+        index = sp.nat(0),
+        account = Addresses.BOB_ADDRESS,
+        amount = sp.nat(200),
+        proof = proof(1),
+      )
+    ).run(
+      sender = Addresses.BOB_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="claim - fails with the proof of another entry")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN Charlie claims his entry with the proof of Alice's entry
+    # THEN the call fails.
+    scenario += distributor.claim(
+      sp.record(
+        index = sp.nat(2),
+        account = Addresses.CHARLIE_ADDRESS,
+        amount = sp.nat(300),
+        proof = proof(0),
+      )
+    ).run(
+      sender = Addresses.CHARLIE_ADDRESS,
+      valid = False
+    )
+
+  ################################################################
+  # setGovernorContract
+  ################################################################
+
+  @sp.add_test(name="setGovernorContract - succeeds when called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a distributor
+    distributor = MerkleDistributor(
+      governorAddress = Addresses.GOVERNOR_ADDRESS
+    )
+    scenario += distributor
+
+    # WHEN the governor calls setGovernorContract
+    scenario += distributor.setGovernorContract(Addresses.ROTATED_ADDRESS).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # THEN the governor is rotated.
+    scenario.verify(distributor.data.governorAddress == Addresses.ROTATED_ADDRESS)
+
+  @sp.add_test(name="setGovernorContract - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a distributor
+    distributor = MerkleDistributor(
+      governorAddress = Addresses.GOVERNOR_ADDRESS
+    )
+    scenario += distributor
+
+    # WHEN setGovernorContract is called by someone other than the governor
+    # THEN the call fails.
+    scenario += distributor.setGovernorContract(Addresses.ROTATED_ADDRESS).run(
+      sender = Addresses.NULL_ADDRESS,
+      valid = False
+    )
+
+  ################################################################
+  # rescueFA12
+  ################################################################
+
+  @sp.add_test(name="rescueFA12 - returns unclaimed tokens")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN the governor rescues the unclaimed tokens
+    scenario += distributor.rescueFA12(
+      sp.record(
+        tokenContractAddress = token.address,
+        amount = sp.nat(1000),
+        destination = Addresses.COMMUNITY_FUND_ADDRESS,
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # THEN the tokens are returned to the destination.
+    scenario.verify(token.data.balances[distributor.address].balance == sp.nat(0))
+    scenario.verify(token.data.balances[Addresses.COMMUNITY_FUND_ADDRESS].balance == sp.nat(1000))
+
+  @sp.add_test(name="rescueFA12 - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a funded distributor
+    token, distributor, proof = setUp(scenario, ENTRIES)
+
+    # WHEN rescueFA12 is called by someone other than the governor
+    # THEN the call fails.
+    scenario += distributor.rescueFA12(
+      sp.record(
+        tokenContractAddress = token.address,
+        amount = sp.nat(1000),
+        destination = Addresses.NULL_ADDRESS,
+      )
+    ).run(
+      sender = Addresses.NULL_ADDRESS,
+      valid = False
+    )
+
+  sp.add_compilation_target("merkle-distributor", MerkleDistributor())
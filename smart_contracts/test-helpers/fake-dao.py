@@ -0,0 +1,53 @@
+import smartpy as sp
+
+Proposal = sp.io.import_script_from_url("file:common/proposal.py")
+
+# A contract which fakes a DAO
+class FakeDaoContract(sp.Contract):
+  def __init__(self, nextProposalId = sp.nat(0), escrowAmount = sp.nat(10), isVestingVault = True):
+    self.init(
+      nextProposalId = nextProposalId,
+      escrowAmount = escrowAmount,
+      isVestingVault = isVestingVault,
+      polls = sp.set(l = [], t = sp.TNat),
+    )
+
+  # Accepts a proposal without taking escrow.
+  @sp.entry_point
+  def propose(self, proposal):
+    sp.set_type(proposal, Proposal.PROPOSAL_TYPE)
+
+    self.data.polls.add(self.data.nextProposalId)
+    self.data.nextProposalId += 1
+
+  # Ends a poll without resolving escrow.
+  @sp.entry_point
+  def endVoting(self, pollId):
+    sp.set_type(pollId, sp.TNat)
+
+    self.data.polls.remove(pollId)
+
+  @sp.onchain_view()
+  def getNextProposalId(self, unit):
+    sp.set_type(unit, sp.TUnit)
+
+    sp.result(self.data.nextProposalId)
+
+  @sp.onchain_view()
+  def getEscrowAmount(self, unit):
+    sp.set_type(unit, sp.TUnit)
+
+    sp.result(self.data.escrowAmount)
+
+  # Reports every address as a vesting vault if isVestingVault is set.
+  @sp.onchain_view()
+  def isVestingVault(self, address):
+    sp.set_type(address, sp.TAddress)
+
+    sp.result(self.data.isVestingVault)
+
+  @sp.onchain_view()
+  def isPollUnderway(self, pollId):
+    sp.set_type(pollId, sp.TNat)
+
+    sp.result(self.data.polls.contains(pollId))
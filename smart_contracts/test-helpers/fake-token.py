@@ -9,17 +9,11 @@ class FakeTokenContract(sp.Contract):
   def default(self, params):
     pass
 
-  @sp.utils.view(sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat))
+  @sp.onchain_view()
   def getPriorBalance(self, params):
     sp.set_type(params, sp.TRecord(
       address = sp.TAddress,
       level = sp.TNat,
     ).layout(("address", "level")))
 
-    sp.result(
-      sp.record(
-        result = self.data.result, 
-        address = params.address,
-        level = params.level,
-      )
-    )
+    sp.result(self.data.result)
@@ -0,0 +1,33 @@
+import smartpy as sp
+
+# A contract which fakes a vesting vault
+class FakeVaultContract(sp.Contract):
+  def __init__(self, result = sp.nat(3)):
+    self.init(
+      result = result,
+      resolvedEscrow = sp.none,
+    )
+    self.init_type(sp.TRecord(
+      result = sp.TNat,
+      resolvedEscrow = sp.TOption(sp.TRecord(pollId = sp.TNat, returned = sp.TBool).layout(("pollId", "returned"))),
+    ))
+
+  @sp.entry_point
+  def default(self, params):
+    pass
+
+  # Records the escrow the DAO resolved.
+  @sp.entry_point
+  def resolveEscrow(self, params):
+    sp.set_type(params, sp.TRecord(pollId = sp.TNat, returned = sp.TBool).layout(("pollId", "returned")))
+
+    self.data.resolvedEscrow = sp.some(params)
+
+  @sp.onchain_view()
+  def getPriorBalance(self, params):
+    sp.set_type(params, sp.TRecord(
+      address = sp.TAddress,
+      level = sp.TNat,
+    ).layout(("address", "level")))
+
+    sp.result(self.data.result)
@@ -10,6 +10,7 @@
 import smartpy as sp
 
 Addresses = sp.io.import_script_from_url("file:test-helpers/addresses.py")
+Checkpoints = sp.io.import_script_from_url("file:common/checkpoints.py")
 Errors = sp.io.import_script_from_url("file:common/errors.py")
 
 # CHANGED: Compress the contract into a single entity, rather than using inheritance.
@@ -17,8 +18,26 @@ class FA12(sp.Contract):
     def __init__(
         self, 
         # CHANGED: Give admin a default value
-        admin = Addresses.TOKEN_ADMIN_ADDRESS
+        admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        # CHANGED: Allow initial balances, approvals and checkpoints to be provided, for tests and benchmarks.
+        balances = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+        approvals = sp.big_map(l = {}, tkey = sp.TPair(sp.TAddress, sp.TAddress), tvalue = sp.TNat),
+        checkpoints = sp.big_map(l = {}, tkey = Checkpoints.CHECKPOINT_PAGE_KEY_TYPE, tvalue = Checkpoints.CHECKPOINT_PAGE_TYPE),
+        checkpointDirectories = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = Checkpoints.CHECKPOINT_DIRECTORY_TYPE),
+        numCheckpoints = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+        # CHANGED: Allow the number of checkpoints in a page to be set when the contract is compiled.
+        checkpointsPerPage = Checkpoints.CHECKPOINTS_PER_PAGE,
+        # CHANGED: Add the DAO, which bounds the checkpoints that may be compacted.
+        daoContractAddress = Addresses.DAO_ADDRESS,
+        # CHANGED: Add the number of blocks of checkpoint history which compaction always keeps.
+        minCheckpointRetentionBlocks = sp.nat(0),
+        # CHANGED: Choose which addresses are checkpointed.
+        checkpointMode = Checkpoints.CHECKPOINT_MODE_ALL,
+        # CHANGED: Add the number of seconds a permit may be used for after it is submitted.
+        permitExpiry = sp.nat(24 * 60 * 60),
     ):
+        self.checkpointsPerPage = checkpointsPerPage
+
         # CHANGED: Construct token metadata.
         token_id = sp.nat(0)
         kol_metadata = sp.map(
@@ -52,26 +71,32 @@ class FA12(sp.Contract):
 
 
         self.init(
-            balances = sp.big_map(
-                tkey = sp.TAddress,
-                tvalue = sp.TNat,
-            ),
-            approvals = sp.big_map(
-                tkey = sp.TAddress,
-                tvalue = sp.TMap(sp.TAddress, sp.TNat)
-            ),
-            # CHANGED: Add Checkpoints
-            checkpoints = sp.big_map(
-                l = {},
-                tkey = sp.TPair(sp.TAddress, sp.TNat),
-                tvalue = sp.TRecord(fromBlock = sp.TNat, balance = sp.TNat).layout(("fromBlock", "balance"))
-            ),
+            balances = balances,
+            approvals = approvals,
+            # CHANGED: Add Checkpoints, grouped in pages.
+            checkpoints = checkpoints,
+            # CHANGED: Add a directory of the checkpoint pages of each address.
+            checkpointDirectories = checkpointDirectories,
             # CHANGED: Add numCheckpoints
-            numCheckpoints = sp.big_map(
-                l = {},
-                tkey = sp.TAddress,
-                tvalue = sp.TNat
-            ),
+            numCheckpoints = numCheckpoints,
+            # CHANGED: Add the index of the oldest page of checkpoints which has not been compacted for each address.
+            firstCheckpointPages = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+            # CHANGED: Add the DAO, which bounds the checkpoints that may be compacted.
+            daoContractAddress = daoContractAddress,
+            # CHANGED: Add the number of blocks of checkpoint history which compaction always keeps.
+            minCheckpointRetentionBlocks = minCheckpointRetentionBlocks,
+            # CHANGED: Add the mode which decides which addresses are checkpointed.
+            checkpointMode = checkpointMode,
+            # CHANGED: Add the addresses which opted in to checkpoints, mapped to the block from which their
+            # checkpoints are complete.
+            checkpointedAddresses = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+            # CHANGED: Add TZIP-17 permits, mapping an owner and the hash of the permitted parameters to the time
+            # the permit expires.
+            permits = sp.big_map(l = {}, tkey = sp.TPair(sp.TAddress, sp.TBytes), tvalue = sp.TTimestamp),
+            # CHANGED: Add the next unused permit counter of each owner.
+            permitCounters = sp.big_map(l = {}, tkey = sp.TAddress, tvalue = sp.TNat),
+            # CHANGED: Add the number of seconds a permit may be used for after it is submitted.
+            permitExpiry = permitExpiry,
             # CHANGED: Allow minting to be disabled.
             mintingDisabled = False,
             # CHANGED: Include metadata and token_metadata bigmap in storage.
@@ -84,6 +109,23 @@ class FA12(sp.Contract):
             administrator = sp.some(admin), 
         )
 
+        # CHANGED: Generate TZIP-16 metadata which includes off chain views.
+        self.init_metadata("token_metadata", {
+            "name": "kDAO Token",
+            "description": "The FA1.2 Governance Token For Kolibri",
+            "authors": ["Hover Labs <hello@hover.engineering>"],
+            "homepage": "https://kolibri.finance",
+            "interfaces": ["TZIP-007-2021-01-29", "TZIP-016", "TZIP-017"],
+            "views": [
+                self.getBalanceOffchainView,
+                self.getAllowanceOffchainView,
+                self.getTotalSupplyOffchainView,
+                self.getPriorBalanceOffchainView,
+                self.getNumCheckpointsOffchainView,
+                self.getPermitCounterOffchainView,
+            ],
+        })
+
     # CHANGED: Allow administrator to update contract metadata.	
     @sp.entry_point	
     def updateContractMetadata(self, params):	
@@ -109,20 +151,145 @@ class FA12(sp.Contract):
     def writeCheckpoint(self, params):
         sp.set_type(params, sp.TRecord(checkpointedAddress = sp.TAddress, numCheckpoints = sp.TNat, newBalance = sp.TNat).layout(("checkpointedAddress", ("numCheckpoints", "newBalance"))))
 
-        # If there are no checkpoints, write data.
-        sp.if params.numCheckpoints == 0:
-            self.data.checkpoints[(params.checkpointedAddress, 0)] = sp.record(fromBlock = sp.level, balance = params.newBalance)
-            self.data.numCheckpoints[params.checkpointedAddress] = params.numCheckpoints + 1
+        Checkpoints.writeCheckpoint(self.data, self.checkpointsPerPage, params.checkpointedAddress, params.numCheckpoints, params.newBalance)
+
+    # CHANGED: Add method to write a checkpoint of the balance of an address, if the address is checkpointed.
+    def checkpointIfNecessary(self, address):
+        sp.if self.data.checkpointMode == Checkpoints.CHECKPOINT_MODE_ALL:
+            self.writeBalanceCheckpoint(address)
+        sp.else:
+            sp.if self.data.checkpointMode == Checkpoints.CHECKPOINT_MODE_OPT_IN:
+                sp.if self.data.checkpointedAddresses.contains(address):
+                    self.writeBalanceCheckpoint(address)
+
+    # CHANGED: Add method to write a checkpoint of the current balance of an address.
+    def writeBalanceCheckpoint(self, address):
+        self.writeCheckpoint(
+            sp.record(
+                checkpointedAddress = address,
+                numCheckpoints = self.data.numCheckpoints.get(address, 0),
+                newBalance = self.data.balances.get(address, 0)
+            )
+        )
+
+    # CHANGED: Add entrypoint to compact the checkpoints of an address.
+    # 
+    # Drops the oldest pages of this token's checkpoints of an address, which are read through
+    # `getPriorBalance`. A page is dropped once it was superseded at or before the compaction bound,
+    # and balances at blocks after the bound are unchanged. The bound is the earlier of:
+    # - `minCheckpointRetentionBlocks` before the current block, which the administrator sets and
+    #   which compaction never goes past, whatever the DAO's parameters are.
+    # - The DAO's `getOldestQueryableBlock`, so that snapshots of polls underway are kept.
+    # This entrypoint may be called by anyone.
+    # Params:
+    # - address (address): The address to compact checkpoints for.
+    # - maxPages (nat): The maximum number of pages to drop, which bounds the cost of the call.
+    @sp.entry_point
+    def compactCheckpoints(self, params):
+        sp.set_type(params, sp.TRecord(address = sp.TAddress, maxPages = sp.TNat).layout(("address", "maxPages")))
+
+        # Read the oldest block the DAO may still query.
+        oldestQueryableBlock = sp.local(
+            'oldestQueryableBlock',
+            sp.view("getOldestQueryableBlock", self.data.daoContractAddress, sp.unit, t = sp.TNat).open_some(Errors.ERROR_BAD_DAO_VIEW)
+        )
+
+        # Never compact within the retention window.
+        sp.if sp.level < self.data.minCheckpointRetentionBlocks:
+            oldestQueryableBlock.value = sp.nat(0)
         sp.else:
-            # Otherwise, if this update occurred in the same block, overwrite
-            sp.if self.data.checkpoints[(params.checkpointedAddress, sp.as_nat(params.numCheckpoints - 1))].fromBlock == sp.level: 
-                self.data.checkpoints[(params.checkpointedAddress, sp.as_nat(params.numCheckpoints - 1))] = sp.record(fromBlock = sp.level, balance = params.newBalance)
+            retainedFromBlock = sp.as_nat(sp.level - self.data.minCheckpointRetentionBlocks)
+            sp.if retainedFromBlock < oldestQueryableBlock.value:
+                oldestQueryableBlock.value = retainedFromBlock
+
+        numCheckpoints = self.data.numCheckpoints.get(params.address, 0)
+        sp.if numCheckpoints != 0:
+            lastPage = sp.local('lastPage', sp.as_nat(numCheckpoints - 1) / self.checkpointsPerPage)
+            firstPage = sp.local('firstPage', self.data.firstCheckpointPages.get(params.address, 0))
+            directory = sp.local('directory', self.data.checkpointDirectories[params.address])
+            droppedPages = sp.local('droppedPages', sp.nat(0))
+
+            # A boolean that indicates that the next page is still needed.
+            # This extra variable is required because SmartPy does not have a way to break from
+            # a while loop. 
+            nextPageIsNeeded = sp.local('nextPageIsNeeded', False)
+
+            # The last page is always kept, so that the latest balance is known.
+            sp.while (droppedPages.value < params.maxPages) & (firstPage.value < lastPage.value) & (nextPageIsNeeded.value == False):
+                # A page is no longer needed once the next page begins at or before the oldest queryable block.
+                sp.if directory.value[firstPage.value + 1] <= oldestQueryableBlock.value:
+                    del self.data.checkpoints[(params.address, firstPage.value)]
+                    del directory.value[firstPage.value]
+                    firstPage.value += 1
+                    droppedPages.value += 1
+                sp.else:
+                    nextPageIsNeeded.value = True
+
+            sp.if droppedPages.value > 0:
+                self.data.checkpointDirectories[params.address] = directory.value
+                self.data.firstCheckpointPages[params.address] = firstPage.value
+
+    # CHANGED: Add entrypoint to opt in to checkpoints.
+    # 
+    # Once opted in, the balance of the sender is checkpointed while the checkpoint mode is
+    # `CHECKPOINT_MODE_OPT_IN`. Opting in can not be undone, so that checkpoints are never left stale.
+    @sp.entry_point
+    def optInToCheckpoints(self, unit):
+        sp.set_type(unit, sp.TUnit)
+
+        sp.if ~self.data.checkpointedAddresses.contains(sp.sender):
+            # The checkpoint mode is only ever lowered, so while all addresses are checkpointed the checkpoints of
+            # the sender are complete from origination. Otherwise they are complete from this block.
+            sp.if self.data.checkpointMode == Checkpoints.CHECKPOINT_MODE_ALL:
+                self.data.checkpointedAddresses[sp.sender] = sp.nat(0)
             sp.else:
-                # Only write an additional checkpoint if the balance has changed.
-                sp.if self.data.checkpoints[(params.checkpointedAddress, sp.as_nat(params.numCheckpoints - 1))].balance != params.newBalance:
-                    self.data.checkpoints[(params.checkpointedAddress, params.numCheckpoints)] = sp.record(fromBlock = sp.level, balance = params.newBalance)
-                    self.data.numCheckpoints[params.checkpointedAddress] = params.numCheckpoints + 1
+                self.data.checkpointedAddresses[sp.sender] = sp.level
+
+        # Record the balance the sender holds when opting in.
+        self.checkpointIfNecessary(sp.sender)
+
+    # CHANGED: Allow administrator to choose which addresses are checkpointed.
+    # 
+    # The mode may only be lowered. Addresses which stop being checkpointed are left with stale checkpoints, which
+    # would be reported as current balances if they were checkpointed again.
+    @sp.entry_point
+    def setCheckpointMode(self, params):
+        sp.set_type(params, sp.TNat)
+        sp.verify(self.is_administrator(sp.sender), Errors.ERROR_NOT_ADMINISTRATOR)
+        sp.verify(params <= Checkpoints.CHECKPOINT_MODE_ALL, Errors.ERROR_BAD_CHECKPOINT_MODE)
+        sp.verify(params <= self.data.checkpointMode, Errors.ERROR_BAD_CHECKPOINT_MODE)
+        self.data.checkpointMode = params
+
+    # CHANGED: Allow administrator to update the DAO.
+    @sp.entry_point
+    def setDaoContractAddress(self, params):
+        sp.set_type(params, sp.TAddress)
+        sp.verify(self.is_administrator(sp.sender), Errors.ERROR_NOT_ADMINISTRATOR)
+        self.data.daoContractAddress = params
+
+    # CHANGED: Allow administrator to update the number of blocks of checkpoint history which compaction always keeps.
+    @sp.entry_point
+    def setMinCheckpointRetentionBlocks(self, params):
+        sp.set_type(params, sp.TNat)
+        sp.verify(self.is_administrator(sp.sender), Errors.ERROR_NOT_ADMINISTRATOR)
+        self.data.minCheckpointRetentionBlocks = params
       
+    # CHANGED: Add method to find the balance of an address at a level from its checkpoints.
+    def findPriorBalance(self, address, level):
+        # Verify the checkpoints of the address are complete at the requested level.
+        sp.verify(self.data.checkpointMode != Checkpoints.CHECKPOINT_MODE_DISABLED, Errors.ERROR_NOT_CHECKPOINTED)
+        sp.if self.data.checkpointMode == Checkpoints.CHECKPOINT_MODE_OPT_IN:
+            sp.verify(self.data.checkpointedAddresses.contains(address), Errors.ERROR_NOT_CHECKPOINTED)
+            sp.verify(self.data.checkpointedAddresses[address] <= level, Errors.ERROR_NOT_CHECKPOINTED)
+
+        return Checkpoints.findPriorBalance(
+            self.data,
+            self.checkpointsPerPage,
+            address,
+            level,
+            firstPage = self.data.firstCheckpointPages.get(address, 0)
+        )
+
     # CHANGED: Add view to get balance from checkpoints
     @sp.utils.view(sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat))
     def getPriorBalance(self, params):
@@ -131,73 +298,28 @@ class FA12(sp.Contract):
             level = sp.TNat,
         ).layout(("address", "level")))
 
-        sp.verify(params.level < sp.level, Errors.ERROR_BLOCK_LEVEL_TOO_SOON)
+        sp.result(sp.record(result = self.findPriorBalance(params.address, params.level), address = params.address, level = params.level))
 
-        # If there are no checkpoints, return 0.
-        sp.if self.data.numCheckpoints.get(params.address, 0) == 0:
-            sp.result(sp.record(result = 0, address = params.address, level = params.level))
-        sp.else:
-            # First check most recent balance.
-            sp.if self.data.checkpoints[(params.address, sp.as_nat(self.data.numCheckpoints[params.address] - 1))].fromBlock <= params.level:
-                sp.result(sp.record(
-                    result = self.data.checkpoints[(params.address, sp.as_nat(self.data.numCheckpoints[params.address] - 1))].balance,
-                    address = params.address,
-                    level = params.level
-                ))
-            sp.else:
-                # Next, check for an implicit zero balance.
-                sp.if self.data.checkpoints[(params.address, sp.nat(0))].fromBlock > params.level:
-                    sp.result(sp.record(result = 0, address = params.address, level = params.level))
-                sp.else:
-                    # A boolean that indicates that the current center is the level we are looking for.
-                    # This extra variable is required because SmartPy does not have a way to break from
-                    # a while loop. 
-                    centerIsNeedle = sp.local('centerIsNeedle', False)
-
-                    # Otherwise perform a binary search.
-                    center = sp.local('center', 0)
-                    lower = sp.local('lower', 0)
-                    upper = sp.local('upper', sp.as_nat(self.data.numCheckpoints[params.address] - 1))   
-                                        
-                    sp.while (upper.value > lower.value) & (centerIsNeedle.value == False):
-                        # A complicated way to get the ceiling.
-                        center.value = sp.as_nat(upper.value - (sp.as_nat(upper.value - lower.value) / 2))
-                        
-                        # Check that center is the exact block we are looking for.
-                        sp.if self.data.checkpoints[(params.address, center.value)].fromBlock == params.level:
-                            centerIsNeedle.value = True
-                        sp.else:
-                            sp.if self.data.checkpoints[(params.address, center.value)].fromBlock < params.level:
-                                lower.value = center.value
-                            sp.else:
-                                upper.value = sp.as_nat(center.value - 1)
-
-                    # If the center is the needle, return the value at center.
-                    sp.if centerIsNeedle.value == True:
-                        sp.result(
-                            sp.record(
-                                result = self.data.checkpoints[(params.address, center.value)].balance,
-                                address = params.address, 
-                                level = params.level
-                            )
-                        )
-                    # Otherwise return the result.
-                    sp.else:
-                        sp.result(
-                            sp.record(
-                                result = self.data.checkpoints[(params.address, lower.value)].balance, 
-                                address = params.address, 
-                                level = params.level
-                            )
-                        )
-        
     @sp.entry_point
     def transfer(self, params):
         sp.set_type(params, sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value"))))
+
+        # CHANGED: Allow a transfer without an allowance if the owner submitted a permit for these exact parameters.
+        # The permit is consumed by the transfer.
+        permitted = sp.local("permitted", False)
+        sp.if (~self.is_administrator(sp.sender)) & (params.from_ != sp.sender) & (self.data.approvals.get((params.from_, sp.sender), 0) < params.value):
+            permitKey = sp.local("permitKey", (params.from_, sp.blake2b(sp.pack(params))))
+            sp.if self.data.permits.contains(permitKey.value):
+                sp.verify(sp.now <= self.data.permits[permitKey.value], Errors.ERROR_PERMIT_EXPIRED)
+                del self.data.permits[permitKey.value]
+                permitted.value = True
+
+        # CHANGED: Read allowances from a single big map keyed by owner and spender.
         sp.verify(self.is_administrator(sp.sender) |
             (~self.is_paused() &
                 ((params.from_ == sp.sender) |
-                 (self.data.approvals[params.from_][sp.sender] >= params.value))), Errors.ERROR_NOT_ALLOWED)
+                 permitted.value |
+                 (self.data.approvals.get((params.from_, sp.sender), 0) >= params.value))), Errors.ERROR_NOT_ALLOWED)
         self.addAddressIfNecessary(params.to_)
 
         # CHANGED: Add from address as well.
@@ -206,64 +328,218 @@ class FA12(sp.Contract):
         sp.verify(self.data.balances[params.from_] >= params.value, Errors.ERROR_LOW_BALANCE)
         self.data.balances[params.from_] = sp.as_nat(self.data.balances[params.from_] - params.value)
         self.data.balances[params.to_] += params.value
-        sp.if (params.from_ != sp.sender) & (~self.is_administrator(sp.sender)):
-            self.data.approvals[params.from_][sp.sender] = sp.as_nat(self.data.approvals[params.from_][sp.sender] - params.value)
+        sp.if (params.from_ != sp.sender) & (~self.is_administrator(sp.sender)) & (~permitted.value):
+            remainingAllowance = sp.local("remainingAllowance", sp.as_nat(self.data.approvals.get((params.from_, sp.sender), 0) - params.value))
+            self.setAllowance(params.from_, sp.sender, remainingAllowance.value)
             
         # CHANGED: Write checkpoints.
         # Write a checkpoint for the sender.
-        self.writeCheckpoint(
-            sp.record(
-                checkpointedAddress = params.from_,
-                numCheckpoints = self.data.numCheckpoints.get(params.from_, 0),
-                newBalance = self.data.balances[params.from_]
-            )
-        )
+        self.checkpointIfNecessary(params.from_)
         # Write a checkpoint for the receiver
-        self.writeCheckpoint(
-            sp.record(
-                checkpointedAddress = params.to_,
-                numCheckpoints = self.data.numCheckpoints.get(params.to_, 0),
-                newBalance = self.data.balances[params.to_]
-            )
-        )
+        self.checkpointIfNecessary(params.to_)
+
+    # CHANGED: Add TZIP-17 permits.
+    #
+    # Each permit is signed by an owner over the chain, this contract, the owner's next unused counter and the
+    # hash of the parameters of a `transfer`. Once submitted, anyone may make that transfer on the owner's behalf
+    # until the permit expires, without the owner approving them. Relayers may submit many permits at once.
+    #
+    # Params:
+    # - (list(pair(key, pair(signature, bytes)))): The public key of each owner, their signature and the
+    #   blake2b hash of the packed parameters they permit.
+    @sp.entry_point
+    def permit(self, params):
+        sp.set_type(params, sp.TList(sp.TPair(sp.TKey, sp.TPair(sp.TSignature, sp.TBytes))))
+        sp.verify(~self.is_paused(), Errors.ERROR_PAUSED)
+
+        sp.for permit in params:
+            publicKey = sp.local('publicKey', sp.fst(permit))
+            signature = sp.local('signature', sp.fst(sp.snd(permit)))
+            paramHash = sp.local('paramHash', sp.snd(sp.snd(permit)))
+            owner = sp.local('owner', sp.to_address(sp.implicit_account(sp.hash_key(publicKey.value))))
+
+            # Verify the permit was signed by the owner with their next unused counter.
+            counter = sp.local('counter', self.data.permitCounters.get(owner.value, sp.nat(0)))
+            payload = sp.pack(sp.pair(sp.pair(sp.chain_id, sp.self_address), sp.pair(counter.value, paramHash.value)))
+            sp.verify(sp.check_signature(publicKey.value, signature.value, payload), Errors.ERROR_BAD_SIGNATURE)
+
+            # A permit may only be replaced once it expires.
+            permitKey = sp.local('permitKey', (owner.value, paramHash.value))
+            sp.if self.data.permits.contains(permitKey.value):
+                sp.verify(self.data.permits[permitKey.value] < sp.now, Errors.ERROR_DUPLICATE_PERMIT)
+
+            # Consume the counter and store the permit.
+            self.data.permitCounters[owner.value] = counter.value + 1
+            self.data.permits[permitKey.value] = sp.now.add_seconds(sp.to_int(self.data.permitExpiry))
+
+    # CHANGED: Allow administrator to update the number of seconds a permit may be used for.
+    @sp.entry_point
+    def setPermitExpiry(self, params):
+        sp.set_type(params, sp.TNat)
+        sp.verify(self.is_administrator(sp.sender), Errors.ERROR_NOT_ADMINISTRATOR)
+        self.data.permitExpiry = params
+
+    # CHANGED: Add entrypoint to make a batch of transfers in one operation.
+    #
+    # Transfers are checked in order against a running balance of each address, so the batch succeeds exactly
+    # when the same transfers made one by one would. Each address in the batch then has its balance written
+    # and checkpointed once, and each sender's allowance is checked and spent once. A sender whose allowance
+    # does not cover the batch may instead have submitted a permit for the hash of the whole batch.
+    # 
+    # Params:
+    # - (list(record(from_, to_, value))): The transfers to make, with the same layout as `transfer`.
+    @sp.entry_point
+    def transferBatch(self, params):
+        sp.set_type(params, sp.TList(sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value")))))
+
+        isAdministrator = sp.local("isAdministrator", self.is_administrator(sp.sender))
+        sp.verify(isAdministrator.value | ~self.is_paused(), Errors.ERROR_NOT_ALLOWED)
+
+        # Sum the value sent by each address, and apply each transfer to the running balances of the batch. The
+        # balance of each address is read from storage once, when it first appears in the batch.
+        sentValues = sp.local("sentValues", {}, sp.TMap(sp.TAddress, sp.TNat))
+        initialBalances = sp.local("initialBalances", {}, sp.TMap(sp.TAddress, sp.TNat))
+        balances = sp.local("balances", {}, sp.TMap(sp.TAddress, sp.TNat))
+        sp.for transfer in params:
+            sentValues.value[transfer.from_] = sentValues.value.get(transfer.from_, 0) + transfer.value
+
+            sp.if ~balances.value.contains(transfer.from_):
+                initialBalances.value[transfer.from_] = self.data.balances.get(transfer.from_, 0)
+                balances.value[transfer.from_] = initialBalances.value[transfer.from_]
+            sp.verify(balances.value[transfer.from_] >= transfer.value, Errors.ERROR_LOW_BALANCE)
+            balances.value[transfer.from_] = sp.as_nat(balances.value[transfer.from_] - transfer.value)
+
+            sp.if ~balances.value.contains(transfer.to_):
+                initialBalances.value[transfer.to_] = self.data.balances.get(transfer.to_, 0)
+                balances.value[transfer.to_] = initialBalances.value[transfer.to_]
+            balances.value[transfer.to_] += transfer.value
+
+        # Authorize each sender once, spending their allowance or consuming their permit for this exact batch.
+        sp.for sent in sentValues.value.items():
+            sp.if (sent.key != sp.sender) & (~isAdministrator.value):
+                allowance = sp.local("allowance", self.data.approvals.get((sent.key, sp.sender), 0))
+                sp.if allowance.value >= sent.value:
+                    self.setAllowance(sent.key, sp.sender, sp.as_nat(allowance.value - sent.value))
+                sp.else:
+                    permitKey = sp.local("permitKey", (sent.key, sp.blake2b(sp.pack(params))))
+                    sp.verify(self.data.permits.contains(permitKey.value), Errors.ERROR_NOT_ALLOWED)
+                    sp.verify(sp.now <= self.data.permits[permitKey.value], Errors.ERROR_PERMIT_EXPIRED)
+                    del self.data.permits[permitKey.value]
+
+        # Write the balance and a checkpoint for each address whose balance changed.
+        sp.for balance in balances.value.items():
+            sp.if balance.value != initialBalances.value[balance.key]:
+                self.data.balances[balance.key] = balance.value
+                self.checkpointIfNecessary(balance.key)
 
     @sp.entry_point
     def approve(self, params):
         sp.set_type(params, sp.TRecord(spender = sp.TAddress, value = sp.TNat).layout(("spender", "value")))
 
-        # CHANGED: Add address if needed. This fixes a bug in our tests for checkpoints where you cannot approve
-        # before you have a balance.
-        self.addAddressIfNecessary(sp.sender)
-
         sp.verify(~self.is_paused(), Errors.ERROR_PAUSED)
-        alreadyApproved = self.data.approvals[sp.sender].get(params.spender, 0)
+        # CHANGED: Read and write allowances in a single big map keyed by owner and spender.
+        alreadyApproved = self.data.approvals.get((sp.sender, params.spender), 0)
         sp.verify((alreadyApproved == 0) | (params.value == 0), Errors.ERROR_UNSAFE_ALLOWANCE_CHANGE)
-        self.data.approvals[sp.sender][params.spender] = params.value
+        self.setAllowance(sp.sender, params.spender, params.value)
+
+    # CHANGED: Add method to set an allowance. Allowances of zero are removed rather than stored.
+    def setAllowance(self, owner, spender, value):
+        sp.if value == 0:
+            del self.data.approvals[(owner, spender)]
+        sp.else:
+            self.data.approvals[(owner, spender)] = value
 
+    # CHANGED: Do not create an empty entry in approvals for new addresses.
     def addAddressIfNecessary(self, address):
         sp.if ~ self.data.balances.contains(address):
             self.data.balances[address] = 0
-            self.data.approvals[address] = {}
 
     @sp.utils.view(sp.TNat)
     def getBalance(self, params):
-        # CHANGED: Add address if needed.
-        self.addAddressIfNecessary(params)
-
-        sp.result(self.data.balances[params])
+        # CHANGED: Read the balance without adding the address to storage.
+        sp.result(self.data.balances.get(params, 0))
 
     @sp.utils.view(sp.TNat)
     def getAllowance(self, params):
-        # CHANGED: Add address if needed.
-        self.addAddressIfNecessary(params.owner)
-
-        sp.result(self.data.approvals[params.owner].get(params.spender, sp.nat(0)))
+        # CHANGED: Read allowances from a single big map keyed by owner and spender.
+        sp.result(self.data.approvals.get((params.owner, params.spender), sp.nat(0)))
 
     @sp.utils.view(sp.TNat)
     def getTotalSupply(self, params):
         sp.set_type(params, sp.TUnit)
         sp.result(self.data.totalSupply)
 
+    ################################################################
+    # Views
+    #
+    # CHANGED: Add views which do not modify storage. On chain views may be read synchronously by other
+    # contracts, and off chain views may be read for free via RPC.
+    ################################################################
+
+    @sp.onchain_view(name = "getBalance")
+    def getBalanceView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.balances.get(address, 0))
+
+    @sp.onchain_view(name = "getAllowance")
+    def getAllowanceView(self, params):
+        sp.set_type(params, sp.TRecord(owner = sp.TAddress, spender = sp.TAddress).layout(("owner", "spender")))
+        sp.result(self.data.approvals.get((params.owner, params.spender), 0))
+
+    @sp.onchain_view(name = "getTotalSupply")
+    def getTotalSupplyView(self, unit):
+        sp.set_type(unit, sp.TUnit)
+        sp.result(self.data.totalSupply)
+
+    @sp.onchain_view(name = "getPriorBalance")
+    def getPriorBalanceView(self, params):
+        sp.set_type(params, sp.TRecord(
+            address = sp.TAddress,
+            level = sp.TNat,
+        ).layout(("address", "level")))
+
+        sp.result(self.findPriorBalance(params.address, params.level))
+
+    @sp.onchain_view(name = "getNumCheckpoints")
+    def getNumCheckpointsView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.numCheckpoints.get(address, 0))
+
+    @sp.offchain_view(pure = True, name = "getBalance")
+    def getBalanceOffchainView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.balances.get(address, 0))
+
+    @sp.offchain_view(pure = True, name = "getAllowance")
+    def getAllowanceOffchainView(self, params):
+        sp.set_type(params, sp.TRecord(owner = sp.TAddress, spender = sp.TAddress).layout(("owner", "spender")))
+        sp.result(self.data.approvals.get((params.owner, params.spender), 0))
+
+    @sp.offchain_view(pure = True, name = "getTotalSupply")
+    def getTotalSupplyOffchainView(self, unit):
+        sp.set_type(unit, sp.TUnit)
+        sp.result(self.data.totalSupply)
+
+    @sp.offchain_view(pure = True, name = "getPriorBalance")
+    def getPriorBalanceOffchainView(self, params):
+        sp.set_type(params, sp.TRecord(
+            address = sp.TAddress,
+            level = sp.TNat,
+        ).layout(("address", "level")))
+
+        sp.result(self.findPriorBalance(params.address, params.level))
+
+    @sp.offchain_view(pure = True, name = "getNumCheckpoints")
+    def getNumCheckpointsOffchainView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.numCheckpoints.get(address, 0))
+
+    # CHANGED: Add view to get the next unused permit counter of an owner, which their next permit must be signed with.
+    @sp.offchain_view(pure = True, name = "getPermitCounter")
+    def getPermitCounterOffchainView(self, address):
+        sp.set_type(address, sp.TAddress)
+        sp.result(self.data.permitCounters.get(address, 0))
+
     # CHANGED: Allow minting to be disabled.
     @sp.entry_point
     def disableMinting(self, unit):
@@ -285,13 +561,27 @@ class FA12(sp.Contract):
         
         # CHANGED
         # Write a checkpoint for the receiver
-        self.writeCheckpoint(
-            sp.record(
-                checkpointedAddress = params.address,
-                numCheckpoints = self.data.numCheckpoints.get(params.address, 0),
-                newBalance = self.data.balances[params.address]
-            )
-        )
+        self.checkpointIfNecessary(params.address)
+
+    # CHANGED: Add entrypoint to mint to many addresses in one operation, for genesis distributions.
+    #
+    # Params:
+    # - (list(record(address, value))): The addresses to mint to and the amount to mint to each, with the same
+    #   layout as `mint`.
+    @sp.entry_point
+    def mintBatch(self, params):
+        sp.verify(self.data.mintingDisabled == False, Errors.ERROR_NOT_ALLOWED)
+
+        sp.set_type(params, sp.TList(sp.TRecord(address = sp.TAddress, value = sp.TNat)))
+        sp.verify(self.is_administrator(sp.sender),  Errors.ERROR_NOT_ADMINISTRATOR)
+
+        # Write the balance and a checkpoint of each receiver, and update the total supply once.
+        mintedValue = sp.local("mintedValue", sp.nat(0))
+        sp.for mint in params:
+            self.data.balances[mint.address] = self.data.balances.get(mint.address, 0) + mint.value
+            mintedValue.value += mint.value
+            self.checkpointIfNecessary(mint.address)
+        self.data.totalSupply += mintedValue.value
         
     # CHANGED: Remove burning.       
 
@@ -331,6 +621,7 @@ class Viewer(sp.Contract):
 if __name__ == "__main__":
 
     Addresses = sp.import_script_from_url("file:./test-helpers/addresses.py")
+    Dao = sp.import_script_from_url("file:./dao.py")
 
     ################################################################
     # transfer
@@ -1062,29 +1353,25 @@ if __name__ == "__main__":
         )      
         scenario.verify(viewer.data.last.open_some().address == Addresses.BOB_ADDRESS)
         scenario.verify(viewer.data.last.open_some().level == 9)
-        scenario.verify(viewer.data.last.open_some().result == 40)             
-
-    ################################################################
-    # transfer
-    #
-    # Core transfer functionality tests are deferred to the token contract
-    # tests by SmartPy. 
-    #
-    # These tests specifically test the checkpoint functionality, and are largely
-    # based off of Compound's tests:
-    # https://github.com/compound-finance/compound-protocol/blob/master/tests/Governance/CompTest.js
-    ################################################################
+        scenario.verify(viewer.data.last.open_some().result == 40)
 
-    @sp.add_test(name="transfer - counts checkpoints correctly on transfers from owners")
+    @sp.add_test(name="getPriorBalance - returns the balance at the appropriate checkpoint across pages")
     def test():
-        # GIVEN a Token contract
+        # GIVEN a Token contract with two checkpoints per page
         scenario = sp.test_scenario()
 
         token = FA12(
             admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
         )
         scenario += token
 
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
         # AND an alice has 100 tokens
         scenario += token.mint(
             sp.record(
@@ -1092,180 +1379,1751 @@ if __name__ == "__main__":
                 address = Addresses.ALICE_ADDRESS
             )
         ).run(
-            level = sp.nat(0),
+            level = 0,
             sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
 
-        # WHEN a series of transfers are made
-        # THEN token checkpoints are incremented properly
+        # And alice transfers Bob 10 tokens at a number of checkpoints such that the pages are:
+        # +------+-------+---------+
+        # | page | block | balance |
+        # +------+-------+---------+
+        # | 0    | 2     | 10      |
+        # |      | 4     | 20      |
+        # +------+-------+---------+
+        # | 1    | 6     | 30      |
+        # |      | 8     | 40      |
+        # +------+-------+---------+
+        # | 2    | 10    | 50      |
+        # +------+-------+---------+
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
 
-        # Alice transfers the initial tokens to Bob.
-        scenario += token.transfer(
-            from_ = Addresses.ALICE_ADDRESS, 
-            to_ = Addresses.BOB_ADDRESS, 
-            value = 10
-        ).run(
-            level = sp.nat(1),
-            sender = Addresses.ALICE_ADDRESS
-        )
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(2))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(0))
+        # THEN the checkpoints are split across three pages
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == 5)
+        scenario.verify(sp.len(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)]) == 2)
+        scenario.verify(sp.len(token.data.checkpoints[(Addresses.BOB_ADDRESS, 1)]) == 2)
+        scenario.verify(sp.len(token.data.checkpoints[(Addresses.BOB_ADDRESS, 2)]) == 1)
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 1)][1].balance == 40)
 
-        # Alice transfers tokens to Charlie
-        scenario += token.transfer(
-            from_ = Addresses.ALICE_ADDRESS, 
-            to_ = Addresses.CHARLIE_ADDRESS, 
-            value = 10
-        ).run(
-            level = sp.nat(2),
-            sender = Addresses.ALICE_ADDRESS
-        )
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(1))
+        # AND the directory records the first block of each page.
+        scenario.verify(token.data.checkpointDirectories[Addresses.BOB_ADDRESS][0] == 2)
+        scenario.verify(token.data.checkpointDirectories[Addresses.BOB_ADDRESS][1] == 6)
+        scenario.verify(token.data.checkpointDirectories[Addresses.BOB_ADDRESS][2] == 10)
 
-        # Bob transfers tokens to Charlie
-        scenario += token.transfer(
-            from_ = Addresses.BOB_ADDRESS, 
-            to_ = Addresses.CHARLIE_ADDRESS, 
-            value = 5
-        ).run(
-            level = sp.nat(3),
-            sender = Addresses.BOB_ADDRESS
-        )
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(2))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(2))
+        # WHEN balances are requested before, at, and between each checkpoint
+        # THEN the correct answer is returned.
+        for (requestLevel, expectedBalance) in [(1, 0), (2, 10), (3, 10), (5, 20), (6, 30), (7, 30), (8, 40), (9, 40), (10, 50), (11, 50)]:
+            scenario += token.getPriorBalance(
+                (
+                    sp.record(
+                        address = Addresses.BOB_ADDRESS,
+                        level = requestLevel
+                    ),
+                    viewer.typed
+                )
+            ).run(
+                level = 12,
+            )
+            scenario.verify(viewer.data.last.open_some().result == expectedBalance)
 
-        # AND history is recorded correctly for Alice.
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].fromBlock == 0)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].balance == 100)
+    ################################################################
+    # compactCheckpoints
+    ################################################################
 
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 1)].fromBlock == 1)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 1)].balance == 90)
+    @sp.add_test(name="compactCheckpoints - drops pages which were superseded before the oldest queryable block")
+    def test():
+        scenario = sp.test_scenario()
 
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 2)].fromBlock == 2)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 2)].balance == 80)
+        # GIVEN a DAO with no polls underway, so the oldest queryable block is the next block
+        dao = Dao.DaoContract()
+        scenario += dao
 
-        # AND history is recorded correctly for Bob.
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)].fromBlock == 1)
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)].balance == 10)
+        # AND a Token contract with two checkpoints per page which reads from the DAO
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
+            daoContractAddress = dao.address,
+        )
+        scenario += token
 
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 1)].fromBlock == 3)
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 1)].balance == 5)
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
 
-        # AND history is recorded correctly for Charlie.
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)].fromBlock == 2)
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)].balance == 10)
+        # AND Bob has checkpoints at blocks 2, 4, 6, 8 and 10, over three pages
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = 0,
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
 
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 1)].fromBlock == 3)
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 1)].balance == 15)
+        # WHEN Bob's checkpoints are compacted
+        scenario += token.compactCheckpoints(
+            sp.record(
+                address = Addresses.BOB_ADDRESS,
+                maxPages = sp.nat(10)
+            )
+        ).run(
+            sender = Addresses.NULL_ADDRESS,
+            level = 12,
+        )
+
+        # THEN every page but the last is dropped
+        scenario.verify(~token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 0)))
+        scenario.verify(~token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 1)))
+        scenario.verify(token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 2)))
+        scenario.verify(~token.data.checkpointDirectories[Addresses.BOB_ADDRESS].contains(0))
+        scenario.verify(~token.data.checkpointDirectories[Addresses.BOB_ADDRESS].contains(1))
+        scenario.verify(token.data.firstCheckpointPages[Addresses.BOB_ADDRESS] == 2)
+
+        # AND the number of checkpoints is unchanged.
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == 5)
+
+        # AND balances which may still be queried are unchanged.
+        for (requestLevel, expectedBalance) in [(10, 50), (11, 50)]:
+            scenario += token.getPriorBalance(
+                (
+                    sp.record(
+                        address = Addresses.BOB_ADDRESS,
+                        level = requestLevel
+                    ),
+                    viewer.typed
+                )
+            ).run(
+                level = 12,
+            )
+            scenario.verify(viewer.data.last.open_some().result == expectedBalance)
 
-    @sp.add_test(name="transfer - counts checkpoints correctly on transfers via approvals")
+    @sp.add_test(name="getPriorBalance - fails for levels before the oldest checkpoint which was not compacted")
     def test():
-        # GIVEN a Token contract
         scenario = sp.test_scenario()
 
+        # GIVEN a DAO with no polls underway, so the oldest queryable block is the next block
+        dao = Dao.DaoContract()
+        scenario += dao
+
+        # AND a Token contract with two checkpoints per page which reads from the DAO
         token = FA12(
             admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
+            daoContractAddress = dao.address,
         )
         scenario += token
 
-        # AND an alice has 100 tokens
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
+        # AND Bob has checkpoints at blocks 2, 4, 6, 8 and 10, over three pages
         scenario += token.mint(
             sp.record(
                 value = 100,
                 address = Addresses.ALICE_ADDRESS
             )
         ).run(
-            level = sp.nat(0),
+            level = 0,
             sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
 
-        # AND Alice has approved Charlie to transfer 100 tokens
-        scenario += token.approve(
-            spender = Addresses.CHARLIE_ADDRESS,
-            value = 100
+        # AND Bob's checkpoints were compacted to the last page, which begins at block 10
+        scenario += token.compactCheckpoints(
+            sp.record(
+                address = Addresses.BOB_ADDRESS,
+                maxPages = sp.nat(10)
+            )
         ).run(
-            sender = Addresses.ALICE_ADDRESS
+            sender = Addresses.NULL_ADDRESS,
+            level = 12,
+        )
+
+        # WHEN balances before block 10 are requested
+        # THEN the requests fail.
+        for requestLevel in [1, 9]:
+            scenario += token.getPriorBalance(
+                (
+                    sp.record(
+                        address = Addresses.BOB_ADDRESS,
+                        level = requestLevel
+                    ),
+                    viewer.typed
+                )
+            ).run(
+                level = 12,
+                valid = False
+            )
+
+    @sp.add_test(name="compactCheckpoints - keeps pages which an active poll may read")
+    def test():
+        scenario = sp.test_scenario()
+
+        # GIVEN a DAO with a poll underway which reads voting power at block 7
+        dao = Dao.DaoContract(
+            activePollStartBlocks = sp.map(l = { 0: sp.nat(7) }, tkey = sp.TNat, tvalue = sp.TNat),
         )
+        scenario += dao
 
-        # AND Bob has approved Charlie to transfer 100 tokens
-        scenario += token.approve(
-            spender = Addresses.CHARLIE_ADDRESS,
-            value = 100
-        ).run(
-            sender = Addresses.BOB_ADDRESS
+        # AND a Token contract with two checkpoints per page which reads from the DAO
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
+            daoContractAddress = dao.address,
         )
+        scenario += token
 
-        # WHEN a series of transfers are made via approvals
-        # THEN token checkpoints are incremented properly
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
 
-        # Charlie transfers tokens from Alice to Bob.
-        scenario += token.transfer(
-            from_ = Addresses.ALICE_ADDRESS, 
-            to_ = Addresses.BOB_ADDRESS, 
-            value = 10
+        # AND Bob has checkpoints at blocks 2, 4, 6, 8 and 10, over three pages
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
         ).run(
-            level = sp.nat(1),
-            sender = Addresses.ALICE_ADDRESS
+            level = 0,
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(2))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(0))
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
 
-        # Charlie transfers tokens from Alice to Charlie.
+        # WHEN Bob's checkpoints are compacted
+        scenario += token.compactCheckpoints(
+            sp.record(
+                address = Addresses.BOB_ADDRESS,
+                maxPages = sp.nat(10)
+            )
+        ).run(
+            sender = Addresses.NULL_ADDRESS,
+            level = 12,
+        )
+
+        # THEN only the first page is dropped
+        scenario.verify(~token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 0)))
+        scenario.verify(token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 1)))
+        scenario.verify(token.data.firstCheckpointPages[Addresses.BOB_ADDRESS] == 1)
+
+        # AND the number of checkpoints is unchanged.
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == 5)
+
+        # AND balances which may still be queried are unchanged.
+        for (requestLevel, expectedBalance) in [(7, 30), (8, 40), (9, 40), (11, 50)]:
+            scenario += token.getPriorBalance(
+                (
+                    sp.record(
+                        address = Addresses.BOB_ADDRESS,
+                        level = requestLevel
+                    ),
+                    viewer.typed
+                )
+            ).run(
+                level = 12,
+            )
+            scenario.verify(viewer.data.last.open_some().result == expectedBalance)
+
+    @sp.add_test(name="compactCheckpoints - drops at most maxPages pages")
+    def test():
+        scenario = sp.test_scenario()
+
+        # GIVEN a DAO with no polls underway
+        dao = Dao.DaoContract()
+        scenario += dao
+
+        # AND a Token contract with two checkpoints per page which reads from the DAO
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
+            daoContractAddress = dao.address,
+        )
+        scenario += token
+
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
+        # AND Bob has checkpoints at blocks 2, 4, 6, 8 and 10, over three pages
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = 0,
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
+
+        # WHEN Bob's checkpoints are compacted
+        scenario += token.compactCheckpoints(
+            sp.record(
+                address = Addresses.BOB_ADDRESS,
+                maxPages = sp.nat(1)
+            )
+        ).run(
+            sender = Addresses.NULL_ADDRESS,
+            level = 12,
+        )
+
+        # THEN only one page is dropped
+        scenario.verify(~token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 0)))
+        scenario.verify(token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 1)))
+        scenario.verify(token.data.firstCheckpointPages[Addresses.BOB_ADDRESS] == 1)
+
+        # AND the number of checkpoints is unchanged.
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == 5)
+
+        # AND balances which may still be queried are unchanged.
+        for (requestLevel, expectedBalance) in [(6, 30), (9, 40), (11, 50)]:
+            scenario += token.getPriorBalance(
+                (
+                    sp.record(
+                        address = Addresses.BOB_ADDRESS,
+                        level = requestLevel
+                    ),
+                    viewer.typed
+                )
+            ).run(
+                level = 12,
+            )
+            scenario.verify(viewer.data.last.open_some().result == expectedBalance)
+
+    @sp.add_test(name="compactCheckpoints - keeps pages within the minimum retention window")
+    def test():
+        scenario = sp.test_scenario()
+
+        # GIVEN a DAO with no polls underway, so the oldest queryable block is the next block
+        dao = Dao.DaoContract()
+        scenario += dao
+
+        # AND a Token contract with two checkpoints per page which keeps 4 blocks of checkpoint history
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
+            daoContractAddress = dao.address,
+            minCheckpointRetentionBlocks = sp.nat(4),
+        )
+        scenario += token
+
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
+        # AND Bob has checkpoints at blocks 2, 4, 6, 8 and 10, over three pages
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = 0,
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
+
+        # WHEN Bob's checkpoints are compacted at block 12
+        scenario += token.compactCheckpoints(
+            sp.record(
+                address = Addresses.BOB_ADDRESS,
+                maxPages = sp.nat(10)
+            )
+        ).run(
+            sender = Addresses.NULL_ADDRESS,
+            level = 12,
+        )
+
+        # THEN only the first page is dropped, even though the DAO would allow the second page to be dropped
+        scenario.verify(~token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 0)))
+        scenario.verify(token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 1)))
+        scenario.verify(token.data.firstCheckpointPages[Addresses.BOB_ADDRESS] == 1)
+
+        # AND balances within the retention window are unchanged.
+        for (requestLevel, expectedBalance) in [(8, 40), (9, 40), (11, 50)]:
+            scenario += token.getPriorBalance(
+                (
+                    sp.record(
+                        address = Addresses.BOB_ADDRESS,
+                        level = requestLevel
+                    ),
+                    viewer.typed
+                )
+            ).run(
+                level = 12,
+            )
+            scenario.verify(viewer.data.last.open_some().result == expectedBalance)
+
+    @sp.add_test(name="compactCheckpoints - drops nothing before the retention window has passed")
+    def test():
+        scenario = sp.test_scenario()
+
+        # GIVEN a DAO with no polls underway
+        dao = Dao.DaoContract()
+        scenario += dao
+
+        # AND a Token contract with two checkpoints per page which keeps 100 blocks of checkpoint history
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointsPerPage = 2,
+            daoContractAddress = dao.address,
+            minCheckpointRetentionBlocks = sp.nat(100),
+        )
+        scenario += token
+
+        # AND Bob has checkpoints at blocks 2, 4, 6, 8 and 10, over three pages
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = 0,
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        for level in [2, 4, 6, 8, 10]:
+            scenario += token.transfer(
+                from_ = Addresses.ALICE_ADDRESS,
+                to_ = Addresses.BOB_ADDRESS,
+                value = 10
+            ).run(
+                sender = Addresses.ALICE_ADDRESS,
+                level = level
+            )
+
+        # WHEN Bob's checkpoints are compacted at block 12
+        scenario += token.compactCheckpoints(
+            sp.record(
+                address = Addresses.BOB_ADDRESS,
+                maxPages = sp.nat(10)
+            )
+        ).run(
+            sender = Addresses.NULL_ADDRESS,
+            level = 12,
+        )
+
+        # THEN no page is dropped.
+        scenario.verify(token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 0)))
+        scenario.verify(~token.data.firstCheckpointPages.contains(Addresses.BOB_ADDRESS))
+
+    ################################################################
+    # setMinCheckpointRetentionBlocks
+    ################################################################
+
+    @sp.add_test(name="setMinCheckpointRetentionBlocks - updates the retention window")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # WHEN the retention window is updated by the admin
+        scenario += token.setMinCheckpointRetentionBlocks(sp.nat(20160)).run(
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # THEN the retention window is updated.
+        scenario.verify(token.data.minCheckpointRetentionBlocks == sp.nat(20160))
+
+    @sp.add_test(name="setMinCheckpointRetentionBlocks - fails when not called by admin")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # WHEN the retention window is updated by someone other than the admin
+        # THEN the call fails.
+        scenario += token.setMinCheckpointRetentionBlocks(sp.nat(0)).run(
+            sender = Addresses.NULL_ADDRESS,
+            valid = False
+        )
+
+    ################################################################
+    # transfer
+    #
+    # Core transfer functionality tests are deferred to the token contract
+    # tests by SmartPy. 
+    #
+    # These tests specifically test the checkpoint functionality, and are largely
+    # based off of Compound's tests:
+    # https://github.com/compound-finance/compound-protocol/blob/master/tests/Governance/CompTest.js
+    ################################################################
+
+    @sp.add_test(name="transfer - counts checkpoints correctly on transfers from owners")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND an alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN a series of transfers are made
+        # THEN token checkpoints are incremented properly
+
+        # Alice transfers the initial tokens to Bob.
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.BOB_ADDRESS, 
+            value = 10
+        ).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS
+        )
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(2))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(0))
+
+        # Alice transfers tokens to Charlie
         scenario += token.transfer(
             from_ = Addresses.ALICE_ADDRESS, 
             to_ = Addresses.CHARLIE_ADDRESS, 
             value = 10
         ).run(
-            level = sp.nat(2),
-            sender = Addresses.ALICE_ADDRESS
+            level = sp.nat(2),
+            sender = Addresses.ALICE_ADDRESS
+        )
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(1))
+
+        # Bob transfers tokens to Charlie
+        scenario += token.transfer(
+            from_ = Addresses.BOB_ADDRESS, 
+            to_ = Addresses.CHARLIE_ADDRESS, 
+            value = 5
+        ).run(
+            level = sp.nat(3),
+            sender = Addresses.BOB_ADDRESS
+        )
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(2))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(2))
+
+        # AND history is recorded correctly for Alice.
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].fromBlock == 0)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].balance == 100)
+
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].fromBlock == 1)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].balance == 90)
+
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][2].fromBlock == 2)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][2].balance == 80)
+
+        # AND history is recorded correctly for Bob.
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].fromBlock == 1)
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].balance == 10)
+
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][1].fromBlock == 3)
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][1].balance == 5)
+
+        # AND history is recorded correctly for Charlie.
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][0].fromBlock == 2)
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][0].balance == 10)
+
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][1].fromBlock == 3)
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][1].balance == 15)
+
+    @sp.add_test(name="transfer - counts checkpoints correctly on transfers via approvals")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND an alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = 100,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND Alice has approved Charlie to transfer 100 tokens
+        scenario += token.approve(
+            spender = Addresses.CHARLIE_ADDRESS,
+            value = 100
+        ).run(
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        # AND Bob has approved Charlie to transfer 100 tokens
+        scenario += token.approve(
+            spender = Addresses.CHARLIE_ADDRESS,
+            value = 100
+        ).run(
+            sender = Addresses.BOB_ADDRESS
+        )
+
+        # WHEN a series of transfers are made via approvals
+        # THEN token checkpoints are incremented properly
+
+        # Charlie transfers tokens from Alice to Bob.
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.BOB_ADDRESS, 
+            value = 10
+        ).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS
+        )
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(2))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(0))
+
+        # Charlie transfers tokens from Alice to Charlie.
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.CHARLIE_ADDRESS, 
+            value = 10
+        ).run(
+            level = sp.nat(2),
+            sender = Addresses.ALICE_ADDRESS
+        )
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(1))
+
+        # Charlie transfers tokens from Bob to Charlie.
+        scenario += token.transfer(
+            from_ = Addresses.BOB_ADDRESS, 
+            to_ = Addresses.CHARLIE_ADDRESS, 
+            value = 5
+        ).run(
+            level = sp.nat(3),
+            sender = Addresses.BOB_ADDRESS
+        )
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(2))
+        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(2))
+
+        # AND history is recorded correctly for Alice.
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].fromBlock == 0)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].balance == 100)
+
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].fromBlock == 1)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].balance == 90)
+
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][2].fromBlock == 2)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][2].balance == 80)
+
+        # AND history is recorded correctly for Bob.
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].fromBlock == 1)
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].balance == 10)
+
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][1].fromBlock == 3)
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][1].balance == 5)
+
+        # AND history is recorded correctly for Charlie.
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][0].fromBlock == 2)
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][0].balance == 10)
+
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][1].fromBlock == 3)
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][1].balance == 15)
+
+    @sp.add_test(name="transfer - does not write two checkpoints for one block")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND an alice has 100 tokens
+        totalTokens = 100
+        scenario += token.mint(
+            sp.record(
+                value = totalTokens,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN two transfers to Bob are made in the same block.
+        transferValue = sp.nat(10)
+        level = sp.nat(1)
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.BOB_ADDRESS, 
+            value = transferValue
+        ).run(
+            level = level,
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.BOB_ADDRESS, 
+            value = transferValue
+        ).run(
+            level = level,
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        # THEN Alice only records the transfer for the block once.
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(2))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].fromBlock == 0)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].balance == totalTokens)
+
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].fromBlock == level)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].balance == sp.as_nat(totalTokens - (transferValue * 2)))
+
+        # AND Bob only records one checkpoint        
+        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].fromBlock == level)
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].balance == (transferValue * 2))
+
+    @sp.add_test(name="transfer - does not write a checkpoint when the sender and receiver are the same")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND an alice has 100 tokens
+        totalTokens = 100
+        scenario += token.mint(
+            sp.record(
+                value = totalTokens,
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN alice transfers tokens to herself.        
+        transferValue = sp.nat(10)
+        level = sp.nat(1)
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.ALICE_ADDRESS, 
+            value = transferValue
+        ).run(
+            level = level,
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        # THEN Alice still has the same amount of tokens
+        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == totalTokens)
+
+        # AND Alice has one checkpoint
+        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(1))
+
+        # THEN Alice's checkpoint is the initial mint.
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].fromBlock == 0)
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].balance == totalTokens)
+
+    ################################################################
+    # approve
+    ################################################################
+
+    @sp.add_test(name="approve - stores allowances by owner and spender")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # WHEN alice approves bob and charlie
+        scenario += token.approve(
+            spender = Addresses.BOB_ADDRESS,
+            value = sp.nat(10)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+        scenario += token.approve(
+            spender = Addresses.CHARLIE_ADDRESS,
+            value = sp.nat(20)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # THEN each allowance is stored under the owner and spender
+        scenario.verify(token.data.approvals[(Addresses.ALICE_ADDRESS, Addresses.BOB_ADDRESS)] == sp.nat(10))
+        scenario.verify(token.data.approvals[(Addresses.ALICE_ADDRESS, Addresses.CHARLIE_ADDRESS)] == sp.nat(20))
+
+        # AND alice was not given a balance.
+        scenario.verify(~token.data.balances.contains(Addresses.ALICE_ADDRESS))
+
+    @sp.add_test(name="approve - removes allowances which are set to zero")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has approved bob
+        scenario += token.approve(
+            spender = Addresses.BOB_ADDRESS,
+            value = sp.nat(10)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # WHEN alice sets bob's allowance to zero
+        scenario += token.approve(
+            spender = Addresses.BOB_ADDRESS,
+            value = sp.nat(0)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # THEN the allowance is removed.
+        scenario.verify(~token.data.approvals.contains((Addresses.ALICE_ADDRESS, Addresses.BOB_ADDRESS)))
+
+    @sp.add_test(name="transfer - removes allowances which are fully spent")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND alice has approved bob to transfer 10 tokens
+        scenario += token.approve(
+            spender = Addresses.BOB_ADDRESS,
+            value = sp.nat(10)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # WHEN bob transfers some of the tokens to charlie
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.CHARLIE_ADDRESS, 
+            value = sp.nat(4)
+        ).run(
+            level = sp.nat(1),
+            sender = Addresses.BOB_ADDRESS
+        )
+
+        # THEN the allowance is reduced
+        scenario.verify(token.data.approvals[(Addresses.ALICE_ADDRESS, Addresses.BOB_ADDRESS)] == sp.nat(6))
+
+        # AND charlie was not given an allowance entry.
+        scenario.verify(~token.data.approvals.contains((Addresses.CHARLIE_ADDRESS, Addresses.BOB_ADDRESS)))
+
+        # WHEN bob transfers the rest of the tokens to charlie
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.CHARLIE_ADDRESS, 
+            value = sp.nat(6)
+        ).run(
+            level = sp.nat(2),
+            sender = Addresses.BOB_ADDRESS
+        )
+
+        # THEN the allowance is removed
+        scenario.verify(~token.data.approvals.contains((Addresses.ALICE_ADDRESS, Addresses.BOB_ADDRESS)))
+
+        # AND bob can not transfer any more tokens.
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.CHARLIE_ADDRESS, 
+            value = sp.nat(1)
+        ).run(
+            level = sp.nat(3),
+            sender = Addresses.BOB_ADDRESS,
+            valid = False
+        )
+
+    ################################################################
+    # transferBatch
+    ################################################################
+
+    @sp.add_test(name="transferBatch - transfers to multiple recipients")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN alice transfers tokens to bob twice and to charlie once in a batch
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(20)),
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.BOB_ADDRESS, value = sp.nat(5)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        # THEN the balances are updated
+        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(65))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(15))
+        scenario.verify(token.data.balances[Addresses.CHARLIE_ADDRESS] == sp.nat(20))
+
+        # AND each address has one checkpoint for the batch.
+        scenario.verify(token.data.numCheckpoints[Addresses.ALICE_ADDRESS] == sp.nat(2))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].fromBlock == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][1].balance == sp.nat(65))
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].balance == sp.nat(15))
+        scenario.verify(token.data.numCheckpoints[Addresses.CHARLIE_ADDRESS] == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)][0].balance == sp.nat(20))
+
+    @sp.add_test(name="transferBatch - spends the allowance of each sender once")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND alice has approved bob to transfer 30 tokens
+        scenario += token.approve(
+            spender = Addresses.BOB_ADDRESS,
+            value = sp.nat(30)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # WHEN bob transfers more than the allowance from alice in a batch
+        # THEN the call fails
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(20)),
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.BOB_ADDRESS, value = sp.nat(11)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.BOB_ADDRESS,
+            valid = False
+        )
+
+        # WHEN bob transfers the allowance from alice in a batch
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(20)),
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.BOB_ADDRESS
+        )
+
+        # THEN the balances are updated
+        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(70))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(10))
+        scenario.verify(token.data.balances[Addresses.CHARLIE_ADDRESS] == sp.nat(20))
+
+        # AND the allowance is spent.
+        scenario.verify(~token.data.approvals.contains((Addresses.ALICE_ADDRESS, Addresses.BOB_ADDRESS)))
+
+    @sp.add_test(name="transferBatch - fails if a sender does not have enough tokens")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN alice transfers more than her balance in a batch
+        # THEN the call fails.
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.BOB_ADDRESS, value = sp.nat(60)),
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(41)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="transferBatch - checks each transfer against the balance left by the transfers before it")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND bob has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.BOB_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND bob has approved alice to transfer 10 tokens
+        scenario += token.approve(
+            spender = Addresses.ALICE_ADDRESS,
+            value = sp.nat(10)
+        ).run(
+            sender = Addresses.BOB_ADDRESS,
+        )
+
+        # WHEN alice sends tokens in a batch before she receives them later in the batch
+        # THEN the call fails, as the same transfers made one by one would.
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(10)),
+            sp.record(from_ = Addresses.BOB_ADDRESS, to_ = Addresses.ALICE_ADDRESS, value = sp.nat(10)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS,
+            valid = False
+        )
+
+        # WHEN alice receives the tokens before she sends them in a batch
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.BOB_ADDRESS, to_ = Addresses.ALICE_ADDRESS, value = sp.nat(10)),
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(10)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # THEN the balances are updated
+        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(0))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(90))
+        scenario.verify(token.data.balances[Addresses.CHARLIE_ADDRESS] == sp.nat(10))
+
+        # AND alice, whose balance did not change, is not checkpointed.
+        scenario.verify(~token.data.numCheckpoints.contains(Addresses.ALICE_ADDRESS))
+
+    @sp.add_test(name="transferBatch - fails when paused")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND the contract is paused
+        scenario += token.setPause(True).run(
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN alice transfers tokens in a batch
+        # THEN the call fails.
+        scenario += token.transferBatch([
+            sp.record(from_ = Addresses.ALICE_ADDRESS, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS,
+            valid = False
+        )
+
+    ################################################################
+    # permit
+    ################################################################
+
+    @sp.add_test(name="permit - allows anyone to make a permitted transfer")
+    def test():
+        scenario = sp.test_scenario()
+
+        alice = sp.test_account("Alice")
+        chainId = sp.chain_id_cst("0x9caecab9")
+
+        # GIVEN a Token contract
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = alice.address
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND a permit signed by alice for a transfer to bob
+        transferParams = sp.set_type_expr(
+            sp.record(from_ = alice.address, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+            sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value")))
+        )
+        paramHash = sp.blake2b(sp.pack(transferParams))
+        signature = sp.make_signature(
+            alice.secret_key,
+            sp.pack(sp.pair(sp.pair(chainId, token.address), sp.pair(sp.nat(0), paramHash))),
+            message_format = "Raw"
+        )
+
+        # WHEN a relayer submits the permit
+        scenario += token.permit([sp.pair(alice.public_key, sp.pair(signature, paramHash))]).run(
+            sender = Addresses.NULL_ADDRESS,
+            now = sp.timestamp(0),
+            chain_id = chainId
+        )
+
+        # THEN the permit is stored and alice's counter is consumed.
+        scenario.verify(token.data.permits[(alice.address, paramHash)] == sp.timestamp(24 * 60 * 60))
+        scenario.verify(token.data.permitCounters[alice.address] == sp.nat(1))
+
+        # WHEN charlie makes the permitted transfer without an allowance
+        scenario += token.transfer(transferParams).run(
+            level = sp.nat(1),
+            now = sp.timestamp(60),
+            sender = Addresses.CHARLIE_ADDRESS
+        )
+
+        # THEN the tokens are transferred
+        scenario.verify(token.data.balances[alice.address] == sp.nat(90))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(10))
+
+        # AND the permit is consumed.
+        scenario.verify(~token.data.permits.contains((alice.address, paramHash)))
+
+        # AND the transfer can not be repeated.
+        scenario += token.transfer(transferParams).run(
+            level = sp.nat(2),
+            now = sp.timestamp(120),
+            sender = Addresses.CHARLIE_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="permit - allows anyone to make a permitted batch of transfers")
+    def test():
+        scenario = sp.test_scenario()
+
+        alice = sp.test_account("Alice")
+        chainId = sp.chain_id_cst("0x9caecab9")
+
+        # GIVEN a Token contract
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = alice.address
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND a permit signed by alice for a batch of transfers to bob and charlie
+        batchParams = sp.set_type_expr(
+            [
+                sp.record(from_ = alice.address, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+                sp.record(from_ = alice.address, to_ = Addresses.CHARLIE_ADDRESS, value = sp.nat(20)),
+            ],
+            sp.TList(sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value"))))
+        )
+        paramHash = sp.blake2b(sp.pack(batchParams))
+        signature = sp.make_signature(
+            alice.secret_key,
+            sp.pack(sp.pair(sp.pair(chainId, token.address), sp.pair(sp.nat(0), paramHash))),
+            message_format = "Raw"
+        )
+        scenario += token.permit([sp.pair(alice.public_key, sp.pair(signature, paramHash))]).run(
+            sender = Addresses.NULL_ADDRESS,
+            now = sp.timestamp(0),
+            chain_id = chainId
+        )
+
+        # WHEN a relayer makes the permitted batch without an allowance
+        scenario += token.transferBatch(batchParams).run(
+            level = sp.nat(1),
+            now = sp.timestamp(60),
+            sender = Addresses.NULL_ADDRESS
+        )
+
+        # THEN the tokens are transferred
+        scenario.verify(token.data.balances[alice.address] == sp.nat(70))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(10))
+        scenario.verify(token.data.balances[Addresses.CHARLIE_ADDRESS] == sp.nat(20))
+
+        # AND the permit is consumed.
+        scenario.verify(~token.data.permits.contains((alice.address, paramHash)))
+
+        # AND the batch can not be repeated.
+        scenario += token.transferBatch(batchParams).run(
+            level = sp.nat(2),
+            now = sp.timestamp(120),
+            sender = Addresses.NULL_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="permit - fails if the permit was not signed by the owner")
+    def test():
+        scenario = sp.test_scenario()
+
+        alice = sp.test_account("Alice")
+        chainId = sp.chain_id_cst("0x9caecab9")
+
+        # GIVEN a Token contract
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = alice.address
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND a permit for a transfer from alice which was signed by bob
+        bob = sp.test_account("Robert")
+        transferParams = sp.set_type_expr(
+            sp.record(from_ = alice.address, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+            sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value")))
+        )
+        paramHash = sp.blake2b(sp.pack(transferParams))
+        signature = sp.make_signature(
+            bob.secret_key,
+            sp.pack(sp.pair(sp.pair(chainId, token.address), sp.pair(sp.nat(0), paramHash))),
+            message_format = "Raw"
+        )
+
+        # WHEN the permit is submitted for alice
+        # THEN the call fails.
+        scenario += token.permit([sp.pair(alice.public_key, sp.pair(signature, paramHash))]).run(
+            sender = bob.address,
+            now = sp.timestamp(0),
+            chain_id = chainId,
+            valid = False
+        )
+
+    @sp.add_test(name="permit - fails if the counter was already used")
+    def test():
+        scenario = sp.test_scenario()
+
+        alice = sp.test_account("Alice")
+        chainId = sp.chain_id_cst("0x9caecab9")
+
+        # GIVEN a Token contract
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = alice.address
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND alice has submitted a permit with her first counter
+        transferParams = sp.set_type_expr(
+            sp.record(from_ = alice.address, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+            sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value")))
+        )
+        paramHash = sp.blake2b(sp.pack(transferParams))
+        signature = sp.make_signature(
+            alice.secret_key,
+            sp.pack(sp.pair(sp.pair(chainId, token.address), sp.pair(sp.nat(0), paramHash))),
+            message_format = "Raw"
+        )
+        scenario += token.permit([sp.pair(alice.public_key, sp.pair(signature, paramHash))]).run(
+            sender = alice.address,
+            now = sp.timestamp(0),
+            chain_id = chainId
+        )
+
+        # AND the permitted transfer was made
+        scenario += token.transfer(transferParams).run(
+            level = sp.nat(1),
+            now = sp.timestamp(60),
+            sender = Addresses.CHARLIE_ADDRESS
+        )
+
+        # WHEN the same permit is submitted again
+        # THEN the call fails.
+        scenario += token.permit([sp.pair(alice.public_key, sp.pair(signature, paramHash))]).run(
+            sender = Addresses.CHARLIE_ADDRESS,
+            now = sp.timestamp(120),
+            chain_id = chainId,
+            valid = False
+        )
+
+    @sp.add_test(name="transfer - fails if the permit has expired")
+    def test():
+        scenario = sp.test_scenario()
+
+        alice = sp.test_account("Alice")
+        chainId = sp.chain_id_cst("0x9caecab9")
+
+        # GIVEN a Token contract
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = alice.address
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND alice has submitted a permit for a transfer to bob
+        transferParams = sp.set_type_expr(
+            sp.record(from_ = alice.address, to_ = Addresses.BOB_ADDRESS, value = sp.nat(10)),
+            sp.TRecord(from_ = sp.TAddress, to_ = sp.TAddress, value = sp.TNat).layout(("from_ as from", ("to_ as to", "value")))
+        )
+        paramHash = sp.blake2b(sp.pack(transferParams))
+        signature = sp.make_signature(
+            alice.secret_key,
+            sp.pack(sp.pair(sp.pair(chainId, token.address), sp.pair(sp.nat(0), paramHash))),
+            message_format = "Raw"
+        )
+        scenario += token.permit([sp.pair(alice.public_key, sp.pair(signature, paramHash))]).run(
+            sender = alice.address,
+            now = sp.timestamp(0),
+            chain_id = chainId
+        )
+
+        # WHEN the permitted transfer is made after the permit expires
+        # THEN the call fails.
+        scenario += token.transfer(transferParams).run(
+            level = sp.nat(1),
+            now = sp.timestamp(24 * 60 * 60 + 1),
+            sender = Addresses.CHARLIE_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="setPermitExpiry - fails when not called by admin")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # WHEN the permit expiry is updated by someone other than the admin
+        # THEN the call fails.
+        scenario += token.setPermitExpiry(sp.nat(60)).run(
+            sender = Addresses.NULL_ADDRESS,
+            valid = False
+        )
+
+    ################################################################
+    # views
+    ################################################################
+
+    @sp.add_test(name="views - read balances, allowances, supply and checkpoints without modifying storage")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND alice has approved bob to transfer 10 tokens
+        scenario += token.approve(
+            spender = Addresses.BOB_ADDRESS,
+            value = sp.nat(10)
+        ).run(
+            sender = Addresses.ALICE_ADDRESS,
+        )
+
+        # WHEN the on chain views are read
+        # THEN they return the state of the token.
+        scenario.verify(token.getBalanceView(Addresses.ALICE_ADDRESS) == 100)
+        scenario.verify(token.getBalanceView(Addresses.BOB_ADDRESS) == 0)
+        scenario.verify(token.getAllowanceView(sp.record(owner = Addresses.ALICE_ADDRESS, spender = Addresses.BOB_ADDRESS)) == 10)
+        scenario.verify(token.getAllowanceView(sp.record(owner = Addresses.BOB_ADDRESS, spender = Addresses.ALICE_ADDRESS)) == 0)
+        scenario.verify(token.getTotalSupplyView(sp.unit) == 100)
+        scenario.verify(token.getNumCheckpointsView(Addresses.ALICE_ADDRESS) == 1)
+        scenario.verify(token.getNumCheckpointsView(Addresses.BOB_ADDRESS) == 0)
+
+        # WHEN the off chain views are read
+        # THEN they return the same values.
+        scenario.verify(token.getBalanceOffchainView(Addresses.ALICE_ADDRESS) == 100)
+        scenario.verify(token.getAllowanceOffchainView(sp.record(owner = Addresses.ALICE_ADDRESS, spender = Addresses.BOB_ADDRESS)) == 10)
+        scenario.verify(token.getTotalSupplyOffchainView(sp.unit) == 100)
+        scenario.verify(token.getNumCheckpointsOffchainView(Addresses.ALICE_ADDRESS) == 1)
+
+        # WHEN the balance of bob is read with the FA1.2 view
+        viewer = Viewer(sp.TNat)
+        scenario += viewer
+        scenario += token.getBalance((Addresses.BOB_ADDRESS, viewer.typed))
+
+        # THEN the balance is 0
+        scenario.verify_equal(viewer.data.last, sp.some(0))
+
+        # AND bob was not added to storage.
+        scenario.verify(~token.data.balances.contains(Addresses.BOB_ADDRESS))
+
+    ################################################################
+    # optInToCheckpoints / setCheckpointMode
+    ################################################################
+
+    @sp.add_test(name="transfer - does not write checkpoints when checkpoints are disabled")
+    def test():
+        # GIVEN a Token contract with checkpoints disabled
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointMode = Checkpoints.CHECKPOINT_MODE_DISABLED,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # WHEN alice transfers tokens to bob
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.BOB_ADDRESS, 
+            value = sp.nat(10)
+        ).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        # THEN the balances are updated
+        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(90))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(10))
+
+        # AND no checkpoints were written.
+        scenario.verify(~token.data.numCheckpoints.contains(Addresses.ALICE_ADDRESS))
+        scenario.verify(~token.data.numCheckpoints.contains(Addresses.BOB_ADDRESS))
+        scenario.verify(~token.data.checkpoints.contains((Addresses.ALICE_ADDRESS, 0)))
+        scenario.verify(~token.data.checkpoints.contains((Addresses.BOB_ADDRESS, 0)))
+
+    @sp.add_test(name="transfer - only writes checkpoints for addresses which opted in")
+    def test():
+        # GIVEN a Token contract where checkpoints are opt in
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointMode = Checkpoints.CHECKPOINT_MODE_OPT_IN,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # AND bob has opted in to checkpoints
+        scenario += token.optInToCheckpoints(sp.unit).run(
+            level = sp.nat(0),
+            sender = Addresses.BOB_ADDRESS,
+        )
+
+        # WHEN alice transfers tokens to bob
+        scenario += token.transfer(
+            from_ = Addresses.ALICE_ADDRESS, 
+            to_ = Addresses.BOB_ADDRESS, 
+            value = sp.nat(10)
+        ).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS
+        )
+
+        # THEN alice has no checkpoints
+        scenario.verify(~token.data.numCheckpoints.contains(Addresses.ALICE_ADDRESS))
+
+        # AND bob has a checkpoint for opting in and a checkpoint for the transfer.
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == sp.nat(2))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].fromBlock == sp.nat(0))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].balance == sp.nat(0))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][1].fromBlock == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][1].balance == sp.nat(10))
+
+    @sp.add_test(name="optInToCheckpoints - checkpoints the current balance")
+    def test():
+        # GIVEN a Token contract where checkpoints are opt in
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointMode = Checkpoints.CHECKPOINT_MODE_OPT_IN,
+        )
+        scenario += token
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
+        ).run(
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(1))
 
-        # Charlie transfers tokens from Bob to Charlie.
-        scenario += token.transfer(
-            from_ = Addresses.BOB_ADDRESS, 
-            to_ = Addresses.CHARLIE_ADDRESS, 
-            value = 5
-        ).run(
-            level = sp.nat(3),
-            sender = Addresses.BOB_ADDRESS
+        # WHEN alice opts in to checkpoints
+        scenario += token.optInToCheckpoints(sp.unit).run(
+            level = sp.nat(1),
+            sender = Addresses.ALICE_ADDRESS,
         )
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(3))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(2))
-        scenario.verify(token.data.numCheckpoints.get(Addresses.CHARLIE_ADDRESS, sp.nat(0)) == sp.nat(2))
 
-        # AND history is recorded correctly for Alice.
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].fromBlock == 0)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].balance == 100)
+        # THEN alice is checkpointed
+        scenario.verify(token.data.checkpointedAddresses.contains(Addresses.ALICE_ADDRESS))
 
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 1)].fromBlock == 1)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 1)].balance == 90)
+        # AND her current balance is checkpointed.
+        scenario.verify(token.data.numCheckpoints[Addresses.ALICE_ADDRESS] == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].fromBlock == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].balance == sp.nat(100))
+
+    @sp.add_test(name="setCheckpointMode - updates checkpoint mode")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
 
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 2)].fromBlock == 2)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 2)].balance == 80)
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
 
-        # AND history is recorded correctly for Bob.
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)].fromBlock == 1)
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)].balance == 10)
+        # WHEN the checkpoint mode is updated by the admin
+        scenario += token.setCheckpointMode(Checkpoints.CHECKPOINT_MODE_OPT_IN).run(
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
 
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 1)].fromBlock == 3)
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 1)].balance == 5)
+        # THEN the checkpoint mode is updated.
+        scenario.verify(token.data.checkpointMode == Checkpoints.CHECKPOINT_MODE_OPT_IN)
 
-        # AND history is recorded correctly for Charlie.
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)].fromBlock == 2)
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 0)].balance == 10)
+    @sp.add_test(name="setCheckpointMode - fails when not called by admin")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
 
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 1)].fromBlock == 3)
-        scenario.verify(token.data.checkpoints[(Addresses.CHARLIE_ADDRESS, 1)].balance == 15)
+        # WHEN the checkpoint mode is updated by someone other than the admin
+        # THEN the call fails.
+        scenario += token.setCheckpointMode(Checkpoints.CHECKPOINT_MODE_DISABLED).run(
+            sender = Addresses.NULL_ADDRESS,
+            valid = False
+        )
 
-    @sp.add_test(name="transfer - does not write two checkpoints for one block")
+    @sp.add_test(name="setCheckpointMode - fails when raising the checkpoint mode")
+    def test():
+        # GIVEN a Token contract where checkpoints are opt in
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointMode = Checkpoints.CHECKPOINT_MODE_OPT_IN,
+        )
+        scenario += token
+
+        # WHEN the admin sets the checkpoint mode to checkpoint all addresses
+        # THEN the call fails.
+        scenario += token.setCheckpointMode(Checkpoints.CHECKPOINT_MODE_ALL).run(
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="setCheckpointMode - fails with an unknown checkpoint mode")
     def test():
         # GIVEN a Token contract
         scenario = sp.test_scenario()
@@ -1275,11 +3133,34 @@ if __name__ == "__main__":
         )
         scenario += token
 
-        # AND an alice has 100 tokens
-        totalTokens = 100
+        # WHEN the admin sets an unknown checkpoint mode
+        # THEN the call fails.
+        scenario += token.setCheckpointMode(sp.nat(3)).run(
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="getPriorBalance - fails when checkpoints are disabled")
+    def test():
+        # GIVEN a Token contract with checkpoints disabled
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointMode = Checkpoints.CHECKPOINT_MODE_DISABLED,
+        )
+        scenario += token
+
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
+        # AND alice has 100 tokens
         scenario += token.mint(
             sp.record(
-                value = totalTokens,
+                value = sp.nat(100),
                 address = Addresses.ALICE_ADDRESS
             )
         ).run(
@@ -1287,43 +3168,104 @@ if __name__ == "__main__":
             sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
 
-        # WHEN two transfers to Bob are made in the same block.
-        transferValue = sp.nat(10)
-        level = sp.nat(1)
-        scenario += token.transfer(
-            from_ = Addresses.ALICE_ADDRESS, 
-            to_ = Addresses.BOB_ADDRESS, 
-            value = transferValue
+        # WHEN alice's balance is requested
+        # THEN the request fails.
+        scenario += token.getPriorBalance(
+            (
+                sp.record(
+                    address = Addresses.ALICE_ADDRESS,
+                    level = sp.nat(1)
+                ),
+                viewer.typed
+            )
         ).run(
-            level = level,
-            sender = Addresses.ALICE_ADDRESS
+            level = sp.nat(2),
+            valid = False
         )
 
-        scenario += token.transfer(
-            from_ = Addresses.ALICE_ADDRESS, 
-            to_ = Addresses.BOB_ADDRESS, 
-            value = transferValue
+    @sp.add_test(name="getPriorBalance - fails for addresses and blocks which were not checkpointed when checkpoints are opt in")
+    def test():
+        # GIVEN a Token contract where checkpoints are opt in
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+            checkpointMode = Checkpoints.CHECKPOINT_MODE_OPT_IN,
+        )
+        scenario += token
+
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
+        # AND alice has 100 tokens
+        scenario += token.mint(
+            sp.record(
+                value = sp.nat(100),
+                address = Addresses.ALICE_ADDRESS
+            )
         ).run(
-            level = level,
-            sender = Addresses.ALICE_ADDRESS
+            level = sp.nat(0),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
 
-        # THEN Alice only records the transfer for the block once.
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(2))
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].fromBlock == 0)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].balance == totalTokens)
+        # AND alice opted in to checkpoints at block 5
+        scenario += token.optInToCheckpoints(sp.unit).run(
+            level = sp.nat(5),
+            sender = Addresses.ALICE_ADDRESS,
+        )
 
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 1)].fromBlock == level)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 1)].balance == sp.as_nat(totalTokens - (transferValue * 2)))
+        # WHEN bob's balance is requested
+        # THEN the request fails.
+        scenario += token.getPriorBalance(
+            (
+                sp.record(
+                    address = Addresses.BOB_ADDRESS,
+                    level = sp.nat(6)
+                ),
+                viewer.typed
+            )
+        ).run(
+            level = sp.nat(7),
+            valid = False
+        )
 
-        # AND Bob only records one checkpoint        
-        scenario.verify(token.data.numCheckpoints.get(Addresses.BOB_ADDRESS, sp.nat(0)) == sp.nat(1))
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)].fromBlock == level)
-        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)].balance == (transferValue * 2))
+        # AND WHEN alice's balance is requested before she opted in
+        # THEN the request fails.
+        scenario += token.getPriorBalance(
+            (
+                sp.record(
+                    address = Addresses.ALICE_ADDRESS,
+                    level = sp.nat(4)
+                ),
+                viewer.typed
+            )
+        ).run(
+            level = sp.nat(7),
+            valid = False
+        )
 
-    @sp.add_test(name="transfer - does not write a checkpoint when the sender and receiver are the same")
+        # AND WHEN alice's balance is requested after she opted in
+        scenario += token.getPriorBalance(
+            (
+                sp.record(
+                    address = Addresses.ALICE_ADDRESS,
+                    level = sp.nat(5)
+                ),
+                viewer.typed
+            )
+        ).run(
+            level = sp.nat(7),
+        )
+
+        # THEN her balance is returned.
+        scenario.verify(viewer.data.last.open_some().result == sp.nat(100))
+
+    @sp.add_test(name="getPriorBalance - reads all checkpoints of addresses which opted in while all addresses were checkpointed")
     def test():
-        # GIVEN a Token contract
+        # GIVEN a Token contract where all addresses are checkpointed
         scenario = sp.test_scenario()
 
         token = FA12(
@@ -1331,39 +3273,50 @@ if __name__ == "__main__":
         )
         scenario += token
 
-        # AND an alice has 100 tokens
-        totalTokens = 100
+        # AND a viewer contract.
+        viewer = Viewer(
+            t = sp.TRecord(result = sp.TNat, address = sp.TAddress, level = sp.TNat)
+        )
+        scenario += viewer
+
+        # AND alice has 100 tokens
         scenario += token.mint(
             sp.record(
-                value = totalTokens,
+                value = sp.nat(100),
                 address = Addresses.ALICE_ADDRESS
             )
         ).run(
-            level = sp.nat(0),
+            level = sp.nat(1),
             sender = Addresses.TOKEN_ADMIN_ADDRESS,
         )
 
-        # WHEN alice transfers tokens to herself.        
-        transferValue = sp.nat(10)
-        level = sp.nat(1)
-        scenario += token.transfer(
-            from_ = Addresses.ALICE_ADDRESS, 
-            to_ = Addresses.ALICE_ADDRESS, 
-            value = transferValue
-        ).run(
-            level = level,
-            sender = Addresses.ALICE_ADDRESS
+        # AND alice opted in to checkpoints at block 5
+        scenario += token.optInToCheckpoints(sp.unit).run(
+            level = sp.nat(5),
+            sender = Addresses.ALICE_ADDRESS,
         )
 
-        # THEN Alice still has the same amount of tokens
-        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == totalTokens)
+        # AND checkpoints were made opt in
+        scenario += token.setCheckpointMode(Checkpoints.CHECKPOINT_MODE_OPT_IN).run(
+            level = sp.nat(6),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
 
-        # AND Alice has one checkpoint
-        scenario.verify(token.data.numCheckpoints.get(Addresses.ALICE_ADDRESS, sp.nat(0)) == sp.nat(1))
+        # WHEN alice's balance is requested before she opted in
+        scenario += token.getPriorBalance(
+            (
+                sp.record(
+                    address = Addresses.ALICE_ADDRESS,
+                    level = sp.nat(2)
+                ),
+                viewer.typed
+            )
+        ).run(
+            level = sp.nat(7),
+        )
 
-        # THEN Alice's checkpoint is the initial mint.
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].fromBlock == 0)
-        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)].balance == totalTokens)
+        # THEN her balance is returned.
+        scenario.verify(viewer.data.last.open_some().result == sp.nat(100))
 
     ################################################################
     # disableMinting
@@ -1505,8 +3458,87 @@ if __name__ == "__main__":
 
         # AND a single checkpoint was written.
         scenario.verify(token.data.numCheckpoints[Addresses.TOKEN_RECIPIENT] == sp.nat(1))
-        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)].fromBlock == level)
-        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)].balance == value)
+        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)][0].fromBlock == level)
+        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)][0].balance == value)
+
+    @sp.add_test(name="mintBatch - mints to each address")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # WHEN the admin mints to alice, bob and alice again in a batch
+        scenario += token.mintBatch([
+            sp.record(address = Addresses.ALICE_ADDRESS, value = sp.nat(10)),
+            sp.record(address = Addresses.BOB_ADDRESS, value = sp.nat(20)),
+            sp.record(address = Addresses.ALICE_ADDRESS, value = sp.nat(5)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+
+        # THEN the balances are updated
+        scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(15))
+        scenario.verify(token.data.balances[Addresses.BOB_ADDRESS] == sp.nat(20))
+
+        # AND the total supply is updated
+        scenario.verify(token.data.totalSupply == sp.nat(35))
+
+        # AND each address has one checkpoint for the batch.
+        scenario.verify(token.data.numCheckpoints[Addresses.ALICE_ADDRESS] == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].fromBlock == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.ALICE_ADDRESS, 0)][0].balance == sp.nat(15))
+        scenario.verify(token.data.numCheckpoints[Addresses.BOB_ADDRESS] == sp.nat(1))
+        scenario.verify(token.data.checkpoints[(Addresses.BOB_ADDRESS, 0)][0].balance == sp.nat(20))
+
+    @sp.add_test(name="mintBatch - fails when not called by admin")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # WHEN someone other than the admin mints in a batch
+        # THEN the call fails.
+        scenario += token.mintBatch([
+            sp.record(address = Addresses.ALICE_ADDRESS, value = sp.nat(10)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.NULL_ADDRESS,
+            valid = False
+        )
+
+    @sp.add_test(name="mintBatch - fails when minting is locked")
+    def test():
+        # GIVEN a Token contract
+        scenario = sp.test_scenario()
+
+        token = FA12(
+            admin = Addresses.TOKEN_ADMIN_ADDRESS,
+        )
+        scenario += token
+
+        # AND minting is disabled
+        scenario += token.disableMinting(sp.unit).run(
+            sender = Addresses.TOKEN_ADMIN_ADDRESS
+        )
+
+        # WHEN the admin mints in a batch
+        # THEN the call fails.
+        scenario += token.mintBatch([
+            sp.record(address = Addresses.ALICE_ADDRESS, value = sp.nat(10)),
+        ]).run(
+            level = sp.nat(1),
+            sender = Addresses.TOKEN_ADMIN_ADDRESS,
+            valid = False
+        )
 
     @sp.add_test(name="mint - writes checkpoints correctly for multiple mints")
     def test():
@@ -1550,12 +3582,12 @@ if __name__ == "__main__":
         scenario.verify(token.data.numCheckpoints[Addresses.TOKEN_RECIPIENT] == sp.nat(2))
 
         # AND the first checkpoint was written correctly.
-        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)].fromBlock == level1)
-        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)].balance == value1)
+        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)][0].fromBlock == level1)
+        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)][0].balance == value1)
 
         # AND the second checkpoint was written correctly.
-        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 1)].fromBlock == level2)
-        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 1)].balance == (value1 + value2))
+        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)][1].fromBlock == level2)
+        scenario.verify(token.data.checkpoints[(Addresses.TOKEN_RECIPIENT, 0)][1].balance == (value1 + value2))
 
     ################################################################
     # updateContractMetadata
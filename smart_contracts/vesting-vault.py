@@ -7,26 +7,42 @@ import smartpy as sp
 ################################################################
 
 Addresses = sp.import_script_from_url("file:./test-helpers/addresses.py")
+Checkpoints = sp.import_script_from_url("file:common/checkpoints.py")
 Errors = sp.import_script_from_url("file:common/errors.py")
 Proposal = sp.import_script_from_url("file:common/proposal.py")
-
-# A simple vesting contract.
+Schedule = sp.import_script_from_url("file:common/vesting-schedule.py")
+
+# A vesting contract which vests tokens to many beneficiaries.
+#
+# Each beneficiary has a vesting schedule, keyed by the address which owns it. New beneficiaries are
+# added by the governor.
+#
+# The tokens each owner has not withdrawn are checkpointed as voting power, in the same format as the escrow
+# contract, so the DAO can read them when the owner votes through the vault.
 class VestingVault(sp.Contract):
     def __init__(
       self,
-      # The amount which becomes available per block.
+      # The amount which becomes available per block for the initial owner.
       amountPerBlock = sp.nat(1),
-      # The block which vesting start on.
+      # The block which vesting start on for the initial owner.
       startBlock = sp.nat(12),
-      # The owner.
+      # The total amount allocated to the initial owner.
+      totalAmount = sp.nat(1000000),
+      # The block from which the total amount is vested for the initial owner.
+      endBlock = sp.nat(1000012),
+      # The initial owner, or None to start without beneficiaries.
       owner = Addresses.OWNER_ADDRESS,
       # The governor.
       governorAddress = Addresses.GOVERNOR_ADDRESS,
       # The token contract.
       tokenContractAddress = Addresses.TOKEN_CONTRACT_ADDRESS,
       # The dao address.
-      daoContractAddress = Addresses.DAO_ADDRESS
+      daoContractAddress = Addresses.DAO_ADDRESS,
+      # The number of checkpoints in a page.
+      checkpointsPerPage = Checkpoints.CHECKPOINTS_PER_PAGE,
     ):
+        self.checkpointsPerPage = checkpointsPerPage
+
         metadata_data = sp.bytes_of_string('{"name": "kDAO Vesting Contract", "description": "kDAO Vesting Contract", "authors": ["Hover Labs <hello@hover.engineering>"], "homepage":  "https://kolibri.finance" }')
 
         metadata = sp.big_map(
@@ -38,17 +54,51 @@ class VestingVault(sp.Contract):
             tvalue = sp.TBytes            
         )
 
+        schedules = {}
+        totalAllocated = sp.nat(0)
+        checkpoints = {}
+        checkpointDirectories = {}
+        numCheckpoints = {}
+        if owner is not None:
+          schedules[owner] = sp.record(
+            totalAmount = totalAmount,
+            cliffBlock = startBlock,
+            endBlock = endBlock,
+            segments = sp.list(
+              l = [
+                sp.record(startBlock = startBlock, amountPerBlock = amountPerBlock, vestedAtStart = sp.nat(0))
+              ],
+              t = Schedule.VESTING_SEGMENT_TYPE
+            ),
+            amountWithdrawn = sp.nat(0),
+            escrowOutstanding = sp.nat(0),
+          )
+
+          # The initial owner's allocation is voting power from origination.
+          checkpoints[(owner, 0)] = sp.map(
+            l = { 0: sp.record(fromBlock = sp.nat(0), balance = totalAmount) },
+            tkey = sp.TNat,
+            tvalue = Checkpoints.CHECKPOINT_TYPE
+          )
+          checkpointDirectories[owner] = sp.map(l = { 0: sp.nat(0) }, tkey = sp.TNat, tvalue = sp.TNat)
+          numCheckpoints[owner] = sp.nat(1)
+          totalAllocated = totalAmount
+
         self.init(
-          # The amount redeemable per block.
-          amountPerBlock = amountPerBlock,
-          # The last block a withdrawal was processed.
-          startBlock = startBlock,
-          # The culmulative amount withdrawn
-          amountWithdrawn = sp.nat(0),
+          # The vesting schedule of each owner.
+          schedules = sp.big_map(l = schedules, tkey = sp.TAddress, tvalue = Schedule.SCHEDULE_TYPE),
+          # The tokens of all schedules which are held by the vault. The vault's token balance is at least this amount.
+          totalAllocated = totalAllocated,
+          # Checkpoints of the voting power of each owner, grouped in pages.
+          checkpoints = sp.big_map(l = checkpoints, tkey = Checkpoints.CHECKPOINT_PAGE_KEY_TYPE, tvalue = Checkpoints.CHECKPOINT_PAGE_TYPE),
+          # A directory of the checkpoint pages of each owner.
+          checkpointDirectories = sp.big_map(l = checkpointDirectories, tkey = sp.TAddress, tvalue = Checkpoints.CHECKPOINT_DIRECTORY_TYPE),
+          # The number of checkpoints of each owner.
+          numCheckpoints = sp.big_map(l = numCheckpoints, tkey = sp.TAddress, tvalue = sp.TNat),
+          # Escrow taken for proposals whose polls have not ended, keyed by DAO and poll id.
+          escrows = sp.big_map(l = {}, tkey = Schedule.ESCROW_KEY_TYPE, tvalue = Schedule.ESCROW_TYPE),
           # The governor.
           governorAddress = governorAddress,
-          # The user who can redeem funds.
-          owner = owner,
           # The token contract to redeem from. 
           tokenContractAddress = tokenContractAddress,
           # The dao contract for proposing and voting.
@@ -66,17 +116,24 @@ class VestingVault(sp.Contract):
     def withdraw(self, params):
       sp.set_type(params, sp.TRecord(numberOfTokens = sp.TNat).layout("numberOfTokens"))
 
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)
+      # Verify the requester is an owner.
+      sp.verify(self.data.schedules.contains(sp.sender), Errors.ERROR_NOT_OWNER)
+      schedule = sp.local('schedule', self.data.schedules[sp.sender])
 
       # Verify the requester can withdraw the amount of tokens.
-      numberOfBlocksElapsed = sp.as_nat(sp.level - self.data.startBlock)
-      maximumAmountAllowed = numberOfBlocksElapsed * self.data.amountPerBlock
-      totalWithdrawn = self.data.amountWithdrawn + params.numberOfTokens
+      # The vested amount never exceeds the total allocation, so withdrawals are capped at the allocation.
+      maximumAmountAllowed = self.vestedAmount(schedule.value)
+      totalWithdrawn = schedule.value.amountWithdrawn + params.numberOfTokens
       sp.verify(totalWithdrawn <= maximumAmountAllowed, Errors.ERROR_NOT_VESTED)
 
+      # Verify the tokens are not escrowed for a proposal.
+      sp.verify(totalWithdrawn + schedule.value.escrowOutstanding <= schedule.value.totalAmount, Errors.ERROR_LOW_BALANCE)
+
       # Update amount withdrawn
-      self.data.amountWithdrawn = totalWithdrawn
+      schedule.value.amountWithdrawn = totalWithdrawn
+      self.data.schedules[sp.sender] = schedule.value
+      self.data.totalAllocated = sp.as_nat(self.data.totalAllocated - params.numberOfTokens)
+      self.writeVotingPower(sp.sender, self.heldAmount(schedule.value))
 
       # Request tokens transferred to recipient.
       handle = sp.contract(
@@ -91,6 +148,79 @@ class VestingVault(sp.Contract):
       arg = sp.record(from_ = sp.self_address, to_ = sp.sender, value = params.numberOfTokens)
       sp.transfer(arg, sp.mutez(0), handle)
 
+    # Returns the amount of tokens vested by a schedule at the current level.
+    #
+    # Segments are stored latest first with the amount vested at their start precomputed, so the vested amount
+    # is read from the latest segment which has started. The number of segments is bounded by
+    # Schedule.MAX_SEGMENTS.
+    #
+    # Params:
+    # - schedule (Schedule.SCHEDULE_TYPE): The schedule.
+    def vestedAmount(self, schedule):
+      vested = sp.local('vested', sp.nat(0))
+
+      sp.if sp.level >= schedule.endBlock:
+        vested.value = schedule.totalAmount
+      sp.else:
+        sp.if sp.level >= schedule.cliffBlock:
+          found = sp.local('found', False)
+          sp.for segment in schedule.segments:
+            sp.if (~found.value) & (segment.startBlock <= sp.level):
+              vested.value = segment.vestedAtStart + (sp.as_nat(sp.level - segment.startBlock) * segment.amountPerBlock)
+              found.value = True
+
+          # Cap the vested amount at the total allocation.
+          sp.if vested.value > schedule.totalAmount:
+            vested.value = schedule.totalAmount
+
+      return vested.value
+
+    # Returns the amount of tokens of a schedule which are held by the vault.
+    # Params:
+    # - schedule (Schedule.SCHEDULE_TYPE): The schedule.
+    def heldAmount(self, schedule):
+      return sp.as_nat(schedule.totalAmount - (schedule.amountWithdrawn + schedule.escrowOutstanding))
+
+    ################################################################
+    # Voting Power
+    ################################################################
+
+    # Record the voting power of an owner at the current level.
+    # Params:
+    # - owner (address): The owner.
+    # - votingPower (nat): The tokens of the owner which are held by the vault.
+    def writeVotingPower(self, owner, votingPower):
+      self.writeCheckpoint(
+        sp.record(
+          checkpointedAddress = owner,
+          numCheckpoints = self.data.numCheckpoints.get(owner, 0),
+          newBalance = votingPower
+        )
+      )
+
+    # Write a checkpoint for an address.
+    @sp.sub_entry_point
+    def writeCheckpoint(self, params):
+      sp.set_type(params, sp.TRecord(checkpointedAddress = sp.TAddress, numCheckpoints = sp.TNat, newBalance = sp.TNat).layout(("checkpointedAddress", ("numCheckpoints", "newBalance"))))
+
+      Checkpoints.writeCheckpoint(self.data, self.checkpointsPerPage, params.checkpointedAddress, params.numCheckpoints, params.newBalance)
+
+    # The voting power of an owner at a level.
+    #
+    # This view matches the escrow contract's view, so the DAO reads voting power from the vault and the
+    # escrow contract in the same way.
+    # Params:
+    # - address (address): The owner.
+    # - level (nat): The level, which must be in the past.
+    @sp.onchain_view()
+    def getPriorBalance(self, params):
+      sp.set_type(params, sp.TRecord(
+        address = sp.TAddress,
+        level = sp.TNat,
+      ).layout(("address", "level")))
+
+      sp.result(Checkpoints.findPriorBalance(self.data, self.checkpointsPerPage, params.address, params.level))
+
     ################################################################
     # Recovery Functions
     # Useful in case XTZ is sent or tokens are airdropped 
@@ -101,8 +231,8 @@ class VestingVault(sp.Contract):
     def rescueXTZ(self, params):
       sp.set_type(params, sp.TRecord(destinationAddress = sp.TAddress).layout("destinationAddress"))
 
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
 
       sp.send(params.destinationAddress, sp.balance)
 
@@ -115,8 +245,8 @@ class VestingVault(sp.Contract):
         destination = sp.TAddress,
       ).layout(("tokenContractAddress", ("amount", "destination"))))
 
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
 
       # Verify the request is not for the vesting tokens.
       sp.verify(params.tokenContractAddress != self.data.tokenContractAddress, Errors.ERROR_USE_WITHDRAW)
@@ -144,8 +274,8 @@ class VestingVault(sp.Contract):
         destination = sp.TAddress,
       ).layout(("tokenContractAddress", ("tokenId", ("amount", "destination")))))
 
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)
+      # Verify the requester is the governor.
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
 
       # Verify the request is not for the vesting tokens.
       # The vesting tokens are assumed to be FA1.2 but this sanity check is a trivial amount of gas
@@ -187,16 +317,94 @@ class VestingVault(sp.Contract):
     # Governance
     ################################################################
 
-    # Rotate the owner key
+    # Add beneficiaries.
+    # Params:
+    # - (list(Schedule.BENEFICIARY_TYPE)): The owners to add and their schedules.
+    @sp.entry_point
+    def addBeneficiaries(self, beneficiaries):
+      sp.set_type(beneficiaries, sp.TList(Schedule.BENEFICIARY_TYPE))
+
+      # Verify the requester is the governor
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # Verify the vault holds the tokens allocated to the new beneficiaries before checkpointing them as voting power.
+      sp.for beneficiary in beneficiaries:
+        self.data.totalAllocated += beneficiary.totalAmount
+      balance = sp.view("getBalance", self.data.tokenContractAddress, sp.self_address, t = sp.TNat).open_some(Errors.ERROR_BAD_TOKEN_VIEW)
+      sp.verify(self.data.totalAllocated <= balance, Errors.ERROR_LOW_BALANCE)
+
+      segments = sp.local('segments', sp.list(l = [], t = Schedule.VESTING_SEGMENT_TYPE))
+      numberOfSegments = sp.local('numberOfSegments', sp.nat(0))
+      previous = sp.local('previous', sp.record(startBlock = sp.nat(0), amountPerBlock = sp.nat(0), vestedAtStart = sp.nat(0)))
+      vestedAtStart = sp.local('vestedAtStart', sp.nat(0))
+      sp.for beneficiary in beneficiaries:
+        # Verify the owner does not already have a schedule.
+        sp.verify(~self.data.schedules.contains(beneficiary.owner), Errors.ERROR_ALREADY_BENEFICIARY)
+
+        # Verify the cliff is not after the end of the schedule.
+        sp.verify(beneficiary.cliffBlock <= beneficiary.endBlock, Errors.ERROR_BAD_SCHEDULE)
+
+        # Precompute the amount vested at the start of each segment. Segments are pushed onto the list, so
+        # they are stored latest first.
+        segments.value = sp.list(l = [], t = Schedule.VESTING_SEGMENT_TYPE)
+        numberOfSegments.value = 0
+        sp.for segment in beneficiary.segments:
+          vestedAtStart.value = 0
+          sp.if numberOfSegments.value > 0:
+            # Verify segments are in order of increasing start block.
+            sp.verify(segment.startBlock > previous.value.startBlock, Errors.ERROR_BAD_SCHEDULE)
+
+            numberOfBlocksInPrevious = sp.as_nat(segment.startBlock - previous.value.startBlock)
+            vestedAtStart.value = previous.value.vestedAtStart + (numberOfBlocksInPrevious * previous.value.amountPerBlock)
+
+          previous.value = sp.record(
+            startBlock = segment.startBlock,
+            amountPerBlock = segment.amountPerBlock,
+            vestedAtStart = vestedAtStart.value,
+          )
+          segments.value.push(previous.value)
+          numberOfSegments.value += 1
+
+        # Verify the number of segments is bounded, so the vested amount is computed in constant gas.
+        sp.verify(numberOfSegments.value > 0, Errors.ERROR_BAD_SCHEDULE)
+        sp.verify(numberOfSegments.value <= Schedule.MAX_SEGMENTS, Errors.ERROR_BAD_SCHEDULE)
+
+        self.data.schedules[beneficiary.owner] = sp.record(
+          totalAmount = beneficiary.totalAmount,
+          cliffBlock = beneficiary.cliffBlock,
+          endBlock = beneficiary.endBlock,
+          segments = segments.value,
+          amountWithdrawn = sp.nat(0),
+          escrowOutstanding = sp.nat(0),
+        )
+        self.writeVotingPower(beneficiary.owner, beneficiary.totalAmount)
+
+    # Rotate the owner key of a schedule
+    # Params:
+    # - owner (address): The current owner of the schedule.
+    # - newOwner (address): The new owner of the schedule.
     @sp.entry_point	
     def rotateOwner(self, params):
-      sp.set_type(params, sp.TRecord(newOwner = sp.TAddress).layout("newOwner"))
+      sp.set_type(params, sp.TRecord(owner = sp.TAddress, newOwner = sp.TAddress).layout(("owner", "newOwner")))
 
       # Verify the requester is the governor
       sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
 
-      # Set owner.
-      self.data.owner = params.newOwner  
+      # Verify the schedule exists and the new owner does not already have a schedule.
+      sp.verify(self.data.schedules.contains(params.owner), Errors.ERROR_NOT_OWNER)
+      sp.verify(~self.data.schedules.contains(params.newOwner), Errors.ERROR_ALREADY_BENEFICIARY)
+
+      # Verify no escrow is outstanding, since the DAO resolves escrow against the owner who proposed.
+      schedule = sp.local('schedule', self.data.schedules[params.owner])
+      sp.verify(schedule.value.escrowOutstanding == 0, Errors.ERROR_ESCROW_OUTSTANDING)
+
+      # Move the schedule to the new owner.
+      self.data.schedules[params.newOwner] = schedule.value
+      del self.data.schedules[params.owner]
+
+      # Move the voting power to the new owner.
+      self.writeVotingPower(params.owner, 0)
+      self.writeVotingPower(params.newOwner, self.heldAmount(schedule.value))
 
     # Set a different dao address
     @sp.entry_point	
@@ -225,18 +433,35 @@ class VestingVault(sp.Contract):
     ################################################################
 
     # Propose a proposal.
+    #
+    # The escrow is read from the DAO rather than given by the owner, so the vault holds exactly what the DAO takes.
     # Params:
-    # - escrowAmount (nat): The amount of tokens required to escrow for the proposal.
-    # - proposal (Proposal.PROPOSAL_TYPE): The proposal to make
+    # - (Proposal.PROPOSAL_TYPE): The proposal to make
     @sp.entry_point
-    def propose(self, params):
-      sp.set_type(params, sp.TRecord(
-        escrowAmount = sp.TNat,
-        proposal = Proposal.PROPOSAL_TYPE
-      ).layout(("escrowAmount", "proposal")))
-
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)      
+    def propose(self, proposal):
+      sp.set_type(proposal, Proposal.PROPOSAL_TYPE)
+
+      # Verify the requester is an owner.
+      sp.verify(self.data.schedules.contains(sp.sender), Errors.ERROR_NOT_OWNER)
+
+      # Verify the DAO knows the vault, so it resolves the escrow when the poll ends.
+      isVestingVault = sp.view("isVestingVault", self.data.daoContractAddress, sp.self_address, t = sp.TBool).open_some(Errors.ERROR_BAD_DAO_VIEW)
+      sp.verify(isVestingVault, Errors.ERROR_NOT_VESTING_VAULT)
+
+      # Hold the escrow against the requester's schedule until the poll ends, so that escrow which is not returned
+      # is not taken from other beneficiaries.
+      escrowAmount = sp.local('escrowAmount', sp.view("getEscrowAmount", self.data.daoContractAddress, sp.unit, t = sp.TNat).open_some(Errors.ERROR_BAD_DAO_VIEW))
+      schedule = sp.local('schedule', self.data.schedules[sp.sender])
+      schedule.value.escrowOutstanding += escrowAmount.value
+      sp.verify(schedule.value.amountWithdrawn + schedule.value.escrowOutstanding <= schedule.value.totalAmount, Errors.ERROR_LOW_BALANCE)
+      self.data.schedules[sp.sender] = schedule.value
+      self.data.totalAllocated = sp.as_nat(self.data.totalAllocated - escrowAmount.value)
+      self.writeVotingPower(sp.sender, self.heldAmount(schedule.value))
+
+      # Record the escrow under the id the DAO will give the poll. The proposal is sent below, so no other poll
+      # is proposed in between.
+      pollId = sp.view("getNextProposalId", self.data.daoContractAddress, sp.unit, t = sp.TNat).open_some(Errors.ERROR_BAD_DAO_VIEW)
+      self.data.escrows[(self.data.daoContractAddress, pollId)] = sp.record(owner = sp.sender, amount = escrowAmount.value)
 
       # Send approvals.
       # This function sends two changes:
@@ -256,7 +481,7 @@ class VestingVault(sp.Contract):
 
       escrowApprovalArg = sp.record(
         spender = self.data.daoContractAddress, 
-        value = params.escrowAmount,
+        value = escrowAmount.value,
       )
       sp.transfer(escrowApprovalArg, sp.mutez(0), approvalHandle)
 
@@ -266,40 +491,116 @@ class VestingVault(sp.Contract):
         self.data.daoContractAddress,
         "propose"
       ).open_some()
-      proposalArg = params.proposal
-      sp.transfer(proposalArg, sp.mutez(0), proposalHandle)
+      sp.transfer(proposal, sp.mutez(0), proposalHandle)
+
+    # Resolve the escrow of a poll which was proposed through the vault. Called by the DAO when the poll ends.
+    #
+    # Escrow which was returned is credited back to the owner who proposed. Escrow which was not returned is
+    # counted as withdrawn from their schedule.
+    # Params:
+    # - pollId (nat): The id of the poll.
+    # - returned (bool): Whether the escrow was returned to the vault.
+    @sp.entry_point
+    def resolveEscrow(self, params):
+      sp.set_type(params, sp.TRecord(pollId = sp.TNat, returned = sp.TBool).layout(("pollId", "returned")))
+
+      # Verify the sender is the DAO the poll was proposed to. Escrow is keyed by DAO, so no other contract can
+      # resolve it.
+      escrowKey = sp.local('escrowKey', (sp.sender, params.pollId))
+      sp.verify(self.data.escrows.contains(escrowKey.value), Errors.ERROR_NOT_DAO)
+
+      # The DAO returns the escrow before resolving it, so returned escrow is held by the vault again.
+      self.settleEscrow(escrowKey.value, params.returned)
+
+    # Clear the escrow of a poll which the DAO ended without resolving it. The governor states whether the escrow
+    # was returned, and escrow which is credited back must be held by the vault.
+    # Params:
+    # - daoContractAddress (address): The DAO the poll was proposed to.
+    # - pollId (nat): The id of the poll.
+    # - returned (bool): Whether the escrow was returned to the vault.
+    @sp.entry_point
+    def clearEscrow(self, params):
+      sp.set_type(params, sp.TRecord(daoContractAddress = sp.TAddress, pollId = sp.TNat, returned = sp.TBool).layout(("daoContractAddress", ("pollId", "returned"))))
+
+      # Verify the requester is the governor
+      sp.verify(sp.sender == self.data.governorAddress, Errors.ERROR_NOT_GOVERNOR)
+
+      # Verify the escrow is outstanding.
+      escrowKey = sp.local('escrowKey', (params.daoContractAddress, params.pollId))
+      sp.verify(self.data.escrows.contains(escrowKey.value), Errors.ERROR_NO_ESCROW)
+
+      # Verify the DAO has ended the poll, so it will not resolve the escrow later.
+      isPollUnderway = sp.view("isPollUnderway", params.daoContractAddress, params.pollId, t = sp.TBool).open_some(Errors.ERROR_BAD_DAO_VIEW)
+      sp.verify(~isPollUnderway, Errors.ERROR_VOTING_NOT_FINISHED)
+
+      self.settleEscrow(escrowKey.value, params.returned)
+
+      # Verify escrow which is credited back is held by the vault.
+      sp.if params.returned:
+        balance = sp.view("getBalance", self.data.tokenContractAddress, sp.self_address, t = sp.TNat).open_some(Errors.ERROR_BAD_TOKEN_VIEW)
+        sp.verify(self.data.totalAllocated <= balance, Errors.ERROR_LOW_BALANCE)
+
+    # Remove an outstanding escrow and account for it against the schedule of the owner who proposed.
+    # Params:
+    # - escrowKey ((address, nat)): The DAO and the id of the poll.
+    # - returned (bool): Whether the escrow was returned to the vault.
+    def settleEscrow(self, escrowKey, returned):
+      escrow = sp.local('escrow', self.data.escrows[escrowKey])
+      del self.data.escrows[escrowKey]
+
+      schedule = sp.local('schedule', self.data.schedules[escrow.value.owner])
+      schedule.value.escrowOutstanding = sp.as_nat(schedule.value.escrowOutstanding - escrow.value.amount)
+      sp.if returned:
+        self.data.totalAllocated += escrow.value.amount
+      sp.else:
+        schedule.value.amountWithdrawn += escrow.value.amount
+      self.data.schedules[escrow.value.owner] = schedule.value
+      self.writeVotingPower(escrow.value.owner, self.heldAmount(schedule.value))
 
     # Vote for a proposal.
+    # Params:
+    # - pollId (nat): The id of the poll to vote on.
+    # - voteValue (nat): The value of the vote.
     @sp.entry_point
-    def vote(self, voteValue):
-      sp.set_type(voteValue, sp.TNat)
+    def vote(self, params):
+      sp.set_type(params, sp.TRecord(pollId = sp.TNat, voteValue = sp.TNat).layout(("pollId", "voteValue")))
 
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)
+      # Verify the requester is an owner.
+      sp.verify(self.data.schedules.contains(sp.sender), Errors.ERROR_NOT_OWNER)
 
-      # Send a vote request
+      # Send a vote request on behalf of the owner. The DAO reads the owner's voting power from this vault.
       handle = sp.contract(
-        sp.TNat,
+        sp.TRecord(owner = sp.TAddress, pollId = sp.TNat, voteValue = sp.TNat).layout(("owner", ("pollId", "voteValue"))),
         self.data.daoContractAddress,
-        "vote"
+        "voteFromVault"
       ).open_some()
-      sp.transfer(voteValue, sp.mutez(0), handle)
+      arg = sp.record(owner = sp.sender, pollId = params.pollId, voteValue = params.voteValue)
+      sp.transfer(arg, sp.mutez(0), handle)
 
     # Execute a proposal
+    # Params:
+    # - pollId (nat): The id of the poll which produced the timelock item.
+    # - proposalLambda (Proposal.PROPOSAL_LAMBDA_TYPE): The code to execute.
     @sp.entry_point
-    def executeTimelock(self, unit):
-      sp.set_type(unit, sp.TUnit)
+    def executeTimelock(self, params):
+      sp.set_type(params, sp.TRecord(
+        pollId = sp.TNat,
+        proposalLambda = Proposal.PROPOSAL_LAMBDA_TYPE
+      ).layout(("pollId", "proposalLambda")))
 
-      # Verify the requester is the owner.
-      sp.verify(sp.sender == self.data.owner, Errors.ERROR_NOT_OWNER)            
+      # Verify the requester is an owner.
+      sp.verify(self.data.schedules.contains(sp.sender), Errors.ERROR_NOT_OWNER)
 
       # Send an execution request
       handle = sp.contract(
-        sp.TUnit,
+        sp.TRecord(
+          pollId = sp.TNat,
+          proposalLambda = Proposal.PROPOSAL_LAMBDA_TYPE
+        ).layout(("pollId", "proposalLambda")),
         self.data.daoContractAddress,
         "executeTimelock"
       ).open_some()
-      sp.transfer(sp.unit, sp.mutez(0), handle)
+      sp.transfer(params, sp.mutez(0), handle)
 
 ################################################################
 ################################################################
@@ -314,12 +615,27 @@ if __name__ == "__main__":
   Dummy = sp.import_script_from_url("file:./test-helpers/dummy.py")
   FA12 = sp.import_script_from_url("file:./test-helpers/fa12.py")
   FA2 = sp.import_script_from_url("file:./test-helpers/fa2.py")
+  FakeDao = sp.import_script_from_url("file:./test-helpers/fake-dao.py")
+  FakeToken = sp.import_script_from_url("file:./test-helpers/fake-token.py")
   HistoricalOutcomes = sp.import_script_from_url("file:common/historical-outcomes.py")
+  Poll = sp.import_script_from_url("file:common/poll.py")
   PollOutcomes = sp.import_script_from_url("file:common/poll-outcomes.py")
   Store = sp.import_script_from_url("file:test-helpers/store.py")
   Token = sp.import_script_from_url("file:./token.py")
   VoteValue = sp.import_script_from_url("file:common/vote-value.py")
 
+  # Returns a beneficiary with a single linear segment, which vests until the total amount is reached.
+  def linearBeneficiary(owner, amountPerBlock, startBlock, totalAmount = sp.nat(1000000)):
+    return sp.record(
+      owner = owner,
+      totalAmount = totalAmount,
+      cliffBlock = startBlock,
+      endBlock = startBlock + totalAmount,
+      segments = [
+        sp.record(startBlock = startBlock, amountPerBlock = amountPerBlock)
+      ]
+    )
+
   ################################################################
   # rescueFA2
   ################################################################
@@ -378,7 +694,7 @@ if __name__ == "__main__":
         tokenContractAddress = extraToken.address
       )
     ).run(
-      sender = owner,
+      sender = Addresses.GOVERNOR_ADDRESS,
     )    
 
     # THEN the tokens are rescued.
@@ -440,11 +756,11 @@ if __name__ == "__main__":
         tokenContractAddress = vestingToken.address
       )
     ).run(
-      sender = owner,
+      sender = Addresses.GOVERNOR_ADDRESS,
       valid = False
     )    
 
-  @sp.add_test(name="rescue FA2 - fails if not called by owner")
+  @sp.add_test(name="rescue FA2 - fails if not called by governor")
   def test():
     scenario = sp.test_scenario()
 
@@ -489,9 +805,9 @@ if __name__ == "__main__":
       sender = Addresses.TOKEN_ADMIN_ADDRESS
     )
     
-    # WHEN rescueFA2 is called by someone other than the owner
+    # WHEN rescueFA2 is called by someone other than the governor
     # THEN the call fails
-    notOwner = Addresses.NULL_ADDRESS
+    notGovernor = Addresses.NULL_ADDRESS
     scenario += vault.rescueFA2(
       sp.record(
         destination = Addresses.ALICE_ADDRESS,
@@ -500,7 +816,7 @@ if __name__ == "__main__":
         tokenContractAddress = extraToken.address
       )
     ).run(
-      sender = notOwner,
+      sender = notGovernor,
       valid = False
     )    
 
@@ -551,7 +867,7 @@ if __name__ == "__main__":
         tokenContractAddress = extraToken.address
       )
     ).run(
-      sender = owner,
+      sender = Addresses.GOVERNOR_ADDRESS,
     )    
 
     # THEN the tokens are rescued.
@@ -602,11 +918,11 @@ if __name__ == "__main__":
         tokenContractAddress = vestingToken.address
       )
     ).run(
-      sender = owner,
+      sender = Addresses.GOVERNOR_ADDRESS,
       valid = False
     )    
 
-  @sp.add_test(name="rescueFA12 - fails to rescue if not called by owner")
+  @sp.add_test(name="rescueFA12 - fails to rescue if not called by governor")
   def test():
     scenario = sp.test_scenario()
 
@@ -641,9 +957,9 @@ if __name__ == "__main__":
       sender = Addresses.TOKEN_ADMIN_ADDRESS
     )
 
-    # WHEN rescueFA12 is called by someone other than the owner.
+    # WHEN rescueFA12 is called by someone other than the governor.
     # THEN the call fails
-    notOwner = Addresses.NULL_ADDRESS
+    notGovernor = Addresses.NULL_ADDRESS
     scenario += vault.rescueFA12(
       sp.record(
         destination = Addresses.ALICE_ADDRESS,
@@ -651,7 +967,7 @@ if __name__ == "__main__":
         tokenContractAddress = extraToken.address
       )
     ).run(
-      sender = notOwner,
+      sender = notGovernor,
       valid = False
     )    
 
@@ -659,7 +975,7 @@ if __name__ == "__main__":
   # rescueXTZ
   ################################################################
 
-  @sp.add_test(name="rescueXTZ - fails if not called by owner")
+  @sp.add_test(name="rescueXTZ - fails if not called by governor")
   def test():
     scenario = sp.test_scenario()
 
@@ -674,15 +990,15 @@ if __name__ == "__main__":
     vault.set_initial_balance(xtzAmount)
     scenario += vault
 
-    # WHEN rescue XTZ is called by someone other than the owner.
+    # WHEN rescue XTZ is called by someone other than the governor.
     # THEN the call fails.
-    notOwner = Addresses.NULL_ADDRESS
+    notGovernor = Addresses.NULL_ADDRESS
     scenario += vault.rescueXTZ(
       sp.record(
         destinationAddress = Addresses.ALICE_ADDRESS
       )
     ).run(
-      sender = notOwner,
+      sender = notGovernor,
       valid = False
     )
 
@@ -711,7 +1027,7 @@ if __name__ == "__main__":
         destinationAddress = dummy.address
       )
     ).run(
-      sender = owner,
+      sender = Addresses.GOVERNOR_ADDRESS,
     )
 
     # THEN XTZ is transferred.
@@ -752,6 +1068,16 @@ if __name__ == "__main__":
     )
     scenario += vault
 
+    # AND the dao allows the vault to vote.
+    scenario += dao.setVestingVault(
+      sp.record(
+        vestingVaultAddress = vault.address,
+        enabled = True
+      )
+    ).run(
+      sender = dao.address
+    )
+
     # AND the vault is funded.
     scenario += token.mint(
       sp.record(
@@ -781,17 +1107,14 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
     
     # WHEN propose is called by someone other than the owner
     # THEN the call fails.
     notOwner = Addresses.NULL_ADDRESS
-    escrowAmount = dao.data.governanceParameters.escrowAmount
     level = 1      
-    scenario += vault.propose(
-      sp.record(escrowAmount = escrowAmount, proposal = proposal)
-    ).run(
+    scenario += vault.propose(proposal).run(
       sender = notOwner,
       level = level,
       valid = False
@@ -826,6 +1149,16 @@ if __name__ == "__main__":
     )
     scenario += vault
 
+    # AND the dao allows the vault to vote.
+    scenario += dao.setVestingVault(
+      sp.record(
+        vestingVaultAddress = vault.address,
+        enabled = True
+      )
+    ).run(
+      sender = dao.address
+    )
+
     # AND the vault is funded.
     scenario += token.mint(
       sp.record(
@@ -855,21 +1188,27 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
     
     # WHEN propose is called
     level = 1      
     escrowAmount = dao.data.governanceParameters.escrowAmount
-    scenario += vault.propose(
-      sp.record(escrowAmount = escrowAmount, proposal = proposal)
-    ).run(
+    scenario += vault.propose(proposal).run(
       sender = owner,
       level = level,
     )
 
     # THEN a proposal is loaded into the timelock.
-    scenario.verify(dao.data.poll.is_some())
+    scenario.verify(dao.data.polls.contains(sp.nat(0)))
+
+    # AND the escrow is held against the owner's schedule
+    scenario.verify(vault.data.schedules[owner].escrowOutstanding == escrowAmount)
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == sp.nat(0))
+
+    # AND the escrow is recorded under the id of the poll.
+    scenario.verify(vault.data.escrows[(dao.address, sp.nat(0))].owner == owner)
+    scenario.verify(vault.data.escrows[(dao.address, sp.nat(0))].amount == escrowAmount)
 
   @sp.add_test(name="propose - can propose when there is a dangling allowance")
   def test():
@@ -900,6 +1239,16 @@ if __name__ == "__main__":
     )
     scenario += vault
 
+    # AND the dao allows the vault to vote.
+    scenario += dao.setVestingVault(
+      sp.record(
+        vestingVaultAddress = vault.address,
+        enabled = True
+      )
+    ).run(
+      sender = dao.address
+    )
+
     # AND the vault is funded.
     scenario += token.mint(
       sp.record(
@@ -929,7 +1278,7 @@ if __name__ == "__main__":
       title = title,
       descriptionLink = descriptionLink,
       descriptionHash = descriptionHash,
-      proposalLambda = updateLambda
+      proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
     )
 
     # AND there is a dangling proposal amount for the dao to move the vault's tokens.
@@ -944,96 +1293,82 @@ if __name__ == "__main__":
     
     # WHEN propose is called
     level = 1      
-    escrowAmount = dao.data.governanceParameters.escrowAmount
-    scenario += vault.propose(
-      sp.record(escrowAmount = escrowAmount, proposal = proposal)
-    ).run(
+    scenario += vault.propose(proposal).run(
       sender = owner,
       level = level,
     )
 
     # THEN a proposal is loaded into the timelock.
-    scenario.verify(dao.data.poll.is_some())
-
-  ################################################################
-  # vote
-  ################################################################
+    scenario.verify(dao.data.polls.contains(sp.nat(0)))
 
-  @sp.add_test(name="vote - fails if not called by owner")
+  @sp.add_test(name="propose - fails if the escrow exceeds the owner's allocation")
   def test():
     scenario = sp.test_scenario()
 
-    # GIVEN a token contract
-    token = Token.FA12(
-      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    # GIVEN a dao contract which escrows 11 tokens for a proposal
+    dao = FakeDao.FakeDaoContract(escrowAmount = sp.nat(11))
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 10 tokens
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      totalAmount = sp.nat(10),
+      owner = owner,
+      daoContractAddress = dao.address,
     )
-    scenario += token
+    scenario += vault
 
-    # AND a poll
-    votingEndBlock = sp.nat(21)
-    poll = sp.record(
-      id = sp.nat(0),
-      proposal = sp.record(
-        title = 'timelocked prop',
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = 'abc123',
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
-      votingStartBlock = sp.nat(11),
-      votingEndBlock = votingEndBlock,
-      yayVotes = sp.nat(0),
-      nayVotes = sp.nat(0),
-      abstainVotes = sp.nat(0),
-      totalVotes = sp.nat(0),
-      voters = {},
-      author = Addresses.ALICE_ADDRESS,
-      escrowAmount = sp.nat(1),
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
+    # AND a proposal
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
     )
 
-    # AND a dao contract with the poll underway.
-    dao = Dao.DaoContract(
-      poll = sp.some(poll),
-      tokenContractAddress = token.address,
+    # WHEN propose is called
+    # THEN the call fails, since the escrow is larger than the allocation.
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      valid = False
     )
+
+  @sp.add_test(name="propose - fails if the dao does not know the vault")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a dao contract which does not know the vault
+    dao = FakeDao.FakeDaoContract(isVestingVault = False)
     scenario += dao
 
     # AND a vesting vault contract
-    amountPerBlock = 1
-    startBlock = 0
     owner = Addresses.TOKEN_RECIPIENT
     vault = VestingVault(
-      amountPerBlock = amountPerBlock,
-      daoContractAddress = dao.address,
-      startBlock = startBlock,
       owner = owner,
-      tokenContractAddress = token.address
+      daoContractAddress = dao.address,
     )
     scenario += vault
 
-    # AND the vault is funded.
-    scenario += token.mint(
-      sp.record(
-        address = vault.address,
-        value = sp.nat(100)
-      )
-    ).run(
-      sender = Addresses.TOKEN_ADMIN_ADDRESS,
-      level = 0
+    # AND a proposal
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
     )
 
-    # WHEN vote is called by someone other than the owner
-    # THEN the call fails.
-    notOwner = Addresses.NULL_ADDRESS
-    voteValue = VoteValue.YAY
-    scenario += vault.vote(voteValue).run(
-      sender = notOwner,
-      level = sp.as_nat(votingEndBlock - 1),
+    # WHEN propose is called
+    # THEN the call fails, since the dao would not resolve the escrow.
+    scenario += vault.propose(proposal).run(
+      sender = owner,
       valid = False
     )
 
-  @sp.add_test(name="vote - successfully votes")
+  ################################################################
+  # resolveEscrow
+  ################################################################
+
+  @sp.add_test(name="resolveEscrow - credits returned escrow so the owner can withdraw their full allocation")
   def test():
     scenario = sp.test_scenario()
 
@@ -1043,80 +1378,98 @@ if __name__ == "__main__":
     )
     scenario += token
 
-    # AND a poll
-    votingEndBlock = sp.nat(21)
-    poll = sp.record(
-      id = sp.nat(0),
-      proposal = sp.record(
-        title = 'timelocked prop',
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = 'abc123',
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
-      votingStartBlock = sp.nat(11),
-      votingEndBlock = votingEndBlock,
-      yayVotes = sp.nat(0),
-      nayVotes = sp.nat(0),
-      abstainVotes = sp.nat(0),
-      totalVotes = sp.nat(0),
-      voters = {},
-      author = Addresses.ALICE_ADDRESS,
-      escrowAmount = sp.nat(1),
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(1), upper = sp.nat(99))
-    )
-
-    # AND a dao contract with the poll underway.
-    dao = Dao.DaoContract(
-      poll = sp.some(poll),
-      tokenContractAddress = token.address,
-    )
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
     scenario += dao
-    
-    # AND a vesting vault contract
-    amountPerBlock = 1
-    startBlock = 0
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
     owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
     vault = VestingVault(
-      amountPerBlock = amountPerBlock,
-      daoContractAddress = dao.address,
-      startBlock = startBlock,
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
       owner = owner,
+      daoContractAddress = dao.address,
       tokenContractAddress = token.address
     )
     scenario += vault
 
     # AND the vault is funded.
-    tokensInVault = sp.nat(100)
     scenario += token.mint(
       sp.record(
         address = vault.address,
-        value = tokensInVault
+        value = totalAmount
       )
     ).run(
       sender = Addresses.TOKEN_ADMIN_ADDRESS,
       level = 0
     )
 
-    # WHEN vote is called
-    voteValue = VoteValue.YAY
-    scenario += vault.vote(voteValue).run(
-      sender = Addresses.TOKEN_RECIPIENT,
-      level = sp.as_nat(votingEndBlock - 1),
-    )    
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # AND the owner can not withdraw their full allocation while the poll is underway.
+    scenario += vault.withdraw(sp.record(numberOfTokens = totalAmount)).run(
+      sender = owner,
+      level = 100,
+      valid = False
+    )
 
-    # THEN the poll increments the value.
-    scenario.verify(dao.data.poll.open_some().yayVotes == tokensInVault)
-    scenario.verify(dao.data.poll.open_some().totalVotes == tokensInVault)
+    # WHEN the poll passes and the dao returns the escrow
+    scenario += token.transfer(
+      from_ = dao.address,
+      to_ = vault.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 101,
+    )
+    scenario += vault.resolveEscrow(sp.record(pollId = sp.nat(0), returned = True)).run(
+      sender = dao.address,
+      level = 101,
+    )
 
-    # AND the vesting contract is listed in voters
-    scenario.verify(dao.data.poll.open_some().voters.contains(vault.address))
+    # THEN the escrow is no longer outstanding
+    scenario.verify(vault.data.schedules[owner].escrowOutstanding == sp.nat(0))
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == sp.nat(0))
+    scenario.verify(~vault.data.escrows.contains((dao.address, sp.nat(0))))
 
-  ################################################################
-  # executeTimelock
-  ################################################################
+    # AND the escrow is allocated again.
+    scenario.verify(vault.data.totalAllocated == totalAmount)
 
-  @sp.add_test(name="executeTimelock - successfully executes a proposal")
+    # AND the owner can withdraw their full allocation.
+    scenario += vault.withdraw(sp.record(numberOfTokens = totalAmount)).run(
+      sender = owner,
+      level = 102,
+    )
+    scenario.verify(token.data.balances[owner] == totalAmount)
+
+    # AND no tokens remain allocated.
+    scenario.verify(vault.data.totalAllocated == sp.nat(0))
+
+  @sp.add_test(name="resolveEscrow - counts escrow which was not returned as withdrawn")
   def test():
     scenario = sp.test_scenario()
 
@@ -1126,9 +1479,988 @@ if __name__ == "__main__":
     )
     scenario += token
 
-    # AND a vesting vault contract
-    amountPerBlock = 1
-    startBlock = 0
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # WHEN the poll fails and the dao keeps the escrow
+    scenario += vault.resolveEscrow(sp.record(pollId = sp.nat(0), returned = False)).run(
+      sender = dao.address,
+      level = 101,
+    )
+
+    # THEN the escrow is counted as withdrawn
+    scenario.verify(vault.data.schedules[owner].escrowOutstanding == sp.nat(0))
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == escrowAmount)
+
+    # AND the owner can not withdraw their full allocation
+    scenario += vault.withdraw(sp.record(numberOfTokens = totalAmount)).run(
+      sender = owner,
+      level = 102,
+      valid = False
+    )
+
+    # AND the owner can withdraw the rest of their allocation.
+    scenario += vault.withdraw(sp.record(numberOfTokens = sp.as_nat(totalAmount - escrowAmount))).run(
+      sender = owner,
+      level = 102,
+    )
+
+  @sp.add_test(name="resolveEscrow - fails if not called by the dao the poll was proposed to")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # WHEN resolveEscrow is called by someone other than the dao
+    # THEN the call fails.
+    scenario += vault.resolveEscrow(sp.record(pollId = sp.nat(0), returned = True)).run(
+      sender = Addresses.NULL_ADDRESS,
+      level = 101,
+      valid = False
+    )
+
+  @sp.add_test(name="resolveEscrow - restores voting power when escrow is returned")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # WHEN the dao returns the escrow
+    scenario += token.transfer(
+      from_ = dao.address,
+      to_ = vault.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 5,
+    )
+    scenario += vault.resolveEscrow(sp.record(pollId = sp.nat(0), returned = True)).run(
+      sender = dao.address,
+      level = 5,
+    )
+
+    # THEN the escrow was not voting power while the poll was underway
+    scenario.verify(vault.data.numCheckpoints[owner] == sp.nat(3))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][1].fromBlock == sp.nat(1))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][1].balance == sp.as_nat(totalAmount - escrowAmount))
+
+    # AND it is voting power again once it is returned.
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][2].fromBlock == sp.nat(5))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][2].balance == totalAmount)
+
+  ################################################################
+  # clearEscrow
+  ################################################################
+
+  @sp.add_test(name="clearEscrow - counts escrow which was not returned as withdrawn")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # AND the dao ended the poll without resolving the escrow.
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = 101,
+    )
+
+    # WHEN the governor clears the escrow
+    scenario += vault.clearEscrow(
+      sp.record(
+        daoContractAddress = dao.address,
+        pollId = sp.nat(0),
+        returned = False
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = 101,
+    )
+
+    # THEN the escrow is no longer outstanding
+    scenario.verify(vault.data.schedules[owner].escrowOutstanding == sp.nat(0))
+    scenario.verify(~vault.data.escrows.contains((dao.address, sp.nat(0))))
+
+    # AND the escrow is counted as withdrawn.
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == escrowAmount)
+
+    # AND the owner can be rotated.
+    scenario += vault.rotateOwner(
+      sp.record(
+        owner = owner,
+        newOwner = Addresses.ROTATED_ADDRESS
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = 102,
+    )
+
+  @sp.add_test(name="clearEscrow - credits returned escrow only if the vault holds it")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # AND the dao ended the poll without resolving the escrow.
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = 101,
+    )
+
+    # WHEN the governor clears the escrow as returned before the vault holds it
+    # THEN the call fails.
+    scenario += vault.clearEscrow(
+      sp.record(
+        daoContractAddress = dao.address,
+        pollId = sp.nat(0),
+        returned = True
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = 101,
+      valid = False
+    )
+
+    # WHEN the escrow is returned and the governor clears it
+    scenario += token.transfer(
+      from_ = dao.address,
+      to_ = vault.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 101,
+    )
+    scenario += vault.clearEscrow(
+      sp.record(
+        daoContractAddress = dao.address,
+        pollId = sp.nat(0),
+        returned = True
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = 101,
+    )
+
+    # THEN the escrow is no longer outstanding
+    scenario.verify(vault.data.schedules[owner].escrowOutstanding == sp.nat(0))
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == sp.nat(0))
+
+    # AND the escrow is allocated again.
+    scenario.verify(vault.data.totalAllocated == totalAmount)
+
+  @sp.add_test(name="clearEscrow - fails while the poll is underway")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # WHEN the governor clears the escrow before the dao ended the poll
+    # THEN the call fails.
+    scenario += vault.clearEscrow(
+      sp.record(
+        daoContractAddress = dao.address,
+        pollId = sp.nat(0),
+        returned = False
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = 101,
+      valid = False
+    )
+
+  @sp.add_test(name="clearEscrow - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # AND the dao ended the poll without resolving the escrow.
+    scenario += dao.endVoting(sp.nat(0)).run(
+      level = 101,
+    )
+
+    # WHEN clearEscrow is called by the owner
+    # THEN the call fails.
+    scenario += vault.clearEscrow(
+      sp.record(
+        daoContractAddress = dao.address,
+        pollId = sp.nat(0),
+        returned = True
+      )
+    ).run(
+      sender = owner,
+      level = 101,
+      valid = False
+    )
+
+  ################################################################
+  # vote
+  ################################################################
+
+  @sp.add_test(name="vote - fails if not called by owner")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a poll
+    votingEndBlock = sp.nat(21)
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = 'abc123',
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.ALICE_ADDRESS,
+      escrowAmount = sp.nat(1),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND a dao contract with the poll underway.
+    dao = Dao.DaoContract(
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+    )
+    scenario += dao
+
+    # AND a vesting vault contract
+    amountPerBlock = 1
+    startBlock = 0
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = amountPerBlock,
+      daoContractAddress = dao.address,
+      startBlock = startBlock,
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # WHEN vote is called by someone other than the owner
+    # THEN the call fails.
+    notOwner = Addresses.NULL_ADDRESS
+    voteValue = VoteValue.YAY
+    scenario += vault.vote(sp.record(pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = notOwner,
+      level = sp.as_nat(votingEndBlock - 1),
+      valid = False
+    )
+
+  @sp.add_test(name="vote - successfully votes")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a poll
+    votingEndBlock = sp.nat(21)
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = 'abc123',
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.ALICE_ADDRESS,
+      escrowAmount = sp.nat(1),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND an escrow contract where the owner has no escrowed tokens.
+    escrow = FakeToken.FakeTokenContract(result = sp.nat(0))
+    scenario += escrow
+
+    # AND a dao contract with the poll underway.
+    dao = Dao.DaoContract(
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = escrow.address,
+    )
+    scenario += dao
+    
+    # AND a vesting vault contract
+    amountPerBlock = 1
+    startBlock = 0
+    totalAmount = sp.nat(500)
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = amountPerBlock,
+      daoContractAddress = dao.address,
+      startBlock = startBlock,
+      totalAmount = totalAmount,
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the dao allows the vault to vote.
+    scenario += dao.setVestingVault(sp.record(vestingVaultAddress = vault.address, enabled = True)).run(
+      sender = dao.address,
+      level = 0
+    )
+
+    # WHEN vote is called
+    voteValue = VoteValue.YAY
+    scenario += vault.vote(sp.record(pollId = sp.nat(0), voteValue = voteValue)).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = sp.as_nat(votingEndBlock - 1),
+    )    
+
+    # THEN the poll counts the owner's whole allocation, without it being escrowed.
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == totalAmount)
+    scenario.verify(dao.data.polls[sp.nat(0)].totalVotes == totalAmount)
+
+    # AND the owner is listed in voters
+    scenario.verify(dao.data.voters.contains((sp.nat(0), owner)))
+
+  @sp.add_test(name="vote - counts the voting power of the owner at the start of the poll")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a poll which starts voting at block 11
+    votingEndBlock = sp.nat(21)
+    poll = sp.record(
+      id = sp.nat(0),
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = 'abc123',
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation)))
+      ),
+      votingStartBlock = sp.nat(11),
+      votingEndBlock = votingEndBlock,
+      yayVotes = sp.nat(0),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(0),
+      author = Addresses.ALICE_ADDRESS,
+      escrowAmount = sp.nat(1),
+      quorum = sp.nat(100),
+      authorIsVestingVault = False
+    )
+
+    # AND an escrow contract where the owner has no escrowed tokens.
+    escrow = FakeToken.FakeTokenContract(result = sp.nat(0))
+    scenario += escrow
+
+    # AND a dao contract with the poll underway.
+    dao = Dao.DaoContract(
+      polls = sp.big_map(l = { sp.nat(0): poll }, tkey = sp.TNat, tvalue = Poll.POLL_TYPE),
+      activePollStartBlocks = sp.map(l = { sp.nat(0): sp.nat(11) }, tkey = sp.TNat, tvalue = sp.TNat),
+      tokenContractAddress = token.address,
+      escrowContractAddress = escrow.address,
+    )
+    scenario += dao
+    
+    # AND a funded vesting vault which the dao allows to vote
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      daoContractAddress = dao.address,
+      startBlock = sp.nat(0),
+      totalAmount = sp.nat(500),
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    scenario += dao.setVestingVault(sp.record(vestingVaultAddress = vault.address, enabled = True)).run(
+      sender = dao.address,
+      level = 0
+    )
+
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(500)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner withdrew 5 tokens before the poll started
+    scenario += vault.withdraw(sp.record(numberOfTokens = sp.nat(5))).run(
+      sender = owner,
+      level = sp.nat(5)
+    )
+
+    # AND withdrew 10 more tokens after the poll started
+    scenario += vault.withdraw(sp.record(numberOfTokens = sp.nat(10))).run(
+      sender = owner,
+      level = sp.nat(15)
+    )
+
+    # WHEN vote is called
+    scenario += vault.vote(sp.record(pollId = sp.nat(0), voteValue = VoteValue.YAY)).run(
+      sender = owner,
+      level = sp.as_nat(votingEndBlock - 1),
+    )    
+
+    # THEN the poll counts the tokens the owner had not withdrawn at the start of the poll.
+    scenario.verify(dao.data.polls[sp.nat(0)].yayVotes == sp.nat(495))
+
+  ################################################################
+  # executeTimelock
+  ################################################################
+
+  @sp.add_test(name="executeTimelock - successfully executes a proposal")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a vesting vault contract
+    amountPerBlock = 1
+    startBlock = 0
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = amountPerBlock,
+      daoContractAddress = Addresses.DAO_ADDRESS, # Updated later
+      startBlock = startBlock,
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND a store value contract with the dao as the admin.
+    storeContract = Store.StoreValueContract(value = 0, admin = Addresses.TOKEN_ADMIN_ADDRESS)
+    scenario += storeContract
+
+    # AND an item in the timelock
+    newValue = sp.nat(3)
+    def updateLambda(unitParam):
+      sp.set_type(unitParam, sp.TUnit)
+      storeContractHandle = sp.contract(sp.TNat, storeContract.address, 'replace').open_some()
+      sp.result([sp.transfer_operation(newValue, sp.mutez(0), storeContractHandle)])    
+
+    pollId = sp.nat(0)
+    endBlock = sp.nat(10)
+    cancelBlock = sp.nat(20)
+    timelockItem = sp.record(
+      id = pollId,
+      proposal = sp.record(
+        title = 'timelocked prop',
+        descriptionLink = 'ipfs://xyz',
+        descriptionHash = "xyz123",
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
+      ),
+      endBlock = endBlock,
+      cancelBlock = cancelBlock,
+      author = vault.address,
+    )
+
+    historicalOutcome = sp.record(
+      outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
+      id = pollId,
+      proposalHash = sp.bytes("0x"),
+      author = vault.address,
+      votingStartBlock = sp.nat(1),
+      votingEndBlock = sp.nat(5),
+      yayVotes = sp.nat(100),
+      nayVotes = sp.nat(0),
+      abstainVotes = sp.nat(0),
+      totalVotes = sp.nat(100),
+      quorum = sp.nat(100)
+    )
+
+    # AND a dao contract with the item.
+    dao = Dao.DaoContract(
+      timelockItems = sp.big_map(l = { pollId: timelockItem }, tkey = sp.TNat, tvalue = Dao.TIMELOCK_ITEM_TYPE),
+      outcomes = sp.big_map(
+        l = {
+            pollId: historicalOutcome
+        },
+        tkey = sp.TNat,
+        tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE,
+      )
+    )
+    scenario += dao
+
+    # AND the store contract has the dao as the admin.
+    scenario += storeContract.setAdmin(dao.address)
+
+    # AND the vault is set to point at the DAO
+    setDaoParam = sp.record(newDaoContractAddress = dao.address)
+    scenario += vault.setDaoContractAddress(setDaoParam).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # AND the vault is funded.
+    tokensInVault = sp.nat(100)
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = tokensInVault
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # WHEN executeTimelock is called
+    scenario += vault.executeTimelock(sp.record(pollId = pollId, proposalLambda = updateLambda)).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = endBlock + 1,
+    )    
+
+    # THEN the proposal executed
+    scenario.verify(storeContract.data.storedValue == newValue)
+
+    # AND the historical outcome is updated.
+    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_EXECUTED)
+
+    # AND the timelock is empty.
+    scenario.verify(~dao.data.timelockItems.contains(pollId))
+
+
+  @sp.add_test(name="executeTimelock - fails if not called by owner")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a vesting vault contract
+    amountPerBlock = 1
+    startBlock = 0
     owner = Addresses.TOKEN_RECIPIENT
     vault = VestingVault(
       amountPerBlock = amountPerBlock,
@@ -1159,43 +2491,33 @@ if __name__ == "__main__":
         title = 'timelocked prop',
         descriptionLink = 'ipfs://xyz',
         descriptionHash = "xyz123",
-        proposalLambda = updateLambda
+        proposalLambdaHash = Proposal.hashLambda(sp.build_lambda(updateLambda))
       ),
       endBlock = endBlock,
       cancelBlock = cancelBlock,
       author = vault.address,
     )
 
-    poll = sp.record(
+    historicalOutcome = sp.record(
+      outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
       id = pollId,
-      proposal = sp.record(
-        title = "timelocked prop",
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
+      proposalHash = sp.bytes("0x"),
+      author = vault.address,
       votingStartBlock = sp.nat(1),
       votingEndBlock = sp.nat(5),
       yayVotes = sp.nat(100),
       nayVotes = sp.nat(0),
       abstainVotes = sp.nat(0),
       totalVotes = sp.nat(100),
-      voters = {},
-      author = vault.address,
-      escrowAmount = sp.nat(2),
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(0), upper = sp.nat(1000))
+      quorum = sp.nat(100)
     )
 
     # AND a dao contract with the item.
     dao = Dao.DaoContract(
-      timelockItem = sp.some(timelockItem),
+      timelockItems = sp.big_map(l = { pollId: timelockItem }, tkey = sp.TNat, tvalue = Dao.TIMELOCK_ITEM_TYPE),
       outcomes = sp.big_map(
         l = {
-            pollId: sp.record(
-              outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
-              poll = poll
-            )
+            pollId: historicalOutcome
         },
         tkey = sp.TNat,
         tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE,
@@ -1212,35 +2534,363 @@ if __name__ == "__main__":
       sender = Addresses.GOVERNOR_ADDRESS
     )
 
-    # AND the vault is funded.
-    tokensInVault = sp.nat(100)
+    # AND the vault is funded.
+    tokensInVault = sp.nat(100)
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = tokensInVault
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # WHEN executeTimelock is called by someone other than the owner
+    # THEN the call fails.
+    scenario += vault.executeTimelock(sp.record(pollId = pollId, proposalLambda = updateLambda)).run(
+      sender = Addresses.NULL_ADDRESS,
+      level = endBlock + 1,
+      valid = False
+    )    
+
+  ################################################################
+  # rotateOwner
+  ################################################################
+
+  @sp.add_test(name="rotateOwner - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a vesting contract
+    amountPerBlock = 1
+    startBlock = 0
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = amountPerBlock,
+      startBlock = startBlock,
+      owner = owner,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # WHEN rotateOwner is called by someone other than the governor
+    # THEN the call fails.
+    notGovernor = Addresses.NULL_ADDRESS
+    scenario += vault.rotateOwner(
+      sp.record(
+        owner = owner,
+        newOwner = Addresses.ROTATED_ADDRESS
+      )
+    ).run(
+      sender = notGovernor,
+      valid = False
+    )
+
+  @sp.add_test(name="rotateOwner - can rotate owner")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a vesting contract
+    amountPerBlock = 1
+    startBlock = 0
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = amountPerBlock,
+      startBlock = startBlock,
+      owner = owner,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # WHEN rotateOwner is called by the governor
+    scenario += vault.rotateOwner(
+      sp.record(
+        owner = owner,
+        newOwner = Addresses.ROTATED_ADDRESS
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )    
+
+    # THEN the schedule is moved to the new owner.
+    scenario.verify(vault.data.schedules[Addresses.ROTATED_ADDRESS].totalAmount == sp.nat(1000000))
+    scenario.verify(vault.data.schedules[Addresses.ROTATED_ADDRESS].cliffBlock == startBlock)
+    scenario.verify(~vault.data.schedules.contains(owner))
+
+  @sp.add_test(name="rotateOwner - fails while escrow is outstanding")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a dao contract
+    dao = FakeDao.FakeDaoContract()
+    scenario += dao
+
+    # AND a vesting vault contract with an allocation of 100 tokens, which is vested at block 100
+    owner = Addresses.TOKEN_RECIPIENT
+    totalAmount = sp.nat(100)
+    vault = VestingVault(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = totalAmount,
+      endBlock = sp.nat(100),
+      owner = owner,
+      daoContractAddress = dao.address,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = totalAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS,
+      level = 0
+    )
+
+    # AND the owner proposed through the vault
+    escrowAmount = sp.nat(10)
+    proposal = sp.record(
+      title = "Prop 1",
+      descriptionLink = "ipfs://xyz",
+      descriptionHash = "xyz123",
+      proposalLambdaHash = sp.bytes("0x1234")
+    )
+    scenario += vault.propose(proposal).run(
+      sender = owner,
+      level = 1,
+    )
+
+    # AND the dao took the escrow.
+    scenario += token.transfer(
+      from_ = vault.address,
+      to_ = dao.address,
+      value = escrowAmount
+    ).run(
+      sender = dao.address,
+      level = 1,
+    )
+
+    # WHEN the owner is rotated before the poll ends
+    # THEN the call fails.
+    scenario += vault.rotateOwner(
+      sp.record(
+        owner = owner,
+        newOwner = Addresses.ROTATED_ADDRESS
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = 2,
+      valid = False
+    )
+
+  @sp.add_test(name="rotateOwner - fails if the new owner already has a schedule")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a vesting contract with two beneficiaries
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      owner = owner,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault holds the tokens to allocate.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(2000000)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ROTATED_ADDRESS, sp.nat(1), sp.nat(0))
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # WHEN rotateOwner is called with the other beneficiary as the new owner
+    # THEN the call fails.
+    scenario += vault.rotateOwner(
+      sp.record(
+        owner = owner,
+        newOwner = Addresses.ROTATED_ADDRESS
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
+    )
+
+  ################################################################
+  # addBeneficiaries
+  ################################################################
+
+  @sp.add_test(name="addBeneficiaries - adds schedules")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a vesting contract without beneficiaries
+    vault = VestingVault(
+      owner = None,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault holds the tokens to allocate.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(2000000)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN beneficiaries are added by the governor
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ALICE_ADDRESS, sp.nat(1), sp.nat(10)),
+      linearBeneficiary(Addresses.BOB_ADDRESS, sp.nat(2), sp.nat(20)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # THEN each beneficiary has a schedule.
+    scenario.verify(vault.data.schedules[Addresses.ALICE_ADDRESS].cliffBlock == sp.nat(10))
+    scenario.verify(vault.data.schedules[Addresses.ALICE_ADDRESS].amountWithdrawn == sp.nat(0))
+    scenario.verify(vault.data.schedules[Addresses.BOB_ADDRESS].cliffBlock == sp.nat(20))
+    scenario.verify(vault.data.schedules[Addresses.BOB_ADDRESS].amountWithdrawn == sp.nat(0))
+
+    # AND their allocations are counted as allocated.
+    scenario.verify(vault.data.totalAllocated == sp.nat(2000000))
+
+  @sp.add_test(name="addBeneficiaries - fails if the vault does not hold the allocated tokens")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a vesting contract with a beneficiary
+    vault = VestingVault(
+      totalAmount = sp.nat(100),
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault holds the tokens of the beneficiary and 50 more.
     scenario += token.mint(
       sp.record(
         address = vault.address,
-        value = tokensInVault
+        value = sp.nat(150)
       )
     ).run(
-      sender = Addresses.TOKEN_ADMIN_ADDRESS,
-      level = 0
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
     )
 
-    # WHEN executeTimelock is called
-    scenario += vault.executeTimelock(sp.unit).run(
-      sender = Addresses.TOKEN_RECIPIENT,
-      level = endBlock + 1,
-    )    
+    # WHEN a beneficiary is added with an allocation larger than the unallocated tokens
+    # THEN the call fails.
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ALICE_ADDRESS, sp.nat(1), sp.nat(10), totalAmount = sp.nat(51)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
+    )
 
-    # THEN the proposal executed
-    scenario.verify(storeContract.data.storedValue == newValue)
+    # AND WHEN a beneficiary is added with an allocation of the unallocated tokens
+    # THEN the call succeeds.
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ALICE_ADDRESS, sp.nat(1), sp.nat(10), totalAmount = sp.nat(50)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
 
-    # AND the historical outcome is updated.
-    scenario.verify(dao.data.outcomes[pollId].outcome == PollOutcomes.POLL_OUTCOME_EXECUTED)
+  @sp.add_test(name="addBeneficiaries - fails if not called by governor")
+  def test():
+    scenario = sp.test_scenario()
 
-    # AND the timelock is empty.
-    scenario.verify(~dao.data.timelockItem.is_some())
+    # GIVEN a vesting contract
+    vault = VestingVault(
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += vault
+
+    # WHEN addBeneficiaries is called by someone other than the governor
+    # THEN the call fails.
+    notGovernor = Addresses.NULL_ADDRESS
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ALICE_ADDRESS, sp.nat(1), sp.nat(10)),
+    ]).run(
+      sender = notGovernor,
+      valid = False
+    )
 
+  @sp.add_test(name="addBeneficiaries - fails if the owner already has a schedule")
+  def test():
+    scenario = sp.test_scenario()
 
-  @sp.add_test(name="executeTimelock - fails if not called by owner")
+    # GIVEN a vesting contract
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      owner = owner,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += vault
+
+    # WHEN the existing owner is added again
+    # THEN the call fails.
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(owner, sp.nat(1), sp.nat(10)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
+    )
+
+  @sp.add_test(name="addBeneficiaries - precomputes the amount vested at the start of each segment")
   def test():
     scenario = sp.test_scenario()
 
@@ -1250,185 +2900,161 @@ if __name__ == "__main__":
     )
     scenario += token
 
-    # AND a vesting vault contract
-    amountPerBlock = 1
-    startBlock = 0
-    owner = Addresses.TOKEN_RECIPIENT
+    # AND a vesting contract without beneficiaries
     vault = VestingVault(
-      amountPerBlock = amountPerBlock,
-      daoContractAddress = Addresses.DAO_ADDRESS, # Updated later
-      startBlock = startBlock,
-      owner = owner,
+      owner = None,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
       tokenContractAddress = token.address
     )
     scenario += vault
 
-    # AND a store value contract with the dao as the admin.
-    storeContract = Store.StoreValueContract(value = 0, admin = Addresses.TOKEN_ADMIN_ADDRESS)
-    scenario += storeContract
-
-    # AND an item in the timelock
-    newValue = sp.nat(3)
-    def updateLambda(unitParam):
-      sp.set_type(unitParam, sp.TUnit)
-      storeContractHandle = sp.contract(sp.TNat, storeContract.address, 'replace').open_some()
-      sp.result([sp.transfer_operation(newValue, sp.mutez(0), storeContractHandle)])    
-
-    pollId = sp.nat(0)
-    endBlock = sp.nat(10)
-    cancelBlock = sp.nat(20)
-    timelockItem = sp.record(
-      id = pollId,
-      proposal = sp.record(
-        title = 'timelocked prop',
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = updateLambda
-      ),
-      endBlock = endBlock,
-      cancelBlock = cancelBlock,
-      author = vault.address,
+    # AND the vault holds the tokens to allocate.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
     )
 
-    poll = sp.record(
-      id = pollId,
-      proposal = sp.record(
-        title = "timelocked prop",
-        descriptionLink = 'ipfs://xyz',
-        descriptionHash = "xyz123",
-        proposalLambda = sp.build_lambda(lambda x: sp.list(l = [], t = sp.TOperation))
-      ),
-      votingStartBlock = sp.nat(1),
-      votingEndBlock = sp.nat(5),
-      yayVotes = sp.nat(100),
-      nayVotes = sp.nat(0),
-      abstainVotes = sp.nat(0),
-      totalVotes = sp.nat(100),
-      voters = {},
-      author = vault.address,
-      escrowAmount = sp.nat(2),
-      quorum = sp.nat(100),
-      quorumCap = sp.record(lower = sp.nat(0), upper = sp.nat(1000))
+    # WHEN a beneficiary with three segments is added
+    scenario += vault.addBeneficiaries([
+      sp.record(
+        owner = Addresses.ALICE_ADDRESS,
+        totalAmount = sp.nat(100),
+        cliffBlock = sp.nat(10),
+        endBlock = sp.nat(50),
+        segments = [
+          sp.record(startBlock = sp.nat(0), amountPerBlock = sp.nat(1)),
+          sp.record(startBlock = sp.nat(10), amountPerBlock = sp.nat(3)),
+          sp.record(startBlock = sp.nat(20), amountPerBlock = sp.nat(0)),
+        ]
+      )
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS
     )
 
-    # AND a dao contract with the item.
-    dao = Dao.DaoContract(
-      timelockItem = sp.some(timelockItem),
-      outcomes = sp.big_map(
-        l = {
-            pollId: sp.record(
-              outcome = PollOutcomes.POLL_OUTCOME_IN_TIMELOCK,
-              poll = poll
-            )
-        },
-        tkey = sp.TNat,
-        tvalue = HistoricalOutcomes.HISTORICAL_OUTCOME_TYPE,
-      )
+    # THEN the segments are stored latest first with the amount vested at their start.
+    scenario.verify_equal(
+      vault.data.schedules[Addresses.ALICE_ADDRESS].segments,
+      [
+        sp.record(startBlock = sp.nat(20), amountPerBlock = sp.nat(0), vestedAtStart = sp.nat(40)),
+        sp.record(startBlock = sp.nat(10), amountPerBlock = sp.nat(3), vestedAtStart = sp.nat(10)),
+        sp.record(startBlock = sp.nat(0), amountPerBlock = sp.nat(1), vestedAtStart = sp.nat(0)),
+      ]
     )
-    scenario += dao
 
-    # AND the store contract has the dao as the admin.
-    scenario += storeContract.setAdmin(dao.address)
+  @sp.add_test(name="addBeneficiaries - fails if segments are not in order")
+  def test():
+    scenario = sp.test_scenario()
 
-    # AND the vault is set to point at the DAO
-    setDaoParam = sp.record(newDaoContractAddress = dao.address)
-    scenario += vault.setDaoContractAddress(setDaoParam).run(
-      sender = Addresses.GOVERNOR_ADDRESS
+    # GIVEN a vesting contract
+    vault = VestingVault(
+      owner = None,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
     )
+    scenario += vault
 
-    # AND the vault is funded.
-    tokensInVault = sp.nat(100)
-    scenario += token.mint(
+    # WHEN a beneficiary is added with segments out of order
+    # THEN the call fails.
+    scenario += vault.addBeneficiaries([
       sp.record(
-        address = vault.address,
-        value = tokensInVault
+        owner = Addresses.ALICE_ADDRESS,
+        totalAmount = sp.nat(100),
+        cliffBlock = sp.nat(0),
+        endBlock = sp.nat(50),
+        segments = [
+          sp.record(startBlock = sp.nat(10), amountPerBlock = sp.nat(1)),
+          sp.record(startBlock = sp.nat(10), amountPerBlock = sp.nat(2)),
+        ]
       )
-    ).run(
-      sender = Addresses.TOKEN_ADMIN_ADDRESS,
-      level = 0
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
     )
 
-    # WHEN executeTimelock is called by someone other than the owner
+  @sp.add_test(name="addBeneficiaries - fails if there are no segments")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a vesting contract
+    vault = VestingVault(
+      owner = None,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += vault
+
+    # WHEN a beneficiary is added without segments
     # THEN the call fails.
-    scenario += vault.executeTimelock(sp.unit).run(
-      sender = Addresses.NULL_ADDRESS,
-      level = endBlock + 1,
+    scenario += vault.addBeneficiaries([
+      sp.record(
+        owner = Addresses.ALICE_ADDRESS,
+        totalAmount = sp.nat(100),
+        cliffBlock = sp.nat(0),
+        endBlock = sp.nat(50),
+        segments = []
+      )
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
       valid = False
-    )    
-
-  ################################################################
-  # rotateOwner
-  ################################################################
+    )
 
-  @sp.add_test(name="rotateOwner - fails if not called by governor")
+  @sp.add_test(name="addBeneficiaries - fails if there are too many segments")
   def test():
     scenario = sp.test_scenario()
 
-    # GIVEN a token contract
-    token = Token.FA12(
-      admin = Addresses.TOKEN_ADMIN_ADDRESS,
-    )
-    scenario += token
-    
-    # AND a vesting contract
-    amountPerBlock = 1
-    startBlock = 0
-    owner = Addresses.TOKEN_RECIPIENT
+    # GIVEN a vesting contract
     vault = VestingVault(
-      amountPerBlock = amountPerBlock,
-      startBlock = startBlock,
-      owner = owner,
+      owner = None,
       governorAddress = Addresses.GOVERNOR_ADDRESS,
-      tokenContractAddress = token.address
     )
     scenario += vault
 
-    # WHEN rotateOwner is called by someone other than the governor
+    # WHEN a beneficiary is added with more than the maximum number of segments
     # THEN the call fails.
-    notGovernor = Addresses.NULL_ADDRESS
-    scenario += vault.rotateOwner(
+    scenario += vault.addBeneficiaries([
       sp.record(
-        newOwner = Addresses.ROTATED_ADDRESS
+        owner = Addresses.ALICE_ADDRESS,
+        totalAmount = sp.nat(100),
+        cliffBlock = sp.nat(0),
+        endBlock = sp.nat(50),
+        segments = [
+          sp.record(startBlock = sp.nat(i), amountPerBlock = sp.nat(1)) for i in range(Schedule.MAX_SEGMENTS + 1)
+        ]
       )
-    ).run(
-      sender = notGovernor,
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
       valid = False
     )
 
-  @sp.add_test(name="rotateOwner - can rotate owner")
+  @sp.add_test(name="addBeneficiaries - fails if the cliff is after the end")
   def test():
     scenario = sp.test_scenario()
 
-    # GIVEN a token contract
-    token = Token.FA12(
-      admin = Addresses.TOKEN_ADMIN_ADDRESS,
-    )
-    scenario += token
-    
-    # AND a vesting contract
-    amountPerBlock = 1
-    startBlock = 0
-    owner = Addresses.TOKEN_RECIPIENT
+    # GIVEN a vesting contract
     vault = VestingVault(
-      amountPerBlock = amountPerBlock,
-      startBlock = startBlock,
-      owner = owner,
+      owner = None,
       governorAddress = Addresses.GOVERNOR_ADDRESS,
-      tokenContractAddress = token.address
     )
     scenario += vault
 
-    # WHEN rotateOwner is called by the governor
-    scenario += vault.rotateOwner(
+    # WHEN a beneficiary is added with a cliff after the end of vesting
+    # THEN the call fails.
+    scenario += vault.addBeneficiaries([
       sp.record(
-        newOwner = Addresses.ROTATED_ADDRESS
+        owner = Addresses.ALICE_ADDRESS,
+        totalAmount = sp.nat(100),
+        cliffBlock = sp.nat(60),
+        endBlock = sp.nat(50),
+        segments = [
+          sp.record(startBlock = sp.nat(0), amountPerBlock = sp.nat(1)),
+        ]
       )
-    ).run(
-      sender = Addresses.GOVERNOR_ADDRESS
-    )    
-
-    # THEN the owner address is updated.
-    scenario.verify(vault.data.owner == Addresses.ROTATED_ADDRESS)
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      valid = False
+    )
 
   ################################################################
   # setDaoContractAddress
@@ -1618,9 +3244,60 @@ if __name__ == "__main__":
     startBlock = 0
     owner = Addresses.TOKEN_RECIPIENT
     vault = VestingVault(
-      amountPerBlock = amountPerBlock,
-      startBlock = startBlock,
+      amountPerBlock = amountPerBlock,
+      startBlock = startBlock,
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN withdraw is called for the exact amount in two blocks.
+    numberOfBlocks = sp.nat(2)
+    level = startBlock + numberOfBlocks
+    withdrawAmount = sp.as_nat(level - startBlock) * amountPerBlock
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = withdrawAmount
+      )
+    ).run(
+      sender = Addresses.TOKEN_RECIPIENT,
+      level = level
+    )
+
+    # THEN the recipient received the tokens.
+    scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == withdrawAmount)
+
+    # AND the amountWithdrawn is updated correctly.
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == withdrawAmount)
+
+  @sp.add_test(name="withdraw - withdraws from the schedule of the requester")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a vesting contract with two beneficiaries on different schedules
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = sp.nat(100),
       owner = owner,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
       tokenContractAddress = token.address
     )
     scenario += vault
@@ -1629,30 +3306,45 @@ if __name__ == "__main__":
     scenario += token.mint(
       sp.record(
         address = vault.address,
-        value = sp.nat(100)
+        value = sp.nat(200)
       )
     ).run(
       sender = Addresses.TOKEN_ADMIN_ADDRESS
     )
 
-    # WHEN withdraw is called for the exact amount in two blocks.
-    numberOfBlocks = sp.nat(2)
-    level = startBlock + numberOfBlocks
-    withdrawAmount = sp.as_nat(level - startBlock) * amountPerBlock
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ALICE_ADDRESS, sp.nat(5), sp.nat(0), totalAmount = sp.nat(100))
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # WHEN alice withdraws her vested amount after two blocks
     scenario += vault.withdraw(
       sp.record(
-        numberOfTokens = withdrawAmount
+        numberOfTokens = sp.nat(10)
       )
     ).run(
-      sender = Addresses.TOKEN_RECIPIENT,
-      level = level
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(2)
     )
 
-    # THEN the recipient received the tokens.
-    scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == withdrawAmount)
+    # THEN alice received the tokens
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(10))
 
-    # AND the amountWithdrawn is updated correctly.
-    scenario.verify(vault.data.amountWithdrawn == withdrawAmount)
+    # AND only alice's schedule is updated.
+    scenario.verify(vault.data.schedules[Addresses.ALICE_ADDRESS].amountWithdrawn == sp.nat(10))
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == sp.nat(0))
+
+    # AND the other owner can not withdraw more than their own vested amount.
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(3)
+      )
+    ).run(
+      sender = owner,
+      level = sp.nat(2),
+      valid = False
+    )
 
   @sp.add_test(name="withdraw - can withdraw exactly the vested amount in two transactions in the same block")
   def test():
@@ -1711,7 +3403,7 @@ if __name__ == "__main__":
     scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == sp.nat(2))
 
     # AND the amountWithdrawn is updated correctly.
-    scenario.verify(vault.data.amountWithdrawn == sp.nat(2)) 
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == sp.nat(2)) 
   
   @sp.add_test(name="withdraw - can withdraw exactly the vested amount in two transactions in different blocks")
   def test():
@@ -1771,7 +3463,7 @@ if __name__ == "__main__":
     scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == sp.nat(3))
 
     # AND the amountWithdrawn is updated correctly.
-    scenario.verify(vault.data.amountWithdrawn == sp.nat(3)) 
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == sp.nat(3)) 
 
   @sp.add_test(name="withdraw - can withdraw exactly the vested amount with a different start block")
   def test():
@@ -1822,7 +3514,7 @@ if __name__ == "__main__":
     scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == withdrawAmount)    
 
     # AND the amountWithdrawn is updated correctly.
-    scenario.verify(vault.data.amountWithdrawn == withdrawAmount)   
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == withdrawAmount)   
 
   @sp.add_test(name="withdraw - correctly tabulates multiple transactions")
   def test():
@@ -1908,7 +3600,339 @@ if __name__ == "__main__":
     scenario.verify(token.data.balances[Addresses.TOKEN_RECIPIENT] == expectedAmount)
 
     # AND the amountWithdrawn is updated correctly.
-    scenario.verify(vault.data.amountWithdrawn == expectedAmount)    
+    scenario.verify(vault.data.schedules[owner].amountWithdrawn == expectedAmount)    
+
+  @sp.add_test(name="withdraw - vests piecewise segments after the cliff")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a vesting contract without beneficiaries
+    vault = VestingVault(
+      owner = None,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # AND a beneficiary which vests 1 token per block from block 0, 3 tokens per block from block 10 and nothing
+    # from block 20, with a cliff at block 10.
+    scenario += vault.addBeneficiaries([
+      sp.record(
+        owner = Addresses.ALICE_ADDRESS,
+        totalAmount = sp.nat(100),
+        cliffBlock = sp.nat(10),
+        endBlock = sp.nat(50),
+        segments = [
+          sp.record(startBlock = sp.nat(0), amountPerBlock = sp.nat(1)),
+          sp.record(startBlock = sp.nat(10), amountPerBlock = sp.nat(3)),
+          sp.record(startBlock = sp.nat(20), amountPerBlock = sp.nat(0)),
+        ]
+      )
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS
+    )
+
+    # WHEN withdraw is called before the cliff
+    # THEN the call fails.
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(1)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(9),
+      valid = False
+    )
+
+    # WHEN withdraw is called at the cliff for the amount vested by the first segment
+    # THEN the call succeeds.
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(10)
+    )
+
+    # WHEN withdraw is called within the second segment for more than is vested
+    # THEN the call fails.
+    # vested = 10 + (15 - 10) * 3 = 25, total withdrawn = 10, requested = 16
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(16)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(15),
+      valid = False
+    )
+
+    # WHEN withdraw is called within the second segment for exactly the vested amount
+    # THEN the call succeeds.
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(15)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(15)
+    )
+
+    # WHEN withdraw is called in the last segment for more than the amount vested by the second segment
+    # THEN the call fails.
+    # vested = 10 + (20 - 10) * 3 = 40, total withdrawn = 25, requested = 16
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(16)
+      )
+    ).run(
+      sender = Addresses.ALICE_ADDRESS,
+      level = sp.nat(30),
+      valid = False
+    )
+
+    # THEN the recipient received the withdrawn tokens.
+    scenario.verify(token.data.balances[Addresses.ALICE_ADDRESS] == sp.nat(25))
+    scenario.verify(vault.data.schedules[Addresses.ALICE_ADDRESS].amountWithdrawn == sp.nat(25))
+
+  @sp.add_test(name="withdraw - caps withdrawals at the total allocation")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a vesting contract with an allocation of 10 tokens
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = sp.nat(10),
+      endBlock = sp.nat(1000),
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault holds more tokens than the allocation.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN withdraw is called for more than the allocation after the linear schedule passes it
+    # THEN the call fails.
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(11)
+      )
+    ).run(
+      sender = owner,
+      level = sp.nat(20),
+      valid = False
+    )
+
+    # WHEN withdraw is called for exactly the allocation
+    # THEN the call succeeds.
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(10)
+      )
+    ).run(
+      sender = owner,
+      level = sp.nat(20)
+    )
+
+    scenario.verify(token.data.balances[owner] == sp.nat(10))
+
+  @sp.add_test(name="withdraw - vests the total allocation at the end block")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+    
+    # AND a vesting contract which vests 1 token per block and ends before the allocation is reached
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = sp.nat(100),
+      endBlock = sp.nat(10),
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault is funded.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN withdraw is called for the allocation at the end block
+    scenario += vault.withdraw(
+      sp.record(
+        numberOfTokens = sp.nat(100)
+      )
+    ).run(
+      sender = owner,
+      level = sp.nat(10)
+    )
+
+    # THEN the recipient received the whole allocation.
+    scenario.verify(token.data.balances[owner] == sp.nat(100))
+
+  ################################################################
+  # voting power
+  ################################################################
+
+  @sp.add_test(name="voting power - checkpoints the allocation of new beneficiaries")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a vesting contract without beneficiaries
+    vault = VestingVault(
+      owner = None,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    # AND the vault holds the tokens to allocate.
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN a beneficiary is added
+    scenario += vault.addBeneficiaries([
+      linearBeneficiary(Addresses.ALICE_ADDRESS, sp.nat(1), sp.nat(10), totalAmount = sp.nat(100)),
+    ]).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(3)
+    )
+
+    # THEN the allocation is checkpointed as voting power.
+    scenario.verify(vault.data.numCheckpoints[Addresses.ALICE_ADDRESS] == sp.nat(1))
+    scenario.verify(vault.data.checkpoints[(Addresses.ALICE_ADDRESS, sp.nat(0))][0].fromBlock == sp.nat(3))
+    scenario.verify(vault.data.checkpoints[(Addresses.ALICE_ADDRESS, sp.nat(0))][0].balance == sp.nat(100))
+
+  @sp.add_test(name="voting power - checkpoints withdrawals")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a token contract
+    token = Token.FA12(
+      admin = Addresses.TOKEN_ADMIN_ADDRESS,
+    )
+    scenario += token
+
+    # AND a funded vesting contract
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      amountPerBlock = sp.nat(1),
+      startBlock = sp.nat(0),
+      totalAmount = sp.nat(100),
+      owner = owner,
+      tokenContractAddress = token.address
+    )
+    scenario += vault
+
+    scenario += token.mint(
+      sp.record(
+        address = vault.address,
+        value = sp.nat(100)
+      )
+    ).run(
+      sender = Addresses.TOKEN_ADMIN_ADDRESS
+    )
+
+    # WHEN the owner withdraws tokens
+    scenario += vault.withdraw(sp.record(numberOfTokens = sp.nat(4))).run(
+      sender = owner,
+      level = sp.nat(5)
+    )
+
+    # THEN the tokens which remain in the vault are checkpointed as voting power.
+    scenario.verify(vault.data.numCheckpoints[owner] == sp.nat(2))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][1].fromBlock == sp.nat(5))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][1].balance == sp.nat(96))
+
+  @sp.add_test(name="voting power - moves voting power when the owner is rotated")
+  def test():
+    scenario = sp.test_scenario()
+
+    # GIVEN a vesting contract
+    owner = Addresses.TOKEN_RECIPIENT
+    vault = VestingVault(
+      totalAmount = sp.nat(100),
+      owner = owner,
+      governorAddress = Addresses.GOVERNOR_ADDRESS,
+    )
+    scenario += vault
+
+    # WHEN the owner is rotated
+    scenario += vault.rotateOwner(
+      sp.record(
+        owner = owner,
+        newOwner = Addresses.ROTATED_ADDRESS
+      )
+    ).run(
+      sender = Addresses.GOVERNOR_ADDRESS,
+      level = sp.nat(7)
+    )
+
+    # THEN the old owner has no voting power from the rotation onwards
+    scenario.verify(vault.data.numCheckpoints[owner] == sp.nat(2))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][1].fromBlock == sp.nat(7))
+    scenario.verify(vault.data.checkpoints[(owner, sp.nat(0))][1].balance == sp.nat(0))
+
+    # AND the new owner has the voting power.
+    scenario.verify(vault.data.numCheckpoints[Addresses.ROTATED_ADDRESS] == sp.nat(1))
+    scenario.verify(vault.data.checkpoints[(Addresses.ROTATED_ADDRESS, sp.nat(0))][0].fromBlock == sp.nat(7))
+    scenario.verify(vault.data.checkpoints[(Addresses.ROTATED_ADDRESS, sp.nat(0))][0].balance == sp.nat(100))
 
   ################################################################
   # setGovernorContract
@@ -1950,5 +3974,5 @@ if __name__ == "__main__":
     )
 
 
-  sp.add_compilation_target("vesting-vault", VestingVault())
+  sp.add_compilation_target("vesting-vault", VestingVault(owner = None))
 